@@ -5,32 +5,71 @@ from google.adk.tools import (
     google_search  # Example built-in ADK tool (function)
 )
 
+from adk.declaration_cache import apply_declaration_cache, declarations_path
+from adk.instruction_loader import build_instruction
+from adk.model_metrics import instrument_model_calls
+from adk.response_cache import mark_uncacheable
+from adk.tool_limits import apply_tool_limits
+from adk.tool_metrics import instrument_tools
+from adk.tool_offload import offload_sync_tools
 from config.settings import settings
-from tools.example_tool import get_current_time_tool  # Your custom tool
+from tools.doc_search import search_project_docs_tool
+from tools.example_tool import (  # Your custom tools
+    get_current_time_tool,
+    get_current_times_tool,
+)
 
 logger = logging.getLogger(__name__)
 
+# Used unless AGENT_INSTRUCTION_SOURCE points at a prompt file or registry prompt.
+DEFAULT_INSTRUCTION = (
+    "You are the gen-bootstrap assistant, a helpful AI designed to "
+    "demonstrate the capabilities of the Google Agent Development Kit (ADK) "
+    "within this scaffold project. Your primary goal is to assist the user "
+    "with their queries by providing information and leveraging the tools "
+    "available to you. Available tools are:\n"
+    "- get_current_time_tool: Use this to find the current time for any timezone.\n"
+    "- get_current_times_tool: Use this to find the current time in several "
+    "timezones at once, in a single call.\n"
+    "- search_project_docs_tool: Use this first for questions about this project "
+    "(gen-bootstrap) itself; it searches the local documentation offline.\n"
+    "- google_search: Use this for general knowledge questions or finding "
+    "current information online.\n"
+    "Be polite, clear, and make sure to tell the user which tool you are "
+    "using if you decide to use one."
+)
+
 root_agent = LlmAgent(
     name="gen_bootstrap_core_assistant",
     model=settings.default_gemini_model,  # Using model from settings
-    instruction=(
-        "You are the gen-bootstrap assistant, a helpful AI designed to "
-        "demonstrate the capabilities of the Google Agent Development Kit (ADK) "
-        "within this scaffold project. Your primary goal is to assist the user "
-        "with their queries by providing information and leveraging the tools "
-        "available to you. Available tools are:\n"
-        "- get_current_time_tool: Use this to find the current time for any timezone.\n"
-        "- google_search: Use this for general knowledge questions or finding "
-        "current information online.\n"
-        "Be polite, clear, and make sure to tell the user which tool you are "
-        "using if you decide to use one."
+    instruction=build_instruction(settings, DEFAULT_INSTRUCTION),
+    # Tools are wrapped in place: sync functions move to per-tool thread pools
+    # (adk/tool_offload.py), then get bulkheads/timeouts from settings
+    # (adk/tool_limits.py) and are instrumented for /metrics (adk/tool_metrics.py).
+    tools=instrument_tools(
+        apply_tool_limits(
+            offload_sync_tools(
+                [
+                    # Clock and live search results must never be replayed from
+                    # the /run response cache (adk/response_cache.py).
+                    mark_uncacheable(get_current_time_tool),
+                    mark_uncacheable(get_current_times_tool),
+                    search_project_docs_tool,
+                    mark_uncacheable(google_search),  # Use the imported function directly
+                ],
+                settings,
+            ),
+            settings,
+        )
     ),
-    tools=[
-        get_current_time_tool,
-        google_search,  # Use the imported function directly
-    ],
 )
 
+# Serve function declarations from the prebuilt artifact when it matches the current
+# sources, instead of introspecting every tool function (adk/declaration_cache.py).
+apply_declaration_cache(root_agent, declarations_path(settings))
+# Model-call latency and token usage for /metrics (adk/model_metrics.py).
+instrument_model_calls(root_agent)
+
 logger.info(
     f"ADK Agent '{root_agent.name}' initialized. "
     f"Model config keys: '{root_agent.model_config.keys()}'. "
@@ -0,0 +1,207 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+import tempfile
+from importlib import metadata
+
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+# Bump when the artifact layout changes; older artifacts are then ignored.
+DECLARATION_ARTIFACT_VERSION = 1
+
+# Set on tool instances whose declarations are served from a cache.
+_CACHED_MARKER = "_gen_bootstrap_declaration_cached"
+
+
+def _adk_version() -> str:
+    try:
+        return metadata.version("google-adk")
+    except metadata.PackageNotFoundError:  # pragma: no cover - ADK is a hard dependency
+        return "unknown"
+
+
+def _api_variant() -> str:
+    # Mirrors BaseTool._api_variant: declarations differ between Gemini API and Vertex AI.
+    use_vertexai = os.environ.get("GOOGLE_GENAI_USE_VERTEXAI", "0").lower() in (
+        "true",
+        "1",
+    )
+    return "VERTEX_AI" if use_vertexai else "GOOGLE_AI"
+
+
+def _declaring_tools(tools: list) -> list:
+    """Tools whose declaration is generated locally by introspecting a function."""
+    return [tool for tool in tools if callable(getattr(tool, "func", None))]
+
+
+def _source_modules(tools: list) -> dict[str, str]:
+    """Maps each module defining a tool function to its source file."""
+    modules = {}
+    for tool in _declaring_tools(tools):
+        # Wrappers such as cached_tool keep the original function in __wrapped__.
+        for func in (tool.func, inspect.unwrap(tool.func)):
+            try:
+                source_file = inspect.getsourcefile(func)
+            except TypeError:
+                source_file = None
+            if source_file:
+                modules[func.__module__] = source_file
+    return modules
+
+
+def agent_config(agent) -> dict:
+    """The agent configuration recorded in, and validated against, the artifact."""
+    model = getattr(agent, "model", "")
+    return {
+        "name": agent.name,
+        "model": model if isinstance(model, str) else type(model).__name__,
+        "tools": [getattr(tool, "name", type(tool).__name__) for tool in agent.tools],
+    }
+
+
+def artifact_key(agent) -> str:
+    """Hashes everything a declaration depends on.
+
+    That is the source of every module defining a tool function, the agent
+    configuration, the ADK version and the API variant. Any change yields a new
+    key, so a stale artifact is ignored rather than served.
+    """
+    digest = hashlib.sha256()
+    header = {
+        "version": DECLARATION_ARTIFACT_VERSION,
+        "adk_version": _adk_version(),
+        "api_variant": _api_variant(),
+        "agent": agent_config(agent),
+    }
+    digest.update(json.dumps(header, sort_keys=True).encode("utf-8"))
+    # Module names rather than paths, so an artifact built in CI matches on Cloud Run.
+    for module, path in sorted(_source_modules(agent.tools).items()):
+        digest.update(module.encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def build_declaration_artifact(agent, path: str) -> dict:
+    """Introspects every function tool once and writes the declarations to `path`.
+
+    The file is written to a temporary name and renamed, so workers starting
+    concurrently never read a partial artifact.
+    """
+    declarations = {}
+    for tool in _declaring_tools(agent.tools):
+        declaration = tool._get_declaration()
+        if declaration is not None:
+            declarations[tool.name] = declaration.model_dump(
+                mode="json", exclude_none=True
+            )
+    artifact = {
+        "version": DECLARATION_ARTIFACT_VERSION,
+        "key": artifact_key(agent),
+        "adk_version": _adk_version(),
+        "api_variant": _api_variant(),
+        "agent": agent_config(agent),
+        "declarations": declarations,
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=".declarations-", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(artifact, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return artifact
+
+
+def load_declaration_artifact(
+    path: str, key: str
+) -> dict[str, types.FunctionDeclaration] | None:
+    """Returns the cached declarations if the artifact at `path` matches `key`."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            artifact = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(
+            "Could not read tool declaration artifact; introspecting tools instead.",
+            extra={"path": path, "error": str(e)},
+        )
+        return None
+    if (
+        artifact.get("version") != DECLARATION_ARTIFACT_VERSION
+        or artifact.get("key") != key
+    ):
+        logger.info(
+            "Tool declaration artifact is stale; run 'gen-bootstrap agent build' "
+            "to refresh it.",
+            extra={"path": path},
+        )
+        return None
+    return {
+        name: types.FunctionDeclaration.model_validate(declaration)
+        for name, declaration in artifact.get("declarations", {}).items()
+    }
+
+
+def declarations_path(settings) -> str:
+    """Artifact location: AGENT_DECLARATIONS_PATH, else the project state directory."""
+    return settings.agent_declarations_path or settings.state_path(
+        "agent_declarations.json"
+    )
+
+
+def _serve_declaration(tool, declaration: types.FunctionDeclaration | None) -> None:
+    get_declaration = tool._get_declaration
+    cached = {_api_variant(): declaration} if declaration is not None else {}
+
+    def cached_get_declaration():
+        # ADK asks for the declaration on every LLM request; build it once per variant.
+        variant = _api_variant()
+        if variant not in cached:
+            cached[variant] = get_declaration()
+        return cached[variant]
+
+    tool._get_declaration = cached_get_declaration
+    setattr(tool, _CACHED_MARKER, True)
+
+
+def apply_declaration_cache(agent, path: str | None) -> int:
+    """Serves the agent's function declarations from the artifact at `path`.
+
+    Tools found in a matching artifact skip introspection entirely; any other
+    function tool builds its declaration once, on first use, instead of on
+    every LLM request. Returns the number of tools served from the artifact.
+    """
+    tools = [
+        t
+        for t in _declaring_tools(agent.tools)
+        if not getattr(t, _CACHED_MARKER, False)
+    ]
+    declarations = {}
+    if path and tools:
+        try:
+            declarations = load_declaration_artifact(path, artifact_key(agent)) or {}
+        except (OSError, ValueError) as e:
+            logger.warning(
+                "Tool declaration artifact unusable; introspecting tools instead.",
+                extra={"path": path, "error": str(e)},
+            )
+    for tool in tools:
+        _serve_declaration(tool, declarations.get(tool.name))
+    loaded = sum(1 for tool in tools if tool.name in declarations)
+    logger.debug(
+        "Tool declarations prepared.",
+        extra={"from_artifact": loaded, "introspected_lazily": len(tools) - loaded},
+    )
+    return loaded
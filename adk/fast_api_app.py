@@ -0,0 +1,61 @@
+# adk/fast_api_app.py
+"""Builds ADK's FastAPI app on this project's session service.
+
+google-adk 0.5's `get_fast_api_app` creates its own session service (in
+memory, or a `DatabaseSessionService` for a `session_db_url`) and has no
+parameter that takes one. `build_adk_app` swaps the in-memory class for a
+factory returning ours while the app is built, so ADK's session endpoints and
+runners (`/run`, `/run_sse`, `/run_live`) all use the configured store.
+Re-check this when upgrading google-adk.
+"""
+
+import logging
+import threading
+
+from fastapi import FastAPI
+from google.adk.cli import fast_api
+from starlette.routing import Mount
+
+logger = logging.getLogger(__name__)
+
+# Serializes builds, since the swap patches a module attribute.
+_build_lock = threading.Lock()
+
+
+def build_adk_app(
+    *, agent_dir: str, session_service, lifespan=None, web: bool = True
+) -> FastAPI:
+    """Returns ADK's app for the agents in `agent_dir`, backed by `session_service`.
+
+    ADK imports each agent as `<app_name>.agent.root_agent` from `agent_dir`,
+    e.g. `adk.agent.root_agent` for app name "adk". It passes `lifespan` to
+    FastAPI, which then ignores `add_event_handler` handlers, so startup and
+    shutdown work belongs in `lifespan`.
+    """
+    with _build_lock:
+        in_memory_session_service = fast_api.InMemorySessionService
+        fast_api.InMemorySessionService = lambda: session_service
+        try:
+            app = fast_api.get_fast_api_app(
+                agent_dir=agent_dir, web=web, lifespan=lifespan
+            )
+        finally:
+            fast_api.InMemorySessionService = in_memory_session_service
+    logger.info(
+        "ADK app built on the project session service.",
+        extra={"session_service": type(session_service).__name__},
+    )
+    return app
+
+
+def serve_static_files_last(app: FastAPI) -> None:
+    """Moves mounted apps (ADK's dev UI files at "/") behind every other route.
+
+    With `web=True`, ADK mounts its static files at "/" as its last route, and
+    a mount at "/" matches every path; routes added afterwards would never be
+    reached. Call once all routes are added.
+    """
+    routes = app.router.routes
+    routes[:] = [route for route in routes if not isinstance(route, Mount)] + [
+        route for route in routes if isinstance(route, Mount)
+    ]
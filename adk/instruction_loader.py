@@ -0,0 +1,248 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from utils.prompt_store import content_hash, version_sort_key
+
+logger = logging.getLogger(__name__)
+
+FILE_SOURCE_PREFIX = "file:"
+REGISTRY_SOURCE_PREFIX = "registry:"
+
+
+@dataclass(frozen=True)
+class LoadedInstruction:
+    text: str
+    version: str  # Registry version ID, or a content hash for local files
+    source: str
+    loaded_at: float
+
+
+def _instruction_from_definition(definition: dict) -> str:
+    """An agent instruction is the prompt's system instruction, else its template."""
+    text = definition.get("system_instruction") or definition.get("prompt_data")
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("Prompt has no text 'system_instruction' or 'prompt_data'.")
+    return text
+
+
+class DynamicInstruction:
+    """An ADK instruction provider backed by a prompt file or the Prompt Registry.
+
+    LlmAgent calls the instance with a ReadonlyContext on every model request, so
+    swapping the loaded instruction takes effect on the next turn without a
+    restart. The last good instruction is cached on disk so a cold start never
+    waits on Vertex AI; from the first call on, the source is refreshed in the
+    background.
+
+    Sources:
+        file:<path.yaml>                 local prompt definition (prompts create format)
+        registry:<prompt_id>[@<version>] Vertex AI Prompt Registry; pinned versions
+                                         never change
+    """
+
+    def __init__(
+        self,
+        source: str,
+        fallback_text: str,
+        cache_dir: str,
+        poll_seconds: float = 0,
+        project_id: str | None = None,
+        location: str | None = None,
+    ):
+        if not source.startswith((FILE_SOURCE_PREFIX, REGISTRY_SOURCE_PREFIX)):
+            raise ValueError(
+                f"Unsupported instruction source '{source}'. "
+                f"Use '{FILE_SOURCE_PREFIX}<path>' or "
+                f"'{REGISTRY_SOURCE_PREFIX}<prompt_id>'."
+            )
+        self.source = source
+        self.poll_seconds = poll_seconds
+        self.project_id = project_id
+        self.location = location
+        source_key = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+        self.cache_path = os.path.join(cache_dir, f"instruction-{source_key}.json")
+        self._current = LoadedInstruction(
+            fallback_text, "builtin", "builtin", time.time()
+        )
+        self._file_mtime_ns: int | None = None
+        self._vertex_initialized = False
+        self._stop = threading.Event()
+        self._poller_lock = threading.Lock()
+        self._poller: threading.Thread | None = None
+
+    def __call__(self, ctx=None) -> str:
+        if self._poller is None:
+            self.start_polling()
+        return self._current.text
+
+    @property
+    def current(self) -> LoadedInstruction:
+        return self._current
+
+    @property
+    def version(self) -> str:
+        return self._current.version
+
+    def load_initial(self) -> None:
+        """Loads from the on-disk cache if present, otherwise from the source."""
+        cached = self._read_cache()
+        if cached is not None:
+            self._current = cached
+            logger.info(
+                "Agent instruction loaded from cache.",
+                extra={
+                    "instruction_source": self.source,
+                    "instruction_version": cached.version,
+                },
+            )
+            if self.source.startswith(FILE_SOURCE_PREFIX):
+                # Local files are cheap to check; do it now rather than on the first poll.
+                self.refresh()
+            return
+        if not self.refresh():
+            logger.warning(
+                "Could not load agent instruction; using the built-in instruction.",
+                extra={"instruction_source": self.source},
+            )
+
+    def refresh(self) -> bool:
+        """Fetches the source and swaps the instruction if its version changed.
+
+        Returns True if a new instruction was loaded.
+        """
+        try:
+            loaded = self._fetch()
+        except Exception as e:
+            logger.warning(
+                f"Failed to refresh agent instruction: {e}",
+                extra={"instruction_source": self.source},
+            )
+            return False
+        if loaded is None or loaded.version == self._current.version:
+            return False
+        self._current = loaded
+        self._write_cache(loaded)
+        logger.info(
+            "Agent instruction updated.",
+            extra={
+                "instruction_source": self.source,
+                "instruction_version": loaded.version,
+            },
+        )
+        return True
+
+    def start_polling(self) -> None:
+        """Starts a daemon thread that refreshes every poll_seconds (if > 0)."""
+        if self.poll_seconds <= 0 or self._is_pinned_registry_version():
+            return  # Polling is off, or a pinned registry version can never change
+        with self._poller_lock:
+            if self._poller is not None:
+                return
+            self._poller = threading.Thread(
+                target=self._poll_loop, name="instruction-poller", daemon=True
+            )
+            self._poller.start()
+
+    def stop_polling(self) -> None:
+        self._stop.set()
+
+    def _poll_loop(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            self.refresh()
+
+    def _is_pinned_registry_version(self) -> bool:
+        return self.source.startswith(REGISTRY_SOURCE_PREFIX) and "@" in self.source
+
+    def _fetch(self) -> LoadedInstruction | None:
+        if self.source.startswith(FILE_SOURCE_PREFIX):
+            return self._fetch_file(self.source[len(FILE_SOURCE_PREFIX) :])
+        return self._fetch_registry(self.source[len(REGISTRY_SOURCE_PREFIX) :])
+
+    def _fetch_file(self, path: str) -> LoadedInstruction | None:
+        mtime_ns = os.stat(path).st_mtime_ns
+        if mtime_ns == self._file_mtime_ns:
+            return None  # Unchanged since the last read
+        import yaml
+
+        with open(path, "r", encoding="utf-8") as f:
+            definition = yaml.safe_load(f)
+        if not isinstance(definition, dict):
+            raise ValueError(f"Invalid prompt definition in '{path}'.")
+        self._file_mtime_ns = mtime_ns
+        return LoadedInstruction(
+            text=_instruction_from_definition(definition),
+            version=content_hash(definition)[:12],
+            source=self.source,
+            loaded_at=time.time(),
+        )
+
+    def _fetch_registry(self, reference: str) -> LoadedInstruction:
+        from google.cloud import aiplatform
+        from vertexai.preview import prompts
+
+        prompt_id, _, version_id = reference.partition("@")
+        if not self._vertex_initialized:
+            aiplatform.init(project=self.project_id, location=self.location)
+            self._vertex_initialized = True
+        if not version_id:
+            # The newest version, so a poll only downloads content when it changed.
+            versions = [str(v.version_id) for v in prompts.list_versions(prompt_id)]
+            version_id = max(versions, key=version_sort_key) if versions else None
+            if version_id == self._current.version:
+                return None
+        fetched = prompts.get(prompt_id=prompt_id, version_id=version_id)
+        definition = {
+            "system_instruction": getattr(fetched, "system_instruction", None),
+            "prompt_data": getattr(fetched, "prompt_data", None),
+        }
+        return LoadedInstruction(
+            text=_instruction_from_definition(definition),
+            version=str(version_id or getattr(fetched, "version_id", "")),
+            source=self.source,
+            loaded_at=time.time(),
+        )
+
+    def _read_cache(self) -> LoadedInstruction | None:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = LoadedInstruction(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+        return cached if cached.source == self.source else None
+
+    def _write_cache(self, loaded: LoadedInstruction) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(asdict(loaded), f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write agent instruction cache: {e}")
+
+
+def build_instruction(settings, fallback_text: str) -> str | DynamicInstruction:
+    """Returns the agent instruction configured in settings.
+
+    With no AGENT_INSTRUCTION_SOURCE set, the built-in text is used as before.
+    Polling starts on the instruction's first use, not here, so importing the
+    agent (e.g. from the CLI or tests) does not start a background thread.
+    """
+    if not settings.agent_instruction_source:
+        return fallback_text
+
+    instruction = DynamicInstruction(
+        source=settings.agent_instruction_source,
+        fallback_text=fallback_text,
+        cache_dir=settings.state_path("instructions"),
+        poll_seconds=settings.agent_instruction_poll_seconds,
+        project_id=settings.gcp_project_id,
+        location=settings.gcp_location,
+    )
+    instruction.load_initial()
+    return instruction
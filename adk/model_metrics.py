@@ -0,0 +1,70 @@
+import logging
+import time
+from collections import OrderedDict
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+MODEL_CALL_LATENCY = REGISTRY.histogram(
+    "gen_bootstrap_model_call_seconds",
+    "Time from sending a request to the model to its complete response.",
+    ["model"],
+)
+MODEL_TOKENS = REGISTRY.counter(
+    "gen_bootstrap_model_tokens_total",
+    "Tokens reported by the model, by kind (prompt, completion).",
+    ["model", "kind"],
+)
+
+# Model calls that raised never reach the after-callback; this bounds their leftovers.
+_MAX_PENDING_CALLS = 1024
+
+# Set on instrumented agents so instrumenting twice is a no-op.
+_INSTRUMENTED_MARKER = "_gen_bootstrap_model_instrumented"
+
+
+def _as_list(callback) -> list:
+    if callback is None:
+        return []
+    return list(callback) if isinstance(callback, list) else [callback]
+
+
+def instrument_model_calls(agent):
+    """Records model-call latency and token usage through the agent's model callbacks.
+
+    The callbacks are appended after any existing ones and return None, so
+    they never replace a request or response. An agent handles one model call
+    at a time per invocation, so the start time is keyed by invocation ID.
+    With streaming, the after-callback runs for every partial chunk; latency
+    and tokens are taken from the final, non-partial response.
+    """
+    if getattr(agent, _INSTRUMENTED_MARKER, False):
+        return agent
+    started: OrderedDict[str, float] = OrderedDict()
+
+    def before_model(callback_context, llm_request):
+        started[callback_context.invocation_id] = time.perf_counter()
+        while len(started) > _MAX_PENDING_CALLS:
+            started.popitem(last=False)
+        return None
+
+    def after_model(callback_context, llm_response):
+        if llm_response.partial:
+            return None
+        model = str(agent.model)
+        call_started = started.pop(callback_context.invocation_id, None)
+        if call_started is not None:
+            MODEL_CALL_LATENCY.labels(model).observe(time.perf_counter() - call_started)
+        usage = getattr(llm_response, "usage_metadata", None)
+        if usage is not None:
+            MODEL_TOKENS.labels(model, "prompt").inc(usage.prompt_token_count or 0)
+            MODEL_TOKENS.labels(model, "completion").inc(
+                usage.candidates_token_count or 0
+            )
+        return None
+
+    agent.before_model_callback = _as_list(agent.before_model_callback) + [before_model]
+    agent.after_model_callback = _as_list(agent.after_model_callback) + [after_model]
+    object.__setattr__(agent, _INSTRUMENTED_MARKER, True)
+    return agent
@@ -0,0 +1,339 @@
+# adk/response_cache.py
+"""Exact-match response cache and request coalescing for the agent's `/run` endpoint."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import unicodedata
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+RUN_PATH = "/run"
+
+# Set on tools whose results must never be replayed (clocks, live search, side effects).
+_UNCACHEABLE_MARKER = "_gen_bootstrap_uncacheable"
+
+RESPONSE_CACHE_REQUESTS = REGISTRY.counter(
+    "gen_bootstrap_response_cache_requests_total",
+    "Agent /run requests by cache outcome (hit, miss, coalesced, bypass).",
+    ["result"],
+)
+RESPONSE_CACHE_BYTES = REGISTRY.gauge(
+    "gen_bootstrap_response_cache_bytes", "Size of the cached /run responses."
+)
+
+
+def mark_uncacheable(tool):
+    """Marks a tool so runs that call it are never cached; returns the tool."""
+    setattr(tool, _UNCACHEABLE_MARKER, True)
+    return tool
+
+
+def uncacheable_tool_names(tools) -> frozenset[str]:
+    return frozenset(
+        getattr(tool, "name", getattr(tool, "__name__", ""))
+        for tool in tools
+        if getattr(tool, _UNCACHEABLE_MARKER, False)
+    )
+
+
+def normalize_input(text: str) -> str:
+    """Unicode-normalized, case-folded text with whitespace runs collapsed."""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def instruction_version(instruction) -> str:
+    """The version of a DynamicInstruction, or a hash of a static instruction."""
+    version = getattr(instruction, "version", None)
+    if version is not None:
+        return str(version)
+    return hashlib.sha256(str(instruction).encode("utf-8")).hexdigest()[:12]
+
+
+def cache_key(app_name: str, model: str, instruction: str, text: str) -> str:
+    payload = json.dumps([app_name, model, instruction, normalize_input(text)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+
+class ResponseCache:
+    """LRU of responses bounded by entry count and total body size, with a TTL.
+
+    Only used from the worker's event loop, so it needs no lock.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.size_bytes = 0
+        self._entries: OrderedDict[str, tuple[float, CachedResponse]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        if len(response.body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+        self.size_bytes += len(response.body)
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+        RESPONSE_CACHE_BYTES.set(self.size_bytes)
+
+    def _remove(self, key: str) -> None:
+        _, response = self._entries.pop(key)
+        self.size_bytes -= len(response.body)
+        RESPONSE_CACHE_BYTES.set(self.size_bytes)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _called_tools(events: list) -> set[str]:
+    names = set()
+    for event in events:
+        # Gemini runs google_search itself; only its grounding metadata comes back.
+        if event.get("grounding_metadata") or event.get("groundingMetadata"):
+            names.add("google_search")
+        for part in (event.get("content") or {}).get("parts") or []:
+            call = part.get("function_call") or part.get("functionCall")
+            if call:
+                names.add(call.get("name"))
+    return names
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware answering repeated stateless `/run` requests from memory.
+
+    A request is eligible when its message is text only and its session is
+    empty (no events, no state), so the reply depends on nothing but the
+    text, the model and the instruction. Identical eligible requests that
+    arrive while one is running wait for it instead of calling the model
+    again. A response is stored only if it succeeded and called no tool
+    marked with `mark_uncacheable`.
+
+    A cached or coalesced reply is also appended to the caller's session,
+    with new event IDs, so a follow-up question sees the same history as
+    after a real run.
+    """
+
+    def __init__(
+        self,
+        app,
+        cache: ResponseCache,
+        session_service,
+        key_context: Callable[[], tuple[str, str]],
+        uncacheable_tools: frozenset[str] = frozenset(),
+        path: str = RUN_PATH,
+    ):
+        self.app = app
+        self.cache = cache
+        self.session_service = session_service
+        self.key_context = key_context  # () -> (model, instruction version)
+        self.uncacheable_tools = uncacheable_tools
+        self.path = path
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] != self.path
+        ):
+            await self.app(scope, receive, send)
+            return
+        body = await self._read_body(receive)
+        replay = self._replay(body, receive)
+        request = await self._eligible_request(body)
+        if request is None:
+            RESPONSE_CACHE_REQUESTS.labels("bypass").inc()
+            await self.app(scope, replay, send)
+            return
+        key = cache_key(request["app_name"], *self.key_context(), request["text"])
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            RESPONSE_CACHE_REQUESTS.labels("hit").inc()
+            await self._reuse(request, cached, send)
+            return
+        leader = self._in_flight.get(key)
+        if leader is not None:
+            shared = await asyncio.shield(leader)
+            if shared is not None:
+                RESPONSE_CACHE_REQUESTS.labels("coalesced").inc()
+                await self._reuse(request, shared, send)
+                return
+            # The leader failed; run this request on its own.
+            RESPONSE_CACHE_REQUESTS.labels("miss").inc()
+            await self.app(scope, replay, send)
+            return
+
+        RESPONSE_CACHE_REQUESTS.labels("miss").inc()
+        future = self._in_flight[key] = asyncio.get_running_loop().create_future()
+        response = None
+        try:
+            response = await self._run_and_capture(scope, replay, send)
+        finally:
+            del self._in_flight[key]
+            future.set_result(response)
+        if response is not None and self._storable(response):
+            self.cache.put(key, response)
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        return b"".join(chunks)
+
+    @staticmethod
+    def _replay(body: bytes, receive):
+        """A `receive` that returns the already-read body, then the real messages."""
+        sent = False
+
+        async def replay():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return replay
+
+    async def _eligible_request(self, body: bytes) -> Optional[dict]:
+        try:
+            payload = json.loads(body)
+            parts = payload["new_message"]["parts"]
+            app_name, user_id = payload["app_name"], payload["user_id"]
+            session_id = payload["session_id"]
+        except (ValueError, KeyError, TypeError):
+            return None  # Let the endpoint report the bad request
+        if payload.get("streaming") or not parts:
+            return None
+        if any(set(part) - {"text"} for part in parts if isinstance(part, dict)):
+            return None  # Images, files or function responses are not cached
+        session = await self.session_service.get_session_async(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        if session is None or session.events or session.state:
+            return None
+        return {
+            "app_name": app_name,
+            "user_id": user_id,
+            "session": session,
+            "new_message": payload["new_message"],
+            "text": "".join(part.get("text") or "" for part in parts),
+        }
+
+    async def _run_and_capture(self, scope, receive, send) -> Optional[CachedResponse]:
+        status = None
+        headers: list = []
+        chunks: list[bytes] = []
+
+        async def capture(message):
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status, headers = message["status"], list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, receive, capture)
+        if status != 200:
+            return None
+        return CachedResponse(status, headers, b"".join(chunks))
+
+    def _storable(self, response: CachedResponse) -> bool:
+        try:
+            events = json.loads(response.body)
+        except ValueError:
+            return False
+        called = _called_tools(events) if isinstance(events, list) else set()
+        return not called & self.uncacheable_tools
+
+    async def _reuse(self, request: dict, response: CachedResponse, send) -> None:
+        try:
+            await self._record_in_session(request, json.loads(response.body))
+        except Exception:
+            logger.warning(
+                "Could not record a cached reply in its session.",
+                exc_info=True,
+                extra={"session_id": request["session"].id},
+            )
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status,
+                "headers": response.headers,
+            }
+        )
+        await send({"type": "http.response.body", "body": response.body})
+
+    async def _record_in_session(self, request: dict, events: list) -> None:
+        from google.adk.events.event import Event
+        from google.genai import types
+
+        session = request["session"]
+        invocation_id = f"e-{uuid.uuid4()}"
+        await self.session_service.append_event_async(
+            session,
+            Event(
+                invocation_id=invocation_id,
+                author="user",
+                content=types.Content.model_validate(request["new_message"]),
+            ),
+        )
+        for data in events:
+            event = Event.model_validate(data)
+            event.id = Event.new_id()
+            event.invocation_id = invocation_id
+            event.timestamp = time.time()
+            await self.session_service.append_event_async(session, event)
+
+
+def install_response_cache(app, settings, session_service, agent) -> bool:
+    """Adds the middleware when RESPONSE_CACHE_ENABLED; returns whether it did."""
+    if not settings.response_cache_enabled:
+        return False
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        cache=ResponseCache(
+            max_entries=settings.response_cache_max_entries,
+            max_bytes=settings.response_cache_max_bytes,
+            ttl_seconds=settings.response_cache_ttl_seconds,
+        ),
+        session_service=session_service,
+        key_context=lambda: (str(agent.model), instruction_version(agent.instruction)),
+        uncacheable_tools=uncacheable_tool_names(agent.tools),
+    )
+    return True
@@ -0,0 +1,156 @@
+# adk/streaming.py
+"""Time-to-first-token and inter-token metrics for ADK's `/run_sse` endpoint."""
+
+import json
+import logging
+import time
+from typing import Optional
+
+from starlette.requests import ClientDisconnect
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Gaps between streamed chunks are usually tens of milliseconds.
+INTER_TOKEN_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+STREAM_TTFT = REGISTRY.histogram(
+    "gen_bootstrap_stream_time_to_first_token_seconds",
+    "Time from receiving a streamed run to sending its first text chunk.",
+)
+STREAM_INTER_TOKEN = REGISTRY.histogram(
+    "gen_bootstrap_stream_inter_token_seconds",
+    "Time between consecutive text chunks of a streamed run.",
+    buckets=INTER_TOKEN_BUCKETS,
+)
+STREAMS = REGISTRY.counter(
+    "gen_bootstrap_streams_total",
+    "Streamed runs by outcome (ok, error, disconnected).",
+    ["outcome"],
+)
+
+# Headers asking proxies to pass chunks through rather than buffer the stream.
+STREAM_HEADERS = ((b"cache-control", b"no-cache"), (b"x-accel-buffering", b"no"))
+
+
+def _event_text(event: dict) -> str:
+    parts = (event.get("content") or {}).get("parts") or []
+    return "".join(part.get("text") or "" for part in parts)
+
+
+def _frame_data(frame: bytes) -> Optional[str]:
+    lines = frame.decode("utf-8", errors="replace").split("\n")
+    data = [line[len("data: ") :] for line in lines if line.startswith("data: ")]
+    return "\n".join(data) if data else None
+
+
+class _StreamTimer:
+    """Follows one SSE body, recording its chunk timings and whether it failed.
+
+    With SSE streaming the model's text arrives as partial events followed by
+    one final event repeating the whole text; a text chunk is each partial
+    event, or a final event nothing was streamed for (e.g. a reply after a
+    tool call returned in one piece). ADK reports a failed run as a
+    `{"error": ...}` frame, which may not be valid JSON.
+    """
+
+    def __init__(self, started: float):
+        self.started = started
+        self.last_chunk_at: Optional[float] = None
+        self.streamed_text = False
+        self.failed = False
+        self._buffer = b""
+
+    def feed(self, body: bytes) -> None:
+        self._buffer += body
+        *frames, self._buffer = self._buffer.split(b"\n\n")
+        for frame in frames:
+            data = _frame_data(frame)
+            if data is not None:
+                self._on_data(data)
+
+    def _on_data(self, data: str) -> None:
+        try:
+            event = json.loads(data)
+        except ValueError:
+            self.failed = self.failed or data.startswith('{"error"')
+            return
+        if not isinstance(event, dict):
+            return
+        if "error" in event:
+            self.failed = True
+            return
+        text = _event_text(event)
+        if not text:
+            return
+        partial = bool(event.get("partial"))
+        if partial or not self.streamed_text:
+            now = time.perf_counter()
+            if self.last_chunk_at is None:
+                STREAM_TTFT.observe(now - self.started)
+            else:
+                STREAM_INTER_TOKEN.observe(now - self.last_chunk_at)
+            self.last_chunk_at = now
+        self.streamed_text = partial
+
+
+class StreamMetricsMiddleware:
+    """ASGI middleware timing the text chunks of `POST <path>` responses.
+
+    It reads the `data:` frames ADK's `/run_sse` sends as they pass through,
+    so the endpoint, its runner and its session store stay ADK's own. Time to
+    first token is measured from the moment the request reached this
+    middleware. Streamed responses also get `Cache-Control: no-cache` and
+    `X-Accel-Buffering: no`, so proxies forward chunks as they are written.
+    """
+
+    def __init__(self, app, path: str = "/run_sse"):
+        self.app = app
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] != self.path
+        ):
+            await self.app(scope, receive, send)
+            return
+        timer = _StreamTimer(time.perf_counter())
+        status = None
+        finished = False
+
+        async def timed_send(message):
+            nonlocal status, finished
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if status == 200:
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", []), *STREAM_HEADERS],
+                    }
+            elif message["type"] == "http.response.body" and status == 200:
+                timer.feed(message.get("body", b""))
+                finished = not message.get("more_body", False)
+            await send(message)
+
+        outcome = "disconnected"  # Unless the body completes or the app raises
+        try:
+            await self.app(scope, receive, timed_send)
+            if status is not None and status != 200:
+                outcome = "error"
+            elif finished:
+                outcome = "error" if timer.failed else "ok"
+        except (ClientDisconnect, OSError):
+            raise  # The client went away mid-stream
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            STREAMS.labels(outcome).inc()
+
+
+def install_stream_metrics(app, path: str = "/run_sse") -> None:
+    """Adds `StreamMetricsMiddleware` for `path` (ADK's SSE endpoint)."""
+    app.add_middleware(StreamMetricsMiddleware, path=path)
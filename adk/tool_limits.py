@@ -0,0 +1,176 @@
+import asyncio
+import functools
+import logging
+import weakref
+from dataclasses import dataclass, fields
+
+logger = logging.getLogger(__name__)
+
+# Set on limited tool instances so limits are applied at most once.
+_LIMITED_MARKER = "_gen_bootstrap_limited"
+
+
+@dataclass(frozen=True)
+class ToolLimit:
+    """Bulkhead settings for one tool. Zero disables the corresponding limit."""
+
+    max_concurrency: int = 0
+    timeout_seconds: float = 0.0
+    queue_timeout_seconds: float = 0.0  # How long a call may wait for a free slot
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrency > 0 or self.timeout_seconds > 0
+
+
+def resolve_tool_limit(settings, tool_name: str) -> ToolLimit:
+    """Combines the global defaults with any per-tool override from TOOL_LIMITS."""
+    limit = ToolLimit(
+        max_concurrency=settings.tool_max_concurrency,
+        timeout_seconds=settings.tool_timeout_seconds,
+        queue_timeout_seconds=settings.tool_queue_timeout_seconds,
+    )
+    override = settings.tool_limits.get(tool_name)
+    if not override:
+        return limit
+    known = {f.name for f in fields(ToolLimit)}
+    unknown = set(override) - known
+    if unknown:
+        raise ValueError(
+            f"Unknown TOOL_LIMITS setting(s) for '{tool_name}': "
+            f"{', '.join(sorted(unknown))}. "
+            f"Expected: {', '.join(sorted(known))}."
+        )
+    merged = {**limit.__dict__, **override}
+    merged["max_concurrency"] = int(merged["max_concurrency"])
+    return ToolLimit(**merged)
+
+
+class _Bulkhead:
+    """Caps concurrent calls; one semaphore per event loop, since asyncio
+    primitives cannot be shared between loops."""
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+
+async def _acquire_within(semaphore: asyncio.Semaphore, timeout: float) -> bool:
+    """Acquires a permit, giving up after `timeout` seconds; True if acquired.
+
+    Before Python 3.12, `asyncio.wait_for(semaphore.acquire(), timeout)` can
+    time out after the acquire succeeded, and the permit is then never released.
+    """
+    if hasattr(asyncio, "timeout"):  # Python 3.11+
+        try:
+            async with asyncio.timeout(timeout):
+                await semaphore.acquire()
+        except TimeoutError:
+            return False
+        return True
+    acquire = asyncio.ensure_future(semaphore.acquire())
+    try:
+        await asyncio.wait_for(asyncio.shield(acquire), timeout)
+    except asyncio.TimeoutError:
+        if acquire.done() and not acquire.cancelled():
+            semaphore.release()  # Acquired just as the timeout fired
+        else:
+            acquire.cancel()
+        return False
+    return True
+
+
+def saturated_result(tool_name: str, limit: ToolLimit) -> dict:
+    return {
+        "error": (
+            f"Tool '{tool_name}' is at its concurrency limit "
+            f"({limit.max_concurrency} calls "
+            "in flight). Try again shortly or answer without it."
+        ),
+        "error_type": "tool_saturated",
+        "retryable": True,
+    }
+
+
+def timeout_result(tool_name: str, limit: ToolLimit) -> dict:
+    return {
+        "error": (
+            f"Tool '{tool_name}' did not respond within {limit.timeout_seconds:g}s. "
+            "Try again later or answer without it."
+        ),
+        "error_type": "tool_timeout",
+        "retryable": True,
+    }
+
+
+def apply_tool_limit(tool, limit: ToolLimit):
+    """Wraps a tool's `run_async` with a concurrency bulkhead and a call timeout.
+
+    A call that cannot get a slot within `queue_timeout_seconds`, or that runs
+    longer than `timeout_seconds`, returns a structured {"error": ...} result
+    to the model instead of waiting. Timeouts cancel async tools; a sync tool
+    offloaded to a thread pool (adk/tool_offload.py) stops being awaited, but
+    its thread runs to completion.
+    """
+    if not limit.enabled or getattr(tool, _LIMITED_MARKER, False):
+        return tool
+
+    tool_name = getattr(tool, "name", type(tool).__name__)
+    bulkhead = _Bulkhead(limit.max_concurrency) if limit.max_concurrency > 0 else None
+    timeout = limit.timeout_seconds if limit.timeout_seconds > 0 else None
+    run_async = tool.run_async
+
+    async def call_with_timeout(*args, **kwargs):
+        try:
+            return await asyncio.wait_for(run_async(*args, **kwargs), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Tool call timed out.",
+                extra={"tool": tool_name, "timeout_seconds": limit.timeout_seconds},
+            )
+            return timeout_result(tool_name, limit)
+
+    @functools.wraps(run_async)
+    async def limited_run_async(*args, **kwargs):
+        if bulkhead is None:
+            return await call_with_timeout(*args, **kwargs)
+
+        semaphore = bulkhead.semaphore()
+        if limit.queue_timeout_seconds > 0:
+            acquired = await _acquire_within(semaphore, limit.queue_timeout_seconds)
+        elif semaphore.locked():
+            acquired = False
+        else:
+            await semaphore.acquire()
+            acquired = True
+        if not acquired:
+            logger.warning(
+                "Tool call rejected: concurrency limit reached.",
+                extra={"tool": tool_name, "max_concurrency": limit.max_concurrency},
+            )
+            return saturated_result(tool_name, limit)
+        try:
+            return await call_with_timeout(*args, **kwargs)
+        finally:
+            semaphore.release()
+
+    tool.run_async = limited_run_async
+    setattr(tool, _LIMITED_MARKER, True)
+    return tool
+
+
+def apply_tool_limits(tools: list, settings) -> list:
+    """Applies the configured limits to every tool instance in the list."""
+    for tool in tools:
+        if callable(getattr(tool, "run_async", None)):
+            apply_tool_limit(
+                tool, resolve_tool_limit(settings, getattr(tool, "name", ""))
+            )
+    return tools
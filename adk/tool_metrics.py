@@ -0,0 +1,80 @@
+import functools
+import logging
+import time
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+TOOL_CALLS = REGISTRY.counter(
+    "gen_bootstrap_tool_calls_total", "Tool invocations by the agent.", ["tool"]
+)
+TOOL_ERRORS = REGISTRY.counter(
+    "gen_bootstrap_tool_errors_total",
+    "Tool invocations that raised or returned an error result.",
+    ["tool", "kind"],
+)
+TOOL_LATENCY = REGISTRY.histogram(
+    "gen_bootstrap_tool_latency_seconds", "Tool execution time in seconds.", ["tool"]
+)
+
+# Set on instrumented tool instances so instrumenting twice is a no-op.
+_INSTRUMENTED_MARKER = "_gen_bootstrap_instrumented"
+
+
+def _is_error_result(result) -> bool:
+    # ADK reports tool-level failures (e.g. missing arguments) as {"error": ...}.
+    return isinstance(result, dict) and "error" in result
+
+
+def instrument_tool(tool):
+    """Records call counts, errors and latency for a tool's `run_async`.
+
+    The tool instance is patched in place, so the object registered on the
+    agent (and compared in tests) is unchanged. Label children are resolved up
+    front so a call costs two clock reads and a few locked additions.
+
+    Built-in tools executed by the model itself (such as `google_search`, which
+    Gemini runs as grounding) are never called locally and record nothing.
+    """
+    if getattr(tool, _INSTRUMENTED_MARKER, False) or not hasattr(tool, "run_async"):
+        return tool
+
+    tool_name = getattr(tool, "name", type(tool).__name__)
+    calls = TOOL_CALLS.labels(tool_name)
+    raised = TOOL_ERRORS.labels(tool_name, "exception")
+    error_results = TOOL_ERRORS.labels(tool_name, "error_result")
+    latency = TOOL_LATENCY.labels(tool_name)
+    run_async = tool.run_async
+
+    @functools.wraps(run_async)
+    async def instrumented_run_async(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = await run_async(*args, **kwargs)
+        except BaseException:
+            raised.inc()
+            raise
+        finally:
+            latency.observe(time.perf_counter() - started)
+            calls.inc()
+        if _is_error_result(result):
+            error_results.inc()
+        return result
+
+    tool.run_async = instrumented_run_async
+    setattr(tool, _INSTRUMENTED_MARKER, True)
+    return tool
+
+
+def instrument_tools(tools: list) -> list:
+    """Instruments every tool instance in the list; plain functions are left as-is."""
+    for tool in tools:
+        if callable(getattr(tool, "run_async", None)):
+            instrument_tool(tool)
+        else:
+            logger.debug(
+                "Tool is not a BaseTool instance; not instrumented.",
+                extra={"tool": getattr(tool, "__name__", repr(tool))},
+            )
+    return tools
@@ -0,0 +1,141 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_TOOL_WORKERS = 4
+
+TOOL_EXECUTOR_QUEUE_DEPTH = REGISTRY.gauge(
+    "gen_bootstrap_tool_executor_queue_depth",
+    "Sync tool calls waiting for a worker thread.",
+    ["tool"],
+)
+TOOL_EXECUTOR_ACTIVE = REGISTRY.gauge(
+    "gen_bootstrap_tool_executor_active",
+    "Sync tool calls currently running on a worker thread.",
+    ["tool"],
+)
+TOOL_EXECUTOR_WAIT = REGISTRY.histogram(
+    "gen_bootstrap_tool_executor_wait_seconds",
+    "Time sync tool calls spent queued before a worker thread picked them up.",
+    ["tool"],
+)
+
+# Set on offloaded tool instances so a tool is offloaded at most once.
+_OFFLOADED_MARKER = "_gen_bootstrap_offloaded"
+
+
+class ToolExecutor:
+    """A bounded thread pool dedicated to one sync tool.
+
+    Each tool gets its own pool, so a slow tool saturates its own workers
+    rather than starving other tools or the event loop.
+    """
+
+    def __init__(self, tool_name: str, max_workers: int = DEFAULT_SYNC_TOOL_WORKERS):
+        self.tool_name = tool_name
+        self.max_workers = max(1, int(max_workers))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=f"tool-{tool_name}"
+        )
+        self._queued = TOOL_EXECUTOR_QUEUE_DEPTH.labels(tool_name)
+        self._active = TOOL_EXECUTOR_ACTIVE.labels(tool_name)
+        self._wait = TOOL_EXECUTOR_WAIT.labels(tool_name)
+
+    async def run(self, func, *args, **kwargs):
+        """Runs `func` on the pool and awaits its result without blocking the loop.
+
+        Context variables (e.g. request-scoped logging fields) are copied into
+        the worker thread. Cancelling the await drops a call that has not
+        started yet; one already running finishes in the background.
+        """
+        context = contextvars.copy_context()
+        lock = threading.Lock()
+        state = {"started": False, "abandoned": False}
+        queued_at = time.perf_counter()
+
+        def call():
+            with lock:
+                if state["abandoned"]:
+                    return None
+                state["started"] = True
+            self._queued.dec()
+            self._wait.observe(time.perf_counter() - queued_at)
+            self._active.inc()
+            try:
+                return context.run(func, *args, **kwargs)
+            finally:
+                self._active.dec()
+
+        self._queued.inc()
+        future = self._executor.submit(call)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            with lock:
+                if not state["started"]:
+                    state["abandoned"] = True
+                    self._queued.dec()
+            raise
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def offload_sync_tool(tool, max_workers: int = DEFAULT_SYNC_TOOL_WORKERS):
+    """Makes a `FunctionTool` wrapping a sync function run on its own thread pool.
+
+    ADK calls sync tool functions directly on the event loop, so a blocking
+    call stalls every session served by the worker. The function is replaced
+    by an async wrapper with the same name, docstring and signature, so the
+    tool's declaration and argument handling are unchanged. Async tools and
+    tools without a Python function (e.g. `google_search`) are returned as-is.
+    The tool is changed in place, so every agent sharing the instance uses
+    the same pool.
+    """
+    func = getattr(tool, "func", None)
+    if (
+        not callable(func)
+        or getattr(tool, _OFFLOADED_MARKER, False)
+        or inspect.iscoroutinefunction(func)
+    ):
+        return tool
+
+    tool_name = getattr(tool, "name", func.__name__)
+    executor = ToolExecutor(tool_name, max_workers)
+
+    @functools.wraps(func)
+    async def offloaded(*args, **kwargs):
+        return await executor.run(func, *args, **kwargs)
+
+    offloaded.executor = executor
+    tool.func = offloaded
+    setattr(tool, _OFFLOADED_MARKER, True)
+    logger.debug(
+        "Sync tool offloaded to a thread pool.",
+        extra={"tool": tool_name, "max_workers": executor.max_workers},
+    )
+    return tool
+
+
+def resolve_sync_tool_workers(settings, tool_name: str) -> int:
+    """Worker count for a tool: SYNC_TOOL_WORKERS[tool_name], else SYNC_TOOL_MAX_WORKERS."""
+    return int(
+        settings.sync_tool_workers.get(tool_name, settings.sync_tool_max_workers)
+    )
+
+
+def offload_sync_tools(tools: list, settings) -> list:
+    """Offloads every sync function tool in the list to a per-tool thread pool."""
+    for tool in tools:
+        name = getattr(tool, "name", "")
+        offload_sync_tool(tool, resolve_sync_tool_workers(settings, name))
+    return tools
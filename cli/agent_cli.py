@@ -0,0 +1,85 @@
+# cli/agent_cli.py
+import time
+from typing import Optional
+
+import typer
+from typing_extensions import Annotated
+
+from config.settings import settings as project_settings
+
+app = typer.Typer(
+    name="agent",
+    help="Build artifacts for the ADK agent.",
+    no_args_is_help=True,
+)
+
+
+@app.command("build")
+def build(
+    output: Annotated[
+        Optional[str],
+        typer.Option(
+            "--output",
+            "-o",
+            help="Artifact path. Defaults to AGENT_DECLARATIONS_PATH or the project "
+            "state directory.",
+        ),
+    ] = None,
+    check: Annotated[
+        bool,
+        typer.Option(
+            "--check",
+            help="Only verify that the existing artifact matches the current sources "
+            "(exit 1 if not).",
+        ),
+    ] = False,
+):
+    """
+    Precomputes the agent's tool function declarations into a versioned artifact.
+
+    Workers load the artifact at startup instead of introspecting every tool
+    function. It is keyed by a hash of the tool sources, the agent configuration
+    and the ADK version, so a stale artifact is ignored rather than served.
+    """
+    # Imported here: building the agent pulls in google-adk and the tool modules.
+    from adk.agent import root_agent
+    from adk.declaration_cache import (
+        artifact_key,
+        build_declaration_artifact,
+        declarations_path,
+        load_declaration_artifact,
+    )
+
+    path = output or declarations_path(project_settings)
+
+    if check:
+        if load_declaration_artifact(path, artifact_key(root_agent)) is None:
+            typer.secho(
+                f"Tool declaration artifact '{path}' is missing or stale. "
+                "Run 'gen-bootstrap agent build'.",
+                fg=typer.colors.RED,
+            )
+            raise typer.Exit(code=1)
+        typer.secho(
+            f"Tool declaration artifact '{path}' is up to date.", fg=typer.colors.GREEN
+        )
+        return
+
+    started = time.perf_counter()
+    try:
+        artifact = build_declaration_artifact(root_agent, path)
+    except OSError as e:
+        typer.secho(
+            f"Error writing tool declaration artifact: {e}", fg=typer.colors.RED
+        )
+        raise typer.Exit(code=1)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    typer.secho(f"Wrote tool declaration artifact to '{path}'.", fg=typer.colors.GREEN)
+    typer.echo(
+        f"  Agent: {artifact['agent']['name']} (model: {artifact['agent']['model']})"
+    )
+    typer.echo(
+        f"  Declarations: {', '.join(sorted(artifact['declarations'])) or 'none'}"
+    )
+    typer.echo(f"  Key: {artifact['key'][:16]}  ({elapsed_ms:.0f} ms)")
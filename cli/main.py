@@ -1,20 +1,30 @@
 import os
 import shutil
 import subprocess
+from typing import Optional
 
 import typer
 from dotenv import load_dotenv
 from typing_extensions import Annotated
 
+from utils.serving import (
+    development_profile,
+    prepare_metrics_directory,
+    production_profile,
+)
+
+from . import agent_cli  # Import the agent build subcommand module
 from . import monitoring_cli  # Import the new monitoring subcommand module
 from . import prompts_cli  # Import the new prompts subcommand module
 from . import secrets_cli  # Import the new secrets subcommand module
+from . import sessions_cli  # Import the session store subcommand module
 from . import tools_cli  # Import the tools subcommand module
 
 app = typer.Typer(name="gen-bootstrap")  # Set CLI name here
 
 # Add new subcommand groups
 app.add_typer(tools_cli.app, name="tools", help="Manage and inspect agent tools.")
+app.add_typer(agent_cli.app, name="agent", help="Build artifacts for the ADK agent.")
 app.add_typer(
     prompts_cli.app,
     name="prompts",
@@ -23,6 +33,9 @@ app.add_typer(
 app.add_typer(
     secrets_cli.app, name="secrets", help="Manage secrets in Google Secret Manager."
 )
+app.add_typer(
+    sessions_cli.app, name="sessions", help="Inspect and benchmark the ADK session store."
+)
 app.add_typer(
     monitoring_cli.app,
     name="monitoring",
@@ -100,9 +113,34 @@ def run(
         str,
         typer.Option(help="Agent module path for ADK UI (e.g. adk.agent:root_agent)."),
     ] = "adk.agent:root_agent",
+    prod: Annotated[
+        bool,
+        typer.Option(
+            "--prod",
+            help="Production serving: no reload, one worker per CPU in the container's "
+            "quota, uvloop/httptools when installed.",
+        ),
+    ] = False,
+    workers: Annotated[
+        Optional[int],
+        typer.Option(help="Worker processes with --prod (default: SERVER_WORKERS, 0 = auto)."),
+    ] = None,
+    keep_alive: Annotated[
+        Optional[int],
+        typer.Option(
+            "--keep-alive",
+            help="Idle keep-alive timeout in seconds with --prod (default: SERVER_KEEP_ALIVE_SECONDS).",
+        ),
+    ] = None,
+    backlog: Annotated[
+        Optional[int],
+        typer.Option(help="Listen socket backlog with --prod (default: SERVER_BACKLOG)."),
+    ] = None,
 ):
     """
     Runs the application: FastAPI server by default, or ADK Web UI with --adk-ui-only.
+
+    The FastAPI server auto-reloads on source changes unless --prod is given.
     """
     if adk_ui_only:
         typer.echo(f"Attempting to run Google ADK Web UI for agent: {agent_path}...")
@@ -128,19 +166,38 @@ def run(
             typer.secho("ERROR: main.py not found.", fg=typer.colors.RED)
             raise typer.Exit(code=1)
 
-        uvicorn_command = [
-            "poetry",
-            "run",
-            "uvicorn",
-            "main:app",
-            "--host",
-            host,
-            "--port",
-            str(port),
-            "--reload",
-            "--reload-dir",
-            ".",
-        ]
+        if prod:
+            profile = production_profile(
+                host=host,
+                port=port,
+                workers=(
+                    workers
+                    if workers is not None
+                    else getattr(project_settings, "server_workers", 0)
+                ),
+                timeout_keep_alive=(
+                    keep_alive
+                    if keep_alive is not None
+                    else getattr(project_settings, "server_keep_alive_seconds", 75)
+                ),
+                backlog=(
+                    backlog
+                    if backlog is not None
+                    else getattr(project_settings, "server_backlog", 2048)
+                ),
+            )
+            typer.echo(
+                f"Production profile: {profile.workers} worker(s), "
+                f"loop={profile.loop}, http={profile.http}."
+            )
+            # Workers merge their /metrics through snapshot files in this directory.
+            metrics_dir = prepare_metrics_directory(profile.workers)
+            if metrics_dir:
+                typer.echo(f"Metrics snapshots: {metrics_dir}")
+        else:
+            profile = development_profile(host=host, port=port)
+
+        uvicorn_command = ["poetry", "run", "uvicorn", "main:app"] + profile.uvicorn_args()
         typer.echo(f"Executing: {' '.join(uvicorn_command)}")
         try:
             process = subprocess.Popen(uvicorn_command)
@@ -175,6 +232,21 @@ def deploy(
             "Deployment will be aborted if tests fail.",
         ),
     ] = False,
+    cpu: Annotated[
+        str,
+        typer.Option(
+            help="CPUs per Cloud Run instance (e.g. 2). The production server "
+            "starts one worker per CPU in this quota."
+        ),
+    ] = "",
+    session_affinity: Annotated[
+        bool,
+        typer.Option(
+            "--session-affinity",
+            help="Route each client back to the same instance so its sessions "
+            "stay in that instance's session cache.",
+        ),
+    ] = False,
 ):
     """Builds and deploys the ADK application (FastAPI server) to Cloud Run."""
     typer.echo("Attempting to deploy application to Cloud Run...")
@@ -274,10 +346,8 @@ def deploy(
 
     procfile_path = "Procfile"
     if not os.path.exists(procfile_path):
-        default_procfile_content = (
-            "web: poetry run uvicorn main:app "
-            "--host 0.0.0.0 --port $PORT --workers 1"
-        )
+        # Same production profile as `gen-bootstrap run --prod` (utils/serving.py).
+        default_procfile_content = "web: poetry run python -m utils.serving"
         typer.secho(f"WARNING: '{procfile_path}' not found.", fg=typer.colors.YELLOW)
         if typer.confirm(
             f"Create default '{procfile_path}' with: '{default_procfile_content}'?"
@@ -311,8 +381,12 @@ def deploy(
         "--allow-unauthenticated",  # Common for testing; review for production
         "--platform",
         "managed",
-        # Consider adding more flags as needed, e.g., --memory, --cpu, --set-env-vars
+        # Consider adding more flags as needed, e.g., --memory, --set-env-vars
     ]
+    if cpu:
+        deploy_command += ["--cpu", cpu]
+    if session_affinity:
+        deploy_command.append("--session-affinity")
     typer.echo(f"Executing: {' '.join(deploy_command)}")
     try:
         result = subprocess.run(
@@ -1,198 +1,892 @@
 # cli/prompts_cli.py
+import json
+import os  # Re-add os import
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+
 import typer
-import os # Re-add os import
-from google.cloud import aiplatform # For aiplatform.init
+from google.cloud import aiplatform  # For aiplatform.init
 from vertexai.preview import prompts
-from vertexai.preview.prompts import Prompt as LocalPrompt # Moved to top level
+from vertexai.preview.prompts import Prompt as LocalPrompt  # Moved to top level
+
+from utils.prompt_renderer import CompiledPrompt, PromptRenderError
+from utils.prompt_store import (
+    PROMPT_CONTENT_FIELDS,
+    PromptMirror,
+    content_hash,
+    version_sort_key,
+)
+from utils.token_utils import DEFAULT_ENCODING
 
 app = typer.Typer(
     name="prompts",
     help="Manage Vertex AI Prompts using vertexai.preview.prompts.",
-    no_args_is_help=True
+    no_args_is_help=True,
 )
 
 # Default location, can be overridden by option
 DEFAULT_LOCATION = "us-central1"
 
-def _initialize_vertexai(project_id: str | None, location: str | None):
-    """Initializes Vertex AI with project and location, loading from config if necessary."""
+# Local mirror of the Prompt Registry, populated by `prompts sync`
+try:
+    from config.settings import settings as _state_settings
+
+    PROMPT_MIRROR_PATH = _state_settings.state_path("prompt_mirror.db")
+except ImportError:
+    PROMPT_MIRROR_PATH = os.path.join(".gen_bootstrap", "prompt_mirror.db")
+
+
+def _resolve_project_id(project_id: str | None) -> str:
+    """Returns the effective project ID (option or config); exits if it is not set."""
     final_project_id = project_id
-    final_location = location or DEFAULT_LOCATION
 
     if not final_project_id:
         try:
             from config.settings import settings as project_settings
+
             final_project_id = project_settings.gcp_project_id
         except ImportError:
-            typer.secho("Project ID not provided and could not load from config.", fg=typer.colors.RED)
+            typer.secho(
+                "Project ID not provided and could not load from config.",
+                fg=typer.colors.RED,
+            )
             raise typer.Exit(code=1)
-    
+
     if not final_project_id or final_project_id == "your-gcp-project-id":
         typer.secho(
-            "Project ID is not configured. Please provide via --project-id or set in .env/config.",
-            fg=typer.colors.RED
+            "Project ID is not configured. "
+            "Please provide via --project-id or set in .env/config.",
+            fg=typer.colors.RED,
         )
         raise typer.Exit(code=1)
-    
+    return final_project_id
+
+
+def _initialize_vertexai(project_id: str | None, location: str | None):
+    """Initializes Vertex AI with project and location, loading from config if necessary."""
+    final_project_id = _resolve_project_id(project_id)
+    final_location = location or DEFAULT_LOCATION
+
     try:
         aiplatform.init(project=final_project_id, location=final_location)
-        typer.echo(f"Initialized Vertex AI for project: {final_project_id}, location: {final_location}")
+        typer.echo(
+            f"Initialized Vertex AI for project: {final_project_id}, "
+            f"location: {final_location}"
+        )
         return final_project_id, final_location
     except Exception as e:
         typer.secho(f"Error initializing Vertex AI: {e}", fg=typer.colors.RED)
         raise typer.Exit(code=1)
 
+
+def _open_mirror(create: bool = False) -> PromptMirror | None:
+    """Opens the local prompt mirror; returns None if it has never been synced."""
+    if not create and not os.path.exists(PROMPT_MIRROR_PATH):
+        return None
+    return PromptMirror(PROMPT_MIRROR_PATH)
+
+
+def _echo_mirror_note(synced_at: float | None):
+    synced = (
+        datetime.fromtimestamp(synced_at).isoformat(timespec="seconds")
+        if synced_at
+        else "unknown"
+    )
+    typer.secho(
+        f"(Served from local mirror synced at {synced}; use --live to query Vertex AI.)",
+        fg=typer.colors.BRIGHT_BLACK,
+    )
+
+
+def _prompt_id_of(prompt_obj) -> str:
+    """Listing results expose 'prompt_id' (metadata) or 'id' (Prompt objects)."""
+    return str(getattr(prompt_obj, "prompt_id", None) or prompt_obj.id)
+
+
+def _fetch_prompt_fields(prompt_id: str, version_id: str) -> dict:
+    fetched = prompts.get(prompt_id=prompt_id, version_id=version_id)
+    return {name: getattr(fetched, name, None) for name in PROMPT_CONTENT_FIELDS}
+
+
 @app.command("list")
 def list_prompts_from_vertex(
-    project_id: str = typer.Option(None, "--project-id", "-p", help="GCP Project ID. If not provided, uses configured default."),
-    location: str = typer.Option(DEFAULT_LOCATION, "--location", "-l", help="GCP Location/Region for Vertex AI.")
+    project_id: str = typer.Option(
+        None,
+        "--project-id",
+        "-p",
+        help="GCP Project ID. If not provided, uses configured default.",
+    ),
+    location: str = typer.Option(
+        DEFAULT_LOCATION, "--location", "-l", help="GCP Location/Region for Vertex AI."
+    ),
+    live: bool = typer.Option(
+        False, "--live", help="Query Vertex AI directly instead of the local mirror."
+    ),
 ):
-    """Lists available Prompts in Vertex AI Prompt Registry."""
-    effective_project_id, effective_location = _initialize_vertexai(project_id, location)
+    """Lists available Prompts, from the local mirror if synced, else from Vertex AI."""
+    if not live:
+        mirror_project_id = _resolve_project_id(project_id)
+        mirror = _open_mirror()
+        if mirror:
+            with mirror:
+                if mirror.has_data(mirror_project_id, location):
+                    _echo_mirror_note(
+                        mirror.last_synced_at(mirror_project_id, location)
+                    )
+                    _echo_prompt_list(
+                        mirror.list_prompts(mirror_project_id, location),
+                        mirror_project_id,
+                        location,
+                    )
+                    return
+
+    effective_project_id, effective_location = _initialize_vertexai(
+        project_id, location
+    )
 
     try:
-        retrieved_prompts = prompts.list() # Uses the initialized project/location
-        
-        if not retrieved_prompts:
-            typer.echo(f"No prompts found in project {effective_project_id} (location: {effective_location}).")
-        else:
-            typer.echo(typer.style(f"Prompts in project {effective_project_id} (location: {effective_location}):", bold=True))
-            # The 'prompts.list()' returns a list of 'Prompt' objects from vertexai.preview.prompts
-            # Each object should have attributes like 'prompt_name', 'id', 'version_id', etc.
-            for p in sorted(retrieved_prompts, key=lambda x: x.prompt_name if hasattr(x, 'prompt_name') else str(x.id)):
-                name_to_display = p.prompt_name if hasattr(p, 'prompt_name') and p.prompt_name else f"ID: {p.id}"
-                version_info = f"(Version: {p.version_id})" if hasattr(p, 'version_id') and p.version_id else ""
-                typer.echo(f"- {name_to_display} {version_info}")
+        retrieved_prompts = prompts.list()  # Uses the initialized project/location
+        _echo_prompt_list(retrieved_prompts, effective_project_id, effective_location)
     except Exception as e:
         typer.secho(f"Error listing prompts from Vertex AI: {e}", fg=typer.colors.RED)
         raise typer.Exit(code=1)
 
+
 @app.command("get")
 def get_prompt_from_vertex(
-    prompt_id: str = typer.Argument(..., help="The ID of the Prompt to retrieve from Vertex AI."),
-    version_id: str = typer.Option(None, "--version", "-v", help="Specific version ID of the prompt. If None, retrieves the default version."),
-    project_id: str = typer.Option(None, "--project-id", "-p", help="GCP Project ID. If not provided, uses configured default."),
-    location: str = typer.Option(DEFAULT_LOCATION, "--location", "-l", help="GCP Location/Region for Vertex AI.")
+    prompt_id: str = typer.Argument(
+        ..., help="The ID of the Prompt to retrieve from Vertex AI."
+    ),
+    version_id: str = typer.Option(
+        None,
+        "--version",
+        "-v",
+        help="Specific version ID of the prompt. If None, retrieves the default version.",
+    ),
+    project_id: str = typer.Option(
+        None,
+        "--project-id",
+        "-p",
+        help="GCP Project ID. If not provided, uses configured default.",
+    ),
+    location: str = typer.Option(
+        DEFAULT_LOCATION, "--location", "-l", help="GCP Location/Region for Vertex AI."
+    ),
+    live: bool = typer.Option(
+        False, "--live", help="Query Vertex AI directly instead of the local mirror."
+    ),
 ):
-    """Displays the details of a specific Prompt from Vertex AI Prompt Registry."""
-    effective_project_id, effective_location = _initialize_vertexai(project_id, location)
-    
+    """Displays the details of a specific Prompt.
+
+    Served from the local mirror once it is synced, else from Vertex AI.
+    """
+    if not live:
+        mirror_project_id = _resolve_project_id(project_id)
+        mirror = _open_mirror()
+        if mirror:
+            with mirror:
+                mirrored_prompt = mirror.get(
+                    mirror_project_id, location, prompt_id, version_id
+                )
+            if mirrored_prompt is not None:
+                _echo_mirror_note(mirrored_prompt.synced_at)
+                _echo_prompt_details(mirrored_prompt)
+                return
+
+    effective_project_id, effective_location = _initialize_vertexai(
+        project_id, location
+    )
+
     try:
-        # The prompts.get() function takes prompt_id (which is the resource name or numeric ID)
-        # and optionally version_id.
+        # The prompts.get() function takes prompt_id (which is the resource name or
+        # numeric ID) and optionally version_id.
         # Example from notebook: prompts.get("8464170802747539456")
         # Example with version: prompts.get(prompt_id=..., version_id=...)
-        
-        retrieved_prompt = prompts.get(prompt_id=prompt_id, version_id=version_id) # Uses initialized project/location
-        
-        if not retrieved_prompt: # Should raise an error if not found, but good to check
-            typer.secho(f"Error: Prompt ID '{prompt_id}' not found.", fg=typer.colors.RED)
+
+        # Uses initialized project/location
+        retrieved_prompt = prompts.get(prompt_id=prompt_id, version_id=version_id)
+
+        # Should raise an error if not found, but good to check
+        if not retrieved_prompt:
+            typer.secho(
+                f"Error: Prompt ID '{prompt_id}' not found.", fg=typer.colors.RED
+            )
             raise typer.Exit(code=1)
 
-        typer.echo(typer.style(f"Prompt Details (ID: {retrieved_prompt.id}):", bold=True))
-        if hasattr(retrieved_prompt, 'prompt_name') and retrieved_prompt.prompt_name:
-            typer.echo(f"  Name: {retrieved_prompt.prompt_name}")
-        if hasattr(retrieved_prompt, 'version_id') and retrieved_prompt.version_id:
-            typer.echo(f"  Version ID: {retrieved_prompt.version_id}")
-        
-        # Displaying the prompt data (template)
-        if hasattr(retrieved_prompt, 'prompt_data') and retrieved_prompt.prompt_data:
-            typer.echo(typer.style("  Prompt Template:", bold=True))
-            typer.echo(retrieved_prompt.prompt_data)
-        
-        # Displaying system instruction
-        if hasattr(retrieved_prompt, 'system_instruction') and retrieved_prompt.system_instruction:
-            typer.echo(typer.style("  System Instruction:", bold=True))
-            typer.echo(retrieved_prompt.system_instruction)
-            
-        # Displaying variables
-        if hasattr(retrieved_prompt, 'variables') and retrieved_prompt.variables:
-            typer.echo(typer.style("  Variables:", bold=True))
-            for var_info in retrieved_prompt.variables:
-                 # var_info is typically a dict like {"artist": "acdc"} or just a string key
-                if isinstance(var_info, dict):
-                    for k, v_example in var_info.items():
-                        typer.echo(f"    - {k} (Example: {v_example})")
-                else: # Assuming it's just a string key
-                    typer.echo(f"    - {var_info}")
-        
-        # Displaying model name
-        if hasattr(retrieved_prompt, 'model_name') and retrieved_prompt.model_name:
-            typer.echo(f"  Model: {retrieved_prompt.model_name}")
-
-    except Exception as e: # Catching google.api_core.exceptions.NotFound or similar
+        _echo_prompt_details(retrieved_prompt)
+
+    except typer.Exit:
+        raise
+    except Exception as e:  # Catching google.api_core.exceptions.NotFound or similar
         typer.secho(f"Error retrieving prompt '{prompt_id}': {e}", fg=typer.colors.RED)
         raise typer.Exit(code=1)
 
+
+def _echo_prompt_list(prompt_list, project_id: str, location: str):
+    """Prints a prompt listing; accepts SDK Prompt objects or mirrored prompts."""
+    if not prompt_list:
+        typer.echo(f"No prompts found in project {project_id} (location: {location}).")
+        return
+    typer.echo(
+        typer.style(
+            f"Prompts in project {project_id} (location: {location}):", bold=True
+        )
+    )
+
+    # Prompt objects expose 'prompt_name'/'id';
+    # listing metadata exposes 'display_name'/'prompt_id'.
+    def display_name(p):
+        return getattr(p, "prompt_name", None) or getattr(p, "display_name", None)
+
+    for p in sorted(prompt_list, key=lambda x: display_name(x) or _prompt_id_of(x)):
+        name_to_display = display_name(p) or f"ID: {_prompt_id_of(p)}"
+        version_info = (
+            f"(Version: {p.version_id})" if getattr(p, "version_id", None) else ""
+        )
+        typer.echo(f"- {name_to_display} {version_info}")
+
+
+def _echo_prompt_details(retrieved_prompt):
+    """Prints prompt details; accepts an SDK Prompt object or a mirrored prompt."""
+    typer.echo(typer.style(f"Prompt Details (ID: {retrieved_prompt.id}):", bold=True))
+    if hasattr(retrieved_prompt, "prompt_name") and retrieved_prompt.prompt_name:
+        typer.echo(f"  Name: {retrieved_prompt.prompt_name}")
+    if hasattr(retrieved_prompt, "version_id") and retrieved_prompt.version_id:
+        typer.echo(f"  Version ID: {retrieved_prompt.version_id}")
+
+    # Displaying the prompt data (template)
+    if hasattr(retrieved_prompt, "prompt_data") and retrieved_prompt.prompt_data:
+        typer.echo(typer.style("  Prompt Template:", bold=True))
+        typer.echo(retrieved_prompt.prompt_data)
+
+    # Displaying system instruction
+    if (
+        hasattr(retrieved_prompt, "system_instruction")
+        and retrieved_prompt.system_instruction
+    ):
+        typer.echo(typer.style("  System Instruction:", bold=True))
+        typer.echo(retrieved_prompt.system_instruction)
+
+    # Displaying variables
+    if hasattr(retrieved_prompt, "variables") and retrieved_prompt.variables:
+        typer.echo(typer.style("  Variables:", bold=True))
+        for var_info in retrieved_prompt.variables:
+            # var_info is typically a dict like {"artist": "acdc"} or just a string key
+            if isinstance(var_info, dict):
+                for k, v_example in var_info.items():
+                    typer.echo(f"    - {k} (Example: {v_example})")
+            else:  # Assuming it's just a string key
+                typer.echo(f"    - {var_info}")
+
+    # Displaying model name
+    if hasattr(retrieved_prompt, "model_name") and retrieved_prompt.model_name:
+        typer.echo(f"  Model: {retrieved_prompt.model_name}")
+
+
+@app.command("sync")
+def sync_prompts_to_mirror(
+    project_id: str = typer.Option(
+        None,
+        "--project-id",
+        "-p",
+        help="GCP Project ID. If not provided, uses configured default.",
+    ),
+    location: str = typer.Option(
+        DEFAULT_LOCATION, "--location", "-l", help="GCP Location/Region for Vertex AI."
+    ),
+    all_versions: bool = typer.Option(
+        False,
+        "--all-versions",
+        help="Mirror every version, not just the latest of each prompt.",
+    ),
+    concurrency: int = typer.Option(
+        4, "--concurrency", "-c", min=1, help="Number of concurrent Vertex AI requests."
+    ),
+):
+    """
+    Mirrors the Vertex AI Prompt Registry into a local indexed store.
+    Sync is incremental: versions are immutable, so only versions missing
+    locally are fetched.
+    """
+    effective_project_id, effective_location = _initialize_vertexai(
+        project_id, location
+    )
+    started = time.perf_counter()
+
+    try:
+        listed_prompts = prompts.list()
+    except Exception as e:
+        typer.secho(f"Error listing prompts from Vertex AI: {e}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    heads = {
+        _prompt_id_of(p): getattr(p, "display_name", None)
+        or getattr(p, "prompt_name", None)
+        for p in listed_prompts
+    }
+
+    def list_version_ids(prompt_id):
+        return prompt_id, [str(v.version_id) for v in prompts.list_versions(prompt_id)]
+
+    fetched, unchanged, failed = 0, 0, 0
+    with _open_mirror(create=True) as mirror, ThreadPoolExecutor(
+        max_workers=concurrency
+    ) as pool:
+        try:
+            version_ids_by_prompt = dict(pool.map(list_version_ids, heads))
+        except Exception as e:
+            typer.secho(
+                f"Error listing prompt versions from Vertex AI: {e}",
+                fg=typer.colors.RED,
+            )
+            raise typer.Exit(code=1)
+
+        to_fetch = []
+        for prompt_id, version_ids in version_ids_by_prompt.items():
+            wanted = (
+                version_ids
+                if all_versions
+                else sorted(version_ids, key=version_sort_key)[-1:]
+            )
+            known = mirror.known_versions(
+                effective_project_id, effective_location, prompt_id
+            )
+            unchanged += sum(1 for v in wanted if v in known)
+            to_fetch.extend((prompt_id, v) for v in wanted if v not in known)
+
+        futures = {key: pool.submit(_fetch_prompt_fields, *key) for key in to_fetch}
+        for (prompt_id, version_id), future in futures.items():
+            try:
+                fields = future.result()
+            except Exception as e:
+                failed += 1
+                typer.secho(
+                    f"Warning: Could not fetch prompt '{prompt_id}' "
+                    f"version {version_id}: {e}",
+                    fg=typer.colors.YELLOW,
+                    err=True,
+                )
+                continue
+            mirror.upsert_version(
+                effective_project_id, effective_location, prompt_id, version_id, fields
+            )
+            fetched += 1
+
+        for prompt_id, prompt_name in heads.items():
+            known = mirror.known_versions(
+                effective_project_id, effective_location, prompt_id
+            )
+            if known:
+                latest = max(known, key=version_sort_key)
+                mirror.set_prompt_head(
+                    effective_project_id,
+                    effective_location,
+                    prompt_id,
+                    prompt_name,
+                    latest,
+                )
+        removed = mirror.remove_missing(
+            effective_project_id, effective_location, set(heads)
+        )
+        if not failed:
+            # list/get serve the mirror only after a sync that saw every prompt.
+            mirror.mark_synced(effective_project_id, effective_location)
+
+    elapsed = time.perf_counter() - started
+    typer.secho(
+        f"Synced {len(heads)} prompt(s) to {PROMPT_MIRROR_PATH} in {elapsed:.2f}s: "
+        f"{fetched} version(s) fetched, {unchanged} unchanged, {removed} removed, "
+        f"{failed} failed.",
+        fg=typer.colors.GREEN if not failed else typer.colors.YELLOW,
+    )
+    if failed:
+        raise typer.Exit(code=1)
+
+
+class PromptDefinitionError(ValueError):
+    """Raised when a prompt definition file is missing, unparsable or incomplete."""
+
+
+# system_instruction and variables are optional
+REQUIRED_PROMPT_FIELDS = ["prompt_name", "prompt_data", "model_name"]
+
+
+def _load_prompt_definition(file: str) -> dict:
+    """Parses and validates a prompt definition YAML file."""
+    if not os.path.exists(file) or not os.path.isfile(file):
+        raise PromptDefinitionError(
+            f"Error: Prompt definition file '{file}' not found."
+        )
+
+    import yaml  # PyYAML
+
+    try:
+        with open(file, "r", encoding="utf-8") as f:
+            prompt_def_data = yaml.safe_load(f)
+    except yaml.YAMLError as e:
+        raise PromptDefinitionError(f"Error parsing YAML from file '{file}': {e}")
+
+    if not isinstance(prompt_def_data, dict):
+        raise PromptDefinitionError(
+            f"Error: Invalid format in '{file}'. Expected a YAML dictionary."
+        )
+
+    # Validate required fields (based on notebook example)
+    for field in REQUIRED_PROMPT_FIELDS:
+        if field not in prompt_def_data:
+            raise PromptDefinitionError(
+                f"Error: Missing required field '{field}' "
+                f"in prompt definition file '{file}'."
+            )
+    return prompt_def_data
+
+
+def _to_local_prompt(prompt_def_data: dict) -> LocalPrompt:
+    # The LocalPrompt constructor takes keyword arguments matching its attributes
+    return LocalPrompt(
+        prompt_name=prompt_def_data.get("prompt_name"),
+        prompt_data=prompt_def_data.get("prompt_data"),
+        model_name=prompt_def_data.get("model_name"),
+        system_instruction=prompt_def_data.get("system_instruction"),  # Optional
+        variables=prompt_def_data.get("variables"),  # Optional
+    )
+
+
 @app.command("create")
 def create_prompt_in_vertex(
-    file: str = typer.Option(..., "--file", "-f", help="Path to the local prompt definition YAML file."),
-    project_id: str = typer.Option(None, "--project-id", "-p", help="GCP Project ID. If not provided, uses configured default."),
-    location: str = typer.Option(DEFAULT_LOCATION, "--location", "-l", help="GCP Location/Region for Vertex AI.")
+    file: str = typer.Option(
+        None,
+        "--file",
+        "-f",
+        help=(
+            "Path to the local prompt definition YAML file. "
+            "Mutually exclusive with --dir."
+        ),
+    ),
+    directory: str = typer.Option(
+        None,
+        "--dir",
+        "-d",
+        help=(
+            "Directory of prompt definition YAML files to publish. "
+            "Mutually exclusive with --file."
+        ),
+    ),
+    project_id: str = typer.Option(
+        None,
+        "--project-id",
+        "-p",
+        help="GCP Project ID. If not provided, uses configured default.",
+    ),
+    location: str = typer.Option(
+        DEFAULT_LOCATION, "--location", "-l", help="GCP Location/Region for Vertex AI."
+    ),
+    concurrency: int = typer.Option(
+        4,
+        "--concurrency",
+        "-c",
+        min=1,
+        help="With --dir: number of concurrent create requests.",
+    ),
+    rate: float = typer.Option(
+        2.0,
+        "--rate",
+        min=0.0,
+        help="With --dir: maximum create requests per second (0 for no cap).",
+    ),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        help="With --dir: create new versions even for unchanged prompts.",
+    ),
 ):
     """
     Creates a new Prompt in Vertex AI Prompt Registry from a local YAML definition file.
     If a prompt with the same 'prompt_name' exists, this will create a new version.
+    With --dir, publishes every changed definition in a directory concurrently.
     """
-    if not os.path.exists(file) or not os.path.isfile(file):
-        typer.secho(f"Error: Prompt definition file '{file}' not found.", fg=typer.colors.RED)
+    if file and directory:
+        typer.secho(
+            "Error: --file and --dir are mutually exclusive.", fg=typer.colors.RED
+        )
         raise typer.Exit(code=1)
+    if not file and not directory:
+        typer.secho(
+            "Error: Either --file or --dir must be provided.", fg=typer.colors.RED
+        )
+        raise typer.Exit(code=1)
+    if directory:
+        _create_prompts_from_dir(
+            directory, project_id, location, concurrency, rate, force
+        )
+        return
 
     try:
-        import yaml # PyYAML
-        # LocalPrompt is now imported at module level
-
-        with open(file, "r", encoding="utf-8") as f:
-            prompt_def_data = yaml.safe_load(f)
-
-        if not isinstance(prompt_def_data, dict):
-            typer.secho(f"Error: Invalid format in '{file}'. Expected a YAML dictionary.", fg=typer.colors.RED)
-            raise typer.Exit(code=1)
+        prompt_def_data = _load_prompt_definition(file)
 
-        # Validate required fields (based on notebook example)
-        required_fields = ["prompt_name", "prompt_data", "model_name"] # system_instruction and variables are optional
-        for field in required_fields:
-            if field not in prompt_def_data:
-                typer.secho(f"Error: Missing required field '{field}' in prompt definition file '{file}'.", fg=typer.colors.RED)
-                raise typer.Exit(code=1)
-        
-        # Construct the local Prompt object
-        # The LocalPrompt constructor takes keyword arguments matching its attributes
-        
         # Initialize Vertex AI only after file parsing and validation are successful
-        effective_project_id, effective_location = _initialize_vertexai(project_id, location)
+        effective_project_id, effective_location = _initialize_vertexai(
+            project_id, location
+        )
+
+        local_prompt = _to_local_prompt(prompt_def_data)
 
-        local_prompt = LocalPrompt(
-            prompt_name=prompt_def_data.get("prompt_name"),
-            prompt_data=prompt_def_data.get("prompt_data"),
-            model_name=prompt_def_data.get("model_name"),
-            system_instruction=prompt_def_data.get("system_instruction"), # Optional
-            variables=prompt_def_data.get("variables") # Optional
+        typer.echo(
+            f"Attempting to create/update prompt '{local_prompt.prompt_name}' "
+            "in Vertex AI..."
         )
-        
-        typer.echo(f"Attempting to create/update prompt '{local_prompt.prompt_name}' in Vertex AI...")
-        saved_prompt = prompts.create_version(prompt=local_prompt) # Uses initialized project/location
+        # Uses initialized project/location
+        saved_prompt = prompts.create_version(prompt=local_prompt)
 
         typer.secho(
             f"Successfully created/updated prompt: {saved_prompt.prompt_name} "
             f"(ID: {saved_prompt.id}, Version: {saved_prompt.version_id})",
-            fg=typer.colors.GREEN
+            fg=typer.colors.GREEN,
         )
 
-    except yaml.YAMLError as e:
-        typer.secho(f"Error parsing YAML from file '{file}': {e}", fg=typer.colors.RED)
+    except PromptDefinitionError as e:
+        typer.secho(str(e), fg=typer.colors.RED)
         raise typer.Exit(code=1)
     # Let typer.Exit from validation propagate without being caught by the generic Exception
     except typer.Exit:
         raise
-    except ImportError: # Should not happen if PyYAML is installed
-        typer.secho("Error: PyYAML library is not installed. Please install it.", fg=typer.colors.RED)
+    except ImportError:  # Should not happen if PyYAML is installed
+        typer.secho(
+            "Error: PyYAML library is not installed. Please install it.",
+            fg=typer.colors.RED,
+        )
         raise typer.Exit(code=1)
-    except Exception as e: # Catch other potential errors, e.g., from prompts.create_version()
+    except (
+        Exception
+    ) as e:  # Catch other potential errors, e.g., from prompts.create_version()
         typer.secho(f"Error creating prompt in Vertex AI: {e}", fg=typer.colors.RED)
         raise typer.Exit(code=1)
 
-# Placeholder for update command (which might be similar to create if create_version handles updates)
+
+@dataclass
+class _PublishJob:
+    """One prompt definition file moving through parse -> hash -> create."""
+
+    path: str
+    data: dict | None = None
+    content_hash: str | None = None
+    status: str = "pending"  # created | skipped | failed
+    detail: str = ""
+    parse_seconds: float = 0.0
+    create_seconds: float = 0.0
+    saved_prompt: object = None
+
+
+def _parse_definition_job(path: str) -> _PublishJob:
+    """Parses, validates and hashes one definition file."""
+    started = time.perf_counter()
+    job = _PublishJob(path=path)
+    try:
+        job.data = _load_prompt_definition(path)
+        job.content_hash = content_hash(job.data)
+    except PromptDefinitionError as e:
+        job.status, job.detail = "failed", str(e)
+    except Exception as e:
+        job.status, job.detail = "failed", f"Error reading '{path}': {e}"
+    job.parse_seconds = time.perf_counter() - started
+    return job
+
+
+class _RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across threads (rate <= 0 disables)."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _find_prompt_definitions(directory: str) -> list[str]:
+    paths = []
+    for root, _dirs, files in os.walk(directory):
+        paths.extend(
+            os.path.join(root, name)
+            for name in files
+            if name.endswith((".yaml", ".yml"))
+        )
+    return sorted(paths)
+
+
+def _create_prompts_from_dir(
+    directory: str,
+    project_id: str | None,
+    location: str,
+    concurrency: int,
+    rate: float,
+    force: bool,
+):
+    """Publishes all changed prompt definitions in a directory and prints a report."""
+    if not os.path.isdir(directory):
+        typer.secho(
+            f"Error: Prompt definition directory '{directory}' not found.",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(code=1)
+    paths = _find_prompt_definitions(directory)
+    if not paths:
+        typer.secho(
+            f"Error: No prompt definition files (*.yaml, *.yml) found in '{directory}'.",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(code=1)
+
+    started = time.perf_counter()
+    # Parsing is fast next to the create_version round trips, so it runs serially;
+    # worker processes would each re-import vertexai before parsing anything.
+    jobs = [_parse_definition_job(path) for path in paths]
+    parse_elapsed = time.perf_counter() - started
+
+    first_path_by_name = {}
+    for job in jobs:
+        if job.status == "failed":
+            continue
+        name = job.data["prompt_name"]
+        if name in first_path_by_name:
+            job.status = "failed"
+            job.detail = (
+                f"Duplicate prompt_name '{name}' "
+                f"(also defined in '{first_path_by_name[name]}')."
+            )
+        else:
+            first_path_by_name[name] = job.path
+
+    effective_project_id = _resolve_project_id(project_id)
+    # The skip check trusts the local mirror: it knows what `prompts sync` last saw
+    # and what this command published since. Versions created elsewhere are not
+    # seen until the next sync, so such a prompt may be skipped (or republished).
+    # Publishing does not mark the mirror synced, so list/get keep going to
+    # Vertex AI until `prompts sync` has mirrored every prompt.
+    with _open_mirror(create=True) as mirror:
+        for job in jobs:
+            if job.status != "failed" and not force:
+                published = mirror.get(
+                    effective_project_id, location, job.data["prompt_name"]
+                )
+                if published is not None and published.content_hash == job.content_hash:
+                    job.status, job.detail = (
+                        "skipped",
+                        f"unchanged since version {published.version_id}",
+                    )
+        pending = [job for job in jobs if job.status == "pending"]
+
+        if pending:
+            _initialize_vertexai(effective_project_id, location)
+            limiter = _RateLimiter(rate)
+
+            def publish(job: _PublishJob) -> _PublishJob:
+                limiter.wait()
+                call_started = time.perf_counter()
+                try:
+                    saved_prompt = prompts.create_version(
+                        prompt=_to_local_prompt(job.data)
+                    )
+                    job.status = "created"
+                    job.detail = (
+                        f"ID: {_prompt_id_of(saved_prompt)}, "
+                        f"Version: {saved_prompt.version_id}"
+                    )
+                    job.saved_prompt = saved_prompt
+                except Exception as e:
+                    job.status, job.detail = (
+                        "failed",
+                        f"Error creating prompt in Vertex AI: {e}",
+                    )
+                job.create_seconds = time.perf_counter() - call_started
+                return job
+
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(pool.map(publish, pending))
+
+            # Record what was published so unchanged prompts are skipped next time.
+            for job in pending:
+                if job.status == "created":
+                    saved_id, saved_version = _prompt_id_of(job.saved_prompt), str(
+                        job.saved_prompt.version_id
+                    )
+                    mirror.upsert_version(
+                        effective_project_id,
+                        location,
+                        saved_id,
+                        saved_version,
+                        job.data,
+                    )
+                    mirror.set_prompt_head(
+                        effective_project_id,
+                        location,
+                        saved_id,
+                        job.data["prompt_name"],
+                        saved_version,
+                    )
+
+    _echo_publish_report(jobs, parse_elapsed, time.perf_counter() - started)
+    if any(job.status == "failed" for job in jobs):
+        raise typer.Exit(code=1)
+
+
+def _echo_publish_report(
+    jobs: list[_PublishJob], parse_elapsed: float, total_elapsed: float
+):
+    colors = {
+        "created": typer.colors.GREEN,
+        "skipped": typer.colors.BLUE,
+        "failed": typer.colors.RED,
+    }
+    for status, title in (
+        ("created", "Created"),
+        ("skipped", "Skipped"),
+        ("failed", "Failed"),
+    ):
+        matching = [job for job in jobs if job.status == status]
+        if not matching:
+            continue
+        typer.echo(
+            typer.style(f"{title} ({len(matching)}):", bold=True, fg=colors[status])
+        )
+        for job in matching:
+            name = job.data["prompt_name"] if job.data else os.path.basename(job.path)
+            timing = f"parse {job.parse_seconds * 1000:.1f}ms"
+            if job.create_seconds:
+                timing += f", create {job.create_seconds:.2f}s"
+            typer.echo(f"  - {name} [{job.path}] ({timing}): {job.detail}")
+
+    counts = {
+        status: sum(1 for job in jobs if job.status == status) for status in colors
+    }
+    typer.echo(
+        f"Summary: {counts['created']} created, {counts['skipped']} skipped, "
+        f"{counts['failed']} failed "
+        f"in {total_elapsed:.2f}s (parsing {parse_elapsed:.2f}s)."
+    )
+
+
+@app.command("render")
+def render_prompt_locally(
+    file: str = typer.Option(
+        ..., "--file", "-f", help="Path to the local prompt definition YAML file."
+    ),
+    batch: str = typer.Option(
+        None,
+        "--batch",
+        "-b",
+        help="JSONL file with one object of template variables per line.",
+    ),
+    var: list[str] = typer.Option(
+        None, "--var", help="Variable as name=value for a single render (repeatable)."
+    ),
+    output: str = typer.Option(
+        None, "--output", "-o", help="Write rendered JSONL here instead of stdout."
+    ),
+    count_tokens: bool = typer.Option(
+        True,
+        "--tokens/--no-tokens",
+        help="Attach token counts to each rendered prompt.",
+    ),
+    encoding: str = typer.Option(
+        DEFAULT_ENCODING, "--encoding", help="Tokenizer encoding used for token counts."
+    ),
+):
+    """
+    Renders a prompt definition locally, without any Vertex AI calls.
+    The template is compiled once and rendered for every variable set in --batch.
+    """
+    try:
+        compiled = CompiledPrompt.from_definition(_load_prompt_definition(file))
+    except (PromptDefinitionError, PromptRenderError) as e:
+        typer.secho(str(e), fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    if batch:
+        if not os.path.isfile(batch):
+            typer.secho(f"Error: Batch file '{batch}' not found.", fg=typer.colors.RED)
+            raise typer.Exit(code=1)
+        variable_sets, line_errors = _read_variable_sets(batch)
+    else:
+        variable_sets, line_errors = [
+            dict(item.split("=", 1) for item in var or [] if "=" in item)
+        ], {}
+
+    started = time.perf_counter()
+    results = compiled.render_batch(
+        variable_sets, count_tokens=count_tokens, encoding=encoding
+    )
+    elapsed = time.perf_counter() - started
+
+    records, result_iter = [], iter(results)
+    for index in range(len(variable_sets) + len(line_errors)):
+        if index in line_errors:
+            records.append({"index": index, "error": line_errors[index]})
+            continue
+        result = next(result_iter)
+        if isinstance(result, PromptRenderError):
+            records.append({"index": index, "error": str(result)})
+        else:
+            records.append(
+                {
+                    "index": index,
+                    "system_instruction": result.system_instruction,
+                    "text": result.text,
+                    "token_count": result.token_count,
+                }
+            )
+
+    lines = "".join(json.dumps(record) + "\n" for record in records)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(lines)
+    else:
+        typer.echo(lines, nl=False)
+
+    failed = sum(1 for record in records if "error" in record)
+    rendered = len(records) - failed
+    per_second = rendered / elapsed if elapsed > 0 else float("inf")
+    typer.secho(
+        f"Rendered {rendered} prompt(s), {failed} failed, "
+        f"in {elapsed:.3f}s ({per_second:,.0f}/s)"
+        + (f" -> {output}" if output else ""),
+        fg=typer.colors.GREEN if not failed else typer.colors.YELLOW,
+        err=True,
+    )
+    if failed:
+        raise typer.Exit(code=1)
+
+
+def _read_variable_sets(path: str) -> tuple[list[dict], dict[int, str]]:
+    """Reads a JSONL batch; returns valid variable sets plus errors keyed by line index."""
+    variable_sets, errors = [], {}
+    with open(path, "r", encoding="utf-8") as f:
+        for index, line in enumerate(line for line in f if line.strip()):
+            try:
+                values = json.loads(line)
+            except json.JSONDecodeError as e:
+                errors[index] = f"Invalid JSON: {e}"
+                continue
+            if not isinstance(values, dict):
+                errors[index] = "Expected a JSON object of variable values."
+                continue
+            variable_sets.append(values)
+    return variable_sets, errors
+
+
+# Placeholder for update command
+# (which might be similar to create if create_version handles updates)
 
 if __name__ == "__main__":
     app()
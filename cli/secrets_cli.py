@@ -3,6 +3,7 @@ import typer
 import os # Ensure os is imported
 from google.cloud import secretmanager
 from config.settings import settings as project_settings # Import at module level
+from utils.secret_cache import SecretCache, SecretCacheUnavailable, is_pinned_version
 # For typing, if needed: from google.cloud.secretmanager_v1.types import Secret
 
 app = typer.Typer(
@@ -20,6 +21,23 @@ def _get_secret_manager_client():
         typer.secho(f"Error initializing Secret Manager client: {e}", fg=typer.colors.RED)
         raise typer.Exit(code=1)
 
+def _get_secret_cache(cache_flag: bool | None) -> SecretCache | None:
+    """Returns the local secret cache if enabled by flag or settings, else None."""
+    if cache_flag is None:
+        cache_flag = project_settings.secret_cache_enabled
+    if not cache_flag:
+        return None
+
+    try:
+        return SecretCache(
+            cache_dir=project_settings.secret_cache_dir,
+            ttl_seconds=project_settings.secret_cache_ttl_seconds,
+            key_path=project_settings.secret_cache_key_path,
+        )
+    except (SecretCacheUnavailable, OSError) as e:
+        typer.secho(f"Warning: Secret cache disabled: {e}", fg=typer.colors.YELLOW, err=True)
+        return None
+
 @app.command("list")
 def list_secrets(
     project_id: str = typer.Option(None, "--project-id", "-p", help="GCP Project ID. If not provided, uses configured default.")
@@ -61,9 +79,14 @@ def list_secrets(
 def get_secret_version(
     secret_id: str = typer.Argument(..., help="The ID of the secret (e.g., 'my-api-key')."),
     version: str = typer.Option("latest", "--version", "-v", help="The version of the secret (e.g., '3' or 'latest')."),
-    project_id: str = typer.Option(None, "--project-id", "-p", help="GCP Project ID. If not provided, uses configured default.")
+    project_id: str = typer.Option(None, "--project-id", "-p", help="GCP Project ID. If not provided, uses configured default."),
+    cache: bool = typer.Option(None, "--cache/--no-cache", help="Use the encrypted local secret cache. Defaults to the SECRET_CACHE_ENABLED setting.")
 ):
-    """Retrieves and displays the payload of a specific secret version."""
+    """Retrieves and displays the payload of a specific secret version.
+
+    With the local cache enabled, pinned (numeric) versions are served from disk
+    until their TTL expires; aliases such as 'latest' are always resolved live.
+    """
     effective_project_id = project_id
     if not effective_project_id:
         if hasattr(project_settings, 'gcp_project_id'):
@@ -78,6 +101,14 @@ def get_secret_version(
             )
             raise typer.Exit(code=1)
 
+    secret_cache = _get_secret_cache(cache)
+    if secret_cache and is_pinned_version(version):
+        cached_payload = secret_cache.get(effective_project_id, secret_id, version)
+        if cached_payload is not None:
+            typer.echo(f"Value for secret '{secret_id}' (version: {version}, project: {effective_project_id}, cached):")
+            typer.echo(cached_payload.decode("UTF-8"))
+            return
+
     client = _get_secret_manager_client()
     secret_version_name = f"projects/{effective_project_id}/secrets/{secret_id}/versions/{version}"
 
@@ -90,6 +121,24 @@ def get_secret_version(
         typer.secho(f"Error accessing secret '{secret_id}' (version {version}): {e}", fg=typer.colors.RED)
         raise typer.Exit(code=1)
 
+    if secret_cache:
+        # Store under the concrete version the API resolved (e.g. 'latest' -> '7').
+        resolved_name = getattr(response, "name", None)
+        resolved_version = resolved_name.split("/")[-1] if isinstance(resolved_name, str) else version
+        try:
+            secret_cache.put(effective_project_id, secret_id, resolved_version, response.payload.data)
+        except OSError as e:
+            typer.secho(f"Warning: Could not write secret cache entry: {e}", fg=typer.colors.YELLOW, err=True)
+
+@app.command("clear-cache")
+def clear_secret_cache():
+    """Removes all entries from the local encrypted secret cache."""
+    secret_cache = _get_secret_cache(True)
+    if not secret_cache:
+        raise typer.Exit(code=1)
+    removed = secret_cache.clear()
+    typer.echo(f"Removed {removed} cached secret version(s) from {secret_cache.cache_dir}.")
+
 @app.command("create")
 def create_secret(
     secret_id: str = typer.Argument(..., help="The ID for the new secret (e.g., 'my-new-api-key')."),
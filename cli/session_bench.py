@@ -0,0 +1,325 @@
+# cli/session_bench.py
+"""Session store throughput benchmark (create/append/read, no LLM involved)."""
+
+import asyncio
+import multiprocessing
+import time
+from dataclasses import dataclass, field
+
+from cli.tool_bench import BenchResult
+
+BENCH_APP_NAME = "gen_bootstrap_bench"
+OPERATIONS = ("create", "append", "read")
+PROCESS_START_TIMEOUT_SECONDS = 60
+
+
+@dataclass
+class SessionBenchRun:
+    clients: int
+    wall_seconds: float
+    operations: dict[str, BenchResult] = field(default_factory=dict)
+    shards: int = 1
+    processes: int = 1
+
+    @property
+    def total_ops(self) -> int:
+        return sum(result.calls for result in self.operations.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.total_ops / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "clients": self.clients,
+            "shards": self.shards,
+            "processes": self.processes,
+            "wall_seconds": self.wall_seconds,
+            "ops_per_second": self.throughput,
+            "operations": {
+                name: result.to_dict() for name, result in self.operations.items()
+            },
+        }
+
+
+@dataclass
+class _Samples:
+    latencies: dict[str, list[float]] = field(
+        default_factory=lambda: {name: [] for name in OPERATIONS}
+    )
+    errors: dict[str, int] = field(
+        default_factory=lambda: {name: 0 for name in OPERATIONS}
+    )
+    first_errors: dict[str, str] = field(default_factory=dict)
+
+    def merge(self, other: "_Samples") -> None:
+        for name in OPERATIONS:
+            self.latencies[name] += other.latencies[name]
+            self.errors[name] += other.errors[name]
+            if name in other.first_errors:
+                self.first_errors.setdefault(name, other.first_errors[name])
+
+
+def _bench_event(client: int, turn: int, payload: str):
+    from google.adk.events.event import Event, EventActions
+    from google.genai import types
+
+    return Event(
+        author="user" if turn % 2 == 0 else "gen_bootstrap_core_assistant",
+        invocation_id=f"bench-{client}-{turn // 2}",
+        content=types.Content(role="user", parts=[types.Part(text=payload)]),
+        actions=EventActions(state_delta={"turns": turn + 1}),
+    )
+
+
+async def _run_clients(
+    service, client_ids: range, events_per_client: int, payload: str, reads: bool
+) -> _Samples:
+    samples = _Samples()
+
+    async def timed(name: str, call):
+        started = time.perf_counter()
+        try:
+            return await call
+        except Exception as e:
+            samples.errors[name] += 1
+            samples.first_errors.setdefault(name, f"{type(e).__name__}: {e}")
+            return None
+        finally:
+            samples.latencies[name].append(time.perf_counter() - started)
+
+    async def client(index: int):
+        session = await timed(
+            "create",
+            service.create_session_async(
+                app_name=BENCH_APP_NAME, user_id=f"bench-user-{index}"
+            ),
+        )
+        if session is None:
+            return
+        for turn in range(events_per_client):
+            await timed(
+                "append",
+                service.append_event_async(session, _bench_event(index, turn, payload)),
+            )
+            if not reads:
+                continue
+            await timed(
+                "read",
+                service.get_session_async(
+                    app_name=BENCH_APP_NAME,
+                    user_id=session.user_id,
+                    session_id=session.id,
+                ),
+            )
+
+    await asyncio.gather(*(client(i) for i in client_ids))
+    return samples
+
+
+def _build_run(samples: _Samples, clients: int, wall_seconds: float) -> SessionBenchRun:
+    return SessionBenchRun(
+        clients=clients,
+        wall_seconds=wall_seconds,
+        operations={
+            name: BenchResult(
+                calls=len(samples.latencies[name]),
+                errors=samples.errors[name],
+                concurrency=clients,
+                wall_seconds=wall_seconds,
+                latencies=sorted(samples.latencies[name]),
+                first_error=samples.first_errors.get(name),
+            )
+            for name in OPERATIONS
+        },
+    )
+
+
+def _run_in_process(service_factory, run_index, clients, events, payload, reads):
+    service = service_factory(run_index)
+    try:
+        started = time.perf_counter()
+        samples = asyncio.run(
+            _run_clients(service, range(clients), events, payload, reads)
+        )
+        return samples, time.perf_counter() - started
+    finally:
+        service.close()
+
+
+def _run_in_processes(
+    service_factory, run_index, clients, processes, events, payload, reads
+):
+    """Splits the clients over forked processes sharing one store, like
+    uvicorn workers do, and times them from a common start."""
+    # The parent creates the store (schema, shard files) before the children race.
+    service_factory(run_index).close()
+    context = multiprocessing.get_context("fork")
+    start = context.Barrier(processes + 1)
+    results = context.Queue()
+
+    def child(client_ids: range):
+        service = service_factory(run_index)
+        try:
+            start.wait(PROCESS_START_TIMEOUT_SECONDS)
+            results.put(
+                asyncio.run(_run_clients(service, client_ids, events, payload, reads))
+            )
+        except BaseException as e:
+            failed = _Samples()
+            failed.errors["create"] = 1
+            failed.first_errors["create"] = f"{type(e).__name__}: {e}"
+            results.put(failed)
+        finally:
+            service.close()
+
+    workers = [
+        context.Process(target=child, args=(range(p, clients, processes),))
+        for p in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    start.wait(PROCESS_START_TIMEOUT_SECONDS)
+    started = time.perf_counter()
+    samples = _Samples()
+    for _ in workers:
+        samples.merge(results.get())
+    wall_seconds = time.perf_counter() - started
+    for worker in workers:
+        worker.join()
+    return samples, wall_seconds
+
+
+def run_session_benchmark(
+    service_factory,
+    client_counts: list[int],
+    events_per_client: int = 20,
+    payload_bytes: int = 512,
+    reads: bool = True,
+    shards: int = 1,
+    processes: int = 1,
+) -> list[SessionBenchRun]:
+    """Runs the create/append/read workload once per client count.
+
+    Each client is an asyncio task that creates a session, then alternately
+    appends an event and reads the whole session back, through the service's
+    `*_async` methods. `service_factory(run_index)` opens the store for one
+    run; every run gets its own index, so it starts from an empty store, and
+    calling the factory again with the same index opens the same store. The
+    service is closed afterwards. Without `reads`, clients only append, so
+    ops/s measures write throughput.
+
+    With `processes` > 1 the clients are split across that many forked
+    processes, each with its own service on the same store, so writers
+    contend on the database file as separate server workers would. `shards`
+    is recorded on each run for reporting.
+    """
+    payload = "x" * payload_bytes
+    runs = []
+    for run_index, clients in enumerate(client_counts):
+        processes_used = min(processes, clients)
+        if processes_used > 1:
+            samples, wall_seconds = _run_in_processes(
+                service_factory,
+                run_index,
+                clients,
+                processes_used,
+                events_per_client,
+                payload,
+                reads,
+            )
+        else:
+            samples, wall_seconds = _run_in_process(
+                service_factory, run_index, clients, events_per_client, payload, reads
+            )
+        run = _build_run(samples, clients, wall_seconds)
+        run.shards = shards
+        run.processes = processes_used
+        runs.append(run)
+    return runs
+
+
+@dataclass
+class LoadBenchRun:
+    events: int
+    snapshot_interval: int
+    loaded_events: int  # Events returned by one load
+    fill_seconds: float
+    load: BenchResult
+
+    def to_dict(self) -> dict:
+        return {
+            "events": self.events,
+            "snapshot_interval": self.snapshot_interval,
+            "loaded_events": self.loaded_events,
+            "fill_seconds": self.fill_seconds,
+            "load": self.load.to_dict(),
+        }
+
+
+def run_load_benchmark(
+    service_factory,
+    event_counts: list[int],
+    snapshot_intervals: list[int],
+    repeat: int = 50,
+    payload_bytes: int = 512,
+) -> list[LoadBenchRun]:
+    """Times `get_session` on one session of each length, per snapshot interval.
+
+    `service_factory(run_index, snapshot_interval)` opens an empty store for
+    one run; the store is filled with a single session of `events` events,
+    appended in batches as the write-behind cache does, then the session is
+    loaded `repeat` times. The service is closed afterwards.
+    """
+    from sessions.sqlite_session_service import EventRecord
+
+    payload = "x" * payload_bytes
+    runs = []
+    run_index = 0
+    for interval in snapshot_intervals:
+        for events in event_counts:
+            service = service_factory(run_index, interval)
+            run_index += 1
+            try:
+                session = service.create_session(
+                    app_name=BENCH_APP_NAME, user_id="bench-user"
+                )
+                started = time.perf_counter()
+                for first in range(0, events, 1000):
+                    records = []
+                    for turn in range(first, min(first + 1000, events)):
+                        event = _bench_event(0, turn, payload)
+                        records.append(EventRecord.from_event(session, event))
+                    service.append_event_records(records)
+                fill_seconds = time.perf_counter() - started
+
+                latencies = []
+                loaded = None
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    call_started = time.perf_counter()
+                    loaded = service.get_session(
+                        app_name=BENCH_APP_NAME,
+                        user_id=session.user_id,
+                        session_id=session.id,
+                    )
+                    latencies.append(time.perf_counter() - call_started)
+                wall_seconds = time.perf_counter() - started
+            finally:
+                service.close()
+            runs.append(
+                LoadBenchRun(
+                    events=events,
+                    snapshot_interval=interval,
+                    loaded_events=len(loaded.events) if loaded else 0,
+                    fill_seconds=fill_seconds,
+                    load=BenchResult(
+                        calls=repeat,
+                        errors=0,
+                        concurrency=1,
+                        wall_seconds=wall_seconds,
+                        latencies=sorted(latencies),
+                    ),
+                )
+            )
+    return runs
@@ -0,0 +1,421 @@
+# cli/sessions_cli.py
+import dataclasses
+import json
+import os
+import tempfile
+
+import typer
+
+from cli.session_bench import OPERATIONS, run_load_benchmark, run_session_benchmark
+from config.settings import settings as project_settings
+
+app = typer.Typer(
+    name="sessions",
+    help="Inspect and benchmark the ADK session store.",
+    no_args_is_help=True,
+)
+
+
+def _format_bytes(value: int) -> str:
+    return f"{value / (1024 * 1024):.1f} MiB"
+
+
+@app.command("compact")
+def compact_sessions(
+    max_age_days: float = typer.Option(
+        None,
+        "--max-age-days",
+        min=0,
+        help="Delete sessions idle this long (default: SESSION_RETENTION_MAX_AGE_DAYS).",
+    ),
+    max_events: int = typer.Option(
+        None,
+        "--max-events",
+        min=0,
+        help="Keep at most this many events per session "
+        "(default: SESSION_RETENTION_MAX_EVENTS).",
+    ),
+    max_db_bytes: int = typer.Option(
+        None,
+        "--max-db-bytes",
+        min=0,
+        help="Cap on live data (default: SESSION_RETENTION_MAX_DB_BYTES).",
+    ),
+    full_vacuum: bool = typer.Option(
+        False,
+        "--full-vacuum",
+        help="Afterwards, switch the file to incremental auto-vacuum and rebuild it. "
+        "Blocks all writes while it runs; needed once for databases created "
+        "before compaction existed.",
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print the report as JSON."),
+):
+    """
+    Runs one retention and compaction pass over the session database.
+
+    Limits default to the SESSION_RETENTION_* settings; 0 disables a limit.
+    Work runs in small transactions, so it is safe while the server is up.
+    """
+    # Imported here: the session store modules are only needed by this command.
+    from sessions.compaction import (
+        CompactionReport,
+        RetentionPolicy,
+        compact_session_store,
+    )
+    from sessions.compaction import full_vacuum as rebuild
+    from sessions.compaction import shard_policy
+    from sessions.sharded_session_service import shard_paths
+    from sessions.sqlite_session_service import SQLiteSessionService
+
+    policy = RetentionPolicy.from_settings(project_settings)
+    overrides = {
+        "max_age_seconds": None if max_age_days is None else max_age_days * 86400,
+        "max_events_per_session": max_events,
+        "max_db_bytes": max_db_bytes,
+    }
+    policy = dataclasses.replace(
+        policy, **{key: value for key, value in overrides.items() if value is not None}
+    )
+    shards = project_settings.session_db_shards
+    if shards > 1:
+        paths = shard_paths(project_settings.session_db_path, shards)
+        policy = shard_policy(policy, shards)
+    else:
+        paths = [project_settings.session_db_path]
+    reports = []
+    for path in paths:
+        store = SQLiteSessionService(path, pool_size=2)
+        try:
+            report = compact_session_store(store.pool, policy)
+            if full_vacuum:
+                rebuild(store.pool)
+                report.file_bytes_after = os.path.getsize(path)
+                report.notes = [n for n in report.notes if "auto_vacuum" not in n]
+        finally:
+            store.close()
+        reports.append(report)
+    report = CompactionReport.combine(reports)
+
+    if as_json:
+        typer.echo(json.dumps(report.to_dict(), indent=2))
+        return
+    typer.echo(
+        typer.style("Session compaction", bold=True, fg=typer.colors.CYAN)
+        + f" ({', '.join(paths)})"
+    )
+    typer.echo(f"  Expired sessions: {report.expired_sessions}")
+    typer.echo(f"  Sessions removed for size cap: {report.evicted_sessions}")
+    typer.echo(f"  Events deleted with sessions: {report.deleted_events}")
+    typer.echo(f"  Events trimmed: {report.trimmed_events}")
+    typer.echo(f"  Pages vacuumed: {report.vacuumed_pages}")
+    for label, before, after in (
+        ("Live data", report.live_bytes_before, report.live_bytes_after),
+        ("File size", report.file_bytes_before, report.file_bytes_after),
+    ):
+        typer.echo(f"  {label}: {_format_bytes(before)} -> {_format_bytes(after)}")
+    typer.echo(f"  {report.transactions} transactions in {report.seconds:.2f}s")
+    for note in report.notes:
+        typer.secho(note, fg=typer.colors.YELLOW, err=True)
+
+
+@app.command("migrate")
+def migrate_sessions(
+    shards: int = typer.Option(
+        ...,
+        "--shards",
+        "-s",
+        min=1,
+        help="Number of shard files to create; 1 converts the source into a "
+        "single database at SESSION_DB_PATH.",
+    ),
+    source: str = typer.Option(
+        None,
+        "--source",
+        help="Unsharded session database to copy (default: SESSION_DB_PATH). "
+        "Both this project's layout and ADK's default database layout are read.",
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print the report as JSON."),
+):
+    """
+    Copies an unsharded session database into SESSION_DB_SHARDS shard files.
+
+    Shard files are named after SESSION_DB_PATH; with --shards 1 the copy is
+    SESSION_DB_PATH itself, so move an ADK-layout database aside first and
+    pass it as --source. The source is only read; stop the server first so no
+    events are written to it mid-copy, then set SESSION_DB_SHARDS to the same
+    count.
+    """
+    # Imported here: the session store modules are only needed by this command.
+    from sessions.migration import migrate_to_shards
+    from sessions.sqlite_session_service import session_tuning
+
+    source = source or project_settings.session_db_path
+    try:
+        report = migrate_to_shards(
+            source,
+            project_settings.session_db_path,
+            shards,
+            tuning=session_tuning(project_settings),
+        )
+    except (FileNotFoundError, FileExistsError, ValueError) as e:
+        typer.secho(f"ERROR: {e}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+
+    if as_json:
+        typer.echo(json.dumps(report.to_dict(), indent=2))
+        return
+    typer.secho(
+        f"Migrated {report.sessions} sessions and {report.events} events "
+        f"({report.layout} layout) into {shards} shards in {report.seconds:.2f}s.",
+        fg=typer.colors.GREEN,
+    )
+    for path in report.targets:
+        typer.echo(f"  {path}")
+    typer.echo(f"Set SESSION_DB_SHARDS={shards} to use them.")
+
+
+def _parse_counts(value: str, what: str) -> list[int]:
+    try:
+        counts = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise typer.BadParameter(
+            "Expected a comma-separated list of integers, e.g. 1,8,64."
+        )
+    if not counts or any(count < 1 for count in counts):
+        raise typer.BadParameter(f"{what} must be positive integers.")
+    return counts
+
+
+@app.command("bench")
+def bench_sessions(
+    clients: str = typer.Option(
+        "1,8,64",
+        "--clients",
+        "-c",
+        help="Comma-separated concurrent client counts to run.",
+    ),
+    events: int = typer.Option(
+        20, "--events", "-n", min=1, help="Append+read turns per client."
+    ),
+    payload_bytes: int = typer.Option(
+        512, "--payload-bytes", min=0, help="Text size of each appended event."
+    ),
+    pool_size: int = typer.Option(
+        None,
+        "--pool-size",
+        min=1,
+        help="Connection pool size (default: SESSION_DB_POOL_SIZE).",
+    ),
+    db_dir: str = typer.Option(
+        None,
+        "--db-dir",
+        help="Directory for the benchmark databases (default: a temporary directory). "
+        "Use the disk the real store lives on for representative numbers.",
+    ),
+    shards: str = typer.Option(
+        None,
+        "--shards",
+        "-s",
+        help="Comma-separated shard counts to compare, e.g. 1,2,4 "
+        "(default: SESSION_DB_SHARDS). Combine with --processes, --no-cache and "
+        "--no-reads to measure write throughput per shard count.",
+    ),
+    processes: int = typer.Option(
+        1,
+        "--processes",
+        "-p",
+        min=1,
+        help="Split the clients across this many processes sharing the store, "
+        "as server workers do.",
+    ),
+    reads: bool = typer.Option(
+        True, "--reads/--no-reads", help="Read the session back after each append."
+    ),
+    cache: bool = typer.Option(
+        None,
+        "--cache/--no-cache",
+        help="Put the LRU write-behind cache in front of the store "
+        "(default: SESSION_CACHE_ENABLED).",
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print results as JSON."),
+):
+    """
+    Benchmarks session create/append/read throughput at several concurrency levels.
+
+    Each client creates a session, then alternately appends an event and reads
+    the session back. Every run uses a fresh database with the configured
+    pragmas, so the live session store is never touched.
+
+    With several shard counts, every client count runs once per shard count.
+    """
+    # Imported here: the session service pulls in google-adk.
+    from sessions.sqlite_session_service import build_session_service
+
+    client_counts = _parse_counts(clients, "Client counts")
+    shard_counts = _parse_counts(
+        shards or str(project_settings.session_db_shards), "Shard counts"
+    )
+    pool_size = pool_size or project_settings.session_db_pool_size
+    if cache is None:
+        cache = project_settings.session_cache_enabled
+
+    runs = []
+    for shard_count in shard_counts:
+        with tempfile.TemporaryDirectory(dir=db_dir) as workdir:
+
+            def service_factory(run_index: int):
+                path = os.path.join(workdir, f"bench-{run_index}.db")
+                settings = project_settings.model_copy(
+                    update={
+                        "session_db_path": path,
+                        "session_db_pool_size": pool_size,
+                        "session_db_shards": shard_count,
+                        "session_cache_enabled": cache,
+                    }
+                )
+                return build_session_service(settings)
+
+            runs += run_session_benchmark(
+                service_factory,
+                client_counts,
+                events_per_client=events,
+                payload_bytes=payload_bytes,
+                reads=reads,
+                shards=shard_count,
+                processes=processes,
+            )
+
+    if as_json:
+        payload = {
+            "pool_size": pool_size,
+            "processes": processes,
+            "cache": cache,
+            "runs": [r.to_dict() for r in runs],
+        }
+        typer.echo(json.dumps(payload, indent=2))
+    else:
+        typer.echo(
+            typer.style("Session store benchmark", bold=True, fg=typer.colors.CYAN)
+            + f" (pool {pool_size}, {processes} process(es), "
+            f"cache {'on' if cache else 'off'}, "
+            f"{events} turns/client, {payload_bytes} B events)"
+        )
+        typer.echo(
+            f"  {'shards':>6}  {'clients':>7}  {'ops/s':>9}  "
+            + "  ".join(f"{name + ' p50/p99 ms':>20}" for name in OPERATIONS)
+            + "  errors"
+        )
+        for run in runs:
+            latencies = "  ".join(
+                f"{run.operations[name].percentile(50) * 1000:>9.2f}/"
+                f"{run.operations[name].percentile(99) * 1000:<10.2f}"
+                for name in OPERATIONS
+            )
+            errors = sum(result.errors for result in run.operations.values())
+            typer.echo(
+                f"  {run.shards:>6}  {run.clients:>7}  {run.throughput:>9.1f}  "
+                f"{latencies}  {errors}"
+            )
+
+    for run in runs:
+        for name, result in run.operations.items():
+            if result.first_error:
+                typer.secho(
+                    f"First {name} error with {run.clients} client(s), "
+                    f"{run.shards} shard(s): "
+                    f"{result.first_error}",
+                    fg=typer.colors.YELLOW,
+                    err=True,
+                )
+    if any(result.errors for run in runs for result in run.operations.values()):
+        raise typer.Exit(code=1)
+
+
+@app.command("bench-load")
+def bench_session_load(
+    events: str = typer.Option(
+        "10,1000,10000",
+        "--events",
+        "-n",
+        help="Comma-separated session lengths (events) to load.",
+    ),
+    snapshot_intervals: str = typer.Option(
+        None,
+        "--snapshot-intervals",
+        help="Comma-separated snapshot intervals to compare; 0 loads the full "
+        "history (default: 0 and SESSION_SNAPSHOT_INTERVAL_EVENTS, or 0,100).",
+    ),
+    repeat: int = typer.Option(
+        50, "--repeat", "-r", min=1, help="Loads timed per session."
+    ),
+    payload_bytes: int = typer.Option(
+        512, "--payload-bytes", min=0, help="Text size of each event."
+    ),
+    db_dir: str = typer.Option(
+        None,
+        "--db-dir",
+        help="Directory for the benchmark databases (default: a temporary directory).",
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print results as JSON."),
+):
+    """
+    Benchmarks loading one session of each length, with and without snapshots.
+
+    Loads go straight to the store (no cache), as after a cache miss or a
+    worker restart. Every run uses a fresh database.
+    """
+    # Imported here: the session service pulls in google-adk.
+    from sessions.sqlite_session_service import build_session_service
+
+    event_counts = _parse_counts(events, "Event counts")
+    if snapshot_intervals is None:
+        configured = project_settings.session_snapshot_interval_events
+        snapshot_intervals = f"0,{configured or 100}"
+    try:
+        intervals = [
+            int(part) for part in snapshot_intervals.split(",") if part.strip()
+        ]
+    except ValueError:
+        raise typer.BadParameter(
+            "Expected a comma-separated list of integers, e.g. 0,100."
+        )
+    if not intervals or any(interval < 0 for interval in intervals):
+        raise typer.BadParameter("Snapshot intervals must be 0 or positive integers.")
+
+    with tempfile.TemporaryDirectory(dir=db_dir) as workdir:
+
+        def service_factory(run_index: int, snapshot_interval: int):
+            settings = project_settings.model_copy(
+                update={
+                    "session_db_path": os.path.join(workdir, f"load-{run_index}.db"),
+                    "session_snapshot_interval_events": snapshot_interval,
+                    "session_cache_enabled": False,
+                }
+            )
+            return build_session_service(settings)
+
+        runs = run_load_benchmark(
+            service_factory,
+            event_counts,
+            intervals,
+            repeat=repeat,
+            payload_bytes=payload_bytes,
+        )
+
+    if as_json:
+        typer.echo(json.dumps({"runs": [run.to_dict() for run in runs]}, indent=2))
+        return
+    typer.echo(
+        typer.style("Session load benchmark", bold=True, fg=typer.colors.CYAN)
+        + f" ({repeat} loads per session, {payload_bytes} B events)"
+    )
+    typer.echo(
+        f"  {'snapshots':>9}  {'events':>7}  {'loaded':>7}  "
+        f"{'p50 ms':>9}  {'p99 ms':>9}"
+    )
+    for run in runs:
+        typer.echo(
+            f"  {run.snapshot_interval or 'off':>9}  {run.events:>7}  "
+            f"{run.loaded_events:>7}  {run.load.percentile(50) * 1000:>9.2f}  "
+            f"{run.load.percentile(99) * 1000:>9.2f}"
+        )
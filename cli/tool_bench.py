@@ -0,0 +1,182 @@
+# cli/tool_bench.py
+"""Micro-benchmark runner for tool functions (no LLM involved)."""
+
+import asyncio
+import inspect
+import json
+import math
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+@dataclass
+class BenchResult:
+    calls: int
+    errors: int
+    concurrency: int
+    wall_seconds: float
+    latencies: list[float] = field(default_factory=list)  # Sorted, seconds
+    peak_rss_bytes: int | None = None
+    peak_traced_bytes: int | None = None
+    first_error: str | None = None
+
+    @property
+    def throughput(self) -> float:
+        return self.calls / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank percentile of the recorded latencies, in seconds."""
+        if not self.latencies:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * len(self.latencies)))
+        return self.latencies[rank - 1]
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "concurrency": self.concurrency,
+            "wall_seconds": self.wall_seconds,
+            "throughput_per_second": self.throughput,
+            "latency_seconds": {
+                "p50": self.percentile(50),
+                "p95": self.percentile(95),
+                "p99": self.percentile(99),
+                "max": self.latencies[-1] if self.latencies else 0.0,
+            },
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "peak_traced_bytes": self.peak_traced_bytes,
+            "first_error": self.first_error,
+        }
+
+
+def read_inputs(path: str) -> list[dict]:
+    """Reads one JSON object of keyword arguments per line."""
+    inputs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            value = json.loads(line)
+            if not isinstance(value, dict):
+                raise ValueError(
+                    f"Line {line_number}: expected a JSON object of arguments."
+                )
+            inputs.append(value)
+    return inputs
+
+
+def _peak_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux reports KiB
+
+
+def _is_error_result(result: Any) -> bool:
+    return isinstance(result, dict) and "error" in result
+
+
+async def _run(
+    func: Callable,
+    inputs: list[dict],
+    iterations: int,
+    concurrency: int,
+    executor: ThreadPoolExecutor | None,
+) -> tuple[list[float], int, str | None]:
+    loop = asyncio.get_running_loop()
+    is_async = inspect.iscoroutinefunction(func)
+    latencies: list[float] = []
+    errors = 0
+    first_error = None
+    next_call = 0
+
+    async def call_once(kwargs: dict):
+        if is_async:
+            return await func(**kwargs)
+        return await loop.run_in_executor(executor, lambda: func(**kwargs))
+
+    async def worker():
+        nonlocal next_call, errors, first_error
+        while next_call < iterations:
+            kwargs = inputs[next_call % len(inputs)]
+            next_call += 1
+            started = time.perf_counter()
+            try:
+                result = await call_once(kwargs)
+                failed = _is_error_result(result)
+                error_text = str(result.get("error")) if failed else None
+            except Exception as e:
+                failed, error_text = True, f"{type(e).__name__}: {e}"
+            latencies.append(time.perf_counter() - started)
+            if failed:
+                errors += 1
+                first_error = first_error or error_text
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, first_error
+
+
+def run_benchmark(
+    func: Callable,
+    inputs: list[dict],
+    iterations: int,
+    concurrency: int = 1,
+    warmup: int = 0,
+    trace_memory: bool = False,
+) -> BenchResult:
+    """Calls `func` `iterations` times, cycling through `inputs`.
+
+    Async functions run as `concurrency` concurrent tasks on one event loop;
+    sync functions run on a thread pool of the same size. Exceptions and
+    ADK-style {"error": ...} results count as errors.
+    """
+    inputs = inputs or [{}]
+    if "tool_context" in inspect.signature(func).parameters:
+        inputs = [{**kwargs, "tool_context": None} for kwargs in inputs]
+    concurrency = max(1, concurrency)
+    executor = (
+        None if inspect.iscoroutinefunction(func) else ThreadPoolExecutor(concurrency)
+    )
+
+    async def main():
+        if warmup:
+            await _run(func, inputs, warmup, min(concurrency, warmup), executor)
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        outcome = await _run(func, inputs, iterations, concurrency, executor)
+        wall_seconds = time.perf_counter() - started
+        traced_peak = None
+        if trace_memory:
+            traced_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return outcome, wall_seconds, traced_peak
+
+    try:
+        (latencies, errors, first_error), wall_seconds, traced_peak = asyncio.run(
+            main()
+        )
+    finally:
+        if executor:
+            executor.shutdown(wait=False)
+
+    return BenchResult(
+        calls=len(latencies),
+        errors=errors,
+        concurrency=concurrency,
+        wall_seconds=wall_seconds,
+        latencies=sorted(latencies),
+        peak_rss_bytes=_peak_rss_bytes(),
+        peak_traced_bytes=traced_peak,
+        first_error=first_error,
+    )
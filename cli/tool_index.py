@@ -0,0 +1,300 @@
+# cli/tool_index.py
+"""Static index of the FunctionTool definitions in the tools/ directory.
+
+Tool modules are parsed with `ast` rather than imported, so `tools list` and
+`tools describe` never pull in google-adk or a tool's own dependencies. Results
+are cached per file in a JSON index keyed by mtime, size and content hash.
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+from dataclasses import asdict, dataclass, field
+
+INDEX_FORMAT_VERSION = 2
+TOOL_CONSTRUCTOR_NAME = "FunctionTool"
+# Helpers that return a FunctionTool for the function (or FunctionTool) passed first.
+TOOL_WRAPPER_NAMES = frozenset({"cached_tool"})
+
+
+@dataclass
+class ToolParameter:
+    name: str
+    annotation: str = "Any"
+    default: str | None = None  # Rendered default value; None when required
+
+
+@dataclass
+class ToolInfo:
+    """What the CLI shows about a tool; built from source or from a live FunctionTool."""
+
+    name: str
+    description: str | None  # FunctionTool uses the raw function docstring
+    docstring: str | None = None  # Cleaned docstring (inspect.cleandoc)
+    parameters: list[ToolParameter] = field(default_factory=list)
+    module_path: str | None = None
+    variable_name: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ToolInfo":
+        data = dict(data)
+        data["parameters"] = [ToolParameter(**p) for p in data.get("parameters", [])]
+        return cls(**data)
+
+    @classmethod
+    def from_function_tool(cls, tool, module_path: str | None = None) -> "ToolInfo":
+        """Describes an imported FunctionTool the same way the static index does."""
+        func = getattr(tool, "func", None)
+        parameters: list[ToolParameter] = []
+        docstring = None
+        if callable(func):
+            for name, param in inspect.signature(func).parameters.items():
+                annotation = "Any"
+                if param.annotation is not inspect.Parameter.empty:
+                    annotation = getattr(param.annotation, "__name__", None) or str(
+                        param.annotation
+                    )
+                default = None
+                if param.default is not inspect.Parameter.empty:
+                    default = str(param.default)
+                parameters.append(ToolParameter(name, annotation, default))
+            docstring = inspect.getdoc(func)
+        return cls(
+            name=tool.name,
+            description=tool.description,
+            docstring=docstring,
+            parameters=parameters,
+            module_path=module_path,
+        )
+
+
+class UnresolvableToolModule(Exception):
+    """The module builds tools dynamically; it has to be imported to be indexed."""
+
+
+def _is_call_to(node: ast.AST, names: frozenset[str]) -> bool:
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id in names
+    return isinstance(func, ast.Attribute) and func.attr in names
+
+
+def _is_tool_constructor(node: ast.AST) -> bool:
+    return _is_call_to(node, frozenset({TOOL_CONSTRUCTOR_NAME}))
+
+
+def _first_argument(call: ast.Call, keyword_name: str) -> ast.expr | None:
+    for keyword in call.keywords:
+        if keyword.arg == keyword_name:
+            return keyword.value
+    return call.args[0] if call.args else None
+
+
+def _tool_definition(value: ast.expr) -> tuple[ast.expr | None, list[ast.Call]]:
+    """For `FunctionTool(f)` or `cached_tool(f | FunctionTool(f), ...)`, returns
+    the expression naming the function and the calls that are accounted for."""
+    if _is_tool_constructor(value):
+        return _first_argument(value, "func"), [value]
+    if _is_call_to(value, TOOL_WRAPPER_NAMES):
+        inner = _first_argument(value, "tool_or_func")
+        if _is_tool_constructor(inner):
+            return _first_argument(inner, "func"), [value, inner]
+        return inner, [value]
+    return None, []
+
+
+def _render_default(node: ast.expr) -> str:
+    try:
+        return str(ast.literal_eval(node))
+    except ValueError:
+        return ast.unparse(node)
+
+
+def _parameters_of(func: ast.FunctionDef | ast.AsyncFunctionDef) -> list[ToolParameter]:
+    args = func.args
+    positional = args.posonlyargs + args.args
+    # Defaults apply to the last len(defaults) positional parameters.
+    defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    pairs = list(zip(positional, defaults)) + list(
+        zip(args.kwonlyargs, args.kw_defaults)
+    )
+    parameters = []
+    for arg, default in pairs:
+        parameters.append(
+            ToolParameter(
+                name=arg.arg,
+                annotation=ast.unparse(arg.annotation) if arg.annotation else "Any",
+                default=_render_default(default) if default is not None else None,
+            )
+        )
+    return parameters
+
+
+def index_source(source: str, module_path: str | None = None) -> list[ToolInfo]:
+    """Finds module-level `name = FunctionTool(func)` definitions in source code.
+
+    `cached_tool(func, ...)` assignments are recognised too. Raises
+    UnresolvableToolModule if the module constructs tools any other way at
+    import time (in a loop, on a non-local callable, via a local factory...).
+    """
+    tree = ast.parse(source, filename=module_path or "<tool module>")
+    functions = {
+        node.name: node
+        for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+
+    resolved_calls: set[int] = set()
+    tools: list[ToolInfo] = []
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target, value = node.targets[0], node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            target, value = node.target, node.value
+        else:
+            continue
+        func_arg, calls = _tool_definition(value)
+        if not calls or not isinstance(target, ast.Name):
+            continue
+        if not isinstance(func_arg, ast.Name) or func_arg.id not in functions:
+            continue  # Left unresolved; caught by the check below
+        func = functions[func_arg.id]
+        resolved_calls.update(id(call) for call in calls)
+        tools.append(
+            ToolInfo(
+                name=func.name,
+                description=ast.get_docstring(func, clean=False),
+                docstring=ast.get_docstring(func, clean=True),
+                parameters=_parameters_of(func),
+                module_path=module_path,
+                variable_name=target.id,
+            )
+        )
+
+    # Local functions that construct tools only matter if they run at import time.
+    tool_factories = {
+        name
+        for name, func in functions.items()
+        if any(
+            _is_tool_constructor(n) or _is_call_to(n, TOOL_WRAPPER_NAMES)
+            for n in ast.walk(func)
+        )
+    }
+    for statement in tree.body:
+        if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        for node in ast.walk(statement):
+            builds_tool = _is_tool_constructor(node) or _is_call_to(
+                node, TOOL_WRAPPER_NAMES
+            )
+            calls_factory = _is_call_to(node, frozenset(tool_factories))
+            if (builds_tool and id(node) not in resolved_calls) or calls_factory:
+                raise UnresolvableToolModule(
+                    f"Tool built on line {node.lineno} cannot be resolved statically."
+                )
+    return tools
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def tool_module_paths(tools_dir: str) -> list[str]:
+    return sorted(
+        os.path.abspath(os.path.join(tools_dir, filename))
+        for filename in os.listdir(tools_dir)
+        if filename.endswith(".py") and filename != "__init__.py"
+    )
+
+
+class ToolIndex:
+    """On-disk cache of per-file static index results.
+
+    A file whose mtime and size are unchanged is served without being read; if
+    only the mtime changed, the content hash decides whether to re-parse.
+    """
+
+    def __init__(self, cache_path: str | None):
+        self.cache_path = cache_path
+        self._files: dict[str, dict] = {}
+        self._dirty = False
+        if cache_path:
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_FORMAT_VERSION:
+                    self._files = data.get("files", {})
+            except (OSError, ValueError, AttributeError):
+                self._files = {}
+
+    def lookup(self, tools_dir: str) -> tuple[list[ToolInfo], list[str]]:
+        """Returns (indexed tools, files that must be imported to be indexed)."""
+        tools: list[ToolInfo] = []
+        unresolved: list[str] = []
+        paths = tool_module_paths(tools_dir)
+        for path in paths:
+            entry = self._entry_for(path)
+            if entry["tools"] is None:
+                unresolved.append(path)
+            else:
+                tools.extend(ToolInfo.from_dict(t) for t in entry["tools"])
+
+        # Forget files that were removed from this directory.
+        directory = os.path.abspath(tools_dir)
+        for cached_path in list(self._files):
+            if os.path.dirname(cached_path) == directory and cached_path not in paths:
+                del self._files[cached_path]
+                self._dirty = True
+        return tools, unresolved
+
+    def _entry_for(self, path: str) -> dict:
+        stat = os.stat(path)
+        entry = self._files.get(path)
+        if (
+            entry
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["size"] == stat.st_size
+        ):
+            return entry
+
+        digest = _file_digest(path)
+        if entry and entry["sha256"] == digest:
+            entry["mtime_ns"] = stat.st_mtime_ns  # Touched but unchanged
+            self._dirty = True
+            return entry
+
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+        try:
+            tools = [asdict(t) for t in index_source(source, path)]
+        except (UnresolvableToolModule, SyntaxError):
+            tools = None
+        entry = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "tools": tools,
+        }
+        self._files[path] = entry
+        self._dirty = True
+        return entry
+
+    def save(self) -> None:
+        if not self.cache_path or not self._dirty:
+            return
+        try:
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_FORMAT_VERSION, "files": self._files}, f)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+        except OSError:
+            pass  # The index is only an optimisation
@@ -0,0 +1,136 @@
+# cli/tool_loader.py
+"""Imports tool modules in isolated worker processes.
+
+Used when tools have to be imported (see cli/tool_index.py for the static
+path). Each module is imported in its own spawned process with its own
+timeout, so a slow or hanging module cannot block the others; tools come
+back as serialized ToolInfo metadata together with the module's import time.
+"""
+
+import importlib.util
+import inspect
+import multiprocessing
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from multiprocessing.connection import wait
+
+from cli.tool_index import ToolInfo
+
+DEFAULT_IMPORT_TIMEOUT_SECONDS = 30.0
+
+
+def default_worker_count() -> int:
+    return min(8, os.cpu_count() or 1)
+
+
+@dataclass
+class ModuleLoadResult:
+    module_path: str
+    tools: list[ToolInfo] = field(default_factory=list)
+    import_seconds: float = 0.0
+    error: str | None = None
+    timed_out: bool = False
+
+
+def _import_module_worker(module_path: str, tools_dir: str, conn) -> None:
+    """Child process entry point: imports one module and sends back its tools."""
+    started = time.perf_counter()
+    try:
+        sys.path.insert(0, tools_dir)
+        module_name = (
+            f"genbootstrap_cli_discovered_tools.{os.path.basename(module_path)[:-3]}"
+        )
+        spec = importlib.util.spec_from_file_location(module_name, module_path)
+        if not spec or not spec.loader:
+            raise ImportError(f"Could not load module spec for {module_path}")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+        tools = []
+        # A module that never imported google-adk cannot define FunctionTools, so
+        # ADK's own (slow) import is only paid for modules that use it.
+        function_tool_module = sys.modules.get("google.adk.tools.function_tool")
+        if function_tool_module is not None:
+            tools = [
+                asdict(ToolInfo.from_function_tool(obj, module_path))
+                for _, obj in inspect.getmembers(module)
+                if isinstance(obj, function_tool_module.FunctionTool)
+            ]
+        conn.send((tools, time.perf_counter() - started, None))
+    except (
+        BaseException
+    ) as e:  # Report everything, including SystemExit from the module
+        conn.send(([], time.perf_counter() - started, f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def load_modules_in_processes(
+    module_paths: list[str],
+    tools_dir: str,
+    workers: int | None = None,
+    import_timeout: float = DEFAULT_IMPORT_TIMEOUT_SECONDS,
+) -> list[ModuleLoadResult]:
+    """Imports each module in a spawned process, at most `workers` at a time.
+
+    A module that does not finish within `import_timeout` seconds is terminated
+    and reported as timed out. Results are returned in `module_paths` order.
+    """
+    workers = max(1, workers or default_worker_count())
+    context = multiprocessing.get_context("spawn")
+    pending = list(module_paths)
+    running: dict = {}  # parent connection -> (path, process, deadline, started)
+    results: dict[str, ModuleLoadResult] = {}
+
+    while pending or running:
+        while pending and len(running) < workers:
+            path = pending.pop(0)
+            parent_conn, child_conn = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_import_module_worker,
+                args=(path, os.path.abspath(tools_dir), child_conn),
+                daemon=True,
+            )
+            started = time.perf_counter()
+            process.start()
+            child_conn.close()
+            running[parent_conn] = (path, process, started + import_timeout, started)
+
+        next_deadline = min(deadline for _, _, deadline, _ in running.values())
+        ready = wait(
+            list(running), timeout=max(0.0, next_deadline - time.perf_counter())
+        )
+
+        for conn in ready:
+            path, process, _, started = running.pop(conn)
+            try:
+                tools, seconds, error = conn.recv()
+            except EOFError:  # The process died without reporting
+                tools, seconds = [], time.perf_counter() - started
+                error = "Worker process exited unexpectedly."
+            conn.close()
+            process.join()
+            results[path] = ModuleLoadResult(
+                module_path=path,
+                tools=[ToolInfo.from_dict(t) for t in tools],
+                import_seconds=seconds,
+                error=error,
+            )
+
+        now = time.perf_counter()
+        for conn, (path, process, deadline, started) in list(running.items()):
+            if now >= deadline:
+                del running[conn]
+                process.terminate()
+                process.join()
+                conn.close()
+                results[path] = ModuleLoadResult(
+                    module_path=path,
+                    import_seconds=now - started,
+                    error=f"Import timed out after {import_timeout:g}s.",
+                    timed_out=True,
+                )
+
+    return [results[path] for path in module_paths]
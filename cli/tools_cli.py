@@ -1,11 +1,21 @@
 # cli/tools_cli.py
 import importlib.util
 import inspect
+import json
 import os
 import sys
 
 import typer
-from google.adk.tools import FunctionTool
+
+from cli.tool_bench import read_inputs, run_benchmark
+from cli.tool_index import ToolIndex, ToolInfo, tool_module_paths
+from cli.tool_loader import (
+    DEFAULT_IMPORT_TIMEOUT_SECONDS,
+    default_worker_count,
+    load_modules_in_processes,
+)
+from config.settings import settings as project_settings
+from utils.doc_index import DocIndex
 
 app = typer.Typer(
     name="tools", help="Manage and inspect agent tools.", no_args_is_help=True
@@ -13,10 +23,87 @@ app = typer.Typer(
 
 # Directory where custom tools are expected to be found
 TOOLS_DIR = "tools"
+# Cached static index of tool modules (see cli/tool_index.py)
+TOOL_INDEX_CACHE_PATH = project_settings.state_path("tool_index.json")
+
+LOADER_OPTION_HELP = (
+    "How tools are discovered: 'static' parses source (no imports, modules that build "
+    "tools dynamically are imported as a fallback), 'import' loads every module in this "
+    "process, 'process' imports each module in a separate worker process with a timeout."
+)
+WORKERS_OPTION_HELP = "Worker processes for '--loader process'."
+IMPORT_TIMEOUT_OPTION_HELP = "Per-module import timeout in seconds for '--loader process'."
+
+
+def _load_tools_in_processes(
+    tools_dir_path: str, workers: int, import_timeout: float
+) -> list[ToolInfo]:
+    """Imports tool modules in worker processes and reports per-module import times."""
+    results = load_modules_in_processes(
+        tool_module_paths(tools_dir_path), tools_dir_path, workers, import_timeout
+    )
+    tools: list[ToolInfo] = []
+    # Timings go to stderr so stdout stays a clean tool listing.
+    typer.echo(typer.style("Module import times:", bold=True), err=True)
+    for result in sorted(results, key=lambda r: r.import_seconds, reverse=True):
+        filename = os.path.basename(result.module_path)
+        status = f"{len(result.tools)} tool(s)"
+        if result.error:
+            status = typer.style(result.error, fg=typer.colors.YELLOW)
+        typer.echo(
+            f"  {result.import_seconds * 1000:8.1f} ms  {filename}: {status}", err=True
+        )
+        tools.extend(result.tools)
+    return tools
+
+
+def _load_tool_infos(
+    tools_dir_path: str,
+    loader: str = "static",
+    workers: int | None = None,
+    import_timeout: float = DEFAULT_IMPORT_TIMEOUT_SECONDS,
+) -> list[ToolInfo]:
+    """Returns tool descriptions using the static index, or real imports."""
+    if loader == "import":
+        return [
+            ToolInfo.from_function_tool(tool) for tool in _discover_tools(tools_dir_path)
+        ]
+    if loader == "process":
+        return _load_tools_in_processes(
+            tools_dir_path, workers or default_worker_count(), import_timeout
+        )
+    if loader != "static":
+        typer.secho(
+            f"Error: Unknown loader '{loader}'. Use 'static', 'import' or 'process'.",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(code=1)
+
+    index = ToolIndex(TOOL_INDEX_CACHE_PATH)
+    tools, unresolved = index.lookup(tools_dir_path)
+    index.save()
+    if unresolved:
+        original_sys_path = list(sys.path)
+        sys.path.insert(0, str(tools_dir_path))
+        try:
+            for module_path in unresolved:
+                tools.extend(
+                    ToolInfo.from_function_tool(tool, module_path)
+                    for tool in _import_tools_from_file(module_path)
+                )
+        finally:
+            sys.path = original_sys_path
+    return tools
 
 
 @app.command("list")
-def list_tools():
+def list_tools(
+    loader: str = typer.Option("static", "--loader", help=LOADER_OPTION_HELP),
+    workers: int = typer.Option(None, "--workers", help=WORKERS_OPTION_HELP),
+    import_timeout: float = typer.Option(
+        DEFAULT_IMPORT_TIMEOUT_SECONDS, "--import-timeout", help=IMPORT_TIMEOUT_OPTION_HELP
+    ),
+):
     """
     Lists available agent tools from the tools/ directory.
     """
@@ -24,7 +111,7 @@ def list_tools():
         typer.secho(f"Tools directory '{TOOLS_DIR}' not found.", fg=typer.colors.RED)
         raise typer.Exit(code=1)
 
-    discovered_tools = _discover_tools(TOOLS_DIR)
+    discovered_tools = _load_tool_infos(TOOLS_DIR, loader, workers, import_timeout)
 
     if not discovered_tools:
         typer.echo(f"No tools found in '{TOOLS_DIR}'.")
@@ -38,8 +125,8 @@ def list_tools():
             )  # Assuming tool has .description
 
 
-def _discover_tools(tools_dir_path: str) -> list[FunctionTool]:
-    """Helper function to discover FunctionTool instances in a directory."""
+def _discover_tools(tools_dir_path: str) -> list:
+    """Helper function to discover FunctionTool instances in a directory by importing it."""
     discovered_tools = []
     if not os.path.exists(tools_dir_path) or not os.path.isdir(tools_dir_path):
         # This case should ideally be handled by the caller or return an empty list/raise error
@@ -78,73 +165,83 @@ def _discover_tools(tools_dir_path: str) -> list[FunctionTool]:
 
     for filename in os.listdir(tools_dir_path):
         if filename.endswith(".py") and filename != "__init__.py":
-            module_name_for_spec = filename[:-3]  # e.g., "mock_tool_module"
-            module_file_path = os.path.join(tools_dir_path, filename)
-
-            # Construct a unique module name for importlib to avoid collisions
-            # This could be based on the path or a fixed prefix
-            # if tools_dir_path is standard.
-            # For instance, if tools_dir_path is "tools", then "tools.mock_tool_module"
-            # If tools_dir_path is temporary, like in tests, need a stable way.
-            # Let's use a fixed prefix for dynamically loaded tool modules.
-            dynamic_module_name = (
-                f"genbootstrap_cli_discovered_tools.{module_name_for_spec}"
+            discovered_tools.extend(
+                _import_tools_from_file(os.path.join(tools_dir_path, filename))
             )
 
-            try:
-                spec = importlib.util.spec_from_file_location(
-                    dynamic_module_name, module_file_path
-                )
-                if spec and spec.loader:
-                    module = importlib.util.module_from_spec(spec)
-                    sys.modules[
-                        dynamic_module_name
-                    ] = module  # Important for inspect to find the module
-                    spec.loader.exec_module(module)
-                else:
-                    # This case might not be hit if spec_from_file_location fails first
-                    typer.secho(
-                        f"Warning: Could not load module spec for {filename}",
-                        fg=typer.colors.YELLOW,
-                        err=True,
-                    )
-                    continue
-
-                for name, obj in inspect.getmembers(module):
-                    if isinstance(obj, FunctionTool):
-                        discovered_tools.append(obj)
-            except ImportError as e:
-                typer.secho(
-                    f"Warning: Could not import module {filename}: {e}",
-                    fg=typer.colors.YELLOW,
-                    err=True,
-                )
-            except Exception as e:
-                # Print to stderr so it doesn't interfere with stdout for successful listings
-                typer.secho(
-                    f"Warning: Error inspecting module {filename}: {e}",
-                    fg=typer.colors.YELLOW,
-                    err=True,
-                )
-
     sys.path = original_sys_path  # Restore original sys.path
     return discovered_tools
 
 
+def _import_tools_from_file(module_file_path: str) -> list:
+    """Imports one tool module and returns the FunctionTool instances it defines."""
+    # Imported lazily: the static index lists tools without loading google-adk.
+    from google.adk.tools import FunctionTool
+
+    filename = os.path.basename(module_file_path)
+    module_name_for_spec = filename[:-3]  # e.g., "mock_tool_module"
+
+    # Use a fixed prefix for dynamically loaded tool modules to avoid collisions.
+    dynamic_module_name = f"genbootstrap_cli_discovered_tools.{module_name_for_spec}"
+
+    discovered_tools = []
+    try:
+        spec = importlib.util.spec_from_file_location(
+            dynamic_module_name, module_file_path
+        )
+        if spec and spec.loader:
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[
+                dynamic_module_name
+            ] = module  # Important for inspect to find the module
+            spec.loader.exec_module(module)
+        else:
+            # This case might not be hit if spec_from_file_location fails first
+            typer.secho(
+                f"Warning: Could not load module spec for {filename}",
+                fg=typer.colors.YELLOW,
+                err=True,
+            )
+            return discovered_tools
+
+        for name, obj in inspect.getmembers(module):
+            if isinstance(obj, FunctionTool):
+                discovered_tools.append(obj)
+    except ImportError as e:
+        typer.secho(
+            f"Warning: Could not import module {filename}: {e}",
+            fg=typer.colors.YELLOW,
+            err=True,
+        )
+    except Exception as e:
+        # Print to stderr so it doesn't interfere with stdout for successful listings
+        typer.secho(
+            f"Warning: Error inspecting module {filename}: {e}",
+            fg=typer.colors.YELLOW,
+            err=True,
+        )
+    return discovered_tools
+
+
 @app.command("describe")
 def describe_tool(
     tool_name: str = typer.Argument(
         ...,
         help="The name of the tool to describe.",
-    )
+    ),
+    loader: str = typer.Option("static", "--loader", help=LOADER_OPTION_HELP),
+    workers: int = typer.Option(None, "--workers", help=WORKERS_OPTION_HELP),
+    import_timeout: float = typer.Option(
+        DEFAULT_IMPORT_TIMEOUT_SECONDS, "--import-timeout", help=IMPORT_TIMEOUT_OPTION_HELP
+    ),
 ):
     """
     Shows detailed information (description, parameters, docstring) for a specified tool.
     """
-    tools = _discover_tools(TOOLS_DIR)
-    found_tool: FunctionTool | None = None
+    tools = _load_tool_infos(TOOLS_DIR, loader, workers, import_timeout)
+    found_tool: ToolInfo | None = None
     for tool in tools:
-        if tool.name == tool_name:  # Assuming tool has .name
+        if tool.name == tool_name:
             found_tool = tool
             break
 
@@ -157,53 +254,158 @@ def describe_tool(
     description = found_tool.description or "No description provided."
     typer.echo(typer.style("Description:", bold=True) + f" {description}")
 
-    # Inspect the underlying function for parameters and full docstring
-    if hasattr(found_tool, "func") and callable(found_tool.func):
-        actual_func = found_tool.func
-        sig = inspect.signature(actual_func)
+    typer.echo(typer.style("Parameters:", bold=True))
+    if not found_tool.parameters:
+        typer.echo("  No parameters.")
+    else:
+        for param in found_tool.parameters:
+            default_val = (
+                f" (default: {param.default})" if param.default is not None else ""
+            )
+            typer.echo(f"  - {param.name}: {param.annotation}{default_val}")
 
-        typer.echo(typer.style("Parameters:", bold=True))
-        if not sig.parameters:
-            typer.echo("  No parameters.")
-        else:
-            for name, param in sig.parameters.items():
-                param_type_obj = param.annotation
-                param_type_str = "Any"  # Default
-                if param_type_obj != inspect.Parameter.empty:
-                    if hasattr(param_type_obj, "__name__"):
-                        param_type_str = param_type_obj.__name__
-                    else:
-                        # For complex types like typing.Union, typing.Optional, etc.
-                        # str(param_type_obj) gives a better representation.
-                        param_type_str = str(param_type_obj)
-
-                default_val = (
-                    f" (default: {param.default})"
-                    if param.default != inspect.Parameter.empty
-                    else ""
-                )
-                typer.echo(f"  - {name}: {param_type_str}{default_val}")
-
-        func_doc = inspect.getdoc(actual_func)
-        if (
-            func_doc and func_doc.strip() != description.strip()
-        ):  # Show full doc if different from .description
-            typer.echo(typer.style("Function Docstring:", bold=True))
-            typer.echo(func_doc)
-        elif not func_doc:
-            typer.echo(
-                typer.style("Function Docstring:", bold=True) + " Not available."
+    func_doc = found_tool.docstring
+    if (
+        func_doc and func_doc.strip() != description.strip()
+    ):  # Show full doc if different from .description
+        typer.echo(typer.style("Function Docstring:", bold=True))
+        typer.echo(func_doc)
+    elif not func_doc:
+        typer.echo(typer.style("Function Docstring:", bold=True) + " Not available.")
+
+
+def _load_function_tool(tool_name: str):
+    """Imports the FunctionTool named `tool_name`, loading only its defining module."""
+    for info in _load_tool_infos(TOOLS_DIR):
+        if info.name == tool_name and info.module_path:
+            original_sys_path = list(sys.path)
+            sys.path.insert(0, str(TOOLS_DIR))
+            try:
+                for tool in _import_tools_from_file(info.module_path):
+                    if tool.name == tool_name:
+                        return tool
+            finally:
+                sys.path = original_sys_path
+    return None
+
+
+def _format_bytes(value: int | None) -> str:
+    return "n/a" if value is None else f"{value / (1024 * 1024):.1f} MiB"
+
+
+@app.command("bench")
+def bench_tool(
+    tool_name: str = typer.Argument(..., help="The name of the tool to benchmark."),
+    iterations: int = typer.Option(
+        100, "--iterations", "-n", min=1, help="Number of timed calls."
+    ),
+    concurrency: int = typer.Option(
+        1, "--concurrency", "-c", min=1, help="Calls in flight at once."
+    ),
+    inputs_file: str = typer.Option(
+        None,
+        "--inputs",
+        "-i",
+        help=(
+            "JSONL file with one object of tool arguments per line; "
+            "cycled through for all calls."
+        ),
+    ),
+    warmup: int = typer.Option(
+        5, "--warmup", min=0, help="Untimed calls before measuring."
+    ),
+    trace_memory: bool = typer.Option(
+        False,
+        "--trace-memory",
+        help=(
+            "Also report peak Python heap use "
+            "(tracemalloc; slows allocation-heavy tools)."
+        ),
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print results as JSON."),
+):
+    """
+    Benchmarks a tool's underlying function directly, without the agent or an LLM.
+
+    Reports throughput, p50/p95/p99 latency and peak memory.
+    """
+    tool = _load_function_tool(tool_name)
+    if tool is None:
+        typer.secho(f"Error: Tool '{tool_name}' not found.", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    inputs: list[dict] = []
+    if inputs_file:
+        try:
+            inputs = read_inputs(inputs_file)
+        except (OSError, ValueError) as e:
+            typer.secho(
+                f"Error reading inputs file '{inputs_file}': {e}", fg=typer.colors.RED
             )
+            raise typer.Exit(code=1)
+
+    result = run_benchmark(
+        tool.func,
+        inputs,
+        iterations=iterations,
+        concurrency=concurrency,
+        warmup=warmup,
+        trace_memory=trace_memory,
+    )
 
+    if as_json:
+        typer.echo(json.dumps({"tool": tool_name, **result.to_dict()}, indent=2))
     else:
         typer.echo(
-            typer.style("Parameters:", bold=True)
-            + " Could not inspect underlying function."
+            typer.style(f"Benchmark: {tool_name}", bold=True, fg=typer.colors.CYAN)
         )
         typer.echo(
-            typer.style("Function Docstring:", bold=True)
-            + " Could not inspect underlying function."
+            f"  Calls: {result.calls} ({result.errors} errors), "
+            f"concurrency {result.concurrency}, {len(inputs) or 1} distinct input(s)"
         )
+        typer.echo(f"  Wall time: {result.wall_seconds:.3f}s")
+        typer.echo(f"  Throughput: {result.throughput:.1f} calls/s")
+        typer.echo(
+            "  Latency: "
+            + ", ".join(
+                f"p{pct} {result.percentile(pct) * 1000:.2f} ms" for pct in (50, 95, 99)
+            )
+            + f", max {result.latencies[-1] * 1000 if result.latencies else 0:.2f} ms"
+        )
+        memory = f"  Peak memory: {_format_bytes(result.peak_rss_bytes)} RSS"
+        if result.peak_traced_bytes is not None:
+            memory += f", {_format_bytes(result.peak_traced_bytes)} traced Python heap"
+        typer.echo(memory)
+    if result.first_error:
+        typer.secho(f"First error: {result.first_error}", fg=typer.colors.YELLOW, err=True)
+    if result.errors == result.calls:
+        raise typer.Exit(code=1)
+
+
+@app.command("index-docs")
+def index_docs():
+    """
+    Builds or updates the local BM25 index used by the search_project_docs tool.
+
+    Only files changed since the last run are re-tokenized.
+    """
+    index = DocIndex(
+        index_dir=project_settings.state_path("doc_index"),
+        roots=project_settings.doc_search_paths,
+    )
+    try:
+        stats = index.update()
+    except OSError as e:
+        typer.secho(f"Error building docs index: {e}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+    finally:
+        index.close()
+    typer.echo(
+        f"Indexed {', '.join(project_settings.doc_search_paths)} into {index.index_dir}: "
+        f"{stats.indexed_files} file(s) tokenized, {stats.reused_files} unchanged, "
+        f"{stats.removed_files} removed; {stats.chunks} chunks, {stats.terms} terms "
+        f"in {stats.seconds * 1000:.0f} ms."
+    )
 
 
 if __name__ == "__main__":
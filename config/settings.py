@@ -1,3 +1,5 @@
+import os
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,8 +8,97 @@ class Settings(BaseSettings):
 
     gcp_project_id: str = "your-gcp-project-id"
     default_prompt_secret_id: str = "default-prompt"
+    gcp_location: str = "us-central1"
     default_gemini_model: str = "gemini-1.5-pro-latest"  # Agent model config
 
+    # Agent instruction: "" (built-in), "file:<prompt.yaml>"
+    # or "registry:<prompt_id>[@<version>]"
+    agent_instruction_source: str = ""
+    agent_instruction_poll_seconds: float = 60.0  # 0 disables background refresh
+    # Prebuilt tool declarations (`gen-bootstrap agent build`);
+    # defaults to the state directory.
+    agent_declarations_path: str | None = None
+
+    # Tool bulkheads (see adk/tool_limits.py); 0 disables a limit.
+    tool_max_concurrency: int = 0  # Concurrent calls per tool
+    tool_timeout_seconds: float = 30.0
+    tool_queue_timeout_seconds: float = 0.5  # Wait for a free slot before failing fast
+    # Per-tool overrides as JSON,
+    # e.g. '{"lookup": {"max_concurrency": 4, "timeout_seconds": 10}}'
+    tool_limits: dict[str, dict[str, float]] = {}
+    # Sync tool functions run on a bounded thread pool per tool (see adk/tool_offload.py).
+    sync_tool_max_workers: int = 4
+    sync_tool_workers: dict[str, int] = {}  # Per-tool overrides, keyed by tool name
+
+    # Local BM25 search over project documentation (tools/doc_search.py)
+    doc_search_paths: list[str] = ["docs", "memory-bank"]
+    doc_search_refresh_seconds: float = (
+        30.0  # How often to check the corpus for changes
+    )
+
+    # `gen-bootstrap run --prod` / `python -m utils.serving` (see utils/serving.py)
+    server_workers: int = 0  # 0 sizes the worker pool from the container's CPU quota
+    server_keep_alive_seconds: int = 75
+    server_backlog: int = 2048
+    # Admission control for the main.py app (see utils/admission.py); 0 disables a limit.
+    admission_max_in_flight: int = 0  # Concurrent requests per worker
+    admission_max_queue: int = 0  # Requests that may wait for a slot
+    admission_queue_timeout_seconds: float = 1.0
+    # Per-route limits as JSON, e.g. '{"/run": {"max_in_flight": 8, "max_queue": 16}}'
+    admission_route_limits: dict[str, dict[str, float]] = {}
+    admission_retry_after_seconds: float = 1.0
+    # Exact-match cache for stateless /run requests (see adk/response_cache.py)
+    response_cache_enabled: bool = False
+    response_cache_ttl_seconds: float = 300.0
+    response_cache_max_entries: int = 1000
+    response_cache_max_bytes: int = 32 * 1024 * 1024
+    # /metrics (see utils/metrics.py, utils/http_metrics.py)
+    metrics_event_loop_interval_seconds: float = 0.5  # Event loop lag sampling
+    # Shared snapshot directory for multi-worker servers; set automatically by
+    # `run --prod` / `python -m utils.serving` when there is more than one worker.
+    metrics_multiproc_dir: str | None = None
+    metrics_multiproc_interval_seconds: float = 5.0  # How often workers publish
+
+    # ADK session store (sessions/sqlite_session_service.py)
+    session_db_path: str = "adk_sessions.db"
+    session_db_pool_size: int = 8  # Connections, and threads for the async API
+    session_db_synchronous: str = "NORMAL"  # With WAL, fsync at checkpoints only
+    session_db_mmap_bytes: int = 256 * 1024 * 1024
+    session_db_cache_kib: int = 16 * 1024  # Page cache per connection
+    session_db_busy_timeout_ms: int = 5000
+    session_db_shards: int = 1  # >1: sessions hashed onto this many files
+    # Every N events a state snapshot; loads then read only recent events. 0 = off
+    session_snapshot_interval_events: int = 0
+    # Per-worker LRU cache with write-behind (sessions/cached_session_service.py)
+    session_cache_enabled: bool = True
+    session_cache_max_entries: int = 1000
+    session_cache_max_bytes: int = 64 * 1024 * 1024
+    session_cache_flush_interval_seconds: float = 0.05
+    session_cache_validate_reads: bool = (
+        True  # False only with sticky, single-worker routing
+    )
+    # Retention and compaction (sessions/compaction.py); 0 disables a limit
+    session_retention_max_age_days: float = 0  # Idle sessions older than this go
+    session_retention_max_events: int = 0  # Per session; oldest events go first
+    session_retention_max_db_bytes: int = 0
+    session_compaction_interval_seconds: int = 0  # Background job period; 0 is off
+    session_compaction_batch_size: int = 500  # Rows (or pages) per transaction
+    session_compaction_batch_pause_ms: int = 20
+
+    # Project-local directory for caches, mirrors and indexes (git-ignored)
+    local_state_dir: str = ".gen_bootstrap"
+
+    # Opt-in encrypted on-disk cache for `gen-bootstrap secrets get`
+    secret_cache_enabled: bool = False
+    secret_cache_ttl_seconds: int = 3600
+    secret_cache_dir: str | None = None  # Defaults to ~/.cache/gen-bootstrap/secrets
+    # Kept apart from the entries; defaults to ~/.config/gen-bootstrap/secret-cache.key
+    secret_cache_key_path: str | None = None
+
+    def state_path(self, *parts: str) -> str:
+        """Returns a path inside the project-local state directory."""
+        return os.path.join(self.local_state_dir, *parts)
+
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
     )
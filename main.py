@@ -1,51 +1,51 @@
+import inspect
 import logging
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from config import settings as project_settings  # Import project settings
+from utils.http_metrics import install_request_metrics
 from utils.logging_utils import configure_logging
+from utils.metrics import CONTENT_TYPE_LATEST, REGISTRY, MultiprocessMetrics
 
 configure_logging()
 logger = logging.getLogger(__name__)
 
 ADK_AGENT_INSTANCE_PATH = "adk.agent:root_agent"
-app: FastAPI
+# ADK loads each agent as <app name>.agent.root_agent from this directory, so
+# root_agent is served under the app name "adk".
+ADK_AGENTS_DIR = os.path.dirname(os.path.abspath(__file__))
 
-try:
-    from google.adk.cli.fast_api import get_fast_api_app
-    from google.adk.runtime.config import RuntimeConfig
+# Run by the app's lifespan: startup hooks in order, shutdown hooks in reverse.
+startup_hooks: list = []
+shutdown_hooks: list = []
 
-    logger.info(
-        f"Init FastAPI app with google-adk helper for agent: {ADK_AGENT_INSTANCE_PATH}"
-    )
 
-    adk_runtime_config = RuntimeConfig(
-        session_config=RuntimeConfig.SessionConfig(
-            store_url=f"sqlite:///{os.getcwd()}/adk_sessions.db"
-        ),
-        llm_config=RuntimeConfig.LlmConfig(
-            model=project_settings.default_gemini_model
-        ),  # Configure agent model via settings
-    )
+async def _run_hook(hook):
+    result = hook()
+    if inspect.isawaitable(result):
+        await result
 
-    app = get_fast_api_app(
-        agent_path_or_dir=ADK_AGENT_INSTANCE_PATH,
-        runtime_config=adk_runtime_config,
-        web=True,
-        title="gen-bootstrap ADK Application (via ADK Helper)",
-        description=(
-            "A FastAPI application serving an agent built with Google ADK. "
-            "Provides ADK standard endpoints like /run, /openapi.json, "
-            "and /adk_web for the UI."
-        ),
-        version="0.2.0-alpha",
-    )
-    logger.info(
-        f"FastAPI app initialized with get_fast_api_app. "
-        f"ADK Web UI at /adk_web. Agent: {ADK_AGENT_INSTANCE_PATH}"
-    )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # ADK builds its app with a lifespan, so FastAPI skips `add_event_handler` hooks.
+    for hook in startup_hooks:
+        await _run_hook(hook)
+    try:
+        yield
+    finally:
+        for hook in reversed(shutdown_hooks):
+            await _run_hook(hook)
+
+
+app: FastAPI
+
+try:
+    from adk.fast_api_app import build_adk_app, serve_static_files_last
 except ImportError as e:
     logger.error(
         f"Fatal: Could not import 'get_fast_api_app' from "
@@ -53,7 +53,12 @@ except ImportError as e:
         exc_info=True,
     )
     logger.error("Please ensure 'google-adk' is installed correctly.")
-    app = FastAPI(title="gen-bootstrap ADK Application - ERROR", version="0.0.0-error")
+    adk_available = False
+    app = FastAPI(
+        title="gen-bootstrap ADK Application - ERROR",
+        version="0.0.0-error",
+        lifespan=lifespan,
+    )
 
     @app.get("/")
     @app.post("/{path:path}")
@@ -63,6 +68,71 @@ except ImportError as e:
             "message": "Could not initialize application via get_fast_api_app.",
         }
 
+else:
+    adk_available = True
+    logger.info(
+        f"Init FastAPI app with google-adk helper for agent: {ADK_AGENT_INSTANCE_PATH}"
+    )
+    from adk.agent import root_agent
+    from sessions.compaction import start_compaction_jobs
+    from sessions.sqlite_session_service import build_session_service
+
+    # Pooled, WAL-mode SQLite store tuned via SESSION_DB_* settings, behind a
+    # per-worker LRU cache with write-behind (SESSION_CACHE_* settings).
+    session_service = build_session_service(project_settings.settings)
+    app = build_adk_app(
+        agent_dir=ADK_AGENTS_DIR,
+        session_service=session_service,
+        lifespan=lifespan,
+        web=True,
+    )
+    app.title = "gen-bootstrap ADK Application (via ADK Helper)"
+    app.description = (
+        "A FastAPI application serving an agent built with Google ADK. "
+        "Provides ADK standard endpoints like /run, /run_sse, /openapi.json, "
+        "and /dev-ui for the UI."
+    )
+    app.version = "0.2.0-alpha"
+
+    # Retention and incremental vacuum in small batches (SESSION_RETENTION_* settings).
+    compaction_jobs = []
+
+    def start_session_compaction():
+        compaction_jobs.extend(
+            start_compaction_jobs(session_service, project_settings.settings)
+        )
+
+    def stop_session_compaction():
+        for compaction_job in compaction_jobs:
+            compaction_job.stop()
+
+    startup_hooks.append(start_session_compaction)
+    # Writes any queued session events before the worker exits, after compaction stops.
+    shutdown_hooks.append(session_service.close)
+    shutdown_hooks.append(stop_session_compaction)
+
+    from utils.admission import install_admission_control
+
+    # Sheds requests beyond the ADMISSION_* limits with 503/429 and Retry-After.
+    install_admission_control(app, project_settings.settings)
+    from adk.response_cache import install_response_cache
+
+    # Added after admission control, so it runs first: cache hits skip the limits.
+    install_response_cache(app, project_settings.settings, session_service, root_agent)
+    from adk.streaming import install_stream_metrics
+
+    # Times the text chunks of ADK's /run_sse, admission waits included.
+    install_stream_metrics(app)
+    logger.info(
+        f"FastAPI app initialized with get_fast_api_app. "
+        f"ADK Web UI at /dev-ui. Agent: {ADK_AGENT_INSTANCE_PATH}"
+    )
+
+# Added last, so it is outermost: latency includes admission waits and cache hits.
+event_loop_lag_monitor = install_request_metrics(app, project_settings.settings)
+startup_hooks.append(event_loop_lag_monitor.start)
+shutdown_hooks.append(event_loop_lag_monitor.stop)
+
 
 @app.get("/custom_health")
 async def custom_health_check():
@@ -70,6 +140,30 @@ async def custom_health_check():
     return {"status": "healthy", "message": "gen-bootstrap custom health OK."}
 
 
+# With several workers, each publishes snapshots to METRICS_MULTIPROC_DIR and any
+# of them answers /metrics for all (set up by `run --prod`, see utils/serving.py).
+metrics_exporter = None
+if project_settings.settings.metrics_multiproc_dir:
+    metrics_exporter = MultiprocessMetrics(
+        REGISTRY,
+        project_settings.settings.metrics_multiproc_dir,
+        project_settings.settings.metrics_multiproc_interval_seconds,
+    )
+    startup_hooks.append(metrics_exporter.start)
+    shutdown_hooks.append(metrics_exporter.stop)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition of the serving stack's metrics (all workers)."""
+    body = metrics_exporter.render() if metrics_exporter else REGISTRY.render()
+    return PlainTextResponse(body, media_type=CONTENT_TYPE_LATEST)
+
+
+if adk_available:
+    # ADK mounts its dev UI files at "/"; keep them behind the routes added above.
+    serve_static_files_last(app)
+
 if __name__ == "__main__":
     print("This app is intended to be run using the CLI or ADK's own tools:")
     print("  To start the FastAPI server (which includes the ADK agent):")
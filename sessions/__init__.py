@@ -0,0 +1,2 @@
+# sessions/__init__.py
+# This file makes the 'sessions' directory a Python package.
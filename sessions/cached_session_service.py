@@ -0,0 +1,433 @@
+# sessions/cached_session_service.py
+"""Per-worker LRU session cache with write-behind persistence."""
+
+import asyncio
+import collections
+import functools
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+from google.adk.events.event import Event
+from google.adk.sessions.base_session_service import (
+    BaseSessionService,
+    GetSessionConfig,
+    ListEventsResponse,
+    ListSessionsResponse,
+)
+from google.adk.sessions.session import Session
+from google.adk.sessions.state import State
+
+from sessions.sharded_session_service import ShardedSessionService
+from sessions.sqlite_session_service import (
+    EventRecord,
+    SQLiteSessionService,
+    split_state_delta,
+)
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+SESSION_CACHE_LOOKUPS = REGISTRY.counter(
+    "gen_bootstrap_session_cache_lookups_total",
+    "Session reads by cache outcome (hit, miss, stale).",
+    ["result"],
+)
+SESSION_CACHE_EVICTIONS = REGISTRY.counter(
+    "gen_bootstrap_session_cache_evictions_total", "Sessions evicted from the cache."
+)
+SESSION_WRITE_BEHIND_PENDING = REGISTRY.gauge(
+    "gen_bootstrap_session_write_behind_pending",
+    "Appended events not yet written to the session database.",
+)
+SESSION_FLUSH_SECONDS = REGISTRY.histogram(
+    "gen_bootstrap_session_flush_seconds", "Time to write one batch of pending events."
+)
+
+_SessionKey = tuple[str, str, str]
+
+
+class _CacheEntry:
+    __slots__ = ("session", "size", "persisted_update_time")
+
+    def __init__(self, session: Session, size: int, persisted_update_time: float):
+        self.session = session
+        self.size = size
+        # Last update time this worker knows the database holds for the session.
+        self.persisted_update_time = persisted_update_time
+
+
+def _session_size(session: Session) -> int:
+    return sum(
+        len(event.model_dump_json(exclude_none=True)) for event in session.events
+    )
+
+
+def _apply_state_delta(state: dict, delta: dict) -> None:
+    # Same rule as BaseSessionService: everything except temp: keys is kept.
+    for key, value in delta.items():
+        if not key.startswith(State.TEMP_PREFIX):
+            state[key] = value
+
+
+class CachedSessionService(BaseSessionService):
+    """Serves sessions from memory and writes appended events back in batches.
+
+    Sessions are cached per worker in an LRU bounded by entry count and by the
+    serialized size of their events. Appends update the cached session and are
+    queued; a background thread writes the queue to the backing store in one
+    transaction every `flush_interval_seconds` (or sooner once `max_batch`
+    events are pending). `close()` stops the flusher and writes everything
+    still queued, so a graceful shutdown loses no events; a crash can lose at
+    most one flush interval.
+
+    With `validate_reads`, a cache hit first compares the session's stored
+    update time (one primary-key read) with what this worker last wrote, and
+    reloads the session if another worker changed it. Disable it only when
+    every session is pinned to one worker (sticky routing, one worker per
+    instance); hot conversations are then served entirely from memory.
+    """
+
+    def __init__(
+        self,
+        backing: SQLiteSessionService | ShardedSessionService,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        flush_interval_seconds: float = 0.05,
+        max_batch: int = 500,
+        validate_reads: bool = True,
+    ):
+        self.backing = backing
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_batch = max_batch
+        self.validate_reads = validate_reads
+        self._entries: collections.OrderedDict[_SessionKey, _CacheEntry] = (
+            collections.OrderedDict()
+        )
+        self._bytes = 0
+        self._app_state: dict[str, dict[str, Any]] = {}
+        self._user_state: dict[tuple[str, str], dict[str, Any]] = {}
+        self._pending: list[EventRecord] = []
+        self._pending_by_key: collections.Counter = collections.Counter()
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()  # Keeps batches in append order
+        self._wake = threading.Event()
+        self._closed = False
+        self._flusher = threading.Thread(
+            target=self._run_flusher, name="session-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    # --- Cache bookkeeping ------------------------------------------------------
+
+    def _remember_shared_state(self, session: Session) -> None:
+        app_state = self._app_state.setdefault(session.app_name, {})
+        user_state = self._user_state.setdefault(
+            (session.app_name, session.user_id), {}
+        )
+        for key, value in session.state.items():
+            if key.startswith(State.APP_PREFIX):
+                app_state[key[len(State.APP_PREFIX) :]] = value
+            elif key.startswith(State.USER_PREFIX):
+                user_state[key[len(State.USER_PREFIX) :]] = value
+
+    def _insert(self, session: Session) -> None:
+        key = (session.app_name, session.user_id, session.id)
+        size = _session_size(session)
+        with self._lock:
+            self._remember_shared_state(session)
+            if size > self.max_bytes:
+                return  # Too large to cache; served from the store
+            self._drop(key)
+            self._entries[key] = _CacheEntry(session, size, session.last_update_time)
+            self._bytes += size
+            self._evict()
+
+    def _drop(self, key: _SessionKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            SESSION_CACHE_EVICTIONS.inc()
+
+    def _view(self, session: Session, config: Optional[GetSessionConfig]) -> Session:
+        """A copy safe to hand out: own event list and state, shared Event objects."""
+        state = dict(session.state)
+        for key, value in self._app_state.get(session.app_name, {}).items():
+            state[State.APP_PREFIX + key] = value
+        for key, value in self._user_state.get(
+            (session.app_name, session.user_id), {}
+        ).items():
+            state[State.USER_PREFIX + key] = value
+        events = list(session.events)
+        if config and config.num_recent_events:
+            events = events[-config.num_recent_events :]
+        if config and config.after_timestamp:
+            events = [
+                event for event in events if event.timestamp >= config.after_timestamp
+            ]
+        return session.model_copy(update={"state": state, "events": events})
+
+    @property
+    def cached_sessions(self) -> int:
+        return len(self._entries)
+
+    @property
+    def cached_bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def pending_events(self) -> int:
+        return len(self._pending)
+
+    # --- BaseSessionService -------------------------------------------------------
+
+    def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        # Written through: the insert decides whether the ID is free.
+        session = self.backing.create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        self._insert(
+            session.model_copy(update={"state": dict(session.state), "events": []})
+        )
+        return session
+
+    def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        key = (app_name, user_id, session_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and self.validate_reads:
+            stored = self.backing.session_update_time(
+                app_name=app_name, user_id=user_id, session_id=session_id
+            )
+            if stored is None or stored > entry.persisted_update_time:
+                SESSION_CACHE_LOOKUPS.labels("stale").inc()
+                with self._lock:
+                    self._drop(key)
+                entry = None
+                if stored is None:
+                    return None
+        if entry is not None:
+            SESSION_CACHE_LOOKUPS.labels("hit").inc()
+            with self._lock:
+                return self._view(entry.session, config)
+
+        SESSION_CACHE_LOOKUPS.labels("miss").inc()
+        if self._pending_by_key.get(key):
+            self.flush()  # The store must include this session's queued events
+        session = self.backing.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        if session is None:
+            return None
+        self._insert(session)
+        with self._lock:
+            return self._view(session, config)
+
+    def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        super().append_event(session, event)  # Updates the caller's copy
+        record = EventRecord.from_event(session, event)
+        key = (session.app_name, session.user_id, session.id)
+        session.last_update_time = record.timestamp
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None and not self._pending_by_key.get(key):
+            # Not cached and nothing queued: make sure the session exists before
+            # accepting the event, since the write happens later.
+            if (
+                self.backing.session_update_time(
+                    app_name=session.app_name,
+                    user_id=session.user_id,
+                    session_id=session.id,
+                )
+                is None
+            ):
+                raise ValueError(f"Session '{session.id}' not found.")
+
+        app_delta, user_delta, _ = split_state_delta(record.state_delta)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.session is not session:
+                    entry.session.events.append(event)
+                    _apply_state_delta(entry.session.state, record.state_delta)
+                entry.session.last_update_time = record.timestamp
+                entry.size += len(record.data)
+                self._bytes += len(record.data)
+                self._entries.move_to_end(key)
+                self._evict()
+            if app_delta:
+                self._app_state.setdefault(session.app_name, {}).update(app_delta)
+            if user_delta:
+                self._user_state.setdefault(
+                    (session.app_name, session.user_id), {}
+                ).update(user_delta)
+            self._pending.append(record)
+            self._pending_by_key[key] += 1
+            SESSION_WRITE_BEHIND_PENDING.inc()
+            if len(self._pending) >= self.max_batch:
+                self._wake.set()
+        return event
+
+    def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        self.flush()
+        return self.backing.list_sessions(app_name=app_name, user_id=user_id)
+
+    def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self.flush()
+        self.backing.delete_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        with self._lock:
+            self._drop((app_name, user_id, session_id))
+
+    def list_events(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> ListEventsResponse:
+        self.flush()
+        return self.backing.list_events(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+
+    # --- Write-behind ---------------------------------------------------------------
+
+    def flush(self) -> int:
+        """Writes every queued event in one transaction; returns how many were written.
+
+        On failure the batch is put back at the front of the queue and the
+        error is raised, so nothing is dropped.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            started = time.perf_counter()
+            try:
+                missing = self.backing.append_event_records(batch)
+            except BaseException:
+                with self._lock:
+                    self._pending = batch + self._pending
+                raise
+            SESSION_FLUSH_SECONDS.observe(time.perf_counter() - started)
+
+            written_until: dict[_SessionKey, float] = {}
+            for record in batch:
+                key = (record.app_name, record.user_id, record.session_id)
+                written_until[key] = max(written_until.get(key, 0.0), record.timestamp)
+            with self._lock:
+                for record in batch:
+                    key = (record.app_name, record.user_id, record.session_id)
+                    self._pending_by_key[key] -= 1
+                    if self._pending_by_key[key] <= 0:
+                        del self._pending_by_key[key]
+                for key, timestamp in written_until.items():
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        entry.persisted_update_time = max(
+                            entry.persisted_update_time, timestamp
+                        )
+                SESSION_WRITE_BEHIND_PENDING.dec(len(batch))
+            if missing:
+                logger.warning(
+                    "Dropped events for sessions deleted before they were written.",
+                    extra={"dropped_events": len(missing)},
+                )
+            return len(batch) - len(missing)
+
+    def _run_flusher(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            if self._pending and not self._closed:
+                try:
+                    self.flush()
+                except Exception as e:  # Retried on the next interval
+                    logger.error(
+                        "Session write-behind flush failed; will retry.",
+                        extra={"pending_events": len(self._pending), "error": str(e)},
+                    )
+
+    def close(self, flush_attempts: int = 5) -> None:
+        """Stops the flusher, writes every queued event, then closes the store."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._flusher.join()
+        for attempt in range(1, flush_attempts + 1):
+            try:
+                self.flush()
+                break
+            except Exception as e:
+                logger.error(
+                    "Final session flush failed.",
+                    extra={
+                        "attempt": attempt,
+                        "pending_events": len(self._pending),
+                        "error": str(e),
+                    },
+                )
+                if attempt == flush_attempts:
+                    raise
+                time.sleep(0.1 * attempt)
+        self.backing.close()
+
+    # --- Async variants ---------------------------------------------------------------
+
+    async def _offload(self, method, /, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.backing._executor, functools.partial(method, **kwargs)
+        )
+
+    async def create_session_async(self, **kwargs) -> Session:
+        return await self._offload(self.create_session, **kwargs)
+
+    async def get_session_async(self, **kwargs) -> Optional[Session]:
+        key = (kwargs["app_name"], kwargs["user_id"], kwargs["session_id"])
+        if not self.validate_reads and key in self._entries:
+            return self.get_session(**kwargs)  # Memory only; no need for a thread
+        return await self._offload(self.get_session, **kwargs)
+
+    async def list_sessions_async(self, **kwargs) -> ListSessionsResponse:
+        return await self._offload(self.list_sessions, **kwargs)
+
+    async def delete_session_async(self, **kwargs) -> None:
+        return await self._offload(self.delete_session, **kwargs)
+
+    async def append_event_async(self, session: Session, event: Event) -> Event:
+        key = (session.app_name, session.user_id, session.id)
+        if key in self._entries or self._pending_by_key.get(key):
+            return self.append_event(
+                session, event
+            )  # Memory only; no need for a thread
+        return await self._offload(self.append_event, session=session, event=event)
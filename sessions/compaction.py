@@ -0,0 +1,398 @@
+# sessions/compaction.py
+"""Retention and compaction for the SQLite session store."""
+
+import dataclasses
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sessions.sqlite_pool import SQLitePool
+from utils.metrics import REGISTRY
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SESSION_COMPACTION_REMOVED = REGISTRY.counter(
+    "gen_bootstrap_session_compaction_removed_total",
+    "Rows removed by session compaction, by reason (expired, trimmed, size).",
+    ["reason"],
+)
+SESSION_COMPACTION_SECONDS = REGISTRY.histogram(
+    "gen_bootstrap_session_compaction_seconds",
+    "Duration of one session compaction pass.",
+)
+
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """What compaction removes; a limit of 0 disables it.
+
+    * `max_age_seconds`: sessions not updated for this long are deleted.
+    * `max_events_per_session`: older events beyond this count are deleted.
+    * `max_db_bytes`: least recently updated sessions are deleted until the
+      live data (pages in use) fits.
+
+    Work is split into transactions of at most `batch_size` rows (or pages,
+    for incremental vacuum), with `batch_pause_seconds` between them, so live
+    traffic never waits long for the write lock.
+    """
+
+    max_age_seconds: float = 0
+    max_events_per_session: int = 0
+    max_db_bytes: int = 0
+    batch_size: int = 500
+    batch_pause_seconds: float = 0.02
+
+    @classmethod
+    def from_settings(cls, settings) -> "RetentionPolicy":
+        return cls(
+            max_age_seconds=settings.session_retention_max_age_days * 86400,
+            max_events_per_session=settings.session_retention_max_events,
+            max_db_bytes=settings.session_retention_max_db_bytes,
+            batch_size=settings.session_compaction_batch_size,
+            batch_pause_seconds=settings.session_compaction_batch_pause_ms / 1000,
+        )
+
+
+@dataclass
+class CompactionReport:
+    expired_sessions: int = 0
+    trimmed_events: int = 0
+    evicted_sessions: int = 0  # Removed to meet max_db_bytes
+    deleted_events: int = 0  # Events of expired or evicted sessions
+    vacuumed_pages: int = 0
+    live_bytes_before: int = 0
+    live_bytes_after: int = 0
+    file_bytes_before: int = 0
+    file_bytes_after: int = 0
+    transactions: int = 0
+    seconds: float = 0.0
+    notes: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+    @classmethod
+    def combine(cls, reports: list["CompactionReport"]) -> "CompactionReport":
+        """Totals per-shard reports; `seconds` is the sum, as passes run one by one."""
+        combined = cls()
+        for report in reports:
+            for name, value in report.to_dict().items():
+                setattr(combined, name, getattr(combined, name) + value)
+        return combined
+
+
+def _page_stats(pool: SQLitePool) -> tuple[int, int]:
+    """(live bytes, file bytes): pages in use vs. pages in the file."""
+    with pool.read() as conn:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return (page_count - free_pages) * page_size, page_count * page_size
+
+
+class _Cancelled(Exception):
+    pass
+
+
+class _Compactor:
+    def __init__(
+        self,
+        pool: SQLitePool,
+        policy: RetentionPolicy,
+        report: CompactionReport,
+        cancel: threading.Event,
+    ):
+        self.pool = pool
+        self.policy = policy
+        self.report = report
+        self.cancel = cancel
+
+    def _pause(self) -> None:
+        # Between transactions: let live writers in, and stop early on shutdown.
+        if self.cancel.wait(self.policy.batch_pause_seconds):
+            raise _Cancelled()
+
+    def _delete_sessions(self, candidates: list[tuple[str, str, str, float]]) -> int:
+        """Deletes sessions not updated since they were picked; returns how many.
+
+        Each candidate is `(app_name, user_id, id, update_time)` as read when
+        it was picked. The session row goes first, in a write transaction that
+        re-checks `update_time`, so a session that received an event since is
+        kept whole, and later appends to a deleted session fail rather than
+        leave orphans. Its events are then removed at most `batch_size` per
+        transaction, up to the newest one it had, so a session re-created
+        under the same ID keeps its new events.
+        """
+        deleted_sessions = 0
+        deleted_events = 0
+        for app_name, user_id, session_id, picked_update_time in candidates:
+            key = (app_name, user_id, session_id)
+            with self.pool.write() as conn:
+                deleted = conn.execute(
+                    "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ? "
+                    "AND update_time <= ?",
+                    (*key, picked_update_time),
+                ).rowcount
+                if deleted:
+                    conn.execute(
+                        "DELETE FROM session_snapshots "
+                        "WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                        key,
+                    )
+                    last_seq = conn.execute(
+                        "SELECT MAX(seq) FROM events "
+                        "WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                        key,
+                    ).fetchone()[0]
+            self.report.transactions += 1
+            if not deleted:
+                continue  # Updated since it was picked
+            deleted_sessions += 1
+            while last_seq is not None:
+                self._pause()
+                with self.pool.write() as conn:
+                    removed = conn.execute(
+                        "DELETE FROM events WHERE seq IN (SELECT seq FROM events "
+                        "WHERE app_name = ? AND user_id = ? AND session_id = ? "
+                        "AND seq <= ? LIMIT ?)",
+                        (*key, last_seq, self.policy.batch_size),
+                    ).rowcount
+                self.report.transactions += 1
+                deleted_events += removed
+                if removed < self.policy.batch_size:
+                    break
+        self.report.deleted_events += deleted_events
+        return deleted_sessions
+
+    def expire(self, now: float) -> None:
+        cutoff = now - self.policy.max_age_seconds
+        while True:
+            with self.pool.read() as conn:
+                candidates = conn.execute(
+                    "SELECT app_name, user_id, id, update_time FROM sessions "
+                    "WHERE update_time < ? LIMIT ?",
+                    (cutoff, self.policy.batch_size),
+                ).fetchall()
+            if not candidates:
+                return
+            expired = self._delete_sessions(candidates)
+            self.report.expired_sessions += expired
+            SESSION_COMPACTION_REMOVED.labels("expired").inc(expired)
+            self._pause()
+
+    def trim(self) -> None:
+        limit = self.policy.max_events_per_session
+        if limit <= 0:
+            return
+        # event_count counts every event ever appended, so it bounds the stored
+        # events from above: sessions at or under the limit need no events read.
+        with self.pool.read() as conn:
+            candidates = conn.execute(
+                "SELECT app_name, user_id, id FROM sessions WHERE event_count > ?",
+                (limit,),
+            ).fetchall()
+        for key in candidates:
+            while True:
+                with self.pool.read() as conn:
+                    # The newest event to drop: the one just past the `limit` newest.
+                    cutoff = conn.execute(
+                        "SELECT seq FROM events WHERE app_name = ? AND user_id = ? "
+                        "AND session_id = ? ORDER BY seq DESC LIMIT 1 OFFSET ?",
+                        (*key, limit),
+                    ).fetchone()
+                if cutoff is None:
+                    break
+                # Oldest first; their state deltas already live in the session's
+                # stored state, so trimming drops transcript, not state.
+                with self.pool.write() as conn:
+                    removed = conn.execute(
+                        "DELETE FROM events WHERE seq IN (SELECT seq FROM events "
+                        "WHERE app_name = ? AND user_id = ? AND session_id = ? "
+                        "AND seq <= ? ORDER BY seq LIMIT ?)",
+                        (*key, cutoff[0], self.policy.batch_size),
+                    ).rowcount
+                self.report.transactions += 1
+                self.report.trimmed_events += removed
+                SESSION_COMPACTION_REMOVED.labels("trimmed").inc(removed)
+                self._pause()
+                if not removed:
+                    break
+
+    def enforce_size(self) -> None:
+        while _page_stats(self.pool)[0] > self.policy.max_db_bytes:
+            with self.pool.read() as conn:
+                candidates = conn.execute(
+                    "SELECT app_name, user_id, id, update_time FROM sessions "
+                    "ORDER BY update_time LIMIT 1"
+                ).fetchall()
+            if not candidates:
+                self.report.notes.append(
+                    "Live data still exceeds max_db_bytes with no sessions left to remove."
+                )
+                return
+            evicted = self._delete_sessions(candidates)
+            self.report.evicted_sessions += evicted
+            SESSION_COMPACTION_REMOVED.labels("size").inc(evicted)
+            self._pause()
+
+    def vacuum(self) -> None:
+        with self.pool.read() as conn:
+            mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        if mode != AUTO_VACUUM_INCREMENTAL:
+            self.report.notes.append(
+                "auto_vacuum is not INCREMENTAL, so freed pages are reused but the file "
+                "does not shrink; run `gen-bootstrap sessions compact --full-vacuum` once."
+            )
+            return
+        while True:
+            with self.pool.write() as conn:
+                free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if not free_pages:
+                    return
+                step = min(free_pages, self.policy.batch_size)
+                conn.execute(f"PRAGMA incremental_vacuum({step})").fetchall()
+            self.report.transactions += 1
+            self.report.vacuumed_pages += step
+            self._pause()
+
+
+def compact_session_store(
+    pool: SQLitePool,
+    policy: RetentionPolicy,
+    now: Optional[float] = None,
+    cancel: Optional[threading.Event] = None,
+) -> CompactionReport:
+    """Runs one retention and compaction pass over the store behind `pool`.
+
+    Order: expire idle sessions, trim long sessions, evict least recently
+    updated sessions until the size cap is met, then return free pages to the
+    filesystem with incremental vacuum. Setting `cancel` stops the pass after
+    the current transaction; the next pass picks up where it left off.
+    """
+    started = time.perf_counter()
+    report = CompactionReport()
+    report.live_bytes_before, report.file_bytes_before = _page_stats(pool)
+    compactor = _Compactor(pool, policy, report, cancel or threading.Event())
+    try:
+        if policy.max_age_seconds > 0:
+            compactor.expire(time.time() if now is None else now)
+        if policy.max_events_per_session > 0:
+            compactor.trim()
+        if policy.max_db_bytes > 0:
+            compactor.enforce_size()
+        compactor.vacuum()
+    except _Cancelled:
+        report.notes.append("Compaction stopped early.")
+    report.live_bytes_after, report.file_bytes_after = _page_stats(pool)
+    report.seconds = time.perf_counter() - started
+    SESSION_COMPACTION_SECONDS.observe(report.seconds)
+    return report
+
+
+def full_vacuum(pool: SQLitePool) -> None:
+    """Switches the database to incremental auto-vacuum and rebuilds it.
+
+    VACUUM rewrites the whole file and blocks every writer while it runs; use
+    it once on databases created before incremental vacuum was enabled, ideally
+    with the service stopped.
+    """
+    with pool.exclusive() as conn:
+        conn.execute(f"PRAGMA auto_vacuum={AUTO_VACUUM_INCREMENTAL}")
+        conn.execute("VACUUM")
+
+
+class SessionCompactionJob:
+    """Runs `compact_session_store` every `interval_seconds` on a daemon thread.
+
+    Every uvicorn worker starts one, but only the worker holding an exclusive
+    lock on `<db>.compaction.lock` compacts, so a pass never runs twice at once.
+    """
+
+    def __init__(
+        self, pool: SQLitePool, policy: RetentionPolicy, interval_seconds: float
+    ):
+        self.pool = pool
+        self.policy = policy
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="session-compaction", daemon=True
+        )
+
+    def start(self) -> "SessionCompactionJob":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.run_once()
+
+    def run_once(self) -> Optional[CompactionReport]:
+        """One pass, or None if another process holds the compaction lock."""
+        with open(f"{self.pool.path}.compaction.lock", "a") as lock_file:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    return None
+            try:
+                report = compact_session_store(
+                    self.pool, self.policy, cancel=self._stop
+                )
+            except Exception as e:
+                logger.error("Session compaction failed.", extra={"error": str(e)})
+                return None
+        logger.info(
+            "Session compaction finished.",
+            extra={
+                key: value for key, value in report.to_dict().items() if key != "notes"
+            },
+        )
+        for note in report.notes:
+            logger.warning(note)
+        return report
+
+
+def session_store_pools(session_service) -> list[SQLitePool]:
+    """The connection pools behind a service from `build_session_service`, one
+    per shard."""
+    store = getattr(session_service, "backing", session_service)
+    return [shard.pool for shard in getattr(store, "shards", [store])]
+
+
+def shard_policy(policy: RetentionPolicy, shard_count: int) -> RetentionPolicy:
+    """Splits the size cap evenly; sessions hash uniformly across shards."""
+    if not policy.max_db_bytes or shard_count <= 1:
+        return policy
+    return dataclasses.replace(policy, max_db_bytes=policy.max_db_bytes // shard_count)
+
+
+def start_compaction_jobs(session_service, settings) -> list[SessionCompactionJob]:
+    """Starts one background job per store file of a `build_session_service` service.
+
+    Returns no jobs when SESSION_COMPACTION_INTERVAL_SECONDS is 0.
+    """
+    if settings.session_compaction_interval_seconds <= 0:
+        return []
+    pools = session_store_pools(session_service)
+    policy = shard_policy(RetentionPolicy.from_settings(settings), len(pools))
+    return [
+        SessionCompactionJob(
+            pool, policy, settings.session_compaction_interval_seconds
+        ).start()
+        for pool in pools
+    ]
@@ -0,0 +1,238 @@
+# sessions/migration.py
+"""Copies an unsharded session database into shard files, or into a single
+file in this project's layout (a shard count of 1)."""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from dataclasses import dataclass, field
+
+from sessions.sharded_session_service import ShardedSessionService, shard_paths
+from sessions.sqlite_pool import SQLiteTuning
+from sessions.sqlite_session_service import SQLiteSessionService, split_state_delta
+
+logger = logging.getLogger(__name__)
+
+LAYOUT_SQLITE = "sqlite"  # sessions/sqlite_session_service.py
+# ADK's DatabaseSessionService, i.e. the original `sqlite:///adk_sessions.db` store
+LAYOUT_ADK = "adk"
+
+
+@dataclass
+class MigrationReport:
+    source: str
+    layout: str
+    targets: list[str] = field(default_factory=list)
+    sessions: int = 0
+    events: int = 0
+    shared_states: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+class _SingleFileTarget:
+    """Stands in for a `ShardedSessionService` when migrating to one file."""
+
+    def __init__(self, store: SQLiteSessionService):
+        self.state_shard = store
+
+    def shard_for(self, session_id: str) -> SQLiteSessionService:
+        return self.state_shard
+
+    def close(self) -> None:
+        self.state_shard.close()
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def detect_layout(conn: sqlite3.Connection) -> str:
+    event_columns = _columns(conn, "events")
+    if "data" in event_columns:
+        return LAYOUT_SQLITE
+    if "invocation_id" in event_columns:
+        return LAYOUT_ADK
+    raise ValueError("Not a session database: no recognizable `events` table.")
+
+
+def _insert_session(conn, key, state: dict, create_time, update_time, events) -> int:
+    # Snapshots are not copied; the shards take new ones as events arrive.
+    conn.execute(
+        "INSERT INTO sessions (app_name, user_id, id, state, create_time, "
+        "update_time, event_count) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (*key, json.dumps(state), create_time, update_time, len(events)),
+    )
+    rows = [(*key, event_id, timestamp, data) for event_id, timestamp, data in events]
+    conn.executemany(
+        "INSERT INTO events (app_name, user_id, session_id, id, timestamp, data) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    return len(rows)
+
+
+def _write_shared_state(target: ShardedSessionService, app_states, user_states, now):
+    with target.state_shard.pool.write() as conn:
+        for app_name, state in app_states.items():
+            conn.execute(
+                "INSERT OR REPLACE INTO app_states (app_name, state, update_time) "
+                "VALUES (?, ?, ?)",
+                (app_name, json.dumps(state), now),
+            )
+        for (app_name, user_id), state in user_states.items():
+            conn.execute(
+                "INSERT OR REPLACE INTO user_states "
+                "(app_name, user_id, state, update_time) VALUES (?, ?, ?, ?)",
+                (app_name, user_id, json.dumps(state), now),
+            )
+    return len(app_states) + len(user_states)
+
+
+def _copy_sqlite_layout(source: sqlite3.Connection, target, report) -> None:
+    sessions = source.execute(
+        "SELECT app_name, user_id, id, state, create_time, update_time FROM sessions"
+    )
+    for app_name, user_id, session_id, state, create_time, update_time in sessions:
+        key = (app_name, user_id, session_id)
+        events = source.execute(
+            "SELECT id, timestamp, data FROM events "
+            "WHERE app_name = ? AND user_id = ? AND session_id = ? ORDER BY seq",
+            key,
+        ).fetchall()
+        with target.shard_for(session_id).pool.write() as conn:
+            report.events += _insert_session(
+                conn, key, json.loads(state), create_time, update_time, events
+            )
+        report.sessions += 1
+    app_states = {
+        app_name: json.loads(state)
+        for app_name, state in source.execute("SELECT app_name, state FROM app_states")
+    }
+    user_states = {
+        (app_name, user_id): json.loads(state)
+        for app_name, user_id, state in source.execute(
+            "SELECT app_name, user_id, state FROM user_states"
+        )
+    }
+    report.shared_states = _write_shared_state(
+        target, app_states, user_states, time.time()
+    )
+
+
+def _copy_adk_layout(source: sqlite3.Connection, target, report) -> None:
+    # ADK stores event actions pickled, so read through its own service. It
+    # creates any table it misses on open, so it reads a private copy (a
+    # consistent snapshot via the backup API) and the source stays untouched.
+    from google.adk.sessions.database_session_service import DatabaseSessionService
+
+    with tempfile.TemporaryDirectory(prefix="adk-sessions-") as scratch:
+        copy_path = os.path.join(scratch, "source.db")
+        copy = sqlite3.connect(copy_path)
+        try:
+            source.backup(copy)
+        finally:
+            copy.close()
+        adk_service = DatabaseSessionService(f"sqlite:///{copy_path}")
+        try:
+            _copy_adk_sessions(adk_service, source, target, report)
+        finally:
+            adk_service.db_engine.dispose()
+
+
+def _copy_adk_sessions(adk_service, source: sqlite3.Connection, target, report) -> None:
+    app_states: dict[str, dict] = {}
+    user_states: dict[tuple[str, str], dict] = {}
+    keys = source.execute("SELECT app_name, user_id, id FROM sessions").fetchall()
+    for app_name, user_id, session_id in keys:
+        session = adk_service.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        if session is None:
+            continue
+        app_state, user_state, session_state = split_state_delta(session.state)
+        app_states.setdefault(app_name, {}).update(app_state)
+        user_states.setdefault((app_name, user_id), {}).update(user_state)
+        events = [
+            (event.id, event.timestamp, event.model_dump_json(exclude_none=True))
+            for event in session.events
+        ]
+        # ADK does not expose a creation time; the last update stands in for it.
+        with target.shard_for(session_id).pool.write() as conn:
+            report.events += _insert_session(
+                conn,
+                (app_name, user_id, session_id),
+                session_state,
+                session.last_update_time,
+                session.last_update_time,
+                events,
+            )
+        report.sessions += 1
+    report.shared_states = _write_shared_state(
+        target, app_states, user_states, time.time()
+    )
+
+
+def migrate_to_shards(
+    source_path: str,
+    target_db_path: str,
+    shard_count: int,
+    tuning: SQLiteTuning | None = None,
+) -> MigrationReport:
+    """Copies every session, event and app/user state into `shard_count` shards.
+
+    With a shard count of 1 the target is `target_db_path` itself, as served
+    with SESSION_DB_SHARDS=1; this converts ADK's database layout in place of
+    sharding it. The source is opened read-only and left untouched. Refuses to
+    write into existing files, so a migration is never merged into a live
+    store, and removes the new files again if it fails.
+    """
+    if shard_count < 1:
+        raise ValueError("The shard count must be at least 1.")
+    if not os.path.exists(source_path):
+        raise FileNotFoundError(f"Session database '{source_path}' not found.")
+    targets = (
+        [target_db_path]
+        if shard_count == 1
+        else shard_paths(target_db_path, shard_count)
+    )
+    existing = [path for path in targets if os.path.exists(path)]
+    if existing:
+        raise FileExistsError(f"Target files already exist: {', '.join(existing)}")
+
+    started = time.perf_counter()
+    source = sqlite3.connect(f"file:{os.path.abspath(source_path)}?mode=ro", uri=True)
+    if shard_count == 1:
+        target = _SingleFileTarget(
+            SQLiteSessionService(target_db_path, pool_size=1, tuning=tuning)
+        )
+    else:
+        target = ShardedSessionService(
+            target_db_path, shard_count, pool_size=1, tuning=tuning
+        )
+    completed = False
+    try:
+        report = MigrationReport(
+            source=source_path, layout=detect_layout(source), targets=targets
+        )
+        if report.layout == LAYOUT_SQLITE:
+            _copy_sqlite_layout(source, target, report)
+        else:
+            _copy_adk_layout(source, target, report)
+        completed = True
+    finally:
+        target.close()
+        source.close()
+        if not completed:  # Leave no half-filled shards behind
+            for path in targets:
+                for suffix in ("", "-wal", "-shm"):
+                    if os.path.exists(path + suffix):
+                        os.remove(path + suffix)
+    report.seconds = time.perf_counter() - started
+    logger.info("Session database migrated to shards.", extra=report.to_dict())
+    return report
@@ -0,0 +1,257 @@
+# sessions/sharded_session_service.py
+"""ADK session service spread over several SQLite files by session ID."""
+
+import asyncio
+import dataclasses
+import functools
+import hashlib
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from google.adk.events.event import Event
+from google.adk.sessions.base_session_service import (
+    BaseSessionService,
+    GetSessionConfig,
+    ListEventsResponse,
+    ListSessionsResponse,
+)
+from google.adk.sessions.session import Session
+from google.adk.sessions.state import State
+
+from sessions.sqlite_pool import SQLiteTuning
+from sessions.sqlite_session_service import (
+    EventRecord,
+    SQLiteSessionService,
+    split_state_delta,
+)
+
+
+def shard_index(session_id: str, shard_count: int) -> int:
+    """Stable shard for a session ID (unlike `hash()`, the same in every process)."""
+    digest = hashlib.blake2b(session_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+def shard_paths(db_path: str, shard_count: int) -> list[str]:
+    """Shard files for `db_path`, e.g. `adk_sessions.shard01-of-04.db`.
+
+    The shard count is part of the name, so changing it starts from new files
+    instead of silently routing sessions to the wrong shard.
+    """
+    root, ext = os.path.splitext(db_path)
+    return [
+        f"{root}.shard{i:02d}-of-{shard_count:02d}{ext}" for i in range(shard_count)
+    ]
+
+
+def _session_only(record: EventRecord) -> EventRecord:
+    _, _, session_delta = split_state_delta(record.state_delta)
+    return dataclasses.replace(record, state_delta=session_delta)
+
+
+class ShardedSessionService(BaseSessionService):
+    """Hashes each session ID onto one of N `SQLiteSessionService` shards.
+
+    Every shard is its own file with its own connection pool and write lock,
+    so appends to sessions on different shards commit in parallel. App and
+    user state are shared by many sessions and live on shard 0; the rare
+    event that changes them commits to its session's shard first, then to
+    shard 0.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        shard_count: int,
+        pool_size: int = 8,
+        tuning: SQLiteTuning | None = None,
+        snapshot_interval: int = 0,
+    ):
+        if shard_count < 1:
+            raise ValueError("Session shard count must be at least 1.")
+        self.db_path = db_path
+        self.shards = [
+            SQLiteSessionService(
+                path,
+                pool_size=pool_size,
+                tuning=tuning,
+                snapshot_interval=snapshot_interval,
+            )
+            for path in shard_paths(db_path, shard_count)
+        ]
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size * shard_count, thread_name_prefix="session-shards"
+        )
+
+    @property
+    def state_shard(self) -> SQLiteSessionService:
+        return self.shards[0]
+
+    def shard_for(self, session_id: str) -> SQLiteSessionService:
+        return self.shards[shard_index(session_id, len(self.shards))]
+
+    def _read_shared_state(self, app_name: str, user_id: str) -> tuple[dict, dict]:
+        with self.state_shard.pool.read() as conn:
+            return SQLiteSessionService._read_shared_state(conn, app_name, user_id)
+
+    def _apply_shared_deltas(self, app_name, user_id, app_delta, user_delta, now):
+        with self.state_shard.pool.write() as conn:
+            return SQLiteSessionService._apply_shared_deltas(
+                conn, app_name, user_id, app_delta, user_delta, now
+            )
+
+    def _with_shared_state(self, session: Session, app_state: dict, user_state: dict):
+        session.state = {
+            key: value
+            for key, value in session.state.items()
+            if not key.startswith((State.APP_PREFIX, State.USER_PREFIX))
+        }
+        return SQLiteSessionService._merge_state(session, app_state, user_state)
+
+    # --- BaseSessionService -------------------------------------------------------
+
+    def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = (
+            session_id.strip()
+            if session_id and session_id.strip()
+            else str(uuid.uuid4())
+        )
+        app_delta, user_delta, session_state = split_state_delta(state or {})
+        session = self.shard_for(session_id).create_session(
+            app_name=app_name,
+            user_id=user_id,
+            state=session_state,
+            session_id=session_id,
+        )
+        if app_delta or user_delta:
+            app_state, user_state = self._apply_shared_deltas(
+                app_name, user_id, app_delta, user_delta, session.last_update_time
+            )
+        else:
+            app_state, user_state = self._read_shared_state(app_name, user_id)
+        return self._with_shared_state(session, app_state, user_state)
+
+    def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        session = self.shard_for(session_id).get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is None:
+            return None
+        return self._with_shared_state(
+            session, *self._read_shared_state(app_name, user_id)
+        )
+
+    def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        sessions = []
+        for shard in self.shards:
+            sessions += shard.list_sessions(app_name=app_name, user_id=user_id).sessions
+        sessions.sort(key=lambda session: session.last_update_time)
+        return ListSessionsResponse(sessions=sessions)
+
+    def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self.shard_for(session_id).delete_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+
+    def list_events(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> ListEventsResponse:
+        return self.shard_for(session_id).list_events(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+
+    def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        super().append_event(session, event)  # Updates the in-memory session
+        record = EventRecord.from_event(session, event)
+        if self.append_event_records([record]):
+            raise ValueError(f"Session '{session.id}' not found.")
+        session.last_update_time = record.timestamp
+        return event
+
+    def append_event_records(self, records: list[EventRecord]) -> list[EventRecord]:
+        """Writes events with one transaction per shard touched (plus one on
+        shard 0 for app/user state); returns records whose session is gone."""
+        by_shard: dict[int, list[EventRecord]] = {}
+        for record in records:
+            by_shard.setdefault(
+                shard_index(record.session_id, len(self.shards)), []
+            ).append(record)
+        missing: dict[int, EventRecord] = {}
+        for index, shard_records in by_shard.items():
+            stored = [_session_only(record) for record in shard_records]
+            skipped = {
+                id(record) for record in self.shards[index].append_event_records(stored)
+            }
+            for record, stored_record in zip(shard_records, stored):
+                if id(stored_record) in skipped:
+                    missing[id(record)] = record
+        shared = []
+        for record in records:
+            app_delta, user_delta, _ = split_state_delta(record.state_delta)
+            if (app_delta or user_delta) and id(record) not in missing:
+                shared.append((record, app_delta, user_delta))
+        if shared:
+            with self.state_shard.pool.write() as conn:
+                for record, app_delta, user_delta in shared:
+                    SQLiteSessionService._apply_shared_deltas(
+                        conn,
+                        record.app_name,
+                        record.user_id,
+                        app_delta,
+                        user_delta,
+                        record.timestamp,
+                    )
+        return list(missing.values())
+
+    def session_update_time(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> Optional[float]:
+        return self.shard_for(session_id).session_update_time(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+
+    # --- Async variants -----------------------------------------------------------------
+
+    async def _offload(self, method, /, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(method, **kwargs)
+        )
+
+    async def create_session_async(self, **kwargs) -> Session:
+        return await self._offload(self.create_session, **kwargs)
+
+    async def get_session_async(self, **kwargs) -> Optional[Session]:
+        return await self._offload(self.get_session, **kwargs)
+
+    async def list_sessions_async(self, **kwargs) -> ListSessionsResponse:
+        return await self._offload(self.list_sessions, **kwargs)
+
+    async def delete_session_async(self, **kwargs) -> None:
+        return await self._offload(self.delete_session, **kwargs)
+
+    async def append_event_async(self, session: Session, event: Event) -> Event:
+        return await self._offload(self.append_event, session=session, event=event)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        for shard in self.shards:
+            shard.close()
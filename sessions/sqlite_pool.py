@@ -0,0 +1,156 @@
+# sessions/sqlite_pool.py
+"""A small, thread-safe pool of tuned SQLite connections."""
+
+import contextlib
+import os
+import queue
+import sqlite3
+import threading
+from dataclasses import dataclass
+
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+@dataclass(frozen=True)
+class SQLiteTuning:
+    """Per-connection pragmas.
+
+    WAL lets readers proceed while one writer commits; with WAL, synchronous
+    NORMAL only fsyncs at checkpoints, so a commit survives an application
+    crash and can only be lost on power failure or an OS crash.
+    """
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 256 * 1024 * 1024  # Bytes of the file read through mmap
+    cache_size_kib: int = 16 * 1024  # Page cache per connection
+    busy_timeout_ms: int = 5000
+
+    def pragmas(self) -> list[str]:
+        synchronous = self.synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(
+                f"Unknown SQLite synchronous mode '{self.synchronous}'. "
+                f"Expected one of: {', '.join(SYNCHRONOUS_MODES)}."
+            )
+        return [
+            f"PRAGMA journal_mode={self.journal_mode}",
+            f"PRAGMA synchronous={synchronous}",
+            f"PRAGMA mmap_size={int(self.mmap_size)}",
+            f"PRAGMA cache_size={-int(self.cache_size_kib)}",  # Negative means KiB
+            f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}",
+            "PRAGMA temp_store=MEMORY",
+        ]
+
+
+class SQLitePool:
+    """Hands out up to `size` connections to one database file.
+
+    Connections are opened lazily, tuned once, and reused; each is used by one
+    thread at a time. Writes also go through a process-local lock: SQLite
+    allows a single writer, and queueing writers on a lock is much cheaper than
+    having them spin in SQLite's busy handler.
+    """
+
+    def __init__(self, path: str, size: int = 8, tuning: SQLiteTuning | None = None):
+        if size < 1:
+            raise ValueError("SQLite pool size must be at least 1.")
+        self.path = path
+        self.size = size
+        self.tuning = tuning or SQLiteTuning()
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened = 0
+        self._open_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def _open(self) -> sqlite3.Connection:
+        # isolation_level=None: transactions are explicit (BEGIN IMMEDIATE for writes).
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.tuning.busy_timeout_ms / 1000,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        for pragma in self.tuning.pragmas():
+            conn.execute(pragma)
+        return conn
+
+    def _acquire(self, timeout: float | None) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError(f"SQLite pool for '{self.path}' is closed.")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._open_lock:
+            if self._opened < self.size:
+                self._opened += 1
+                try:
+                    return self._open()
+                except Exception:
+                    self._opened -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No SQLite connection to '{self.path}' became free within {timeout}s."
+            ) from None
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if self._closed:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    @contextlib.contextmanager
+    def read(self, timeout: float | None = 30.0):
+        """Yields a connection for reads. It is in autocommit mode; wrap several
+        statements in BEGIN/COMMIT to read them from one snapshot."""
+        conn = self._acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    @contextlib.contextmanager
+    def write(self, timeout: float | None = 30.0):
+        """Yields a connection inside a BEGIN IMMEDIATE transaction, committed on
+        success and rolled back on error."""
+        # Writers wait on the lock before taking a connection, so queued writers
+        # never hold connections that readers could use.
+        with self._write_lock:
+            conn = self._acquire(timeout)
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    yield conn
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+            finally:
+                self._release(conn)
+
+    @contextlib.contextmanager
+    def exclusive(self, timeout: float | None = 30.0):
+        """Yields a connection with the write lock held and no transaction open,
+        for statements that cannot run inside one (VACUUM)."""
+        with self._write_lock:
+            conn = self._acquire(timeout)
+            try:
+                yield conn
+            finally:
+                self._release(conn)
+
+    def close(self) -> None:
+        """Closes idle connections; connections in use close when released."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
@@ -0,0 +1,632 @@
+# sessions/sqlite_session_service.py
+"""ADK session service backed by a tuned, pooled SQLite database."""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from google.adk.events.event import Event
+from google.adk.sessions.base_session_service import (
+    BaseSessionService,
+    GetSessionConfig,
+    ListEventsResponse,
+    ListSessionsResponse,
+)
+from google.adk.sessions.session import Session
+from google.adk.sessions.state import State
+
+from sessions.sqlite_pool import SQLitePool, SQLiteTuning
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+SESSION_STORE_LATENCY = REGISTRY.histogram(
+    "gen_bootstrap_session_store_seconds",
+    "SQLite session store operation time, including waiting for a connection.",
+    ["operation"],
+)
+
+
+def _timed(operation: str):
+    """Records the decorated store method's duration under `operation`."""
+    latency = SESSION_STORE_LATENCY.labels(operation)
+
+    def decorator(method):
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                latency.observe(time.perf_counter() - started)
+
+        return timed
+
+    return decorator
+
+
+SCHEMA_VERSION = 1
+
+# event_count counts every event ever appended (trimmed ones included), so
+# snapshot boundaries stay put when compaction deletes old events. A snapshot
+# only marks where a load may start; the state always comes from the session
+# row, which every event's delta has already been applied to.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    create_time REAL NOT NULL,
+    update_time REAL NOT NULL,
+    event_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (app_name, user_id, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_session ON events (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS app_states (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    update_time REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_states (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS session_snapshots (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    event_count INTEGER NOT NULL,
+    create_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, event_count)
+) WITHOUT ROWID;
+"""
+
+
+def _table_names(conn) -> list[str]:
+    return [
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    ]
+
+
+def split_state_delta(delta: dict[str, Any]) -> tuple[dict, dict, dict]:
+    """Splits a state delta into app, user and session parts; `temp:` keys are dropped."""
+    app_delta, user_delta, session_delta = {}, {}, {}
+    for key, value in delta.items():
+        if key.startswith(State.APP_PREFIX):
+            app_delta[key[len(State.APP_PREFIX) :]] = value
+        elif key.startswith(State.USER_PREFIX):
+            user_delta[key[len(State.USER_PREFIX) :]] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            session_delta[key] = value
+    return app_delta, user_delta, session_delta
+
+
+def _merge_json(current: Optional[str], delta: dict) -> str:
+    state = json.loads(current) if current else {}
+    state.update(delta)
+    return json.dumps(state)
+
+
+@dataclass(frozen=True)
+class EventRecord:
+    """An event serialized for storage, with the state delta it applies."""
+
+    app_name: str
+    user_id: str
+    session_id: str
+    event_id: str
+    timestamp: float
+    data: str  # Event JSON
+    state_delta: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_event(cls, session: Session, event: Event) -> "EventRecord":
+        delta = (
+            event.actions.state_delta
+            if event.actions and event.actions.state_delta
+            else {}
+        )
+        return cls(
+            app_name=session.app_name,
+            user_id=session.user_id,
+            session_id=session.id,
+            event_id=event.id,
+            timestamp=event.timestamp or time.time(),
+            data=event.model_dump_json(exclude_none=True),
+            state_delta=dict(delta),
+        )
+
+
+class SQLiteSessionService(BaseSessionService):
+    """Stores sessions and events in one SQLite file.
+
+    Connections come from a `SQLitePool` (WAL, tuned pragmas), so concurrent
+    sessions read in parallel and writers queue on a lock instead of on the
+    database lock. Each append is one short transaction.
+
+    ADK's session service interface is synchronous. The `*_async` methods run
+    the same operations on a dedicated thread pool, so callers on the event
+    loop (our own endpoints, `gen-bootstrap sessions bench`) never block on I/O.
+
+    With `snapshot_interval` N > 0, every Nth event of a session also writes
+    a snapshot (its sequence number and event count), and
+    `get_session` without a config loads the current state plus only the
+    events after the snapshot that leaves at least N of them: between N and
+    2N - 1 recent events, however long the session. `list_events`, or a
+    `GetSessionConfig`, still reads the full history.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        pool_size: int = 8,
+        tuning: SQLiteTuning | None = None,
+        snapshot_interval: int = 0,
+    ):
+        self.db_path = db_path
+        self.snapshot_interval = snapshot_interval
+        # Before the pool opens the file: its tuning switches it to WAL mode.
+        self._reject_foreign_database()
+        self.pool = SQLitePool(db_path, size=pool_size, tuning=tuning)
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="session-store"
+        )
+        try:
+            self._ensure_schema()
+        except BaseException:
+            self.close()
+            raise
+
+    def _ensure_schema(self) -> None:
+        with self.pool.exclusive() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise RuntimeError(
+                    f"Session database '{self.db_path}' has schema version {version}; "
+                    f"this version supports up to {SCHEMA_VERSION}."
+                )
+            if version == 0:
+                tables = _table_names(conn)
+                if tables:
+                    raise RuntimeError(self._foreign_database_message(tables))
+                # Lets compaction hand freed pages back (sessions/compaction.py).
+                # The WAL pragma already wrote the header, so the mode only
+                # applies after a VACUUM, which is instant on the empty file.
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+                conn.executescript(_SCHEMA)
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def _reject_foreign_database(self) -> None:
+        """Raises if the file has tables but no schema version, read-only."""
+        if not os.path.exists(self.db_path) or not os.path.getsize(self.db_path):
+            return
+        uri = f"file:{os.path.abspath(self.db_path)}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True)
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            tables = _table_names(conn) if version == 0 else []
+        finally:
+            conn.close()
+        if tables:
+            raise RuntimeError(self._foreign_database_message(tables))
+
+    def _foreign_database_message(self, tables: list[str]) -> str:
+        # E.g. the adk_sessions.db that ADK's DatabaseSessionService created
+        # before this store replaced it; it is left untouched.
+        return (
+            f"Session database '{self.db_path}' has tables "
+            f"({', '.join(sorted(tables))}) but not this store's schema; it is "
+            "probably ADK's DatabaseSessionService database. Move it aside and "
+            "copy its sessions with `gen-bootstrap sessions migrate --source "
+            "<moved file> --shards <SESSION_DB_SHARDS>`, or set SESSION_DB_PATH "
+            "to a new file."
+        )
+
+    # --- BaseSessionService --------------------------------------------------
+
+    @_timed("create_session")
+    def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = (
+            session_id.strip()
+            if session_id and session_id.strip()
+            else str(uuid.uuid4())
+        )
+        app_delta, user_delta, session_state = split_state_delta(state or {})
+        now = time.time()
+        with self.pool.write() as conn:
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO sessions "
+                "(app_name, user_id, id, state, create_time, "
+                "update_time) VALUES (?, ?, ?, ?, ?, ?)",
+                (app_name, user_id, session_id, json.dumps(session_state), now, now),
+            ).rowcount
+            if not inserted:
+                raise ValueError(f"Session '{session_id}' already exists.")
+            app_state, user_state = self._apply_shared_deltas(
+                conn, app_name, user_id, app_delta, user_delta, now
+            )
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=session_state,
+            last_update_time=now,
+        )
+        return self._merge_state(session, app_state, user_state)
+
+    @_timed("get_session")
+    def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        with self.pool.read() as conn:
+            # One read transaction for the session, its events and shared state
+            conn.execute("BEGIN")
+            try:
+                row = conn.execute(
+                    "SELECT state, update_time, event_count FROM sessions "
+                    "WHERE app_name = ? AND user_id = ? AND id = ?",
+                    (app_name, user_id, session_id),
+                ).fetchone()
+                if row is None:
+                    return None
+                after_seq = None
+                if config is None and self.snapshot_interval > 0:
+                    after_seq = self._tail_start(
+                        conn, app_name, user_id, session_id, row[2]
+                    )
+                events = self._read_events(
+                    conn, app_name, user_id, session_id, config, after_seq
+                )
+                app_state, user_state = self._read_shared_state(conn, app_name, user_id)
+            finally:
+                conn.execute("COMMIT")
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=json.loads(row[0]),
+            events=events,
+            last_update_time=row[1],
+        )
+        return self._merge_state(session, app_state, user_state)
+
+    @_timed("list_sessions")
+    def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        with self.pool.read() as conn:
+            rows = conn.execute(
+                "SELECT id, update_time FROM sessions WHERE app_name = ? AND user_id = ?",
+                (app_name, user_id),
+            ).fetchall()
+        return ListSessionsResponse(
+            sessions=[
+                Session(
+                    app_name=app_name,
+                    user_id=user_id,
+                    id=row[0],
+                    last_update_time=row[1],
+                )
+                for row in rows
+            ]
+        )
+
+    @_timed("delete_session")
+    def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        with self.pool.write() as conn:
+            conn.execute(
+                "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                (app_name, user_id, session_id),
+            )
+            conn.execute(
+                "DELETE FROM session_snapshots "
+                "WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                (app_name, user_id, session_id),
+            )
+            conn.execute(
+                "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+                (app_name, user_id, session_id),
+            )
+
+    def list_events(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> ListEventsResponse:
+        with self.pool.read() as conn:
+            events = self._read_events(conn, app_name, user_id, session_id, None)
+        return ListEventsResponse(events=events)
+
+    @_timed("append_event")
+    def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        super().append_event(session, event)  # Updates the in-memory session
+        record = EventRecord.from_event(session, event)
+        with self.pool.write() as conn:
+            if not self._write_event(conn, record):
+                raise ValueError(f"Session '{session.id}' not found.")
+        session.last_update_time = record.timestamp
+        return event
+
+    @_timed("append_event_records")
+    def append_event_records(self, records: list["EventRecord"]) -> list["EventRecord"]:
+        """Writes many events in one transaction, in order.
+
+        Returns the records whose session no longer exists; they are skipped
+        rather than failing the whole batch.
+        """
+        missing = []
+        with self.pool.write() as conn:
+            for record in records:
+                if not self._write_event(conn, record):
+                    missing.append(record)
+        return missing
+
+    def session_update_time(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> Optional[float]:
+        """The stored last-update time of a session, or None if it does not exist."""
+        with self.pool.read() as conn:
+            row = conn.execute(
+                "SELECT update_time FROM sessions "
+                "WHERE app_name = ? AND user_id = ? AND id = ?",
+                (app_name, user_id, session_id),
+            ).fetchone()
+        return row[0] if row else None
+
+    # --- Async variants (offloaded to the store's thread pool) ---------------
+
+    async def _offload(self, method, /, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(method, **kwargs)
+        )
+
+    async def create_session_async(self, **kwargs) -> Session:
+        return await self._offload(self.create_session, **kwargs)
+
+    async def get_session_async(self, **kwargs) -> Optional[Session]:
+        return await self._offload(self.get_session, **kwargs)
+
+    async def list_sessions_async(self, **kwargs) -> ListSessionsResponse:
+        return await self._offload(self.list_sessions, **kwargs)
+
+    async def delete_session_async(self, **kwargs) -> None:
+        return await self._offload(self.delete_session, **kwargs)
+
+    async def append_event_async(self, session: Session, event: Event) -> Event:
+        return await self._offload(self.append_event, session=session, event=event)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+
+    # --- Helpers --------------------------------------------------------------
+
+    def _write_event(self, conn, record: "EventRecord") -> bool:
+        """Inserts one event and applies its state delta; False if the session is gone."""
+        app_delta, user_delta, session_delta = split_state_delta(record.state_delta)
+        key = (record.app_name, record.user_id, record.session_id)
+        if session_delta:
+            row = conn.execute(
+                "SELECT state FROM sessions "
+                "WHERE app_name = ? AND user_id = ? AND id = ?",
+                key,
+            ).fetchone()
+            updated = (
+                row is not None
+                and conn.execute(
+                    "UPDATE sessions SET state = ?, update_time = ?, "
+                    "event_count = event_count + 1 "
+                    "WHERE app_name = ? AND user_id = ? AND id = ?",
+                    (_merge_json(row[0], session_delta), record.timestamp, *key),
+                ).rowcount
+            )
+        else:
+            updated = conn.execute(
+                "UPDATE sessions SET update_time = ?, event_count = event_count + 1 "
+                "WHERE app_name = ? AND user_id = ? AND id = ?",
+                (record.timestamp, *key),
+            ).rowcount
+        if not updated:
+            return False
+        seq = conn.execute(
+            "INSERT INTO events (app_name, user_id, session_id, id, timestamp, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (*key, record.event_id, record.timestamp, record.data),
+        ).lastrowid
+        if self.snapshot_interval > 0:
+            self._maybe_snapshot(conn, key, seq, record.timestamp)
+        if app_delta or user_delta:
+            self._apply_shared_deltas(
+                conn,
+                record.app_name,
+                record.user_id,
+                app_delta,
+                user_delta,
+                record.timestamp,
+            )
+        return True
+
+    def _maybe_snapshot(self, conn, key, seq: int, now: float) -> None:
+        (event_count,) = conn.execute(
+            "SELECT event_count FROM sessions "
+            "WHERE app_name = ? AND user_id = ? AND id = ?",
+            key,
+        ).fetchone()
+        if event_count % self.snapshot_interval:
+            return
+        conn.execute(
+            "INSERT OR REPLACE INTO session_snapshots (app_name, user_id, session_id, "
+            "seq, event_count, create_time) VALUES (?, ?, ?, ?, ?, ?)",
+            (*key, seq, event_count, now),
+        )
+        # Loads only ever start at one of the two newest snapshots.
+        conn.execute(
+            "DELETE FROM session_snapshots WHERE app_name = ? AND user_id = ? "
+            "AND session_id = ? AND event_count < ?",
+            (*key, event_count - self.snapshot_interval),
+        )
+
+    def _tail_start(self, conn, app_name, user_id, session_id, event_count):
+        """Sequence number after which a load starts, or None to load everything."""
+        row = conn.execute(
+            "SELECT seq FROM session_snapshots WHERE app_name = ? AND user_id = ? "
+            "AND session_id = ? AND event_count <= ? "
+            "ORDER BY event_count DESC LIMIT 1",
+            (app_name, user_id, session_id, event_count - self.snapshot_interval),
+        ).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _read_events(
+        conn, app_name, user_id, session_id, config, after_seq: Optional[int] = None
+    ) -> list[Event]:
+        query = (
+            "SELECT data FROM events "
+            "WHERE app_name = ? AND user_id = ? AND session_id = ?"
+        )
+        params: list[Any] = [app_name, user_id, session_id]
+        if after_seq is not None:
+            query += " AND seq > ?"
+            params.append(after_seq)
+        if config and config.after_timestamp:
+            query += " AND timestamp >= ?"
+            params.append(config.after_timestamp)
+        if config and config.num_recent_events:
+            query += " ORDER BY seq DESC LIMIT ?"
+            params.append(config.num_recent_events)
+            rows = conn.execute(query, params).fetchall()[::-1]
+        else:
+            rows = conn.execute(query + " ORDER BY seq", params).fetchall()
+        return [Event.model_validate_json(row[0]) for row in rows]
+
+    @staticmethod
+    def _read_shared_state(conn, app_name, user_id) -> tuple[dict, dict]:
+        app_row = conn.execute(
+            "SELECT state FROM app_states WHERE app_name = ?", (app_name,)
+        ).fetchone()
+        user_row = conn.execute(
+            "SELECT state FROM user_states WHERE app_name = ? AND user_id = ?",
+            (app_name, user_id),
+        ).fetchone()
+        return (
+            json.loads(app_row[0]) if app_row else {},
+            json.loads(user_row[0]) if user_row else {},
+        )
+
+    @classmethod
+    def _apply_shared_deltas(cls, conn, app_name, user_id, app_delta, user_delta, now):
+        app_state, user_state = cls._read_shared_state(conn, app_name, user_id)
+        if app_delta:
+            app_state.update(app_delta)
+            conn.execute(
+                "INSERT INTO app_states (app_name, state, update_time) VALUES (?, ?, ?) "
+                "ON CONFLICT (app_name) DO UPDATE SET state = excluded.state, "
+                "update_time = excluded.update_time",
+                (app_name, json.dumps(app_state), now),
+            )
+        if user_delta:
+            user_state.update(user_delta)
+            conn.execute(
+                "INSERT INTO user_states (app_name, user_id, state, update_time) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (app_name, user_id) DO UPDATE SET "
+                "state = excluded.state, update_time = excluded.update_time",
+                (app_name, user_id, json.dumps(user_state), now),
+            )
+        return app_state, user_state
+
+    @staticmethod
+    def _merge_state(session: Session, app_state: dict, user_state: dict) -> Session:
+        for key, value in app_state.items():
+            session.state[State.APP_PREFIX + key] = value
+        for key, value in user_state.items():
+            session.state[State.USER_PREFIX + key] = value
+        return session
+
+
+def session_tuning(settings) -> SQLiteTuning:
+    return SQLiteTuning(
+        synchronous=settings.session_db_synchronous,
+        mmap_size=settings.session_db_mmap_bytes,
+        cache_size_kib=settings.session_db_cache_kib,
+        busy_timeout_ms=settings.session_db_busy_timeout_ms,
+    )
+
+
+def build_session_service(settings) -> BaseSessionService:
+    """Creates the session service configured by the SESSION_DB_* settings.
+
+    With SESSION_DB_SHARDS > 1 the store is a `ShardedSessionService`. Either
+    way it is wrapped in `CachedSessionService` unless SESSION_CACHE_ENABLED
+    is false.
+    """
+    if settings.session_db_shards > 1:
+        from sessions.sharded_session_service import ShardedSessionService, shard_paths
+
+        if os.path.exists(settings.session_db_path) and not os.path.exists(
+            shard_paths(settings.session_db_path, settings.session_db_shards)[0]
+        ):
+            logger.warning(
+                "Starting empty session shards next to an unsharded database; run "
+                "`gen-bootstrap sessions migrate` to copy its sessions.",
+                extra={"session_db_path": settings.session_db_path},
+            )
+        store = ShardedSessionService(
+            settings.session_db_path,
+            settings.session_db_shards,
+            pool_size=settings.session_db_pool_size,
+            tuning=session_tuning(settings),
+            snapshot_interval=settings.session_snapshot_interval_events,
+        )
+    else:
+        store = SQLiteSessionService(
+            db_path=settings.session_db_path,
+            pool_size=settings.session_db_pool_size,
+            tuning=session_tuning(settings),
+            snapshot_interval=settings.session_snapshot_interval_events,
+        )
+    if not settings.session_cache_enabled:
+        return store
+    from sessions.cached_session_service import CachedSessionService
+
+    return CachedSessionService(
+        store,
+        max_entries=settings.session_cache_max_entries,
+        max_bytes=settings.session_cache_max_bytes,
+        flush_interval_seconds=settings.session_cache_flush_interval_seconds,
+        validate_reads=settings.session_cache_validate_reads,
+    )
@@ -1,74 +1,117 @@
-import asyncio
 import json
 import os
+import time
+import uuid
 
 import gradio as gr
 import httpx
 
 AGENT_API_URL = os.getenv("AGENT_API_URL", "http://localhost:8080")
-# ADK's get_fast_api_app usually exposes the agent at /run
-# The payload structure for /run is specific to ADK.
-# It often involves a list of "messages" or a structured "input".
-ADK_INTERACT_ENDPOINT = f"{AGENT_API_URL}/run"
+# ADK's server-sent-events endpoint streams the reply as it is generated; /run
+# only answers once the whole reply is ready.
+ADK_STREAM_ENDPOINT = f"{AGENT_API_URL}/run_sse"
+AGENT_APP_NAME = os.getenv("AGENT_APP_NAME", "adk")
+USER_ID = "gradio-user"
 
 
-async def call_agent_api_via_adk_run(
-    input_text: str, session_id: str = "gradio_default_session"
-) -> str:
+def _event_text(event: dict) -> str:
+    parts = (event.get("content") or {}).get("parts") or []
+    return "".join(part.get("text", "") for part in parts)
+
+
+async def stream_agent_reply(input_text: str, session_id: str):
     """
-    Calls the ADK agent's /run endpoint.
-    The payload for ADK's /run is typically structured. This is a common pattern.
+    Calls /run_sse and yields (reply so far, timing line) as text arrives.
+
+    Partial events carry the next chunk of text; the final event of a model
+    turn repeats the whole turn, so it replaces the chunks streamed for it.
+    The session is created on first use (ADK answers 400 if it exists).
     """
+    session_url = (
+        f"{AGENT_API_URL}/apps/{AGENT_APP_NAME}/users/{USER_ID}/sessions/{session_id}"
+    )
     payload = {
-        "messages": [
-            {"content": {"text": input_text}, "role": "user"}
-        ],  # Common ADK messages
+        "app_name": AGENT_APP_NAME,
+        "user_id": USER_ID,
         "session_id": session_id,
-        # "stream": False,  # Set to True if you want to handle streaming responses
+        "new_message": {"role": "user", "parts": [{"text": input_text}]},
+        "streaming": True,
     }
+    done_turns = ""  # Text of completed model turns
+    current_turn = ""  # Chunks of the turn being streamed
+    started = time.perf_counter()
+    first_token_ms = None
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(ADK_INTERACT_ENDPOINT, json=payload)
-            response.raise_for_status()
-            response_data = response.json()
-
-            # ADK /run responses are often a list of messages.
-            # Extracting the agent's textual response.
-            if isinstance(response_data, list) and response_data:
-                last_message = response_data[-1]
-                if isinstance(last_message, dict) and "content" in last_message:
-                    content = last_message["content"]
-                    if isinstance(content, dict) and "text" in content:
-                        return str(content["text"])
-            return json.dumps(response_data, indent=2)  # Fallback
+        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0, read=300.0)) as client:
+            created = await client.post(session_url, json={})
+            if created.is_error and created.status_code != 400:
+                yield f"API Error: {created.status_code} - {created.text}", ""
+                return
+            async with client.stream(
+                "POST", ADK_STREAM_ENDPOINT, json=payload
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                    yield f"API Error: {response.status_code} - {response.text}", ""
+                    return
+                text_events = 0
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    raw = line[len("data: ") :]
+                    if raw.startswith('{"error"'):
+                        # ADK does not escape the message, so this may not parse.
+                        yield done_turns + current_turn, f"Error: {raw}"
+                        return
+                    data = json.loads(raw)
+                    text = _event_text(data)
+                    if not text or data.get("author") == USER_ID:
+                        continue
+                    if first_token_ms is None:
+                        first_token_ms = (time.perf_counter() - started) * 1000
+                    text_events += 1
+                    if data.get("partial"):
+                        current_turn += text
+                    else:
+                        done_turns += text + "\n"
+                        current_turn = ""
+                    yield done_turns + current_turn, "Streaming..."
+                yield done_turns + current_turn, (
+                    f"First token after {first_token_ms or 0:.0f} ms; {text_events} events "
+                    f"in {time.perf_counter() - started:.2f} s (server-side timings "
+                    "are on /metrics)"
+                )
     except httpx.RequestError as e:
-        return (
-            f"Connection Error: Failed to connect to agent at {ADK_INTERACT_ENDPOINT}. "
+        yield (
+            f"Connection Error: Failed to connect to agent at {ADK_STREAM_ENDPOINT}. "
             f"Is it running? Details: {e}"
-        )
-    except httpx.HTTPStatusError as e:
-        return f"API Error: {e.response.status_code} - {e.response.text}"
+        ), ""
     except Exception as e:
-        return f"An unexpected error occurred: {e}"
+        yield f"An unexpected error occurred: {e}", ""
 
 
-def gradio_interface_sync_wrapper(input_text_sync: str):
-    return asyncio.run(call_agent_api_via_adk_run(input_text_sync))
+if __name__ == "__main__":
+    session_id = f"gradio-{uuid.uuid4()}"  # One conversation per client launch
 
+    async def respond(input_text: str):
+        async for reply, timing in stream_agent_reply(input_text, session_id):
+            yield reply, timing
 
-if __name__ == "__main__":
     iface = gr.Interface(
-        fn=gradio_interface_sync_wrapper,
+        fn=respond,
         inputs=gr.Textbox(lines=5, label="Enter input for the ADK agent:"),
-        outputs=gr.Textbox(label="Agent Response:", lines=15, show_copy_button=True),
+        outputs=[
+            gr.Textbox(label="Agent Response:", lines=15, show_copy_button=True),
+            gr.Textbox(label="Timing:", lines=1),
+        ],
         title="gen-bootstrap ADK Agent Test Client (via API)",
         description=(
-            f"Interacts with ADK agent served by FastAPI (default: {ADK_INTERACT_ENDPOINT}). "
-            "Ensure `gen-bootstrap` FastAPI/ADK server is running "
-            "(`poetry run gen-bootstrap run`). Uses common ADK /run patterns."
+            f"Streams replies from the ADK agent served by FastAPI "
+            f"(default: {ADK_STREAM_ENDPOINT}). Ensure the `gen-bootstrap` "
+            "FastAPI/ADK server is running (`poetry run gen-bootstrap run`)."
         ),
     )
-    print(f"Launching Gradio interface for agent at {ADK_INTERACT_ENDPOINT}")
+    print(f"Launching Gradio interface for agent at {ADK_STREAM_ENDPOINT}")
     print(
         "Ensure the gen-bootstrap FastAPI/ADK server is running: "
         "`poetry run gen-bootstrap run`"
@@ -1,5 +1,4 @@
 import importlib
-from unittest.mock import MagicMock
 
 import pytest
 # Correct import path for the google_search function
@@ -9,8 +8,11 @@ from google.adk.tools import (
 
 # Module to be tested
 import adk.agent
+from config.settings import Settings
+from tools.doc_search import search_project_docs_tool
 from tools.example_tool import (
     get_current_time_tool,
+    get_current_times_tool,
 )
 
 # Original settings, to be restored if necessary.
@@ -29,9 +31,8 @@ def test_agent_initialization_with_default_model(mocker):
     """
     test_model_name = "gemini-1.5-pro-latest"
 
-    # Mock the settings object that adk.agent will import
-    mock_settings = MagicMock()
-    mock_settings.default_gemini_model = test_model_name
+    # Replace the settings object that adk.agent will import
+    mock_settings = Settings(_env_file=None, default_gemini_model=test_model_name)
 
     mocker.patch("adk.agent.settings", mock_settings)
 
@@ -52,10 +53,12 @@ def test_agent_initialization_with_tools(mocker):
 
     agent_tools = adk.agent.root_agent.tools
 
-    assert len(agent_tools) == 2
+    assert len(agent_tools) == 4
 
-    # Check for custom tool
+    # Check for custom tools
     assert get_current_time_tool in agent_tools
+    assert get_current_times_tool in agent_tools
+    assert search_project_docs_tool in agent_tools
 
     # Check for built-in ADK tool (google_search function)
     assert google_search in agent_tools
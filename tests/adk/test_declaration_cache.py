@@ -0,0 +1,100 @@
+import os
+from types import SimpleNamespace
+
+from google.adk.tools.function_tool import FunctionTool
+
+from adk.declaration_cache import (
+    apply_declaration_cache,
+    artifact_key,
+    build_declaration_artifact,
+    declarations_path,
+    load_declaration_artifact,
+)
+from config.settings import Settings
+
+
+def lookup_order(order_id: str, include_items: bool) -> dict:
+    """Looks up an order by ID."""
+    return {"order_id": order_id}
+
+
+def make_agent(model="gemini-test"):
+    return SimpleNamespace(
+        name="test_agent", model=model, tools=[FunctionTool(lookup_order), object()]
+    )
+
+
+def test_build_and_load_round_trips_declarations(tmp_path):
+    agent = make_agent()
+    path = str(tmp_path / "declarations.json")
+
+    artifact = build_declaration_artifact(agent, path)
+
+    assert artifact["agent"] == {
+        "name": "test_agent",
+        "model": "gemini-test",
+        "tools": ["lookup_order", "object"],
+    }
+    declarations = load_declaration_artifact(path, artifact_key(agent))
+    assert declarations["lookup_order"] == FunctionTool(lookup_order)._get_declaration()
+
+
+def test_apply_serves_artifact_without_introspection(tmp_path, mocker):
+    path = str(tmp_path / "declarations.json")
+    build_declaration_artifact(make_agent(), path)
+    agent = make_agent()
+    introspect = mocker.patch.object(FunctionTool, "_get_declaration")
+
+    assert apply_declaration_cache(agent, path) == 1
+
+    declaration = agent.tools[0]._get_declaration()
+    assert declaration.name == "lookup_order"
+    assert set(declaration.parameters.properties) == {"order_id", "include_items"}
+    introspect.assert_not_called()
+
+
+def test_stale_artifact_is_ignored_and_declarations_built_once(tmp_path, mocker):
+    path = str(tmp_path / "declarations.json")
+    build_declaration_artifact(make_agent(model="gemini-old"), path)
+    agent = make_agent(model="gemini-new")
+    introspect = mocker.spy(FunctionTool, "_get_declaration")
+
+    assert apply_declaration_cache(agent, path) == 0
+
+    first = agent.tools[0]._get_declaration()
+    assert agent.tools[0]._get_declaration() is first
+    assert introspect.call_count == 1
+
+
+def test_unreadable_artifact_falls_back_to_introspection(tmp_path):
+    path = tmp_path / "declarations.json"
+    path.write_text("{not json")
+    agent = make_agent()
+
+    assert apply_declaration_cache(agent, str(path)) == 0
+    assert agent.tools[0]._get_declaration().name == "lookup_order"
+
+
+def test_key_changes_when_tool_source_changes(tmp_path, mocker):
+    agent = make_agent()
+    source = tmp_path / "tool_module.py"
+    source.write_text("v1")
+    mocker.patch(
+        "adk.declaration_cache._source_modules",
+        return_value={"tool_module": str(source)},
+    )
+    before = artifact_key(agent)
+
+    source.write_text("v2")
+
+    assert artifact_key(agent) != before
+
+
+def test_declarations_path_prefers_configured_path():
+    settings = Settings(_env_file=None, local_state_dir="state")
+    assert declarations_path(settings) == os.path.join(
+        "state", "agent_declarations.json"
+    )
+
+    settings.agent_declarations_path = "build/agent_declarations.json"
+    assert declarations_path(settings) == "build/agent_declarations.json"
@@ -0,0 +1,96 @@
+import os
+
+import yaml
+
+from adk.instruction_loader import (
+    DynamicInstruction,
+    LoadedInstruction,
+    build_instruction,
+)
+from config.settings import Settings
+
+
+def _write_prompt(path, system_instruction):
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(
+            {
+                "prompt_name": "agent",
+                "prompt_data": "{query}",
+                "system_instruction": system_instruction,
+            },
+            f,
+        )
+
+
+def test_build_instruction_without_source_returns_fallback():
+    settings = Settings(_env_file=None, agent_instruction_source="")
+    assert build_instruction(settings, "builtin text") == "builtin text"
+
+
+def test_file_source_swaps_instruction_when_file_changes(tmp_path):
+    prompt_path = tmp_path / "agent.yaml"
+    _write_prompt(prompt_path, "Version one.")
+    instruction = DynamicInstruction(
+        f"file:{prompt_path}", "fallback", cache_dir=str(tmp_path / "cache")
+    )
+    instruction.load_initial()
+    assert instruction(None) == "Version one."
+    first_version = instruction.version
+
+    assert instruction.refresh() is False  # Unchanged file is not re-read
+
+    _write_prompt(prompt_path, "Version two.")
+    os.utime(prompt_path, ns=(0, os.stat(prompt_path).st_mtime_ns + 1_000_000))
+    assert instruction.refresh() is True
+    assert instruction(None) == "Version two."
+    assert instruction.version != first_version
+
+
+def test_cold_start_uses_disk_cache_when_source_unavailable(tmp_path, mocker):
+    cache_dir = str(tmp_path / "cache")
+    source = "registry:prompt-123"
+    first = DynamicInstruction(source, "fallback", cache_dir=cache_dir)
+    mocker.patch.object(
+        first,
+        "_fetch_registry",
+        return_value=LoadedInstruction("Registry text.", "4", source, 0.0),
+    )
+    assert first.refresh() is True
+
+    second = DynamicInstruction(source, "fallback", cache_dir=cache_dir)
+    fetch = mocker.patch.object(
+        second, "_fetch_registry", side_effect=RuntimeError("offline")
+    )
+    second.load_initial()
+    assert second(None) == "Registry text."
+    assert second.version == "4"
+    fetch.assert_not_called()  # Registry refreshes happen in the background only
+
+
+def test_pinned_registry_version_is_not_polled(tmp_path):
+    instruction = DynamicInstruction(
+        "registry:prompt-123@2", "fallback", cache_dir=str(tmp_path), poll_seconds=5
+    )
+    instruction.start_polling()
+    assert instruction._poller is None
+
+
+def test_polling_starts_on_first_use_not_on_build(tmp_path):
+    prompt_path = tmp_path / "agent.yaml"
+    _write_prompt(prompt_path, "Version one.")
+    settings = Settings(
+        _env_file=None,
+        agent_instruction_source=f"file:{prompt_path}",
+        agent_instruction_poll_seconds=60,
+        local_state_dir=str(tmp_path / "state"),
+    )
+    instruction = build_instruction(settings, "fallback")
+    try:
+        assert instruction._poller is None
+        assert instruction(None) == "Version one."
+        poller = instruction._poller
+        assert poller is not None and poller.is_alive()
+        instruction(None)
+        assert instruction._poller is poller
+    finally:
+        instruction.stop_polling()
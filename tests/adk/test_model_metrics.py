@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+from google.adk.agents.llm_agent import LlmAgent
+
+from adk.model_metrics import MODEL_CALL_LATENCY, MODEL_TOKENS, instrument_model_calls
+
+
+def _response(partial=False, prompt=None, completion=None):
+    usage = None
+    if prompt is not None:
+        usage = SimpleNamespace(
+            prompt_token_count=prompt, candidates_token_count=completion
+        )
+    return SimpleNamespace(partial=partial, usage_metadata=usage)
+
+
+def test_model_calls_record_latency_and_tokens_once_per_response():
+    def existing(callback_context, llm_request):
+        return None
+
+    agent = LlmAgent(
+        name="metrics_probe", model="probe-model", before_model_callback=existing
+    )
+    assert instrument_model_calls(agent) is agent
+    instrument_model_calls(agent)  # Instrumenting twice must not double count
+    before_model, after_model = (
+        agent.before_model_callback[-1],
+        agent.after_model_callback[-1],
+    )
+    assert agent.before_model_callback[0] is existing
+
+    context = SimpleNamespace(invocation_id="e-1")
+    before_model(context, None)
+    after_model(context, _response(partial=True, prompt=5, completion=1))  # Chunk
+    after_model(context, _response(prompt=12, completion=30))
+
+    _, _, calls = MODEL_CALL_LATENCY.labels("probe-model").snapshot()
+    assert calls == 1
+    assert MODEL_TOKENS.labels("probe-model", "prompt").value == 12
+    assert MODEL_TOKENS.labels("probe-model", "completion").value == 30
+    after_model(context, _response())  # No usage, no matching start
+    assert MODEL_CALL_LATENCY.labels("probe-model").snapshot()[2] == 1
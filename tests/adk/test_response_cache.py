@@ -0,0 +1,157 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from adk.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    ResponseCacheMiddleware,
+    cache_key,
+)
+from sessions.sqlite_session_service import SQLiteSessionService
+
+
+class _FakeRun:
+    """Stands in for ADK's /run: replies after a short delay, counting calls."""
+
+    def __init__(self, reply_parts=None):
+        self.calls = 0
+        self.reply_parts = reply_parts or [{"text": "It depends."}]
+
+    async def __call__(self, scope, receive, send):
+        await receive()
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        body = json.dumps(
+            [
+                {
+                    "author": "gen_bootstrap_core_assistant",
+                    "invocation_id": "e-original",
+                    "content": {"role": "model", "parts": self.reply_parts},
+                }
+            ]
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = SQLiteSessionService(str(tmp_path / "s.db"), pool_size=2)
+    yield service
+    service.close()
+
+
+def _middleware(app, service, uncacheable=frozenset()):
+    return ResponseCacheMiddleware(
+        app,
+        ResponseCache(max_entries=10, max_bytes=1 << 20, ttl_seconds=60),
+        service,
+        key_context=lambda: ("gemini-test", "v1"),
+        uncacheable_tools=uncacheable,
+    )
+
+
+async def _run(middleware, session_id: str, text: str) -> httpx.Response:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=middleware), base_url="http://test"
+    ) as client:
+        return await client.post(
+            "/run",
+            json={
+                "app_name": "adk",
+                "user_id": "u",
+                "session_id": session_id,
+                "new_message": {"role": "user", "parts": [{"text": text}]},
+            },
+        )
+
+
+def _new_session(service, session_id: str):
+    return service.create_session(app_name="adk", user_id="u", session_id=session_id)
+
+
+@pytest.mark.asyncio
+async def test_repeated_stateless_question_is_served_from_cache(service):
+    app = _FakeRun()
+    middleware = _middleware(app, service)
+    _new_session(service, "a")
+    _new_session(service, "b")
+
+    first = await _run(middleware, "a", "Is it  cached?")
+    second = await _run(middleware, "b", "is it cached?")  # Same after normalizing
+
+    assert app.calls == 1
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    recorded = service.get_session(app_name="adk", user_id="u", session_id="b")
+    assert [event.author for event in recorded.events] == [
+        "user",
+        "gen_bootstrap_core_assistant",
+    ]
+    assert recorded.events[1].invocation_id == recorded.events[0].invocation_id
+    assert recorded.events[1].invocation_id != "e-original"
+
+
+@pytest.mark.asyncio
+async def test_identical_in_flight_requests_share_one_model_call(service):
+    app = _FakeRun()
+    middleware = _middleware(app, service)
+    for session_id in ("a", "b", "c"):
+        _new_session(service, session_id)
+
+    responses = await asyncio.gather(
+        *(_run(middleware, session_id, "Same question") for session_id in "abc")
+    )
+
+    assert app.calls == 1
+    assert [response.status_code for response in responses] == [200, 200, 200]
+
+
+@pytest.mark.asyncio
+async def test_stateful_sessions_and_uncacheable_tools_bypass_the_cache(service):
+    app = _FakeRun()
+    middleware = _middleware(app, service)
+    for session_id in ("a", "b"):
+        _new_session(service, session_id)
+    await _run(middleware, "a", "First")
+    await _run(middleware, "b", "First")  # Hit, recorded in session "b"
+    assert app.calls == 1
+    await _run(middleware, "b", "First")  # Session "b" now has history
+    assert app.calls == 2
+    service.create_session(app_name="adk", user_id="u", state={"x": 1}, session_id="s")
+    await _run(middleware, "s", "First")
+    assert app.calls == 3
+
+    clock = _FakeRun([{"functionCall": {"name": "get_current_time_async"}}])
+    middleware = _middleware(clock, service, frozenset({"get_current_time_async"}))
+    for session_id in ("c", "d"):
+        _new_session(service, session_id)
+    await _run(middleware, "c", "What time is it?")
+    await _run(middleware, "d", "What time is it?")
+    assert clock.calls == 2
+
+
+def test_response_cache_evicts_by_size_and_expires():
+    cache = ResponseCache(max_entries=10, max_bytes=10, ttl_seconds=60)
+    cache.put("a", CachedResponse(200, [], b"123456"))
+    cache.put("b", CachedResponse(200, [], b"123456"))  # Over 10 bytes: "a" goes
+    assert cache.get("a") is None
+    assert cache.get("b").body == b"123456"
+    assert cache.size_bytes == 6
+
+    cache.ttl_seconds = 0
+    cache.put("c", CachedResponse(200, [], b"1"))
+    assert cache.get("c") is None
+    assert cache_key("adk", "m", "v1", "Hi  there") == cache_key(
+        "adk", "m", "v1", "hi there"
+    )
+    assert cache_key("adk", "m", "v1", "hi") != cache_key("adk", "m", "v2", "hi")
@@ -0,0 +1,87 @@
+import json
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from adk.streaming import (
+    STREAM_INTER_TOKEN,
+    STREAM_TTFT,
+    STREAMS,
+    install_stream_metrics,
+)
+
+
+def _text_event(text: str, partial: bool) -> dict:
+    return {
+        "author": "gen_bootstrap_core_assistant",
+        "content": {"role": "model", "parts": [{"text": text}]},
+        "partial": partial,
+    }
+
+
+def _sse_app(frames: list[str]) -> FastAPI:
+    """An app whose /run_sse writes `frames` the way ADK's endpoint does."""
+    app = FastAPI()
+
+    @app.post("/run_sse")
+    async def run_sse():
+        async def event_generator():
+            for frame in frames:
+                yield f"data: {frame}\n\n"
+
+        return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+    @app.post("/run")
+    async def run():
+        return []
+
+    install_stream_metrics(app)
+    return app
+
+
+def test_run_sse_chunks_are_timed():
+    ttft_before = STREAM_TTFT.labels().snapshot()[2]
+    gaps_before = STREAM_INTER_TOKEN.labels().snapshot()[2]
+    ok_before = STREAMS.labels("ok").value
+    frames = [
+        json.dumps(_text_event("Hel", partial=True)),
+        json.dumps(_text_event("lo", partial=True)),
+        json.dumps(_text_event("Hello", partial=False)),  # Aggregate, not a chunk
+        json.dumps(_text_event("Done.", partial=False)),  # Unstreamed reply
+    ]
+
+    response = TestClient(_sse_app(frames)).post("/run_sse", json={})
+
+    assert response.status_code == 200
+    assert response.headers["x-accel-buffering"] == "no"
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.text == "".join(f"data: {frame}\n\n" for frame in frames)
+    assert STREAM_TTFT.labels().snapshot()[2] == ttft_before + 1
+    assert STREAM_INTER_TOKEN.labels().snapshot()[2] == gaps_before + 2
+    assert STREAMS.labels("ok").value == ok_before + 1
+
+
+def test_run_sse_error_frames_count_as_errors():
+    errors_before = STREAMS.labels("error").value
+    frames = [
+        json.dumps(_text_event("Partial answer", partial=True)),
+        '{"error": "model said "no""}',  # ADK does not escape the message
+    ]
+
+    response = TestClient(_sse_app(frames)).post("/run_sse", json={})
+
+    assert response.status_code == 200
+    assert STREAMS.labels("error").value == errors_before + 1
+
+
+def test_other_routes_are_not_timed():
+    ttft_before = STREAM_TTFT.labels().snapshot()[2]
+    counts_before = {o: STREAMS.labels(o).value for o in ("ok", "error")}
+
+    response = TestClient(_sse_app([])).post("/run", json={})
+
+    assert response.status_code == 200
+    assert "x-accel-buffering" not in response.headers
+    assert STREAM_TTFT.labels().snapshot()[2] == ttft_before
+    assert {o: STREAMS.labels(o).value for o in counts_before} == counts_before
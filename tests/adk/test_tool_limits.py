@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+from google.adk.tools.function_tool import FunctionTool
+
+from adk.tool_limits import (
+    ToolLimit,
+    _acquire_within,
+    apply_tool_limit,
+    resolve_tool_limit,
+)
+from config.settings import Settings
+
+
+def _slow_tool(delay: float):
+    async def slow_lookup(query: str) -> dict:
+        """Sleeps, then answers."""
+        await asyncio.sleep(delay)
+        return {"answer": query}
+
+    return FunctionTool(slow_lookup)
+
+
+def test_resolve_tool_limit_merges_per_tool_overrides():
+    settings = Settings(
+        _env_file=None,
+        tool_max_concurrency=0,
+        tool_timeout_seconds=30.0,
+        tool_queue_timeout_seconds=0.5,
+        tool_limits={"slow_lookup": {"max_concurrency": 2.0, "timeout_seconds": 5}},
+    )
+
+    assert resolve_tool_limit(settings, "other") == ToolLimit(0, 30.0, 0.5)
+    assert resolve_tool_limit(settings, "slow_lookup") == ToolLimit(2, 5, 0.5)
+
+    settings.tool_limits = {"slow_lookup": {"max_concurrent": 2}}
+    with pytest.raises(ValueError, match="max_concurrent"):
+        resolve_tool_limit(settings, "slow_lookup")
+
+
+@pytest.mark.asyncio
+async def test_saturated_tool_returns_structured_error_fast():
+    tool = apply_tool_limit(
+        _slow_tool(0.2), ToolLimit(max_concurrency=1, queue_timeout_seconds=0.01)
+    )
+
+    first = asyncio.create_task(tool.run_async(args={"query": "a"}, tool_context=None))
+    await asyncio.sleep(0.01)
+    rejected = await tool.run_async(args={"query": "b"}, tool_context=None)
+
+    assert rejected["error_type"] == "tool_saturated"
+    assert rejected["retryable"] is True
+    assert await first == {"answer": "a"}
+    # The slot is released once the first call finishes.
+    assert await tool.run_async(args={"query": "c"}, tool_context=None) == {
+        "answer": "c"
+    }
+
+
+@pytest.mark.asyncio
+async def test_slow_tool_times_out_with_structured_error():
+    tool = apply_tool_limit(_slow_tool(1.0), ToolLimit(timeout_seconds=0.05))
+
+    result = await tool.run_async(args={"query": "a"}, tool_context=None)
+
+    assert result["error_type"] == "tool_timeout"
+    assert "0.05s" in result["error"]
+
+
+def test_disabled_limits_leave_tool_untouched():
+    tool = _slow_tool(0)
+    original = tool.run_async
+    apply_tool_limit(tool, ToolLimit())
+    assert tool.run_async == original
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("has_asyncio_timeout", [True, False])
+async def test_acquire_within_never_loses_a_permit(monkeypatch, has_asyncio_timeout):
+    if not has_asyncio_timeout:
+        monkeypatch.delattr(asyncio, "timeout", raising=False)
+    semaphore = asyncio.Semaphore(1)
+
+    assert await _acquire_within(semaphore, 0.05) is True
+    # Held: waiters time out without taking the permit when it is released.
+    waiters = [_acquire_within(semaphore, 0.01 * (i + 1)) for i in range(5)]
+    assert await asyncio.gather(*waiters) == [False] * 5
+    semaphore.release()
+
+    assert await _acquire_within(semaphore, 0.05) is True
+    assert semaphore.locked()
+    semaphore.release()
+    assert not semaphore.locked()
@@ -0,0 +1,30 @@
+import pytest
+from google.adk.tools.function_tool import FunctionTool
+
+from adk.tool_metrics import TOOL_CALLS, TOOL_ERRORS, TOOL_LATENCY, instrument_tool
+
+
+@pytest.mark.asyncio
+async def test_instrument_tool_records_calls_errors_and_latency():
+    async def metrics_probe_tool(value: str) -> str:
+        """Echoes the value, or fails on 'boom'."""
+        if value == "boom":
+            raise RuntimeError("boom")
+        return value
+
+    tool = FunctionTool(metrics_probe_tool)
+    assert instrument_tool(tool) is tool
+    instrument_tool(tool)  # Instrumenting twice must not double count
+
+    assert await tool.run_async(args={"value": "ok"}, tool_context=None) == "ok"
+    with pytest.raises(RuntimeError):
+        await tool.run_async(args={"value": "boom"}, tool_context=None)
+    # Missing mandatory argument: ADK returns an error result instead of raising.
+    result = await tool.run_async(args={}, tool_context=None)
+    assert "error" in result
+
+    assert TOOL_CALLS.labels("metrics_probe_tool").value == 3
+    assert TOOL_ERRORS.labels("metrics_probe_tool", "exception").value == 1
+    assert TOOL_ERRORS.labels("metrics_probe_tool", "error_result").value == 1
+    _, _, observed = TOOL_LATENCY.labels("metrics_probe_tool").snapshot()
+    assert observed == 3
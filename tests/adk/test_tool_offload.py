@@ -0,0 +1,94 @@
+import asyncio
+import threading
+
+import pytest
+from google.adk.tools.function_tool import FunctionTool
+
+from adk.tool_offload import (
+    TOOL_EXECUTOR_ACTIVE,
+    TOOL_EXECUTOR_QUEUE_DEPTH,
+    offload_sync_tool,
+    resolve_sync_tool_workers,
+)
+from config.settings import Settings
+
+
+def _blocking_tool(release: threading.Event, name: str):
+    def blocking_lookup(query: str) -> dict:
+        """Blocks until released, then answers."""
+        release.wait(5)
+        return {"answer": query, "thread": threading.current_thread().name}
+
+    blocking_lookup.__name__ = name
+    return FunctionTool(blocking_lookup)
+
+
+@pytest.mark.asyncio
+async def test_sync_tool_runs_off_the_event_loop():
+    release = threading.Event()
+    tool = offload_sync_tool(
+        _blocking_tool(release, "offload_loop_check"), max_workers=2
+    )
+
+    call = asyncio.create_task(tool.run_async(args={"query": "a"}, tool_context=None))
+    # The loop keeps running while the tool blocks its worker thread.
+    await asyncio.sleep(0.05)
+    assert not call.done()
+    release.set()
+
+    result = await call
+    assert result["answer"] == "a"
+    assert result["thread"].startswith("tool-offload_loop_check")
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_and_active_gauges_track_waiting_calls():
+    release = threading.Event()
+    tool = offload_sync_tool(
+        _blocking_tool(release, "offload_gauge_check"), max_workers=1
+    )
+    queued = TOOL_EXECUTOR_QUEUE_DEPTH.labels("offload_gauge_check")
+    active = TOOL_EXECUTOR_ACTIVE.labels("offload_gauge_check")
+
+    calls = [
+        asyncio.create_task(tool.run_async(args={"query": str(i)}, tool_context=None))
+        for i in range(3)
+    ]
+    await asyncio.sleep(0.05)
+    assert (queued.value, active.value) == (2, 1)
+
+    # A cancelled call that never started leaves the queue without running.
+    calls[2].cancel()
+    await asyncio.sleep(0)
+    assert queued.value == 1
+
+    release.set()
+    assert [r["answer"] for r in await asyncio.gather(*calls[:2])] == ["0", "1"]
+    assert (queued.value, active.value) == (0, 0)
+
+
+def test_offloading_keeps_declaration_and_skips_async_tools():
+    def sync_lookup(query: str, limit: int) -> dict:
+        """Looks something up."""
+        return {}
+
+    async def async_lookup(query: str) -> dict:
+        """Already async."""
+        return {}
+
+    expected = FunctionTool(sync_lookup)._get_declaration()
+    tool = offload_sync_tool(FunctionTool(sync_lookup))
+    async_tool = FunctionTool(async_lookup)
+
+    assert tool._get_declaration() == expected
+    assert offload_sync_tool(tool).func is tool.func  # Offloading twice is a no-op
+    assert offload_sync_tool(async_tool).func is async_lookup
+
+
+def test_resolve_sync_tool_workers_uses_per_tool_overrides():
+    settings = Settings(
+        _env_file=None, sync_tool_max_workers=4, sync_tool_workers={"slow": 16}
+    )
+
+    assert resolve_sync_tool_workers(settings, "slow") == 16
+    assert resolve_sync_tool_workers(settings, "other") == 4
@@ -0,0 +1,32 @@
+# tests/cli/test_agent_cli.py
+import json
+
+from typer.testing import CliRunner
+
+from cli.main import app
+
+runner = CliRunner()
+
+
+def test_agent_build_writes_artifact_and_check_passes(tmp_path):
+    path = tmp_path / "declarations.json"
+
+    result = runner.invoke(app, ["agent", "build", "--output", str(path)])
+
+    assert result.exit_code == 0, result.stdout
+    assert "get_current_time_async" in result.stdout
+    artifact = json.loads(path.read_text())
+    assert "search_project_docs" in artifact["declarations"]
+
+    check = runner.invoke(app, ["agent", "build", "--check", "--output", str(path)])
+    assert check.exit_code == 0
+    assert "is up to date" in check.stdout
+
+
+def test_agent_build_check_fails_without_artifact(tmp_path):
+    path = tmp_path / "missing.json"
+
+    result = runner.invoke(app, ["agent", "build", "--check", "--output", str(path)])
+
+    assert result.exit_code == 1
+    assert "missing or stale" in result.stdout
@@ -368,4 +368,30 @@ def test_cli_test_command_pytest_not_found(mock_subprocess_run):
 
     assert result.exit_code == 1
     assert "ERROR: 'poetry' or 'pytest' not found." in result.stdout
-    
\ No newline at end of file
+    
+
+@patch("cli.main.subprocess.Popen")
+def test_run_defaults_to_reload(mock_popen):
+    """Test 'gen-bootstrap run' keeps the auto-reloading development server."""
+    result = runner.invoke(app, ["run", "--port", "9000"])
+
+    assert result.exit_code == 0
+    command = mock_popen.call_args[0][0]
+    assert command[:4] == ["poetry", "run", "uvicorn", "main:app"]
+    assert "--reload" in command
+    assert "--workers" not in command
+
+
+@patch("utils.serving.default_worker_count", return_value=3)
+@patch("cli.main.subprocess.Popen")
+def test_run_prod_uses_production_profile(mock_popen, _mock_worker_count):
+    """Test 'gen-bootstrap run --prod' disables reload and sizes workers from the CPU quota."""
+    result = runner.invoke(app, ["run", "--prod", "--keep-alive", "30", "--backlog", "512"])
+
+    assert result.exit_code == 0
+    command = mock_popen.call_args[0][0]
+    assert "--reload" not in command
+    assert command[command.index("--workers") + 1] == "3"
+    assert command[command.index("--timeout-keep-alive") + 1] == "30"
+    assert command[command.index("--backlog") + 1] == "512"
+    assert "3 worker(s)" in result.stdout
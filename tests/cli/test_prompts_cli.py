@@ -199,3 +199,192 @@ def test_prompts_get_prompt_not_found(mock_ai_init, monkeypatch):
         
         mock_ai_init.assert_called_once_with(project="test-project", location="us-central1")
         mock_prompts_get.assert_called_once_with(prompt_id=prompt_id_to_get, version_id=None)
+
+
+class MockPromptMetadata:
+    def __init__(self, prompt_id, display_name):
+        self.prompt_id = prompt_id
+        self.display_name = display_name
+
+
+class MockPromptVersionMetadata:
+    def __init__(self, prompt_id, version_id):
+        self.prompt_id = prompt_id
+        self.version_id = version_id
+
+
+@pytest.fixture
+def mirror_path(tmp_path, monkeypatch):
+    path = tmp_path / "state" / "prompt_mirror.db"
+    monkeypatch.setattr("cli.prompts_cli.PROMPT_MIRROR_PATH", str(path))
+    return path
+
+
+def _mock_registry(mock_list, mock_list_versions, mock_get, versions):
+    mock_list.return_value = [MockPromptMetadata("111", "greeter")]
+    mock_list_versions.side_effect = lambda prompt_id: [
+        MockPromptVersionMetadata(prompt_id, v) for v in versions
+    ]
+    mock_get.side_effect = lambda prompt_id, version_id: MockSDKPrompt(
+        id=prompt_id,
+        prompt_name="greeter",
+        version_id=version_id,
+        prompt_data=f"Hello {{name}} v{version_id}",
+        model_name="gemini-pro",
+    )
+
+
+@patch("cli.prompts_cli.aiplatform.init")
+@patch("cli.prompts_cli.prompts.get")
+@patch("cli.prompts_cli.prompts.list_versions")
+@patch("cli.prompts_cli.prompts.list")
+def test_prompts_sync_is_incremental(mock_list, mock_list_versions, mock_get, mock_ai_init, mirror_path):
+    """Test 'prompts sync' only fetches versions that are not mirrored yet."""
+    _mock_registry(mock_list, mock_list_versions, mock_get, versions=["1", "2"])
+
+    result = runner.invoke(app, ["prompts", "sync", "--project-id", "test-project"])
+    assert result.exit_code == 0
+    assert "1 version(s) fetched, 0 unchanged" in result.stdout
+    mock_get.assert_called_once_with(prompt_id="111", version_id="2")
+
+    mock_get.reset_mock()
+    result = runner.invoke(app, ["prompts", "sync", "--project-id", "test-project"])
+    assert result.exit_code == 0
+    assert "0 version(s) fetched, 1 unchanged" in result.stdout
+    mock_get.assert_not_called()
+
+    _mock_registry(mock_list, mock_list_versions, mock_get, versions=["1", "2", "10"])
+    result = runner.invoke(app, ["prompts", "sync", "--project-id", "test-project"])
+    assert result.exit_code == 0
+    mock_get.assert_called_once_with(prompt_id="111", version_id="10")
+
+
+@patch("cli.prompts_cli.aiplatform.init")
+@patch("cli.prompts_cli.prompts.get")
+@patch("cli.prompts_cli.prompts.list_versions")
+@patch("cli.prompts_cli.prompts.list")
+def test_prompts_list_and_get_served_from_mirror(mock_list, mock_list_versions, mock_get, mock_ai_init, mirror_path):
+    """Test 'prompts list'/'get' read the mirror after a sync, and --live bypasses it."""
+    _mock_registry(mock_list, mock_list_versions, mock_get, versions=["1", "2"])
+    assert runner.invoke(app, ["prompts", "sync", "--project-id", "test-project"]).exit_code == 0
+    mock_ai_init.reset_mock()
+    mock_list.reset_mock()
+    mock_get.reset_mock()
+
+    result = runner.invoke(app, ["prompts", "list", "--project-id", "test-project"])
+    assert result.exit_code == 0
+    assert "Served from local mirror" in result.stdout
+    assert "greeter (Version: 2)" in result.stdout
+
+    result = runner.invoke(app, ["prompts", "get", "greeter", "--project-id", "test-project"])
+    assert result.exit_code == 0
+    assert "Prompt Details (ID: 111):" in result.stdout
+    assert "Hello {name} v2" in result.stdout
+    assert "Model: gemini-pro" in result.stdout
+
+    mock_ai_init.assert_not_called()
+    mock_list.assert_not_called()
+    mock_get.assert_not_called()
+
+    result = runner.invoke(app, ["prompts", "list", "--live", "--project-id", "test-project"])
+    assert result.exit_code == 0
+    mock_ai_init.assert_called_once_with(project="test-project", location="us-central1")
+    mock_list.assert_called_once()
+
+
+@pytest.fixture
+def prompt_definitions_dir(tmp_path):
+    import yaml
+
+    definitions = tmp_path / "prompts"
+    (definitions / "nested").mkdir(parents=True)
+    for name, path in (("alpha", definitions / "alpha.yaml"), ("beta", definitions / "nested" / "beta.yml")):
+        path.write_text(yaml.dump({"prompt_name": name, "prompt_data": f"{name} {{x}}", "model_name": "gemini-pro"}))
+    (definitions / "broken.yaml").write_text("prompt_name: broken\n")  # Missing required fields
+    return definitions
+
+
+@patch("cli.prompts_cli.aiplatform.init")
+@patch("cli.prompts_cli.prompts.create_version")
+@patch("cli.prompts_cli.LocalPrompt")
+def test_prompts_create_dir_skips_unchanged(mock_local_prompt, mock_create_version, mock_ai_init, prompt_definitions_dir, mirror_path):
+    """Test 'prompts create --dir' publishes changed prompts and skips unchanged ones on re-run."""
+    mock_local_prompt.side_effect = lambda **kwargs: MagicMock(**kwargs)
+    mock_create_version.side_effect = lambda prompt: MockSDKPrompt(
+        id=f"id-{prompt.prompt_name}", prompt_name=prompt.prompt_name, version_id="1"
+    )
+
+    result = runner.invoke(app, ["prompts", "create", "--dir", str(prompt_definitions_dir), "--rate", "0", "--project-id", "test-project"])
+    assert result.exit_code == 1  # broken.yaml fails validation
+    assert "Created (2):" in result.stdout
+    assert "Failed (1):" in result.stdout
+    assert "Missing required field 'prompt_data'" in result.stdout
+    assert "Summary: 2 created, 0 skipped, 1 failed" in result.stdout
+    assert mock_create_version.call_count == 2
+
+    (prompt_definitions_dir / "broken.yaml").unlink()
+    (prompt_definitions_dir / "alpha.yaml").write_text("prompt_name: alpha\nprompt_data: changed\nmodel_name: gemini-pro\n")
+    mock_create_version.reset_mock()
+
+    result = runner.invoke(app, ["prompts", "create", "--dir", str(prompt_definitions_dir), "--rate", "0", "--project-id", "test-project"])
+    assert result.exit_code == 0
+    assert "Summary: 1 created, 1 skipped, 0 failed" in result.stdout
+    assert "unchanged since version 1" in result.stdout
+    mock_create_version.assert_called_once()
+
+
+def test_prompts_create_file_and_dir_exclusive():
+    """Test 'prompts create' rejects --file together with --dir."""
+    result = runner.invoke(app, ["prompts", "create", "--file", "a.yaml", "--dir", "prompts"])
+    assert result.exit_code != 0
+    assert "Error: --file and --dir are mutually exclusive." in result.stdout
+
+
+def test_prompts_render_batch(temp_prompt_file, tmp_path):
+    """Test 'prompts render --batch' renders every variable set locally."""
+    import json
+
+    prompt_file_path = temp_prompt_file()
+    batch_file = tmp_path / "vars.jsonl"
+    batch_file.write_text('{"variable": "cat"}\n\n{"variable": "dog"}\n{"other": 1}\nnot json\n')
+    output_file = tmp_path / "rendered.jsonl"
+
+    result = runner.invoke(app, [
+        "prompts", "render", "--file", str(prompt_file_path), "--batch", str(batch_file),
+        "--output", str(output_file), "--no-tokens",
+    ])
+
+    assert result.exit_code == 1  # Two lines could not be rendered
+    assert "Rendered 2 prompt(s), 2 failed" in result.stdout
+    records = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert [r["index"] for r in records] == [0, 1, 2, 3]
+    assert records[0]["text"] == "This is a cat."
+    assert records[1]["text"] == "This is a dog."
+    assert records[0]["system_instruction"] == "Be a test prompt."
+    assert "Missing value(s) for variable(s): variable" in records[2]["error"]
+    assert "Invalid JSON" in records[3]["error"]
+
+
+@patch("cli.prompts_cli.aiplatform.init")
+@patch("cli.prompts_cli.prompts.list")
+@patch("cli.prompts_cli.prompts.create_version")
+@patch("cli.prompts_cli.LocalPrompt")
+def test_prompts_create_dir_does_not_mark_mirror_synced(
+    mock_local_prompt, mock_create_version, mock_list, mock_ai_init, prompt_definitions_dir, mirror_path
+):
+    """Test 'prompts list' still goes live after 'create --dir' into an unsynced mirror."""
+    mock_local_prompt.side_effect = lambda **kwargs: MagicMock(**kwargs)
+    mock_create_version.side_effect = lambda prompt: MockSDKPrompt(
+        id=f"id-{prompt.prompt_name}", prompt_name=prompt.prompt_name, version_id="1"
+    )
+    (prompt_definitions_dir / "broken.yaml").unlink()
+    mock_list.return_value = [MockSDKPrompt(id="999", prompt_name="from-elsewhere", version_id="3")]
+
+    result = runner.invoke(app, ["prompts", "create", "--dir", str(prompt_definitions_dir), "--rate", "0", "--project-id", "test-project"])
+    assert result.exit_code == 0
+
+    result = runner.invoke(app, ["prompts", "list", "--project-id", "test-project"])
+    assert result.exit_code == 0
+    assert "Served from local mirror" not in result.stdout
+    assert "from-elsewhere (Version: 3)" in result.stdout
+    mock_list.assert_called_once()
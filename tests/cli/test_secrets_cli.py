@@ -1,18 +1,27 @@
 # tests/cli/test_secrets_cli.py
+import os
+
 import pytest
 from typer.testing import CliRunner
 from unittest.mock import patch, MagicMock
 from cli.main import app # Main CLI app
+from config.settings import Settings
 
 runner = CliRunner()
 
+
+def _settings(**overrides):
+    """Real settings, ignoring any local .env, so tests see the actual defaults."""
+    return Settings(_env_file=None, **overrides)
+
+
 # Mock for the Secret object returned by Secret Manager client
 class MockGMSecret:
     def __init__(self, name):
         self.name = name # Full resource name, e.g., projects/.../secrets/my-secret
 
 @patch("cli.secrets_cli.secretmanager.SecretManagerServiceClient")
-@patch("cli.secrets_cli.project_settings") # To control project_id if not passed via CLI
+@patch("cli.secrets_cli.project_settings", new_callable=_settings) # To control project_id if not passed via CLI
 def test_secrets_list_no_secrets(mock_settings, MockSecretManagerClient, monkeypatch):
     """Test 'secrets list' when no secrets are found."""
     mock_settings.gcp_project_id = "test-project" # Set default project ID for the test
@@ -29,7 +38,7 @@ def test_secrets_list_no_secrets(mock_settings, MockSecretManagerClient, monkeyp
     )
 
 @patch("cli.secrets_cli.secretmanager.SecretManagerServiceClient")
-@patch("cli.secrets_cli.project_settings")
+@patch("cli.secrets_cli.project_settings", new_callable=_settings)
 def test_secrets_list_with_secrets(mock_settings, MockSecretManagerClient, monkeypatch):
     """Test 'secrets list' with some secrets found."""
     mock_settings.gcp_project_id = "test-project-with-secrets"
@@ -86,7 +95,7 @@ class MockAccessSecretVersionResponse:
         self.payload.data = payload_data.encode('utf-8')
 
 @patch("cli.secrets_cli.secretmanager.SecretManagerServiceClient")
-@patch("cli.secrets_cli.project_settings")
+@patch("cli.secrets_cli.project_settings", new_callable=_settings)
 def test_secrets_get_success(mock_settings, MockSecretManagerClient):
     """Test 'secrets get <secret_id>' successfully retrieves latest version."""
     mock_settings.gcp_project_id = "test-project"
@@ -104,7 +113,7 @@ def test_secrets_get_success(mock_settings, MockSecretManagerClient):
     mock_client_instance.access_secret_version.assert_called_once_with(name=expected_name)
 
 @patch("cli.secrets_cli.secretmanager.SecretManagerServiceClient")
-@patch("cli.secrets_cli.project_settings")
+@patch("cli.secrets_cli.project_settings", new_callable=_settings)
 def test_secrets_get_specific_version_success(mock_settings, MockSecretManagerClient):
     """Test 'secrets get <secret_id> --version <num>' successfully."""
     mock_settings.gcp_project_id = "test-project"
@@ -123,7 +132,7 @@ def test_secrets_get_specific_version_success(mock_settings, MockSecretManagerCl
     mock_client_instance.access_secret_version.assert_called_once_with(name=expected_name)
 
 @patch("cli.secrets_cli.secretmanager.SecretManagerServiceClient")
-@patch("cli.secrets_cli.project_settings")
+@patch("cli.secrets_cli.project_settings", new_callable=_settings)
 def test_secrets_get_secret_not_found(mock_settings, MockSecretManagerClient):
     """Test 'secrets get' when secret or version is not found."""
     mock_settings.gcp_project_id = "test-project"
@@ -139,7 +148,7 @@ def test_secrets_get_secret_not_found(mock_settings, MockSecretManagerClient):
     assert f"Error accessing secret '{secret_id}' (version latest): 404 Secret not found" in result.stdout
 
 @patch("cli.secrets_cli.secretmanager.SecretManagerServiceClient")
-@patch("cli.secrets_cli.project_settings")
+@patch("cli.secrets_cli.project_settings", new_callable=_settings)
 def test_secrets_get_permission_denied(mock_settings, MockSecretManagerClient):
     """Test 'secrets get' when permission is denied."""
     mock_settings.gcp_project_id = "test-project"
@@ -155,7 +164,7 @@ def test_secrets_get_permission_denied(mock_settings, MockSecretManagerClient):
     assert f"Error accessing secret '{secret_id}' (version latest): 403 Permission denied" in result.stdout
 
 @patch("cli.secrets_cli.secretmanager.SecretManagerServiceClient")
-@patch("cli.secrets_cli.project_settings")
+@patch("cli.secrets_cli.project_settings", new_callable=_settings)
 def test_secrets_create_success(mock_settings, MockSecretManagerClient):
     """Test 'secrets create <secret_id>' successfully."""
     mock_settings.gcp_project_id = "test-project"
@@ -188,7 +197,7 @@ def test_secrets_create_success(mock_settings, MockSecretManagerClient):
 
 
 @patch("cli.secrets_cli.secretmanager.SecretManagerServiceClient")
-@patch("cli.secrets_cli.project_settings")
+@patch("cli.secrets_cli.project_settings", new_callable=_settings)
 def test_secrets_create_already_exists(mock_settings, MockSecretManagerClient):
     """Test 'secrets create' when the secret already exists."""
     mock_settings.gcp_project_id = "test-project"
@@ -204,7 +213,7 @@ def test_secrets_create_already_exists(mock_settings, MockSecretManagerClient):
     assert f"Error creating secret '{secret_id}': 409 Secret already exists" in result.stdout
 
 @patch("cli.secrets_cli.secretmanager.SecretManagerServiceClient")
-@patch("cli.secrets_cli.project_settings")
+@patch("cli.secrets_cli.project_settings", new_callable=_settings)
 def test_secrets_create_permission_denied(mock_settings, MockSecretManagerClient):
     """Test 'secrets create' when permission is denied."""
     mock_settings.gcp_project_id = "test-project"
@@ -227,7 +236,7 @@ class MockGMSecretVersion:
         self.version_id = name.split("/")[-1] # Extract version_id from full name
 
 @patch("cli.secrets_cli.secretmanager.SecretManagerServiceClient")
-@patch("cli.secrets_cli.project_settings")
+@patch("cli.secrets_cli.project_settings", new_callable=_settings)
 def test_secrets_add_version_with_data_success(mock_settings, MockSecretManagerClient):
     """Test 'secrets add-version --data' successfully."""
     mock_settings.gcp_project_id = "test-project"
@@ -254,7 +263,7 @@ def test_secrets_add_version_with_data_success(mock_settings, MockSecretManagerC
     assert request_arg['payload']['data'] == secret_data.encode('utf-8')
 
 @patch("cli.secrets_cli.secretmanager.SecretManagerServiceClient")
-@patch("cli.secrets_cli.project_settings")
+@patch("cli.secrets_cli.project_settings", new_callable=_settings)
 def test_secrets_add_version_with_data_file_success(mock_settings, MockSecretManagerClient, tmp_path):
     """Test 'secrets add-version --data-file' successfully."""
     mock_settings.gcp_project_id = "test-project"
@@ -295,7 +304,7 @@ def test_secrets_add_version_no_data_or_file():
     assert "Error: Either --data or --data-file must be provided." in result.stdout
 
 @patch("cli.secrets_cli.secretmanager.SecretManagerServiceClient")
-@patch("cli.secrets_cli.project_settings")
+@patch("cli.secrets_cli.project_settings", new_callable=_settings)
 def test_secrets_add_version_secret_not_found(mock_settings, MockSecretManagerClient):
     """Test 'secrets add-version' when the parent secret is not found."""
     mock_settings.gcp_project_id = "test-project"
@@ -316,3 +325,59 @@ def test_secrets_add_version_data_file_not_found(tmp_path):
     result = runner.invoke(app, ["secrets", "add-version", "any-secret", "--data-file", str(tmp_path / "no_such_file.txt"), "--project-id", "test-project"])
     assert result.exit_code != 0
     assert f"Error: Data file '{str(tmp_path / 'no_such_file.txt')}' not found." in result.stdout
+
+
+class MockResolvedSecretVersionResponse(MockAccessSecretVersionResponse):
+    def __init__(self, payload_data, name):
+        super().__init__(payload_data)
+        self.name = name
+
+
+@patch("cli.secrets_cli.secretmanager.SecretManagerServiceClient")
+@patch("cli.secrets_cli.project_settings", new_callable=_settings)
+def test_secrets_get_cache_serves_pinned_version(mock_settings, MockSecretManagerClient, tmp_path):
+    """Test 'secrets get --cache' serves a pinned version locally after an alias lookup."""
+    mock_settings.gcp_project_id = "test-project"
+    mock_settings.secret_cache_dir = str(tmp_path / "cache")
+    mock_settings.secret_cache_key_path = str(tmp_path / "config" / "cache.key")
+    mock_settings.secret_cache_ttl_seconds = 300
+    secret_id = "cached-key"
+
+    mock_client_instance = MockSecretManagerClient.return_value
+    mock_client_instance.access_secret_version.return_value = MockResolvedSecretVersionResponse(
+        payload_data="cachedvalue",
+        name=f"projects/123/secrets/{secret_id}/versions/7",
+    )
+
+    # 'latest' always goes to the API, and populates the entry for version 7.
+    result = runner.invoke(app, ["secrets", "get", secret_id, "--cache", "--project-id", "test-project"])
+    assert result.exit_code == 0
+    assert "cachedvalue" in result.stdout
+
+    result = runner.invoke(app, ["secrets", "get", secret_id, "--version", "7", "--cache", "--project-id", "test-project"])
+    assert result.exit_code == 0
+    assert "cachedvalue" in result.stdout
+    assert "cached" in result.stdout
+    mock_client_instance.access_secret_version.assert_called_once()
+
+
+@patch("cli.secrets_cli.secretmanager.SecretManagerServiceClient")
+@patch("cli.secrets_cli.project_settings", new_callable=_settings)
+def test_secrets_get_no_cache_overrides_setting(mock_settings, MockSecretManagerClient, tmp_path):
+    """Test 'secrets get --no-cache' goes to the API even when the cache is enabled in settings."""
+    mock_settings.gcp_project_id = "test-project"
+    mock_settings.secret_cache_enabled = True
+    mock_settings.secret_cache_dir = str(tmp_path / "cache")
+    mock_settings.secret_cache_key_path = str(tmp_path / "config" / "cache.key")
+    mock_settings.secret_cache_ttl_seconds = 300
+
+    mock_client_instance = MockSecretManagerClient.return_value
+    mock_client_instance.access_secret_version.return_value = MockAccessSecretVersionResponse(payload_data="livevalue")
+
+    for _ in range(2):
+        result = runner.invoke(app, ["secrets", "get", "my-key", "--version", "2", "--no-cache", "--project-id", "test-project"])
+        assert result.exit_code == 0
+        assert "livevalue" in result.stdout
+
+    assert mock_client_instance.access_secret_version.call_count == 2
+    assert not os.path.exists(tmp_path / "cache")
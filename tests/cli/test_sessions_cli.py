@@ -0,0 +1,130 @@
+# tests/cli/test_sessions_cli.py
+import json
+
+from typer.testing import CliRunner
+
+from cli import sessions_cli
+from cli.main import app
+
+runner = CliRunner()
+
+
+def test_sessions_bench_reports_each_client_count(tmp_path):
+    result = runner.invoke(
+        app,
+        [
+            "sessions",
+            "bench",
+            "--clients",
+            "1,4",
+            "--events",
+            "3",
+            "--db-dir",
+            str(tmp_path),
+            "--json",
+        ],
+    )
+
+    assert result.exit_code == 0, result.stdout
+    report = json.loads(result.stdout)
+    assert [run["clients"] for run in report["runs"]] == [1, 4]
+    four_clients = report["runs"][1]["operations"]
+    assert four_clients["create"]["calls"] == 4
+    assert four_clients["append"]["calls"] == 12
+    assert four_clients["read"]["errors"] == 0
+
+
+def test_sessions_bench_rejects_bad_client_counts():
+    result = runner.invoke(app, ["sessions", "bench", "--clients", "1,x"])
+
+    assert result.exit_code != 0
+
+
+def test_sessions_compact_reports_json(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "sessions.db")
+    monkeypatch.setattr(sessions_cli.project_settings, "session_db_path", db_path)
+
+    result = runner.invoke(app, ["sessions", "compact", "--max-events", "5", "--json"])
+
+    assert result.exit_code == 0, result.output
+    report = json.loads(result.stdout)
+    assert report["trimmed_events"] == 0
+    assert report["notes"] == []
+
+
+def test_sessions_bench_compares_shard_counts_across_processes(tmp_path):
+    result = runner.invoke(
+        app,
+        [
+            "sessions",
+            "bench",
+            "--clients",
+            "2",
+            "--events",
+            "2",
+            "--shards",
+            "1,2",
+            "--processes",
+            "2",
+            "--no-cache",
+            "--no-reads",
+            "--db-dir",
+            str(tmp_path),
+            "--json",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    runs = json.loads(result.stdout)["runs"]
+    assert [(run["shards"], run["processes"]) for run in runs] == [(1, 2), (2, 2)]
+    assert all(run["operations"]["append"]["calls"] == 4 for run in runs)
+    assert all(run["operations"]["read"]["calls"] == 0 for run in runs)
+
+
+def test_sessions_migrate_copies_into_shards(tmp_path, monkeypatch):
+    from sessions.sqlite_session_service import SQLiteSessionService
+
+    db_path = str(tmp_path / "sessions.db")
+    source = SQLiteSessionService(db_path, pool_size=1)
+    source.create_session(app_name="app", user_id="u1")
+    source.close()
+    monkeypatch.setattr(sessions_cli.project_settings, "session_db_path", db_path)
+
+    result = runner.invoke(app, ["sessions", "migrate", "--shards", "2"])
+    assert result.exit_code == 0, result.output
+    assert "Migrated 1 sessions" in result.stdout
+    assert "SESSION_DB_SHARDS=2" in result.stdout
+
+    again = runner.invoke(app, ["sessions", "migrate", "--shards", "2"])
+    assert again.exit_code == 1
+
+
+def test_sessions_bench_load_compares_snapshot_intervals(tmp_path):
+    result = runner.invoke(
+        app,
+        [
+            "sessions",
+            "bench-load",
+            "--events",
+            "5,40",
+            "--snapshot-intervals",
+            "0,10",
+            "--repeat",
+            "2",
+            "--db-dir",
+            str(tmp_path),
+            "--json",
+        ],
+    )
+
+    assert result.exit_code == 0, result.stdout
+    runs = json.loads(result.stdout)["runs"]
+    assert [
+        (r["snapshot_interval"], r["events"], r["loaded_events"]) for r in runs
+    ] == [
+        (0, 5, 5),
+        (0, 40, 40),
+        (10, 5, 5),
+        (10, 40, 10),
+    ]
+    assert runs[0]["load"]["calls"] == 2
@@ -0,0 +1,59 @@
+# tests/cli/test_tool_bench.py
+import asyncio
+import threading
+
+from cli.tool_bench import BenchResult, run_benchmark
+
+
+def test_percentiles_use_nearest_rank():
+    result = BenchResult(
+        calls=100,
+        errors=0,
+        concurrency=1,
+        wall_seconds=2.0,
+        latencies=[i / 1000 for i in range(1, 101)],
+    )
+    assert result.percentile(50) == 0.05
+    assert result.percentile(95) == 0.095
+    assert result.percentile(99) == 0.099
+    assert result.throughput == 50
+
+
+def test_run_benchmark_async_respects_concurrency_and_counts_errors():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def probe(value: int) -> dict:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return {"error": "odd"} if value % 2 else {"value": value}
+
+    result = run_benchmark(
+        probe,
+        [{"value": 1}, {"value": 2}],
+        iterations=20,
+        concurrency=4,
+        trace_memory=True,
+    )
+
+    assert result.calls == 20
+    assert result.errors == 10
+    assert result.first_error == "odd"
+    assert max_in_flight == 4
+    assert result.peak_traced_bytes is not None
+
+
+def test_run_benchmark_runs_sync_functions_on_threads():
+    thread_names = set()
+
+    def probe() -> str:
+        thread_names.add(threading.current_thread().name)
+        return "ok"
+
+    result = run_benchmark(probe, [], iterations=10, concurrency=2, warmup=2)
+
+    assert result.calls == 10 and result.errors == 0
+    assert threading.main_thread().name not in thread_names
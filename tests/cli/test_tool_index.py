@@ -0,0 +1,95 @@
+# tests/cli/test_tool_index.py
+import os
+import textwrap
+
+import pytest
+
+from cli.tool_index import ToolIndex, UnresolvableToolModule, index_source
+
+TOOL_SOURCE = textwrap.dedent(
+    """
+    from google.adk.tools import FunctionTool
+    from google.adk.tools.function_tool import FunctionTool as FT
+
+    async def lookup(query: str, limit: int = 5, *, exact: bool = False) -> list[str]:
+        '''Looks things up.
+
+        Args:
+            query: What to look for.
+        '''
+
+    def helper():
+        pass
+
+    lookup_tool = FunctionTool(lookup)
+    """
+)
+
+
+def test_index_source_reads_names_signatures_and_docstrings():
+    tools = index_source(TOOL_SOURCE)
+
+    assert len(tools) == 1
+    tool = tools[0]
+    assert tool.name == "lookup"
+    assert tool.variable_name == "lookup_tool"
+    assert tool.description.startswith("Looks things up.")
+    assert tool.docstring.splitlines()[2] == "Args:"
+    assert [(p.name, p.annotation, p.default) for p in tool.parameters] == [
+        ("query", "str", None),
+        ("limit", "int", "5"),
+        ("exact", "bool", "False"),
+    ]
+
+
+def test_index_source_rejects_dynamic_tool_construction():
+    source = (
+        "from google.adk.tools import FunctionTool\n"
+        "tools = [FunctionTool(f) for f in FUNCS]\n"
+    )
+    with pytest.raises(UnresolvableToolModule):
+        index_source(source)
+
+
+def test_tool_index_reuses_cached_entries(tmp_path, mocker):
+    tools_dir = tmp_path / "tools"
+    tools_dir.mkdir()
+    module_path = tools_dir / "lookup.py"
+    module_path.write_text(TOOL_SOURCE)
+    cache_path = str(tmp_path / "index.json")
+
+    index = ToolIndex(cache_path)
+    tools, unresolved = index.lookup(str(tools_dir))
+    index.save()
+    assert [t.name for t in tools] == ["lookup"]
+    assert unresolved == []
+
+    parse_spy = mocker.patch("cli.tool_index.index_source")
+    # Touching the file changes the mtime but not the hash: still no re-parse.
+    stat = os.stat(module_path)
+    os.utime(module_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    tools, _ = ToolIndex(cache_path).lookup(str(tools_dir))
+    assert [t.name for t in tools] == ["lookup"]
+    parse_spy.assert_not_called()
+
+
+def test_index_source_recognises_cached_tool_and_ignores_unused_factories():
+    source = textwrap.dedent(
+        """
+        from google.adk.tools import FunctionTool
+        from tools.cached_tool import cached_tool
+
+        async def lookup(query: str):
+            '''Cached lookup.'''
+
+        def make_tool(func):
+            return FunctionTool(func)
+
+        lookup_tool = cached_tool(FunctionTool(lookup), maxsize=16, ttl_seconds=60)
+        """
+    )
+    tools = index_source(source)
+    assert [(t.name, t.variable_name) for t in tools] == [("lookup", "lookup_tool")]
+
+    with pytest.raises(UnresolvableToolModule):
+        index_source(source + "other_tool = make_tool(lookup)\n")
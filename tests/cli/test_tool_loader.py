@@ -0,0 +1,23 @@
+# tests/cli/test_tool_loader.py
+from cli.tool_loader import load_modules_in_processes
+
+
+def test_load_modules_in_processes_isolates_slow_and_broken_modules(tmp_path):
+    tools_dir = tmp_path / "tools"
+    tools_dir.mkdir()
+    (tools_dir / "plain.py").write_text("VALUE = 1\n")
+    (tools_dir / "hanging.py").write_text("import time\ntime.sleep(60)\n")
+    (tools_dir / "broken.py").write_text("raise RuntimeError('boom')\n")
+    paths = [str(tools_dir / name) for name in ("plain.py", "hanging.py", "broken.py")]
+
+    results = load_modules_in_processes(
+        paths, str(tools_dir), workers=3, import_timeout=5
+    )
+
+    plain, hanging, broken = results
+    assert [r.module_path for r in results] == paths
+    assert plain.error is None and plain.tools == [] and plain.import_seconds > 0
+    assert hanging.timed_out and hanging.tools == []
+    assert "timed out" in hanging.error
+    assert not broken.timed_out
+    assert "RuntimeError: boom" in broken.error
@@ -1,6 +1,9 @@
 # tests/cli/test_tools_cli.py
+import json
 import os
 import shutil
+import textwrap
+from unittest.mock import MagicMock
 
 import pytest
 from typer.testing import CliRunner
@@ -11,6 +14,14 @@ from cli.main import \
 runner = CliRunner()
 
 
+@pytest.fixture(autouse=True)
+def tool_index_cache(tmp_path, monkeypatch):
+    """Keeps the static tool index cache out of the project's state directory."""
+    cache_path = tmp_path / "state" / "tool_index.json"
+    monkeypatch.setattr("cli.tools_cli.TOOL_INDEX_CACHE_PATH", str(cache_path))
+    return cache_path
+
+
 @pytest.fixture
 def empty_tools_dir(tmp_path):
     """Creates a temporary empty tools directory."""
@@ -164,3 +175,118 @@ def test_tools_describe_tool_not_found(monkeypatch, populated_tools_dir):
 
     assert result.exit_code != 0  # Expecting a non-zero exit code for error
     assert f"Error: Tool '{tool_name_to_describe}' not found." in result.stdout
+
+
+def test_tools_list_static_loader_does_not_import_modules(
+    monkeypatch, populated_tools_dir, tool_index_cache
+):
+    """The default static loader reads tool modules without executing them."""
+    monkeypatch.setattr("cli.tools_cli.TOOLS_DIR", str(populated_tools_dir))
+    import_spy = MagicMock(side_effect=AssertionError("module was imported"))
+    monkeypatch.setattr("cli.tools_cli._import_tools_from_file", import_spy)
+
+    result = runner.invoke(app, ["tools", "list"])
+
+    assert result.exit_code == 0
+    assert "MockToolAlpha" in result.stdout
+    assert "MockToolBeta" in result.stdout
+    import_spy.assert_not_called()
+    assert tool_index_cache.exists()
+
+
+def test_tools_describe_static_matches_import_loader(monkeypatch, populated_tools_dir):
+    monkeypatch.setattr("cli.tools_cli.TOOLS_DIR", str(populated_tools_dir))
+
+    static_result = runner.invoke(app, ["tools", "describe", "MockToolBeta"])
+    import_result = runner.invoke(
+        app, ["tools", "describe", "MockToolBeta", "--loader", "import"]
+    )
+
+    assert static_result.exit_code == 0
+    assert import_result.exit_code == 0
+    assert static_result.stdout == import_result.stdout
+    assert "data: int" in static_result.stdout
+
+
+def test_tools_list_imports_dynamically_built_tools(monkeypatch, populated_tools_dir):
+    """Modules whose tools cannot be resolved from source fall back to a real import."""
+    (populated_tools_dir / "dynamic_tools.py").write_text(
+        textwrap.dedent(
+            """
+            from google.adk.tools import FunctionTool
+
+            def make_tool():
+                async def DynamicTool(x: str):
+                    '''Built at import time.'''
+                    return x
+                return FunctionTool(DynamicTool)
+
+            dynamic_tool = make_tool()
+            """
+        )
+    )
+    monkeypatch.setattr("cli.tools_cli.TOOLS_DIR", str(populated_tools_dir))
+
+    result = runner.invoke(app, ["tools", "list"])
+
+    assert result.exit_code == 0
+    assert "DynamicTool" in result.stdout
+    assert "MockToolAlpha" in result.stdout
+
+
+def test_tools_list_process_loader_reports_import_times(monkeypatch, populated_tools_dir):
+    monkeypatch.setattr("cli.tools_cli.TOOLS_DIR", str(populated_tools_dir))
+
+    separate_stderr_runner = CliRunner(mix_stderr=False)
+    result = separate_stderr_runner.invoke(
+        app, ["tools", "list", "--loader", "process", "--workers", "2"]
+    )
+
+    assert result.exit_code == 0, result.stderr
+    assert "MockToolAlpha" in result.stdout
+    assert "MockToolBeta" in result.stdout
+    assert "Module import times:" in result.stderr
+    assert "mock_tool_module.py: 2 tool(s)" in result.stderr
+    assert "import times" not in result.stdout
+
+
+def test_tools_bench_reports_latency_percentiles(monkeypatch, populated_tools_dir, tmp_path):
+    monkeypatch.setattr("cli.tools_cli.TOOLS_DIR", str(populated_tools_dir))
+    inputs_file = tmp_path / "inputs.jsonl"
+    inputs_file.write_text('{"data": 1}\n{"data": 2}\n')
+
+    result = runner.invoke(
+        app,
+        ["tools", "bench", "MockToolBeta", "-n", "50", "-c", "5", "-i", str(inputs_file), "--json"],
+    )
+
+    assert result.exit_code == 0, result.stdout
+    report = json.loads(result.stdout)
+    assert report["tool"] == "MockToolBeta"
+    assert report["calls"] == 50
+    assert report["errors"] == 0
+    assert set(report["latency_seconds"]) == {"p50", "p95", "p99", "max"}
+
+
+def test_tools_bench_unknown_tool(monkeypatch, populated_tools_dir):
+    monkeypatch.setattr("cli.tools_cli.TOOLS_DIR", str(populated_tools_dir))
+
+    result = runner.invoke(app, ["tools", "bench", "NonExistentTool"])
+
+    assert result.exit_code != 0
+    assert "Error: Tool 'NonExistentTool' not found." in result.stdout
+
+
+def test_tools_index_docs_reports_incremental_updates(monkeypatch, tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "guide.md").write_text("# Guide\n\nHow to deploy.\n")
+    monkeypatch.setattr("cli.tools_cli.project_settings.doc_search_paths", [str(docs)])
+    monkeypatch.setattr("cli.tools_cli.project_settings.local_state_dir", str(tmp_path / "state"))
+
+    first = runner.invoke(app, ["tools", "index-docs"])
+    second = runner.invoke(app, ["tools", "index-docs"])
+
+    assert first.exit_code == 0, first.stdout
+    assert "1 file(s) tokenized, 0 unchanged" in first.stdout
+    assert "0 file(s) tokenized, 1 unchanged" in second.stdout
@@ -0,0 +1,193 @@
+# tests/sessions/test_cached_session_service.py
+import asyncio
+
+import pytest
+from google.adk.events.event import Event, EventActions
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai import types
+
+from sessions.cached_session_service import CachedSessionService
+from sessions.sqlite_session_service import SQLiteSessionService
+
+
+def _event(text: str, state_delta: dict | None = None) -> Event:
+    return Event(
+        author="user",
+        invocation_id="inv",
+        content=types.Content(role="user", parts=[types.Part(text=text)]),
+        actions=EventActions(state_delta=state_delta or {}),
+    )
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "sessions.db")
+
+
+def _cached(db_path, **kwargs) -> CachedSessionService:
+    # A long interval keeps flushes under the test's control.
+    kwargs.setdefault("flush_interval_seconds", 60)
+    return CachedSessionService(SQLiteSessionService(db_path, pool_size=2), **kwargs)
+
+
+def _stored_texts(db_path, session_id):
+    store = SQLiteSessionService(db_path, pool_size=1)
+    try:
+        session = store.get_session(app_name="app", user_id="u1", session_id=session_id)
+        return session and [event.content.parts[0].text for event in session.events]
+    finally:
+        store.close()
+
+
+def test_hit_is_served_from_memory_and_appends_are_queued(db_path, monkeypatch):
+    service = _cached(db_path, validate_reads=False)
+    session = service.create_session(
+        app_name="app", user_id="u1", state={"user:tz": "UTC"}
+    )
+    service.append_event(session, _event("hi", {"count": 1, "app:mode": "fast"}))
+
+    monkeypatch.setattr(
+        service.backing, "get_session", lambda **_: pytest.fail("read the store")
+    )
+    loaded = service.get_session(app_name="app", user_id="u1", session_id=session.id)
+    assert [event.content.parts[0].text for event in loaded.events] == ["hi"]
+    assert loaded.state == {"count": 1, "app:mode": "fast", "user:tz": "UTC"}
+    assert service.pending_events == 1
+    assert _stored_texts(db_path, session.id) == []
+
+    recent = service.get_session(
+        app_name="app",
+        user_id="u1",
+        session_id=session.id,
+        config=GetSessionConfig(num_recent_events=1),
+    )
+    recent.events.clear()  # Callers get their own list
+    assert (
+        len(
+            service.get_session(
+                app_name="app", user_id="u1", session_id=session.id
+            ).events
+        )
+        == 1
+    )
+    service.close()
+
+
+def test_flush_writes_batch_and_close_loses_nothing(db_path):
+    service = _cached(db_path)
+    sessions = [service.create_session(app_name="app", user_id="u1") for _ in range(3)]
+    for turn in range(4):
+        for session in sessions:
+            service.append_event(session, _event(f"t{turn}"))
+    assert service.flush() == 12
+    assert service.pending_events == 0
+
+    service.append_event(sessions[0], _event("last"))
+    service.close()
+    assert _stored_texts(db_path, sessions[0].id) == ["t0", "t1", "t2", "t3", "last"]
+    assert _stored_texts(db_path, sessions[2].id) == ["t0", "t1", "t2", "t3"]
+
+
+def test_background_flusher_persists_appends(db_path):
+    service = _cached(db_path, flush_interval_seconds=0.01)
+    session = service.create_session(app_name="app", user_id="u1")
+    service.append_event(session, _event("hi"))
+    for _ in range(200):
+        if service.pending_events == 0:
+            break
+        asyncio.run(asyncio.sleep(0.01))
+    assert _stored_texts(db_path, session.id) == ["hi"]
+    service.close()
+
+
+def test_failed_flush_requeues_events(db_path, monkeypatch):
+    service = _cached(db_path)
+    session = service.create_session(app_name="app", user_id="u1")
+    service.append_event(session, _event("hi"))
+    original = service.backing.append_event_records
+
+    def broken(records):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(service.backing, "append_event_records", broken)
+    with pytest.raises(RuntimeError):
+        service.flush()
+    assert service.pending_events == 1
+    monkeypatch.setattr(service.backing, "append_event_records", original)
+    service.close()
+    assert _stored_texts(db_path, session.id) == ["hi"]
+
+
+def test_lru_evicts_by_entries_and_bytes(db_path):
+    service = _cached(db_path, max_entries=2)
+    first, second, third = (
+        service.create_session(app_name="app", user_id="u1") for _ in range(3)
+    )
+    assert service.cached_sessions == 2
+    service.append_event(
+        first, _event("still queued")
+    )  # Not cached: exists check, then queued
+
+    # A miss on a session with queued events flushes them before loading.
+    loaded = service.get_session(app_name="app", user_id="u1", session_id=first.id)
+    assert [event.content.parts[0].text for event in loaded.events] == ["still queued"]
+    assert service.pending_events == 0
+    service.close()
+
+    service = _cached(db_path, max_bytes=1500)
+    session = service.create_session(app_name="app", user_id="u1")
+    service.append_event(session, _event("x" * 1000))
+    assert service.cached_sessions == 1
+    service.append_event(session, _event("y" * 1000))
+    assert service.cached_sessions == 0 and service.cached_bytes == 0
+    loaded = service.get_session(app_name="app", user_id="u1", session_id=session.id)
+    assert len(loaded.events) == 2
+    service.close()
+
+
+def test_validated_read_reloads_after_another_worker_writes(db_path):
+    worker_a = _cached(db_path)
+    worker_b = _cached(db_path)
+    session = worker_a.create_session(app_name="app", user_id="u1")
+    assert (
+        worker_b.get_session(app_name="app", user_id="u1", session_id=session.id).events
+        == []
+    )
+
+    worker_a.append_event(session, _event("from a"))
+    worker_a.flush()
+    loaded = worker_b.get_session(app_name="app", user_id="u1", session_id=session.id)
+    assert [event.content.parts[0].text for event in loaded.events] == ["from a"]
+
+    worker_a.delete_session(app_name="app", user_id="u1", session_id=session.id)
+    assert (
+        worker_b.get_session(app_name="app", user_id="u1", session_id=session.id)
+        is None
+    )
+    worker_a.close()
+    worker_b.close()
+
+
+def test_append_to_unknown_session_raises(db_path):
+    service = _cached(db_path)
+    session = service.create_session(app_name="app", user_id="u1")
+    service.delete_session(app_name="app", user_id="u1", session_id=session.id)
+    with pytest.raises(ValueError, match="not found"):
+        service.append_event(session, _event("late"))
+    service.close()
+
+
+def test_async_api_round_trip(db_path):
+    service = _cached(db_path, validate_reads=False)
+
+    async def scenario():
+        session = await service.create_session_async(app_name="app", user_id="u1")
+        await service.append_event_async(session, _event("hi"))
+        return await service.get_session_async(
+            app_name="app", user_id="u1", session_id=session.id
+        )
+
+    loaded = asyncio.run(scenario())
+    assert [event.content.parts[0].text for event in loaded.events] == ["hi"]
+    service.close()
+    assert _stored_texts(db_path, loaded.id) == ["hi"]
@@ -0,0 +1,209 @@
+# tests/sessions/test_compaction.py
+import threading
+from types import SimpleNamespace
+
+import pytest
+from google.adk.events.event import Event
+from google.genai import types
+
+from sessions.compaction import (
+    RetentionPolicy,
+    SessionCompactionJob,
+    compact_session_store,
+    full_vacuum,
+)
+from sessions.sqlite_pool import SQLitePool
+from sessions.sqlite_session_service import SQLiteSessionService
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = SQLiteSessionService(str(tmp_path / "sessions.db"), pool_size=2)
+    yield service
+    service.close()
+
+
+def _fill(service, events: int, payload: int = 200, **create_kwargs):
+    session = service.create_session(app_name="app", user_id="u1", **create_kwargs)
+    for turn in range(events):
+        service.append_event(
+            session,
+            Event(
+                author="user",
+                invocation_id="inv",
+                content=types.Content(
+                    role="user", parts=[types.Part(text=f"{turn}:" + "x" * payload)]
+                ),
+            ),
+        )
+    return session
+
+
+def _texts(service, session):
+    loaded = service.get_session(app_name="app", user_id="u1", session_id=session.id)
+    return [event.content.parts[0].text.split(":")[0] for event in loaded.events]
+
+
+def _policy(**kwargs):
+    kwargs.setdefault("batch_size", 4)
+    kwargs.setdefault("batch_pause_seconds", 0)
+    return RetentionPolicy(**kwargs)
+
+
+def test_new_databases_use_incremental_auto_vacuum(service):
+    with service.pool.read() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+
+def test_expires_idle_sessions_in_batches(service):
+    old = _fill(service, 10)
+    fresh = _fill(service, 2)
+    with service.pool.write() as conn:
+        conn.execute("UPDATE sessions SET update_time = 0 WHERE id = ?", (old.id,))
+
+    report = compact_session_store(service.pool, _policy(max_age_seconds=3600))
+
+    assert report.expired_sessions == 1
+    assert report.deleted_events == 10
+    assert report.transactions >= 3  # 10 events, 4 per transaction
+    assert service.get_session(app_name="app", user_id="u1", session_id=old.id) is None
+    assert _texts(service, fresh) == ["0", "1"]
+
+
+def test_trims_oldest_events_and_keeps_state(service):
+    session = _fill(service, 11, state={"topic": "tides"})
+
+    report = compact_session_store(service.pool, _policy(max_events_per_session=3))
+
+    assert report.trimmed_events == 8
+    assert _texts(service, session) == ["8", "9", "10"]
+    loaded = service.get_session(app_name="app", user_id="u1", session_id=session.id)
+    assert loaded.state == {"topic": "tides"}
+
+
+def test_trim_keeps_the_newest_events_of_previously_trimmed_sessions(service):
+    short = _fill(service, 3)
+    trimmed = _fill(service, 6)
+    first = compact_session_store(service.pool, _policy(max_events_per_session=3))
+    # event_count still counts the trimmed events; the session is checked, not cut.
+    second = compact_session_store(service.pool, _policy(max_events_per_session=3))
+
+    assert (first.trimmed_events, second.trimmed_events) == (3, 0)
+    assert _texts(service, short) == ["0", "1", "2"]
+    assert _texts(service, trimmed) == ["3", "4", "5"]
+
+
+def test_size_cap_removes_least_recently_updated_and_vacuum_shrinks_file(service):
+    sessions = [_fill(service, 40, payload=2000) for _ in range(4)]
+    policy = _policy(max_db_bytes=250 * 1024, batch_size=500)
+
+    report = compact_session_store(service.pool, policy)
+
+    assert report.evicted_sessions >= 1
+    assert report.live_bytes_after <= 250 * 1024
+    assert report.vacuumed_pages > 0
+    assert report.file_bytes_after < report.file_bytes_before
+    assert (
+        service.get_session(app_name="app", user_id="u1", session_id=sessions[0].id)
+        is None
+    )
+    assert service.get_session(app_name="app", user_id="u1", session_id=sessions[-1].id)
+
+
+def test_cancel_stops_between_transactions(service):
+    _fill(service, 20)
+    cancel = threading.Event()
+    cancel.set()
+
+    report = compact_session_store(
+        service.pool, _policy(max_events_per_session=1), cancel=cancel
+    )
+
+    assert report.transactions == 1
+    assert "stopped early" in report.notes[0]
+
+
+def test_full_vacuum_converts_legacy_database(tmp_path):
+    pool = SQLitePool(str(tmp_path / "legacy.db"), size=1)
+    with pool.write() as conn:
+        conn.execute("CREATE TABLE sessions (id TEXT)")
+    report = compact_session_store(pool, _policy())
+    assert "--full-vacuum" in report.notes[0]
+
+    full_vacuum(pool)
+    with pool.read() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    pool.close()
+
+
+def test_job_skips_pass_while_another_process_holds_the_lock(service):
+    fcntl = pytest.importorskip("fcntl")
+    job = SessionCompactionJob(service.pool, _policy(), interval_seconds=3600)
+    assert job.run_once() is not None
+
+    with open(f"{service.pool.path}.compaction.lock", "a") as held:
+        fcntl.flock(held, fcntl.LOCK_EX)
+        assert job.run_once() is None
+
+
+def test_one_job_per_shard_with_split_size_cap(tmp_path):
+    from sessions.compaction import start_compaction_jobs
+    from sessions.sharded_session_service import ShardedSessionService
+
+    settings = SimpleNamespace(
+        session_compaction_interval_seconds=3600,
+        session_retention_max_age_days=0,
+        session_retention_max_events=0,
+        session_retention_max_db_bytes=4 * 1024 * 1024,
+        session_compaction_batch_size=100,
+        session_compaction_batch_pause_ms=0,
+    )
+    service = ShardedSessionService(str(tmp_path / "sessions.db"), 4, pool_size=1)
+
+    jobs = start_compaction_jobs(service, settings)
+    try:
+        assert [job.pool for job in jobs] == [shard.pool for shard in service.shards]
+        assert {job.policy.max_db_bytes for job in jobs} == {1024 * 1024}
+    finally:
+        for job in jobs:
+            job.stop()
+        service.close()
+
+
+class _EventBeforeFirstWrite:
+    """The service's pool, but `before` runs just ahead of compaction's first write."""
+
+    def __init__(self, pool, before):
+        self._pool = pool
+        self._before = before
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+    def write(self):
+        if self._before is not None:
+            before, self._before = self._before, None
+            before()
+        return self._pool.write()
+
+
+def test_expiry_keeps_sessions_updated_after_they_were_picked(service):
+    session = _fill(service, 3)
+    with service.pool.write() as conn:
+        conn.execute("UPDATE sessions SET update_time = 0 WHERE id = ?", (session.id,))
+    pool = _EventBeforeFirstWrite(
+        service.pool,
+        lambda: service.append_event(
+            service.get_session(app_name="app", user_id="u1", session_id=session.id),
+            Event(
+                author="user",
+                invocation_id="inv",
+                content=types.Content(role="user", parts=[types.Part(text="3:x")]),
+            ),
+        ),
+    )
+
+    report = compact_session_store(pool, _policy(max_age_seconds=3600))
+
+    assert (report.expired_sessions, report.deleted_events) == (0, 0)
+    assert _texts(service, session) == ["0", "1", "2", "3"]
@@ -0,0 +1,128 @@
+# tests/sessions/test_migration.py
+import sqlite3
+
+import pytest
+from google.adk.events.event import Event, EventActions
+from google.adk.sessions.database_session_service import DatabaseSessionService
+from google.genai import types
+
+from sessions.migration import LAYOUT_ADK, LAYOUT_SQLITE, migrate_to_shards
+from sessions.sharded_session_service import ShardedSessionService, shard_paths
+from sessions.sqlite_session_service import SQLiteSessionService
+
+
+def _event(text: str, state_delta: dict | None = None) -> Event:
+    return Event(
+        author="user",
+        invocation_id="inv",
+        content=types.Content(role="user", parts=[types.Part(text=text)]),
+        actions=EventActions(state_delta=state_delta or {}),
+    )
+
+
+def _fill(service, count: int) -> list:
+    sessions = []
+    for i in range(count):
+        session = service.create_session(app_name="app", user_id=f"u{i % 2}")
+        service.append_event(session, _event(f"{i}-a", {"turn": i, "user:seen": i}))
+        service.append_event(session, _event(f"{i}-b", {"app:version": 2}))
+        sessions.append(session)
+    return sessions
+
+
+def _assert_migrated(target_path, sessions):
+    sharded = ShardedSessionService(target_path, 3, pool_size=1)
+    try:
+        for i, session in enumerate(sessions):
+            loaded = sharded.get_session(
+                app_name="app", user_id=session.user_id, session_id=session.id
+            )
+            texts = [event.content.parts[0].text for event in loaded.events]
+            assert texts == [f"{i}-a", f"{i}-b"]
+            assert loaded.state["turn"] == i
+            assert loaded.state["app:version"] == 2
+            assert "user:seen" in loaded.state
+    finally:
+        sharded.close()
+
+
+def test_migrates_sqlite_layout_into_shards(tmp_path):
+    source_path = str(tmp_path / "adk_sessions.db")
+    source = SQLiteSessionService(source_path, pool_size=1)
+    sessions = _fill(source, 9)
+    source.close()
+
+    report = migrate_to_shards(source_path, source_path, 3)
+
+    assert (report.layout, report.sessions, report.events) == (LAYOUT_SQLITE, 9, 18)
+    assert report.shared_states == 3  # One app, two users
+    _assert_migrated(source_path, sessions)
+    with pytest.raises(FileExistsError):
+        migrate_to_shards(source_path, source_path, 3)
+
+
+def test_migrates_adk_database_layout(tmp_path):
+    source_path = str(tmp_path / "adk_sessions.db")
+    source = DatabaseSessionService(f"sqlite:///{source_path}")
+    sessions = _fill(source, 4)
+
+    report = migrate_to_shards(source_path, source_path, 3)
+
+    assert (report.layout, report.sessions, report.events) == (LAYOUT_ADK, 4, 8)
+    _assert_migrated(source_path, sessions)
+
+
+def test_failed_migration_removes_partial_shards(tmp_path):
+    source_path = tmp_path / "other.db"
+    source_path.write_bytes(b"")  # Valid SQLite file with no session tables
+
+    with pytest.raises(ValueError, match="Not a session database"):
+        migrate_to_shards(str(source_path), str(tmp_path / "adk_sessions.db"), 2)
+    for path in shard_paths(str(tmp_path / "adk_sessions.db"), 2):
+        assert not (tmp_path / path).exists()
+
+
+def test_adk_database_is_rejected_then_migrates_to_a_single_file(tmp_path):
+    db_path = str(tmp_path / "adk_sessions.db")
+    source = DatabaseSessionService(f"sqlite:///{db_path}")
+    sessions = _fill(source, 4)
+    with open(db_path, "rb") as f:
+        original = f.read()
+
+    with pytest.raises(RuntimeError, match="sessions migrate"):
+        SQLiteSessionService(db_path, pool_size=1)
+    with open(db_path, "rb") as f:
+        assert f.read() == original  # Not vacuumed, not even switched to WAL
+
+    moved_path = str(tmp_path / "adk_sessions.adk.db")
+    (tmp_path / "adk_sessions.db").rename(moved_path)
+    report = migrate_to_shards(moved_path, db_path, 1)
+
+    assert (report.layout, report.sessions, report.events) == (LAYOUT_ADK, 4, 8)
+    assert report.targets == [db_path]
+    store = SQLiteSessionService(db_path, pool_size=1)
+    try:
+        for i, session in enumerate(sessions):
+            loaded = store.get_session(
+                app_name="app", user_id=session.user_id, session_id=session.id
+            )
+            texts = [event.content.parts[0].text for event in loaded.events]
+            assert texts == [f"{i}-a", f"{i}-b"]
+            assert loaded.state["app:version"] == 2
+    finally:
+        store.close()
+
+
+def test_adk_migration_leaves_the_source_untouched(tmp_path):
+    source_path = str(tmp_path / "adk_sessions.adk.db")
+    _fill(DatabaseSessionService(f"sqlite:///{source_path}"), 2)
+    with sqlite3.connect(source_path) as conn:
+        conn.execute("DROP TABLE user_states")  # As in older ADK databases
+    with open(source_path, "rb") as f:
+        original = f.read()
+
+    report = migrate_to_shards(source_path, str(tmp_path / "sessions.db"), 1)
+
+    assert (report.layout, report.sessions) == (LAYOUT_ADK, 2)
+    with open(source_path, "rb") as f:
+        assert f.read() == original  # ADK recreated user_states in a copy only
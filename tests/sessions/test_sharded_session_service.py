@@ -0,0 +1,101 @@
+# tests/sessions/test_sharded_session_service.py
+import os
+
+import pytest
+from google.adk.events.event import Event, EventActions
+from google.genai import types
+
+from sessions.cached_session_service import CachedSessionService
+from sessions.sharded_session_service import (
+    ShardedSessionService,
+    shard_index,
+    shard_paths,
+)
+from sessions.sqlite_session_service import EventRecord
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = ShardedSessionService(str(tmp_path / "sessions.db"), 4, pool_size=2)
+    yield service
+    service.close()
+
+
+def _event(text: str, state_delta: dict | None = None) -> Event:
+    return Event(
+        author="user",
+        invocation_id="inv",
+        content=types.Content(role="user", parts=[types.Part(text=text)]),
+        actions=EventActions(state_delta=state_delta or {}),
+    )
+
+
+def test_shard_index_is_stable_and_spreads_sessions():
+    assert shard_index("session-1", 8) == shard_index("session-1", 8)
+    used = {shard_index(f"session-{i}", 4) for i in range(200)}
+    assert used == {0, 1, 2, 3}
+    assert shard_paths("data/adk_sessions.db", 2) == [
+        "data/adk_sessions.shard00-of-02.db",
+        "data/adk_sessions.shard01-of-02.db",
+    ]
+
+
+def test_sessions_live_in_their_shard_and_share_app_and_user_state(service):
+    sessions = [
+        service.create_session(app_name="app", user_id="u1", state={"n": i})
+        for i in range(12)
+    ]
+    for path in shard_paths(service.db_path, 4):
+        assert os.path.exists(path)
+    for session in sessions:
+        shard = service.shard_for(session.id)
+        assert shard.session_update_time(
+            app_name="app", user_id="u1", session_id=session.id
+        )
+
+    first, last = sessions[0], sessions[-1]
+    service.append_event(first, _event("hi", {"app:mode": "fast", "user:tz": "UTC"}))
+    loaded = service.get_session(app_name="app", user_id="u1", session_id=last.id)
+    assert loaded.state == {"n": 11, "app:mode": "fast", "user:tz": "UTC"}
+    loaded = service.get_session(app_name="app", user_id="u1", session_id=first.id)
+    assert [event.content.parts[0].text for event in loaded.events] == ["hi"]
+
+    listed = service.list_sessions(app_name="app", user_id="u1").sessions
+    assert {session.id for session in listed} == {session.id for session in sessions}
+
+    service.delete_session(app_name="app", user_id="u1", session_id=first.id)
+    assert (
+        service.get_session(app_name="app", user_id="u1", session_id=first.id) is None
+    )
+
+
+def test_append_event_records_reports_missing_sessions(service):
+    alive = service.create_session(app_name="app", user_id="u1")
+    gone = service.create_session(app_name="app", user_id="u1")
+    records = [
+        EventRecord.from_event(alive, _event("a", {"user:seen": True})),
+        EventRecord.from_event(gone, _event("b", {"user:lost": True})),
+    ]
+    service.delete_session(app_name="app", user_id="u1", session_id=gone.id)
+
+    assert service.append_event_records(records) == [records[1]]
+    loaded = service.get_session(app_name="app", user_id="u1", session_id=alive.id)
+    assert loaded.state == {"user:seen": True}
+    with pytest.raises(ValueError, match="not found"):
+        service.append_event(gone, _event("late"))
+
+
+def test_cache_works_over_shards(tmp_path):
+    service = CachedSessionService(
+        ShardedSessionService(str(tmp_path / "sessions.db"), 2, pool_size=1),
+        flush_interval_seconds=60,
+    )
+    session = service.create_session(app_name="app", user_id="u1")
+    service.append_event(session, _event("hi"))
+    backing = service.backing
+    service.close()
+
+    reopened = ShardedSessionService(backing.db_path, 2, pool_size=1)
+    loaded = reopened.get_session(app_name="app", user_id="u1", session_id=session.id)
+    assert [event.content.parts[0].text for event in loaded.events] == ["hi"]
+    reopened.close()
@@ -0,0 +1,166 @@
+# tests/sessions/test_sqlite_session_service.py
+import asyncio
+import sqlite3
+
+import pytest
+from google.adk.events.event import Event, EventActions
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai import types
+
+from sessions.sqlite_pool import SQLitePool, SQLiteTuning
+from sessions.sqlite_session_service import SQLiteSessionService, split_state_delta
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = SQLiteSessionService(str(tmp_path / "sessions.db"), pool_size=4)
+    yield service
+    service.close()
+
+
+def _event(text: str, state_delta: dict | None = None, **kwargs) -> Event:
+    return Event(
+        author="user",
+        invocation_id="inv",
+        content=types.Content(role="user", parts=[types.Part(text=text)]),
+        actions=EventActions(state_delta=state_delta or {}),
+        **kwargs,
+    )
+
+
+def test_split_state_delta_routes_prefixes():
+    assert split_state_delta({"a": 1, "app:b": 2, "user:c": 3, "temp:d": 4}) == (
+        {"b": 2},
+        {"c": 3},
+        {"a": 1},
+    )
+
+
+def test_pool_applies_wal_and_tuned_pragmas(tmp_path):
+    pool = SQLitePool(
+        str(tmp_path / "p.db"), size=2, tuning=SQLiteTuning(mmap_size=1 << 20)
+    )
+    with pool.read() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 1 << 20
+    with pytest.raises(ValueError, match="synchronous"):
+        SQLiteTuning(synchronous="SOMETIMES").pragmas()
+    pool.close()
+
+
+def test_pool_write_rolls_back_on_error(tmp_path):
+    pool = SQLitePool(str(tmp_path / "p.db"), size=1)
+    with pool.write() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+    with pytest.raises(RuntimeError):
+        with pool.write() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+            raise RuntimeError("boom")
+    with pool.read() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    pool.close()
+
+
+def test_sessions_round_trip_events_and_scoped_state(service):
+    session = service.create_session(
+        app_name="app", user_id="u1", state={"topic": "time", "app:region": "eu"}
+    )
+    service.append_event(
+        session, _event("hello", {"topic": "tz", "user:tz": "UTC", "temp:x": 1})
+    )
+    service.append_event(session, _event("partial", partial=True))  # Never persisted
+
+    loaded = service.get_session(app_name="app", user_id="u1", session_id=session.id)
+    assert [e.content.parts[0].text for e in loaded.events] == ["hello"]
+    assert loaded.state == {"topic": "tz", "app:region": "eu", "user:tz": "UTC"}
+
+    # App and user state are shared with the user's other sessions.
+    other = service.create_session(app_name="app", user_id="u1")
+    assert other.state == {"app:region": "eu", "user:tz": "UTC"}
+    assert {
+        s.id for s in service.list_sessions(app_name="app", user_id="u1").sessions
+    } == {
+        session.id,
+        other.id,
+    }
+
+
+def test_get_session_honours_recent_events_config(service):
+    session = service.create_session(app_name="app", user_id="u1", session_id="s1")
+    for i in range(5):
+        service.append_event(session, _event(f"m{i}", timestamp=1000.0 + i))
+
+    recent = service.get_session(
+        app_name="app",
+        user_id="u1",
+        session_id="s1",
+        config=GetSessionConfig(num_recent_events=2),
+    )
+    after = service.get_session(
+        app_name="app",
+        user_id="u1",
+        session_id="s1",
+        config=GetSessionConfig(after_timestamp=1003),
+    )
+
+    assert [e.content.parts[0].text for e in recent.events] == ["m3", "m4"]
+    assert [e.content.parts[0].text for e in after.events] == ["m3", "m4"]
+
+
+def test_duplicate_missing_and_deleted_sessions(service):
+    session = service.create_session(app_name="app", user_id="u1", session_id="s1")
+    with pytest.raises(ValueError, match="already exists"):
+        service.create_session(app_name="app", user_id="u1", session_id="s1")
+
+    service.delete_session(app_name="app", user_id="u1", session_id="s1")
+
+    assert service.get_session(app_name="app", user_id="u1", session_id="s1") is None
+    with pytest.raises(ValueError, match="not found"):
+        service.append_event(session, _event("late"))
+
+
+@pytest.mark.asyncio
+async def test_async_api_handles_concurrent_clients(service):
+    async def client(i: int):
+        session = await service.create_session_async(app_name="app", user_id=f"u{i}")
+        for turn in range(5):
+            await service.append_event_async(
+                session, _event(f"{i}-{turn}", {"turns": turn + 1})
+            )
+        return await service.get_session_async(
+            app_name="app", user_id=f"u{i}", session_id=session.id
+        )
+
+    sessions = await asyncio.gather(*(client(i) for i in range(16)))
+
+    assert all(len(s.events) == 5 and s.state == {"turns": 5} for s in sessions)
+    with sqlite3.connect(service.db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 80
+
+
+def test_snapshots_bound_the_events_a_load_reads(tmp_path):
+    service = SQLiteSessionService(str(tmp_path / "s.db"), snapshot_interval=5)
+    session = service.create_session(app_name="app", user_id="u")
+    for i in range(23):
+        service.append_event(session, _event(f"e{i}", {"n": i, "user:seen": i}))
+
+    loaded = service.get_session(app_name="app", user_id="u", session_id=session.id)
+    # Latest usable snapshot is at event 15, so events 16..23 are loaded.
+    assert [e.content.parts[0].text for e in loaded.events] == [
+        f"e{i}" for i in range(15, 23)
+    ]
+    assert loaded.state == {"n": 22, "user:seen": 22}
+    full = service.list_events(app_name="app", user_id="u", session_id=session.id)
+    assert len(full.events) == 23
+    with service.pool.read() as conn:
+        snapshots = conn.execute(
+            "SELECT event_count, seq FROM session_snapshots ORDER BY event_count"
+        ).fetchall()
+    assert [count for count, _ in snapshots] == [15, 20]  # Older ones pruned
+    assert [seq for _, seq in snapshots] == [15, 20]  # Markers only, no state
+
+    service.delete_session(app_name="app", user_id="u", session_id=session.id)
+    with service.pool.read() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM session_snapshots").fetchone()[0] == 0
+    service.close()
@@ -0,0 +1,238 @@
+import asyncio
+import importlib
+import sys
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.routing import Mount
+
+from config.settings import settings
+
+
+@pytest.fixture
+def settings_overrides():
+    """Settings to apply before main.py is imported; parametrize to change them."""
+    return {}
+
+
+@pytest.fixture
+def main_module(tmp_path, monkeypatch, settings_overrides):
+    """Imports main.py afresh with its session store in a temporary directory."""
+    monkeypatch.setattr(settings, "session_db_path", str(tmp_path / "sessions.db"))
+    monkeypatch.setattr(settings, "metrics_multiproc_dir", None)
+    monkeypatch.setattr(settings, "session_compaction_interval_seconds", 3600)
+    for name, value in settings_overrides.items():
+        monkeypatch.setattr(settings, name, value)
+    sys.modules.pop("main", None)
+    module = importlib.import_module("main")
+    yield module
+    module.session_service.close()
+    sys.modules.pop("main", None)
+
+
+def test_main_builds_the_adk_app(main_module):
+    app = main_module.app
+    paths = {getattr(route, "path", None) for route in app.router.routes}
+
+    assert main_module.adk_available
+    assert "ERROR" not in app.title
+    assert {
+        "/run",
+        "/run_sse",
+        "/apps/{app_name}/users/{user_id}/sessions/{session_id}",
+        "/custom_health",
+        "/metrics",
+    } <= paths
+    # ADK's static files are mounted at "/"; they must not shadow later routes.
+    assert isinstance(app.router.routes[-1], Mount)
+
+
+def test_adk_endpoints_use_the_project_session_store(main_module):
+    with TestClient(main_module.app) as client:
+        response = client.post(
+            "/apps/adk/users/u1/sessions/s1", json={"topic": "testing"}
+        )
+        assert response.status_code == 200
+        assert client.get("/custom_health").json()["status"] == "healthy"
+        assert client.get("/metrics").status_code == 200
+
+        stored = main_module.session_service.get_session(
+            app_name="adk", user_id="u1", session_id="s1"
+        )
+        assert stored is not None and stored.state == {"topic": "testing"}
+        assert main_module.compaction_jobs  # Started by the lifespan
+
+
+class _FakeModel:
+    """Stands in for Gemini: replies `texts` (streamed when asked), counting calls.
+
+    With `release` set, each call waits for it after setting `entered`.
+    """
+
+    def __init__(self, texts, release=None):
+        self.texts = texts
+        self.release = release
+        self.entered = threading.Event()
+        self.calls = 0
+
+    def install(self, monkeypatch, agent):
+        from google.adk.models.google_llm import Gemini
+
+        fake = self
+
+        async def generate_content_async(model, llm_request, stream=False):
+            async for response in fake.generate(stream):
+                yield response
+
+        monkeypatch.setattr(Gemini, "generate_content_async", generate_content_async)
+        # ADK refuses google_search next to other tools on Gemini 1.x models.
+        monkeypatch.setattr(agent, "model", "gemini-2.0-flash")
+        return self
+
+    async def generate(self, stream):
+        from google.adk.models.llm_response import LlmResponse
+        from google.genai import types
+
+        self.calls += 1
+        self.entered.set()
+        while self.release is not None and not self.release.is_set():
+            await asyncio.sleep(0.01)
+        for text in self.texts if stream else []:
+            yield LlmResponse(
+                content=types.Content(role="model", parts=[types.Part(text=text)]),
+                partial=True,
+            )
+        yield LlmResponse(
+            content=types.Content(
+                role="model", parts=[types.Part(text="".join(self.texts))]
+            )
+        )
+
+
+def _run_request(session_id, text="hi", **fields):
+    return {
+        "app_name": "adk",
+        "user_id": "u1",
+        "session_id": session_id,
+        "new_message": {"role": "user", "parts": [{"text": text}]},
+        **fields,
+    }
+
+
+def test_run_sse_records_stream_metrics(main_module, monkeypatch):
+    from adk.streaming import STREAM_INTER_TOKEN, STREAM_TTFT, STREAMS
+
+    _FakeModel(["Hel", "lo"]).install(monkeypatch, main_module.root_agent)
+    ttft_before = STREAM_TTFT.labels().snapshot()[2]
+    gaps_before = STREAM_INTER_TOKEN.labels().snapshot()[2]
+    ok_before = STREAMS.labels("ok").value
+
+    with TestClient(main_module.app) as client:
+        client.post("/apps/adk/users/u1/sessions/s1", json={})
+        response = client.post("/run_sse", json=_run_request("s1", streaming=True))
+
+    assert response.status_code == 200
+    assert response.headers["x-accel-buffering"] == "no"
+    assert '"text":"Hel"' in response.text
+    assert STREAM_TTFT.labels().snapshot()[2] == ttft_before + 1
+    assert STREAM_INTER_TOKEN.labels().snapshot()[2] == gaps_before + 1
+    assert STREAMS.labels("ok").value == ok_before + 1
+
+
+@pytest.mark.parametrize(
+    "settings_overrides",
+    [{"admission_max_in_flight": 1, "admission_max_queue": 0}],
+)
+def test_admission_control_sheds_requests_beyond_the_limit(main_module, monkeypatch):
+    from utils.admission import AdmissionControlMiddleware
+
+    assert AdmissionControlMiddleware in {
+        m.cls for m in main_module.app.user_middleware
+    }
+    release = threading.Event()
+    model = _FakeModel(["Hello"], release=release).install(
+        monkeypatch, main_module.root_agent
+    )
+    responses = {}
+
+    with TestClient(main_module.app) as client:
+        for session_id in ("s1", "s2"):
+            client.post(f"/apps/adk/users/u1/sessions/{session_id}", json={})
+        first = threading.Thread(
+            target=lambda: responses.setdefault(
+                "first", client.post("/run", json=_run_request("s1"))
+            )
+        )
+        first.start()
+        try:
+            assert model.entered.wait(10)
+            shed = client.post("/run", json=_run_request("s2"))
+            health = client.get("/custom_health")  # Never limited
+        finally:
+            release.set()
+            first.join(10)
+
+    assert shed.status_code == 503
+    assert "retry-after" in shed.headers
+    assert health.status_code == 200
+    assert responses["first"].status_code == 200
+    assert model.calls == 1
+
+
+@pytest.mark.parametrize("settings_overrides", [{"response_cache_enabled": True}])
+def test_response_cache_answers_repeated_runs(main_module, monkeypatch):
+    from adk.response_cache import RESPONSE_CACHE_REQUESTS, ResponseCacheMiddleware
+
+    assert ResponseCacheMiddleware in {m.cls for m in main_module.app.user_middleware}
+    model = _FakeModel(["ADK is a toolkit."]).install(
+        monkeypatch, main_module.root_agent
+    )
+    hits_before = RESPONSE_CACHE_REQUESTS.labels("hit").value
+
+    with TestClient(main_module.app) as client:
+        for session_id in ("s1", "s2"):
+            client.post(f"/apps/adk/users/u1/sessions/{session_id}", json={})
+        first = client.post("/run", json=_run_request("s1", "What is ADK?"))
+        second = client.post("/run", json=_run_request("s2", "what is  ADK?"))
+        session = main_module.session_service.get_session(
+            app_name="adk", user_id="u1", session_id="s2"
+        )
+
+    assert first.status_code == second.status_code == 200
+    assert model.calls == 1
+    assert RESPONSE_CACHE_REQUESTS.labels("hit").value == hits_before + 1
+    reply = second.json()[-1]["content"]["parts"][0]["text"]
+    assert reply == "ADK is a toolkit."
+    # The cached reply joins the caller's session, as a real run's would.
+    assert [event.author for event in session.events] == [
+        "user",
+        "gen_bootstrap_core_assistant",
+    ]
+
+
+def test_request_metrics_record_served_routes(main_module):
+    from utils.http_metrics import HTTP_REQUEST_DURATION, RequestMetricsMiddleware
+
+    middleware = [m.cls for m in main_module.app.user_middleware]
+    # Outermost, so its timings include admission waits and cache hits.
+    assert middleware[0] is RequestMetricsMiddleware
+    session_route = "/apps/{app_name}/users/{user_id}/sessions/{session_id}"
+    before = {
+        route: HTTP_REQUEST_DURATION.labels(method, route, "2xx").snapshot()[2]
+        for method, route in (("GET", "/custom_health"), ("POST", session_route))
+    }
+
+    with TestClient(main_module.app) as client:
+        client.get("/custom_health")
+        client.post("/apps/adk/users/u1/sessions/s1", json={})
+        lag_sampling = main_module.event_loop_lag_monitor._task is not None
+        exposition = client.get("/metrics").text
+
+    assert lag_sampling  # Started by the lifespan
+    assert main_module.event_loop_lag_monitor._task is None  # And stopped
+    for method, route in (("GET", "/custom_health"), ("POST", session_route)):
+        count = HTTP_REQUEST_DURATION.labels(method, route, "2xx").snapshot()[2]
+        assert count == before[route] + 1
+    assert 'route="/custom_health"' in exposition
+    assert "gen_bootstrap_event_loop_lag_seconds" in exposition
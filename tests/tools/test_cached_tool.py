@@ -0,0 +1,162 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from google.adk.tools.function_tool import FunctionTool
+
+from tools.cached_tool import ToolResultCache, cached_tool
+
+
+@pytest.mark.asyncio
+async def test_cached_tool_preserves_declaration_and_memoizes():
+    calls = []
+
+    async def lookup(query: str, limit: int = 3) -> dict:
+        """Looks up a query."""
+        calls.append((query, limit))
+        return {"query": query, "limit": limit}
+
+    tool = cached_tool(FunctionTool(lookup), maxsize=8)
+    assert tool.name == "lookup"
+    assert tool.description == "Looks up a query."
+
+    first = await tool.run_async(args={"query": "adk"}, tool_context=MagicMock())
+    # Same normalized arguments: explicit default and different keyword order.
+    second = await tool.run_async(
+        args={"limit": 3, "query": "adk"}, tool_context=MagicMock()
+    )
+    assert first == second == {"query": "adk", "limit": 3}
+    assert calls == [("adk", 3)]
+
+    second["query"] = "mutated"  # Results are copies; the cache is unaffected
+    third = await tool.run_async(args={"query": "adk"}, tool_context=MagicMock())
+    assert third["query"] == "adk"
+    assert tool.func.cache.hits == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_tool_single_flight_for_concurrent_async_calls():
+    calls = 0
+
+    async def slow_lookup(query: str) -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return query.upper()
+
+    tool = cached_tool(slow_lookup)
+    results = await asyncio.gather(
+        *(tool.run_async(args={"query": "x"}, tool_context=None) for _ in range(10))
+    )
+    assert results == ["X"] * 10
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_tool_leader_cancellation_does_not_cancel_followers():
+    calls = 0
+
+    async def slow_lookup(query: str) -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return query.upper()
+
+    tool = cached_tool(slow_lookup)
+    leader = asyncio.create_task(tool.run_async(args={"query": "x"}, tool_context=None))
+    await asyncio.sleep(0)
+    followers = [
+        asyncio.create_task(tool.run_async(args={"query": "x"}, tool_context=None))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await asyncio.gather(*followers) == ["X"] * 5
+    assert leader.cancelled()
+    assert calls == 2  # The cancelled leader's call, then one retry for all followers
+
+
+def test_cached_tool_coalesces_per_event_loop():
+    started = threading.Barrier(2)
+
+    async def lookup(query: str) -> str:
+        await asyncio.sleep(0.05)
+        return query.upper()
+
+    tool = cached_tool(lookup)
+    results = []
+
+    def run_in_own_loop():
+        started.wait()
+        results.append(
+            asyncio.run(tool.run_async(args={"query": "x"}, tool_context=None))
+        )
+
+    threads = [threading.Thread(target=run_in_own_loop) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["X", "X"]
+
+
+def test_cached_tool_single_flight_for_concurrent_sync_calls():
+    calls = 0
+    release = threading.Event()
+
+    def slow_lookup(query: str) -> str:
+        nonlocal calls
+        calls += 1
+        release.wait(timeout=5)
+        return query.upper()
+
+    wrapped = cached_tool(slow_lookup).func
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(wrapped("x"))) for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ["X"] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_tool_does_not_cache_errors_or_rejected_results():
+    calls = 0
+
+    async def flaky(query: str) -> str:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("upstream failed")
+        return f"Error: {query}" if calls == 2 else query
+
+    tool = cached_tool(flaky, cache_if=lambda result: not result.startswith("Error"))
+    with pytest.raises(RuntimeError):
+        await tool.func(query="q")
+    assert await tool.func(query="q") == "Error: q"
+    assert await tool.func(query="q") == "q"
+    assert await tool.func(query="q") == "q"
+    assert calls == 3
+
+
+def test_tool_result_cache_lru_and_ttl(mocker):
+    cache = ToolResultCache(maxsize=2, ttl_seconds=10)
+    clock = mocker.patch("tools.cached_tool.time.monotonic", return_value=100.0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == (True, 1)  # "a" is now most recently used
+    cache.put("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.evictions == 1
+
+    clock.return_value = 111.0
+    assert cache.get("a") == (False, None)
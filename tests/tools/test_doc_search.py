@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+import pytest
+
+import tools.doc_search as doc_search
+
+
+@pytest.fixture
+def docs_settings(tmp_path, mocker):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "guide.md").write_text(
+        "# Prompts\n\nPrompts are synced into a local mirror.\n"
+    )
+    mocker.patch.object(doc_search.settings, "doc_search_paths", [str(docs)])
+    mocker.patch.object(doc_search.settings, "local_state_dir", str(tmp_path / "state"))
+    mocker.patch.object(doc_search, "_doc_index", None)
+    yield docs
+    if doc_search._doc_index is not None:
+        doc_search._doc_index.close()
+
+
+@pytest.mark.asyncio
+async def test_search_project_docs_returns_ranked_sections(docs_settings):
+    result = await doc_search.search_project_docs("prompt mirror", max_results=3)
+
+    assert result["query"] == "prompt mirror"
+    assert len(result["results"]) == 1
+    top = result["results"][0]
+    assert top["heading"] == "Prompts"
+    assert top["path"].endswith("guide.md")
+    assert "local mirror" in top["text"]
+
+
+@pytest.mark.asyncio
+async def test_search_project_docs_picks_up_new_files_once_stale(docs_settings, mocker):
+    mocker.patch.object(doc_search.settings, "doc_search_refresh_seconds", 30.0)
+    await doc_search.search_project_docs("anything")
+    (docs_settings / "new.md").write_text(
+        "# Sessions\n\nSessions are stored in SQLite.\n"
+    )
+
+    assert (await doc_search.search_project_docs("sqlite sessions"))["results"] == []
+
+    doc_search._doc_index.last_checked -= 60
+
+    result = await doc_search.search_project_docs("sqlite sessions")
+
+    assert result["results"][0]["path"].endswith("new.md")
+
+
+@pytest.mark.asyncio
+async def test_search_project_docs_builds_the_index_off_the_event_loop(
+    docs_settings, mocker
+):
+    loop_thread = threading.get_ident()
+    open_index = doc_search.DocIndex.open
+    opened_in = []
+
+    def record_thread(index):
+        opened_in.append(threading.get_ident())
+        return open_index(index)
+
+    mocker.patch.object(doc_search.DocIndex, "open", record_thread)
+
+    results = await asyncio.gather(
+        *(doc_search.search_project_docs("prompt mirror") for _ in range(3))
+    )
+
+    assert opened_in and loop_thread not in opened_in
+    assert len(opened_in) == 1  # Concurrent first calls share one build
+    assert all(len(result["results"]) == 1 for result in results)
@@ -1,10 +1,14 @@
 import datetime
 from unittest.mock import MagicMock
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
 
 import pytest
 
-from tools.example_tool import get_current_time_async
+from tools.example_tool import (
+    MAX_BATCH_TIMEZONES,
+    get_current_time_async,
+    get_current_times_async,
+)
 
 # A fixed point in time for consistent testing, in UTC
 FIXED_UTC_NOW = datetime.datetime(2023, 10, 26, 10, 0, 0, tzinfo=datetime.timezone.utc)
@@ -95,4 +99,66 @@ async def test_get_current_time_invalid_timezone(mock_datetime_now, mocker):
     assert "Current UTC time:" in result  # Partial check, full timestamp varies
 
     # Verify that datetime.now was called with UTC timezone
-    mock_datetime_now.assert_called_with(datetime.timezone.utc)
\ No newline at end of file
+    mock_datetime_now.assert_called_with(datetime.timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_get_current_times_returns_all_zones_in_one_call(mock_datetime_now):
+    """The batch tool resolves names case-insensitively and accepts aliases."""
+    result = await get_current_times_async(["UTC", "america/new_york", "Asia/Tokyo", "PST"])
+
+    assert result["errors"] == {}
+    assert result["times"] == {
+        "UTC": FIXED_UTC_NOW.isoformat(),
+        "america/new_york": FIXED_UTC_NOW.astimezone(
+            ZoneInfo("America/New_York")
+        ).isoformat(),
+        "Asia/Tokyo": FIXED_UTC_NOW.astimezone(ZoneInfo("Asia/Tokyo")).isoformat(),
+        "PST": FIXED_UTC_NOW.astimezone(ZoneInfo("America/Los_Angeles")).isoformat(),
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_current_times_rejects_invalid_names_without_zoneinfo(
+    mock_datetime_now, mocker
+):
+    """Unknown names are rejected from the precomputed index, never via ZoneInfo errors."""
+    zoneinfo_spy = mocker.patch("tools.example_tool.ZoneInfo", wraps=ZoneInfo)
+
+    result = await get_current_times_async(["Invalid/Timezone", "Europe/London", 42])
+
+    assert set(result["errors"]) == {"Invalid/Timezone", "42"}
+    assert "Europe/London" in result["times"]
+    for call in zoneinfo_spy.call_args_list:
+        assert call.args[0] != "Invalid/Timezone"
+
+
+@pytest.mark.asyncio
+async def test_get_current_times_caps_batch_size(mock_datetime_now):
+    timezones = sorted(available_timezones())[: MAX_BATCH_TIMEZONES + 5]
+
+    result = await get_current_times_async(timezones)
+
+    assert len(result["times"]) == MAX_BATCH_TIMEZONES
+    assert len(result["errors"]) == 5
+    assert all("Too many timezones" in reason for reason in result["errors"].values())
+
+
+@pytest.mark.asyncio
+async def test_get_current_times_prefers_real_zones_over_aliases(mock_datetime_now):
+    """Aliases never shadow tz database names, and ambiguous abbreviations are rejected."""
+    result = await get_current_times_async(["EST", "MST", "CST", "IST"])
+
+    assert result["times"] == {
+        "EST": FIXED_UTC_NOW.astimezone(ZoneInfo("EST")).isoformat(),
+        "MST": FIXED_UTC_NOW.astimezone(ZoneInfo("MST")).isoformat(),
+    }
+    assert set(result["errors"]) == {"CST", "IST"}
+
+
+@pytest.mark.asyncio
+async def test_get_current_times_reports_unhashable_items(mock_datetime_now):
+    result = await get_current_times_async(["UTC", ["Europe/London"], {"tz": "UTC"}, "UTC"])
+
+    assert list(result["times"]) == ["UTC"]
+    assert set(result["errors"]) == {"['Europe/London']", "{'tz': 'UTC'}"}
@@ -0,0 +1,115 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from utils.admission import (
+    ADMISSION_REJECTED,
+    AdmissionControlMiddleware,
+    AdmissionLimit,
+    resolve_admission_limits,
+)
+
+
+def _slow_app(release: asyncio.Event):
+    async def app(scope, receive, send):
+        if scope["path"] == "/slow":
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    return app
+
+
+def _client(middleware) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=middleware), base_url="http://test"
+    )
+
+
+@pytest.mark.asyncio
+async def test_requests_over_the_global_limit_are_shed_with_retry_after():
+    release = asyncio.Event()
+    middleware = AdmissionControlMiddleware(
+        _slow_app(release), AdmissionLimit(max_in_flight=1), retry_after_seconds=2.5
+    )
+    async with _client(middleware) as client:
+        first = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.05)
+        shed = await client.get("/slow")
+        health = await client.get("/custom_health")  # Exempt
+        release.set()
+        assert (await first).status_code == 200
+
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == "3"
+    assert "global" in shed.json()["detail"]
+    assert health.status_code == 200
+    assert middleware.global_gate.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_queued_request_takes_the_freed_slot():
+    release = asyncio.Event()
+    middleware = AdmissionControlMiddleware(
+        _slow_app(release),
+        AdmissionLimit(max_in_flight=1, max_queue=1, queue_timeout_seconds=5),
+    )
+    async with _client(middleware) as client:
+        first = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.05)
+        overflow = await client.get("/slow")  # Queue of one is full
+        release.set()
+        responses = await asyncio.gather(first, queued)
+
+    assert [r.status_code for r in responses] == [200, 200]
+    assert overflow.status_code == 503
+    assert middleware.global_gate.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_route_limit_times_out_queued_requests_with_429():
+    timeouts_before = ADMISSION_REJECTED.labels("/slow", "queue_timeout").value
+    release = asyncio.Event()
+    middleware = AdmissionControlMiddleware(
+        _slow_app(release),
+        AdmissionLimit(),
+        route_limits={
+            "/slow": AdmissionLimit(
+                max_in_flight=1, max_queue=4, queue_timeout_seconds=0.05
+            )
+        },
+    )
+    async with _client(middleware) as client:
+        first = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.05)
+        timed_out = await client.get("/slow")
+        other_route = await client.get("/fast")
+        release.set()
+        await first
+
+    assert timed_out.status_code == 429
+    assert other_route.status_code == 200
+    assert ADMISSION_REJECTED.labels("/slow", "queue_timeout").value == (
+        timeouts_before + 1
+    )
+
+
+def test_resolve_admission_limits_merges_route_overrides():
+    settings = SimpleNamespace(
+        admission_max_in_flight=32,
+        admission_max_queue=64,
+        admission_queue_timeout_seconds=2.0,
+        admission_route_limits={"/run": {"max_in_flight": 8}},
+    )
+
+    global_limit, routes = resolve_admission_limits(settings)
+
+    assert global_limit == AdmissionLimit(32, 64, 2.0)
+    assert routes["/run"] == AdmissionLimit(8, 64, 2.0)
+    settings.admission_route_limits = {"/run": {"max_inflight": 8}}
+    with pytest.raises(ValueError, match="max_inflight"):
+        resolve_admission_limits(settings)
@@ -0,0 +1,73 @@
+# tests/utils/test_doc_index.py
+import os
+
+import pytest
+
+from utils.doc_index import DocIndex, chunk_document, tokenize
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "secrets.md").write_text(
+        "# Secrets\n\nSecrets live in Secret Manager.\n\n"
+        "## Cache\n\nThe secret cache is encrypted and honours a TTL.\n"
+    )
+    (docs / "deploy.md").write_text("# Deploy\n\nDeploy the agent to Cloud Run.\n")
+    (docs / "notes.py").write_text("# Not indexed: wrong extension\n")
+    return docs
+
+
+def test_tokenize_drops_stopwords_and_single_characters():
+    assert tokenize("The Secret-cache is a TTL_value, x") == [
+        "secret",
+        "cache",
+        "ttl_value",
+    ]
+
+
+def test_chunk_document_splits_on_headings():
+    chunks = chunk_document("intro\n\n# Title\nbody\n\n## Sub\nmore\n")
+    assert [(heading, line) for heading, line, _ in chunks] == [
+        ("", 1),
+        ("Title", 3),
+        ("Sub", 6),
+    ]
+
+
+def test_search_ranks_matching_sections_with_bm25(corpus, tmp_path):
+    index = DocIndex(str(tmp_path / "index"), [str(corpus)])
+    stats = index.update()
+
+    assert stats.indexed_files == 2
+    hits = index.search("encrypted secret cache ttl", top_k=3)
+    assert hits[0].heading == "Cache"
+    assert hits[0].path.endswith("secrets.md")
+    assert hits[0].line == 5
+    assert all(h1.score >= h2.score for h1, h2 in zip(hits, hits[1:]))
+    assert index.search("kubernetes") == []
+    index.close()
+
+
+def test_update_only_retokenizes_changed_files(corpus, tmp_path, mocker):
+    index_dir = str(tmp_path / "index")
+    index = DocIndex(index_dir, [str(corpus)])
+    index.update()
+    index.close()
+
+    (corpus / "deploy.md").write_text("# Deploy\n\nDeploy with uvicorn workers.\n")
+    os.remove(corpus / "secrets.md")
+    chunker = mocker.patch("utils.doc_index.chunk_document", wraps=chunk_document)
+
+    reopened = DocIndex(index_dir, [str(corpus)])
+    stats = reopened.update()
+
+    assert stats.indexed_files == 1
+    assert stats.removed_files == 1
+    assert chunker.call_count == 1
+    assert reopened.search("uvicorn")[0].path.endswith("deploy.md")
+    assert reopened.search("secret") == []
+    # Only the current postings generation is kept on disk.
+    assert len([f for f in os.listdir(index_dir) if f.startswith("postings-")]) == 1
+    reopened.close()
@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from utils.http_metrics import (
+    EVENT_LOOP_LAG,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_FLIGHT,
+    HTTP_RESPONSE_SIZE,
+    EventLoopLagMonitor,
+    RequestMetricsMiddleware,
+)
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        return {"id": item_id}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(RequestMetricsMiddleware)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_requests_are_recorded_by_route_template_and_status_class():
+    ok = HTTP_REQUEST_DURATION.labels("GET", "/items/{item_id}", "2xx")
+    failed = HTTP_REQUEST_DURATION.labels("GET", "/boom", "5xx")
+    unmatched = HTTP_REQUEST_DURATION.labels("GET", "unmatched", "4xx")
+    sizes = HTTP_RESPONSE_SIZE.labels("GET", "/items/{item_id}")
+    before = [child.snapshot() for child in (ok, failed, unmatched, sizes)]
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=_app(), raise_app_exceptions=False),
+        base_url="http://test",
+    ) as client:
+        await client.get("/items/1")
+        await client.get("/items/2")
+        assert (await client.get("/boom")).status_code == 500
+        assert (await client.get("/nowhere")).status_code == 404
+
+    counts = [
+        child.snapshot()[2] - old[2]
+        for child, old in zip((ok, failed, unmatched), before)
+    ]
+    assert counts == [2, 1, 1]
+    assert sizes.snapshot()[1] - before[3][1] == len(b'{"id":"1"}') * 2
+    assert HTTP_REQUESTS_IN_FLIGHT.labels().value == 0
+
+
+@pytest.mark.asyncio
+async def test_event_loop_lag_monitor_reports_a_blocked_loop():
+    monitor = EventLoopLagMonitor(interval_seconds=0.01)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)  # Blocks the loop past the monitor's wake-up time
+    await asyncio.sleep(0.001)
+    await monitor.stop()
+
+    assert EVENT_LOOP_LAG.labels().value >= 0.05
@@ -0,0 +1,108 @@
+# tests/utils/test_metrics.py
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from utils.metrics import MetricsRegistry, MultiprocessMetrics
+
+
+def test_counter_and_histogram_render_prometheus_text():
+    registry = MetricsRegistry()
+    calls = registry.counter("demo_calls_total", "Demo calls.", ["tool"])
+    latency = registry.histogram(
+        "demo_latency_seconds", "Demo latency.", ["tool"], buckets=(0.1, 1.0)
+    )
+
+    calls.labels("lookup").inc()
+    calls.labels("lookup").inc(2)
+    latency.labels("lookup").observe(0.05)
+    latency.labels("lookup").observe(0.5)
+    latency.labels("lookup").observe(5)
+
+    text = registry.render()
+    assert "# TYPE demo_calls_total counter" in text
+    assert 'demo_calls_total{tool="lookup"} 3' in text
+    assert 'demo_latency_seconds_bucket{tool="lookup",le="0.1"} 1' in text
+    assert 'demo_latency_seconds_bucket{tool="lookup",le="1"} 2' in text
+    assert 'demo_latency_seconds_bucket{tool="lookup",le="+Inf"} 3' in text
+    assert 'demo_latency_seconds_count{tool="lookup"} 3' in text
+    assert 'demo_latency_seconds_sum{tool="lookup"} 5.55' in text
+
+
+def test_registry_returns_existing_metric_and_rejects_type_conflicts():
+    registry = MetricsRegistry()
+    first = registry.counter("demo_total", "Demo.")
+    assert registry.counter("demo_total", "Demo.") is first
+    with pytest.raises(ValueError):
+        registry.histogram("demo_total", "Demo.")
+    with pytest.raises(ValueError):
+        first.labels("unexpected")
+
+
+def test_gauge_moves_both_ways_and_renders_as_gauge():
+    registry = MetricsRegistry()
+    depth = registry.gauge("demo_queue_depth", "Demo queue depth.", ["tool"])
+
+    depth.labels("lookup").inc(3)
+    depth.labels("lookup").dec()
+    depth.labels("other").set(7)
+
+    text = registry.render()
+    assert "# TYPE demo_queue_depth gauge" in text
+    assert 'demo_queue_depth{tool="lookup"} 2' in text
+    assert 'demo_queue_depth{tool="other"} 7' in text
+    with pytest.raises(ValueError):
+        registry.counter("demo_queue_depth", "Demo.")
+
+
+def _worker_snapshot(directory, pid, registry):
+    with open(directory / f"metrics-{pid}.json", "w", encoding="utf-8") as f:
+        json.dump({"pid": pid, "families": registry.collect()}, f)
+
+
+def _demo_metrics(registry):
+    return (
+        registry.counter("demo_total", "Demo.", ["route"]),
+        registry.gauge("demo_in_flight", "Demo in flight."),
+        registry.gauge("demo_lag_seconds", "Demo lag.", multiprocess_mode="max"),
+        registry.histogram("demo_seconds", "Demo latency.", buckets=(0.1, 1.0)),
+    )
+
+
+def test_multiprocess_render_merges_worker_snapshots(tmp_path):
+    mine, live_worker, exited_worker = (MetricsRegistry() for _ in range(3))
+    for registry, lag in ((mine, 0.01), (live_worker, 0.2), (exited_worker, 5.0)):
+        total, in_flight, lag_gauge, latency = _demo_metrics(registry)
+        total.labels("/run").inc()
+        in_flight.inc(2)
+        lag_gauge.set(lag)
+        latency.observe(0.5)
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    _worker_snapshot(tmp_path, os.getppid(), live_worker)
+    _worker_snapshot(tmp_path, exited.pid, exited_worker)
+
+    text = MultiprocessMetrics(mine, str(tmp_path)).render()
+
+    assert 'demo_total{route="/run"} 3' in text  # Exited workers' counts are kept
+    assert "demo_in_flight 4" in text  # Their gauges are not
+    assert "demo_lag_seconds 0.2" in text
+    assert 'demo_seconds_bucket{le="1"} 3' in text
+    assert "demo_seconds_count 3" in text
+
+
+def test_multiprocess_writer_publishes_a_final_snapshot_on_stop(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("demo_total", "Demo.").inc(4)
+    exporter = MultiprocessMetrics(registry, str(tmp_path), interval_seconds=60)
+    exporter.start()
+    registry.counter("demo_total", "Demo.").inc()
+    exporter.stop()  # Writes a final snapshot
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"metrics-{os.getpid()}.json"]
+    with open(exporter.path, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    assert snapshot["families"][0]["samples"] == [[[], 5.0]]
@@ -0,0 +1,71 @@
+import pytest
+
+from utils.prompt_renderer import (
+    CompiledPrompt,
+    CompiledTemplate,
+    PromptRenderError,
+)
+
+DEFINITION = {
+    "prompt_name": "describer",
+    "prompt_data": (
+        "Describe {subject} for {audience}. " 'Reply as JSON like {"answer": "..."}.'
+    ),
+    "model_name": "gemini-pro",
+    "system_instruction": "You write for {audience}.",
+    "variables": [{"subject": "the moon", "audience": "kids"}],
+}
+
+
+def test_template_compiles_into_literals_and_slots():
+    template = CompiledTemplate.compile("Hi {name}, meet {other}!")
+    assert template.slots == ("name", "other")
+    assert template.literals == ("Hi ", ", meet ", "!")
+    assert template.render({"name": "A", "other": "B"}) == "Hi A, meet B!"
+
+
+def test_non_identifier_braces_are_literal():
+    compiled = CompiledPrompt.from_definition(DEFINITION)
+    rendered = compiled.render({"subject": "tides", "audience": "adults"})
+    assert (
+        rendered.text
+        == 'Describe tides for adults. Reply as JSON like {"answer": "..."}.'
+    )
+    assert rendered.system_instruction == "You write for adults."
+    assert compiled.declared_variables == {"subject", "audience"}
+
+
+def test_missing_variables_raise():
+    compiled = CompiledPrompt.from_definition(DEFINITION)
+    with pytest.raises(PromptRenderError, match="audience"):
+        compiled.render({"subject": "tides"})
+
+
+def test_render_batch_attaches_token_counts_and_keeps_failures(mocker):
+    count_batch = mocker.patch(
+        "utils.prompt_renderer.count_text_tokens_batch",
+        side_effect=lambda texts, encoding: [len(t.split()) for t in texts],
+    )
+    compiled = CompiledPrompt.from_definition(DEFINITION)
+
+    results = compiled.render_batch(
+        [
+            {"subject": "a", "audience": "b"},
+            {"subject": "only"},
+            {"subject": "c", "audience": "d"},
+        ]
+    )
+
+    assert isinstance(results[1], PromptRenderError)
+    assert results[0].token_count == len(
+        f"{results[0].system_instruction}\n{results[0].text}".split()
+    )
+    assert results[2].token_count is not None
+    count_batch.assert_called_once()  # One tokenizer pass for the whole batch
+
+
+def test_non_text_prompt_data_is_rejected():
+    with pytest.raises(PromptRenderError):
+        CompiledPrompt.from_definition(
+            {**DEFINITION, "prompt_data": ["part-1", "part-2"]}
+        )
@@ -0,0 +1,79 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.secret_cache import SecretCache, SecretCacheUnavailable, is_pinned_version
+
+
+def _cache(tmp_path, **kwargs):
+    return SecretCache(
+        cache_dir=str(tmp_path / "secrets"),
+        key_path=str(tmp_path / "config" / "cache.key"),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return _cache(tmp_path, ttl_seconds=60)
+
+
+def test_put_and_get_roundtrip(cache):
+    cache.put("proj", "api-key", "3", b"s3cr3t-value")
+    assert cache.get("proj", "api-key", "3") == b"s3cr3t-value"
+    assert cache.get("proj", "api-key", "4") is None
+
+
+def test_entries_are_encrypted_at_rest(cache):
+    cache.put("proj", "api-key", "3", b"s3cr3t-value")
+    entry_files = [f for f in os.listdir(cache.cache_dir) if f.endswith(".bin")]
+    assert len(entry_files) == 1
+    with open(os.path.join(cache.cache_dir, entry_files[0]), "rb") as f:
+        assert b"s3cr3t-value" not in f.read()
+
+
+def test_key_and_entries_are_user_only(cache):
+    cache.put("proj", "api-key", "3", b"value")
+    paths = [os.path.join(cache.cache_dir, f) for f in os.listdir(cache.cache_dir)]
+    assert cache.key_path not in paths  # The key is kept outside the cache
+    for path in paths + [cache.key_path]:
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+
+def test_concurrent_first_use_agrees_on_one_complete_key(tmp_path):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        caches = list(pool.map(lambda _: _cache(tmp_path), range(16)))
+
+    caches[0].put("proj", "api-key", "3", b"value")
+    assert all(c.get("proj", "api-key", "3") == b"value" for c in caches)
+    assert os.listdir(tmp_path / "config") == ["cache.key"]  # No temp files left
+
+
+def test_invalid_key_makes_the_cache_unavailable(tmp_path):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "cache.key").write_bytes(b"")
+
+    with pytest.raises(SecretCacheUnavailable, match="delete it"):
+        _cache(tmp_path)
+
+
+def test_expired_entry_is_a_miss(cache, mocker):
+    cache.put("proj", "api-key", "3", b"value")
+    # Fernet checks the token timestamp against time.time() when a TTL is given.
+    mocker.patch("cryptography.fernet.time.time", return_value=4102444800)
+    assert cache.get("proj", "api-key", "3") is None
+
+
+def test_aliases_are_never_stored(cache):
+    cache.put("proj", "api-key", "latest", b"value")
+    assert cache.get("proj", "api-key", "latest") is None
+    assert not is_pinned_version("latest")
+    assert is_pinned_version("12")
+
+
+def test_clear_removes_entries(cache):
+    cache.put("proj", "a", "1", b"x")
+    cache.put("proj", "b", "2", b"y")
+    assert cache.clear() == 2
+    assert cache.get("proj", "a", "1") is None
@@ -0,0 +1,83 @@
+# tests/utils/test_serving.py
+import os
+
+from utils.serving import (
+    cgroup_cpu_quota,
+    default_worker_count,
+    development_profile,
+    prepare_metrics_directory,
+    production_profile,
+)
+
+
+def test_cgroup_v2_quota(tmp_path):
+    (tmp_path / "cpu.max").write_text("200000 100000\n")
+    assert cgroup_cpu_quota(str(tmp_path)) == 2.0
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert cgroup_cpu_quota(str(tmp_path)) is None
+
+
+def test_cgroup_v1_quota(tmp_path):
+    cpu_dir = tmp_path / "cpu,cpuacct"
+    cpu_dir.mkdir()
+    (cpu_dir / "cpu.cfs_quota_us").write_text("150000\n")
+    (cpu_dir / "cpu.cfs_period_us").write_text("100000\n")
+    assert cgroup_cpu_quota(str(tmp_path)) == 1.5
+
+    (cpu_dir / "cpu.cfs_quota_us").write_text("-1\n")  # Unlimited
+    assert cgroup_cpu_quota(str(tmp_path)) is None
+
+
+def test_no_cgroup_files_means_unlimited(tmp_path):
+    assert cgroup_cpu_quota(str(tmp_path)) is None
+
+
+def test_default_worker_count_uses_whole_cpus_and_at_least_one():
+    assert default_worker_count(0.5) == 1
+    assert default_worker_count(1.5) == 1
+    assert default_worker_count(4.0) == 4
+
+
+def test_profiles_build_uvicorn_arguments(mocker):
+    mocker.patch("utils.serving._module_available", return_value=False)
+
+    prod = production_profile(port=9000, workers=2, timeout_keep_alive=30, backlog=128)
+    dev = development_profile(port=9000)
+
+    assert prod.uvicorn_args() == [
+        "--host",
+        "0.0.0.0",
+        "--port",
+        "9000",
+        "--workers",
+        "2",
+        "--loop",
+        "asyncio",
+        "--http",
+        "h11",
+        "--timeout-keep-alive",
+        "30",
+        "--backlog",
+        "128",
+    ]
+    assert dev.uvicorn_args()[-3:] == ["--reload", "--reload-dir", "."]
+    assert prod.uvicorn_kwargs()["loop"] == "asyncio"
+    assert "workers" not in dev.uvicorn_kwargs()
+
+
+def test_metrics_directory_is_only_prepared_for_several_workers(tmp_path):
+    environ = {}
+    assert prepare_metrics_directory(1, environ) is None
+    assert environ == {}
+
+    stale = tmp_path / "metrics-123.json"
+    stale.write_text("{}")
+    environ = {"METRICS_MULTIPROC_DIR": str(tmp_path)}
+    assert prepare_metrics_directory(4, environ) == str(tmp_path)
+    assert not stale.exists()
+
+    environ = {}
+    created = prepare_metrics_directory(2, environ)
+    assert environ["METRICS_MULTIPROC_DIR"] == created
+    os.rmdir(created)
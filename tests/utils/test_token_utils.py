@@ -27,3 +27,18 @@ def test_trim_text_to_tokens_with_encoding():
     encoding = "cl100k_base"
     trimmed_text = trim_text_to_tokens(text, max_tokens, encoding)
     assert count_text_tokens(trimmed_text, encoding) == len(trimmed_text.split())
+
+
+def test_batch_fallback_warns_once(mocker, caplog):
+    import utils.token_utils as token_utils
+
+    mocker.patch.object(token_utils, "tiktoken", None)
+    mocker.patch.object(token_utils, "_warned_ttok_fallback", False)
+    count = mocker.patch.object(token_utils, "count_text_tokens", return_value=3)
+
+    with caplog.at_level("WARNING", logger="utils.token_utils"):
+        assert token_utils.count_text_tokens_batch(["a", "b"]) == [3, 3]
+        assert token_utils.count_text_tokens_batch(["c"]) == [3]
+
+    assert count.call_count == 3
+    assert len([r for r in caplog.records if "ttok subprocess" in r.message]) == 1
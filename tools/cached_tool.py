@@ -0,0 +1,207 @@
+import asyncio
+import copy
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable
+
+from google.adk.tools.function_tool import FunctionTool
+
+logger = logging.getLogger(__name__)
+
+# Parameters injected by ADK rather than chosen by the model; never part of a cache key.
+_INJECTED_PARAMETERS = frozenset({"tool_context", "input_stream"})
+_IMMUTABLE_RESULT_TYPES = (str, bytes, int, float, bool, type(None))
+# Handed to followers when the leading call is cancelled: the cancellation is
+# the leader's caller's, not theirs, so they retry instead of re-raising it.
+_LEADER_CANCELLED = object()
+
+
+class ToolResultCache:
+    """Thread-safe LRU cache with an optional per-entry TTL."""
+
+    def __init__(self, maxsize: int = 128, ttl_seconds: float | None = None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Returns (found, value)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: str, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _copy_result(value: Any) -> Any:
+    # Cached dicts/lists are copied so a caller mutating a result cannot alter the cache.
+    return value if isinstance(value, _IMMUTABLE_RESULT_TYPES) else copy.deepcopy(value)
+
+
+def _make_key_function(func: Callable) -> Callable[..., str]:
+    signature = inspect.signature(func)
+
+    def make_key(*args, **kwargs) -> str:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()  # f() and f(x=<default>) share an entry
+        arguments = {
+            name: value
+            for name, value in bound.arguments.items()
+            if name not in _INJECTED_PARAMETERS
+        }
+        return json.dumps(arguments, sort_keys=True, default=repr)
+
+    return make_key
+
+
+class _InFlightCall:
+    """The result slot shared by concurrent synchronous callers of one key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+def cached_tool(
+    tool_or_func: FunctionTool | Callable,
+    maxsize: int = 128,
+    ttl_seconds: float | None = None,
+    cache_if: Callable[[Any], bool] | None = None,
+) -> FunctionTool:
+    """Returns a FunctionTool whose results are memoized by normalized arguments.
+
+    Identical concurrent calls are coalesced: one runs, the others wait for its
+    result. Exceptions are never cached, and `cache_if` can reject results such
+    as error messages. The tool keeps the original name, docstring and signature,
+    so the model sees the same declaration. The cache is exposed as
+    `tool.func.cache` for inspection and clearing.
+
+    Args:
+        tool_or_func: A FunctionTool or the plain (sync or async) function to wrap.
+        maxsize: Maximum number of cached results for this tool (LRU eviction).
+        ttl_seconds: How long a result stays valid; None keeps it until evicted.
+        cache_if: Optional predicate; results for which it returns False are not cached.
+    """
+    func = tool_or_func.func if isinstance(tool_or_func, FunctionTool) else tool_or_func
+    cache = ToolResultCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+    make_key = _make_key_function(func)
+    tool_name = getattr(func, "__name__", repr(func))
+
+    def store(key: str, result: Any) -> None:
+        if cache_if is None or cache_if(result):
+            cache.put(key, _copy_result(result))
+
+    if inspect.iscoroutinefunction(func):
+        # Futures belong to one event loop, so each loop coalesces its own calls.
+        in_flight_by_loop: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = make_key(*args, **kwargs)
+            loop = asyncio.get_running_loop()
+            in_flight: dict[str, asyncio.Future] = in_flight_by_loop.setdefault(
+                loop, {}
+            )
+            while True:
+                found, value = cache.get(key)
+                if found:
+                    logger.debug("Tool cache hit.", extra={"tool_name": tool_name})
+                    return _copy_result(value)
+                pending = in_flight.get(key)
+                if pending is None:
+                    break
+                shared = await asyncio.shield(pending)
+                if shared is not _LEADER_CANCELLED:
+                    return _copy_result(shared)
+                # The leader was cancelled; its followers run (or coalesce) again.
+
+            future = loop.create_future()
+            in_flight[key] = future
+            try:
+                result = await func(*args, **kwargs)
+            except asyncio.CancelledError:
+                future.set_result(_LEADER_CANCELLED)
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                future.exception()  # Mark retrieved when no one else is waiting
+                raise
+            else:
+                store(key, result)
+                future.set_result(result)
+                return result
+            finally:
+                in_flight.pop(key, None)
+
+    else:
+        in_flight_calls: dict[str, _InFlightCall] = {}
+        in_flight_lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(*args, **kwargs)
+            found, value = cache.get(key)
+            if found:
+                logger.debug("Tool cache hit.", extra={"tool_name": tool_name})
+                return _copy_result(value)
+
+            with in_flight_lock:
+                call = in_flight_calls.get(key)
+                is_leader = call is None
+                if is_leader:
+                    call = in_flight_calls[key] = _InFlightCall()
+            if not is_leader:
+                call.done.wait()
+                if call.error is not None:
+                    raise call.error
+                return _copy_result(call.result)
+
+            try:
+                call.result = func(*args, **kwargs)
+                store(key, call.result)
+                return call.result
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with in_flight_lock:
+                    in_flight_calls.pop(key, None)
+                call.done.set()
+
+    wrapper.cache = cache
+    return FunctionTool(wrapper)
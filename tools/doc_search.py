@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import threading
+import time
+import weakref
+
+from google.adk.tools.function_tool import FunctionTool
+
+from config.settings import settings
+from utils.doc_index import DocIndex
+
+logger = logging.getLogger(__name__)
+
+MAX_RESULTS_LIMIT = 20
+MAX_RESULT_CHARS = 1200  # Per result, to keep tool responses compact for the model
+
+_doc_index: DocIndex | None = None
+# Opening and refreshing read and write the whole index, so they run in a worker
+# thread, one at a time. Each event loop also holds its lock while it searches,
+# so a refresh never swaps the memory-mapped postings out from under a search.
+_refresh_lock = threading.Lock()
+_index_lock_by_loop: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_doc_index() -> DocIndex:
+    """Returns the shared project docs index, building it on first use."""
+    global _doc_index
+    if _doc_index is None:
+        _doc_index = DocIndex(
+            index_dir=settings.state_path("doc_index"),
+            roots=settings.doc_search_paths,
+        ).open()
+    return _doc_index
+
+
+def _fresh_doc_index() -> DocIndex:
+    """Opens the index and re-checks the corpus if it is stale (blocking I/O)."""
+    with _refresh_lock:
+        index = get_doc_index()
+        index.refresh_if_stale(settings.doc_search_refresh_seconds)
+        return index
+
+
+async def search_project_docs(query: str, max_results: int = 5) -> dict:
+    """
+    Searches this project's own documentation (docs/ and memory-bank/) offline.
+    Use it for questions about the gen-bootstrap project, its features, design
+    and conventions before falling back to google_search.
+
+    Args:
+        query: Keywords or a question, e.g. 'how are secrets cached'.
+        max_results: Maximum number of matching sections to return (1-20).
+    Returns:
+        A dict with 'results': a list of matching sections, best first, each
+        with 'path', 'heading', 'line', 'score' and 'text'.
+    """
+    started = time.perf_counter()
+    max_results = min(max(int(max_results), 1), MAX_RESULTS_LIMIT)
+    lock = _index_lock_by_loop.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+    try:
+        async with lock:
+            index = await asyncio.to_thread(_fresh_doc_index)
+            hits = index.search(query, top_k=max_results)
+    except OSError as e:
+        logger.error("Project docs index unavailable.", extra={"error": str(e)})
+        return {"error": f"Project documentation index is unavailable: {e}"}
+
+    results = [
+        {
+            "path": hit.path,
+            "heading": hit.heading,
+            "line": hit.line,
+            "score": round(hit.score, 3),
+            "text": hit.text[:MAX_RESULT_CHARS],
+        }
+        for hit in hits
+    ]
+    logger.info(
+        "Tool 'search_project_docs' completed.",
+        extra={
+            "tool_input_query": query,
+            "tool_result_count": len(results),
+            "tool_duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        },
+    )
+    return {"query": query, "results": results}
+
+
+search_project_docs_tool = FunctionTool(search_project_docs)
@@ -1,11 +1,29 @@
 import datetime
+import functools
 import logging
-from zoneinfo import ZoneInfo  # For timezone support
+from zoneinfo import ZoneInfo, available_timezones  # For timezone support
 
 from google.adk.tools.function_tool import FunctionTool
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on zones per batch call, to keep one tool call's work bounded.
+MAX_BATCH_TIMEZONES = 50
+
+# Abbreviations models commonly send that the tz database does not know. Names
+# it does know (UTC, GMT, EST, MST, CET, ...) resolve to their own zones, and
+# ambiguous abbreviations (CST, IST, BST, ...) are left out rather than guessed.
+TIMEZONE_ALIASES = {
+    "z": "UTC",
+    "pst": "America/Los_Angeles",
+    "pdt": "America/Los_Angeles",
+    "mdt": "America/Denver",
+    "edt": "America/New_York",
+    "cest": "Europe/Paris",
+    "jst": "Asia/Tokyo",
+    "aest": "Australia/Sydney",
+}
+
 
 async def get_current_time_async(timezone_str: str = "UTC") -> str:
     """
@@ -67,9 +85,87 @@ async def get_current_time_async(timezone_str: str = "UTC") -> str:
         )
 
 
+def _normalize_zone_name(name: str) -> str:
+    return name.strip().replace(" ", "_").lower()
+
+
+@functools.lru_cache(maxsize=1)
+def _zone_name_index() -> dict[str, str]:
+    """Maps normalized (case-insensitive) names and aliases to IANA zone names.
+
+    Built once from the system tz database, so invalid names are rejected with a
+    dict lookup rather than a failed ZoneInfo() call and its exception.
+    """
+    index = {_normalize_zone_name(name): name for name in available_timezones()}
+    for alias, name in TIMEZONE_ALIASES.items():
+        index.setdefault(alias, name)  # A real zone name always wins
+    return index
+
+
+@functools.lru_cache(maxsize=512)
+def _resolve_zone(zone_name: str) -> ZoneInfo:
+    return ZoneInfo(zone_name)
+
+
+def _lookup_zone(name: str) -> ZoneInfo | None:
+    canonical_name = _zone_name_index().get(_normalize_zone_name(name))
+    return _resolve_zone(canonical_name) if canonical_name else None
+
+
+async def get_current_times_async(timezones: list[str]) -> dict:
+    """
+    Gets the current time in several timezones with a single call.
+    Prefer this over calling get_current_time_async repeatedly.
+
+    Args:
+        timezones: IANA timezone names (e.g., 'UTC', 'America/New_York',
+                   'Asia/Tokyo'). Matching is case-insensitive and common
+                   abbreviations such as 'PST' or 'EDT' are accepted.
+    Returns:
+        A dict with 'times' (timezone -> ISO formatted current time) and
+        'errors' (timezone -> reason) for any names that could not be used.
+    """
+    if isinstance(timezones, str):
+        timezones = [timezones]
+    now_utc = datetime.datetime.now(datetime.timezone.utc)
+    times: dict[str, str] = {}
+    errors: dict[str, str] = {}
+    names = []
+    for name in timezones or []:
+        if isinstance(name, str):
+            names.append(name)
+        else:  # Model arguments are JSON: numbers, lists or objects may arrive here
+            errors[str(name)] = "Not a timezone name; expected a string."
+    requested = list(dict.fromkeys(names))  # De-duplicate, keep order
+
+    for position, name in enumerate(requested):
+        if position >= MAX_BATCH_TIMEZONES:
+            errors[str(name)] = (
+                f"Too many timezones; at most {MAX_BATCH_TIMEZONES} are handled per call."
+            )
+            continue
+        zone = _lookup_zone(name)
+        if zone is None:
+            errors[str(name)] = (
+                "Unknown timezone. Use IANA names like 'UTC' or 'America/New_York'."
+            )
+            continue
+        times[name] = now_utc.astimezone(zone).isoformat()
+
+    logger.info(
+        "Tool 'get_current_times_async' completed.",
+        extra={
+            "tool_input_timezone_count": len(requested),
+            "tool_invalid_timezones": list(errors),
+        },
+    )
+    return {"times": times, "errors": errors}
+
+
 # The FunctionTool will use the function's __name__ (get_current_time_async)
 # and __doc__ string for its name and description by default.
 # If a different name or description is desired for the agent,
 # this might need to be handled by how the agent consumes the tool,
 # or by wrapping/aliasing, if FunctionTool doesn't allow overriding these.
 get_current_time_tool = FunctionTool(get_current_time_async)
+get_current_times_tool = FunctionTool(get_current_times_async)
@@ -0,0 +1,257 @@
+# utils/admission.py
+"""Admission control: caps in-flight requests and sheds the excess early.
+
+Without a cap, a traffic spike sends every request to the model at once; they
+all slow down together and most of them time out. The middleware admits up to
+`max_in_flight` requests (globally, and per route for expensive endpoints such
+as `/run`), lets a bounded number wait briefly for a slot, and answers the
+rest immediately with 503 (server at capacity) or 429 (route at capacity) and
+a `Retry-After` header, so admitted requests stay fast and clients back off.
+
+Limits are per worker process: with N uvicorn workers the instance admits up
+to N times `max_in_flight`.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_LIMIT = "global"
+# Health checks and scrapes must answer even when the server is saturated.
+DEFAULT_EXEMPT_PATHS = ("/custom_health", "/metrics")
+
+ADMISSION_IN_FLIGHT = REGISTRY.gauge(
+    "gen_bootstrap_admission_in_flight",
+    "Requests holding a slot, by limit (global or route).",
+    ["limit"],
+)
+ADMISSION_QUEUED = REGISTRY.gauge(
+    "gen_bootstrap_admission_queued",
+    "Requests waiting for a slot, by limit.",
+    ["limit"],
+)
+ADMISSION_REJECTED = REGISTRY.counter(
+    "gen_bootstrap_admission_rejected_total",
+    "Requests shed, by limit and reason (queue_full, queue_timeout).",
+    ["limit", "reason"],
+)
+ADMISSION_QUEUE_WAIT = REGISTRY.histogram(
+    "gen_bootstrap_admission_queue_wait_seconds",
+    "Time admitted requests spent waiting for a slot.",
+    ["limit"],
+)
+
+
+@dataclass(frozen=True)
+class AdmissionLimit:
+    """One in-flight cap. Zero `max_in_flight` disables it."""
+
+    max_in_flight: int = 0
+    max_queue: int = 0  # Requests allowed to wait for a slot
+    queue_timeout_seconds: float = 1.0  # How long a request may wait
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_in_flight > 0
+
+
+def resolve_admission_limits(
+    settings,
+) -> tuple[AdmissionLimit, dict[str, AdmissionLimit]]:
+    """The global limit and per-route limits from the ADMISSION_* settings.
+
+    Route entries in ADMISSION_ROUTE_LIMITS override the global queue settings.
+    """
+    default = AdmissionLimit(
+        max_in_flight=settings.admission_max_in_flight,
+        max_queue=settings.admission_max_queue,
+        queue_timeout_seconds=settings.admission_queue_timeout_seconds,
+    )
+    known = {f.name for f in fields(AdmissionLimit)}
+    routes = {}
+    for path, override in settings.admission_route_limits.items():
+        unknown = set(override) - known
+        if unknown:
+            raise ValueError(
+                f"Unknown ADMISSION_ROUTE_LIMITS setting(s) for '{path}': "
+                f"{', '.join(sorted(unknown))}. Expected: {', '.join(sorted(known))}."
+            )
+        merged = {**default.__dict__, "max_in_flight": 0, **override}
+        merged["max_in_flight"] = int(merged["max_in_flight"])
+        merged["max_queue"] = int(merged["max_queue"])
+        routes[path] = AdmissionLimit(**merged)
+    return default, routes
+
+
+class _Gate:
+    """In-flight counter with a bounded FIFO of waiters.
+
+    Used from one event loop (a worker's), so plain counters suffice; a freed
+    slot is handed straight to the oldest waiter rather than released.
+    """
+
+    def __init__(self, name: str, limit: AdmissionLimit):
+        self.name = name
+        self.limit = limit
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._in_flight_gauge = ADMISSION_IN_FLIGHT.labels(name)
+        self._queued_gauge = ADMISSION_QUEUED.labels(name)
+        self._wait = ADMISSION_QUEUE_WAIT.labels(name)
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        self._in_flight_gauge.inc()
+
+    async def acquire(self) -> str | None:
+        """Takes a slot; returns None, or why the request was rejected."""
+        if self.in_flight < self.limit.max_in_flight and not self._waiters:
+            self._admit()
+            return None
+        if len(self._waiters) >= self.limit.max_queue:
+            return "queue_full"
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._queued_gauge.inc()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(waiter), self.limit.queue_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                waiter.cancel()
+                return "queue_timeout"
+        except asyncio.CancelledError:
+            # Client went away while waiting; pass on a slot handed over meanwhile.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                waiter.cancel()
+            raise
+        finally:
+            self._queued_gauge.dec()
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        self._wait.observe(time.perf_counter() - started)
+        return None
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # The slot passes on; in_flight is unchanged
+                return
+        self.in_flight -= 1
+        self._in_flight_gauge.dec()
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware applying a global limit and per-route limits (exact paths).
+
+    A request takes its route's slot first, then a global one, and holds both
+    until its response has been sent, including the whole body of a streamed
+    response.
+    """
+
+    def __init__(
+        self,
+        app,
+        global_limit: AdmissionLimit,
+        route_limits: dict[str, AdmissionLimit] | None = None,
+        retry_after_seconds: float = 1.0,
+        exempt_paths=DEFAULT_EXEMPT_PATHS,
+    ):
+        self.app = app
+        self.global_gate = (
+            _Gate(GLOBAL_LIMIT, global_limit) if global_limit.enabled else None
+        )
+        self.route_gates = {
+            path: _Gate(path, limit)
+            for path, limit in (route_limits or {}).items()
+            if limit.enabled
+        }
+        self.retry_after = str(max(1, math.ceil(retry_after_seconds)))
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        gates = [
+            gate
+            for gate in (self.route_gates.get(scope["path"]), self.global_gate)
+            if gate is not None
+        ]
+        acquired = []
+        try:
+            for gate in gates:
+                reason = await gate.acquire()
+                if reason is not None:
+                    ADMISSION_REJECTED.labels(gate.name, reason).inc()
+                    logger.warning(
+                        "Request shed by admission control.",
+                        extra={
+                            "path": scope["path"],
+                            "limit": gate.name,
+                            "reason": reason,
+                        },
+                    )
+                    await self._reject(send, gate)
+                    return
+                acquired.append(gate)
+            await self.app(scope, receive, send)
+        finally:
+            for gate in reversed(acquired):
+                gate.release()
+
+    async def _reject(self, send, gate: _Gate) -> None:
+        status = 503 if gate.name == GLOBAL_LIMIT else 429
+        body = json.dumps(
+            {"detail": f"Server is at capacity ({gate.name} limit). Retry shortly."}
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", self.retry_after.encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def install_admission_control(app, settings) -> bool:
+    """Adds the middleware when any ADMISSION_* limit is set; returns whether it did."""
+    global_limit, route_limits = resolve_admission_limits(settings)
+    if not global_limit.enabled and not any(
+        limit.enabled for limit in route_limits.values()
+    ):
+        return False
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        global_limit=global_limit,
+        route_limits=route_limits,
+        retry_after_seconds=settings.admission_retry_after_seconds,
+    )
+    logger.info(
+        "Admission control enabled.",
+        extra={
+            "max_in_flight": global_limit.max_in_flight,
+            "route_limits": {
+                path: limit.max_in_flight for path, limit in route_limits.items()
+            },
+        },
+    )
+    return True
@@ -0,0 +1,402 @@
+# utils/doc_index.py
+"""On-disk BM25 index over local text corpora (docs/, memory-bank/ ...).
+
+Layout of the index directory:
+    files.json      per-file cache: mtime/size/sha256 and each chunk's text and
+                    term frequencies, so unchanged files are never re-tokenized
+    index.json      chunk metadata, BM25 parameters and the term lexicon
+                    (term -> [offset, document frequency] into the postings file)
+    postings-N.bin  (chunk id, term frequency) uint32 pairs, grouped by term;
+                    memory-mapped for queries
+
+The postings file is written under a new generation name and the manifest is
+replaced atomically, so readers never see a manifest/postings mismatch.
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import sys
+import time
+from array import array
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+INDEX_FORMAT_VERSION = 1
+INDEXED_EXTENSIONS = (".md", ".markdown", ".txt", ".rst")
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+MAX_CHUNK_WORDS = 200
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9_]*")
+_HEADING_PATTERN = re.compile(r"^\s{0,3}#{1,6}\s+(.*?)\s*#*\s*$")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have if in into is it its of on or "
+    "that the their then there these this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        token
+        for token in _TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in _STOPWORDS
+    ]
+
+
+def chunk_document(text: str) -> list[tuple[str, int, str]]:
+    """Splits a document into (heading, 1-based start line, text) chunks.
+
+    Chunks follow markdown sections; long sections are split at paragraph
+    boundaries into pieces of roughly MAX_CHUNK_WORDS words.
+    """
+    chunks: list[tuple[str, int, str]] = []
+    heading = ""
+    paragraphs: list[tuple[int, str]] = []  # (start line, text) of the current chunk
+    paragraph: list[str] = []
+    paragraph_line = 1
+    words = 0
+
+    def flush_paragraph():
+        nonlocal paragraph, words
+        if paragraph:
+            paragraphs.append((paragraph_line, "\n".join(paragraph)))
+            words += sum(len(line.split()) for line in paragraph)
+            paragraph = []
+
+    def flush_chunk():
+        nonlocal paragraphs, words
+        flush_paragraph()
+        if paragraphs:
+            chunks.append(
+                (heading, paragraphs[0][0], "\n\n".join(p for _, p in paragraphs))
+            )
+        paragraphs, words = [], 0
+
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        match = _HEADING_PATTERN.match(line)
+        if match:
+            flush_chunk()
+            heading = match.group(1)
+        elif not line.strip():
+            flush_paragraph()
+            if words >= MAX_CHUNK_WORDS:
+                flush_chunk()
+            continue
+        if not paragraph:
+            paragraph_line = line_number
+        paragraph.append(line)
+    flush_chunk()
+    return chunks
+
+
+@dataclass
+class SearchHit:
+    path: str
+    heading: str
+    line: int
+    score: float
+    text: str
+
+
+@dataclass
+class UpdateStats:
+    indexed_files: int = 0  # (Re-)tokenized
+    reused_files: int = 0
+    removed_files: int = 0
+    chunks: int = 0
+    terms: int = 0
+    seconds: float = 0.0
+    rebuilt: bool = False
+
+
+class DocIndex:
+    """BM25 search over the text files under `roots`, persisted in `index_dir`."""
+
+    def __init__(
+        self,
+        index_dir: str,
+        roots: list[str],
+        k1: float = DEFAULT_K1,
+        b: float = DEFAULT_B,
+    ):
+        self.index_dir = index_dir
+        self.roots = list(roots)
+        self.k1 = k1
+        self.b = b
+        self.last_checked: float | None = None
+        self._manifest_mtime_ns: int | None = None
+        self._chunks: list[dict] = []
+        self._lexicon: dict[str, list[int]] = {}
+        self._norms: list[float] = []
+        self._mmap: mmap.mmap | None = None
+        self._postings: memoryview | None = None
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.index_dir, "index.json")
+
+    @property
+    def files_path(self) -> str:
+        return os.path.join(self.index_dir, "files.json")
+
+    # --- Building -------------------------------------------------------------
+
+    def _corpus_files(self) -> list[str]:
+        paths = []
+        for root in self.roots:
+            if os.path.isfile(root):
+                paths.append(os.path.normpath(root))
+                continue
+            for directory, subdirectories, filenames in os.walk(root):
+                subdirectories[:] = sorted(
+                    d for d in subdirectories if not d.startswith(".")
+                )
+                paths.extend(
+                    os.path.normpath(os.path.join(directory, name))
+                    for name in sorted(filenames)
+                    if name.lower().endswith(INDEXED_EXTENSIONS)
+                )
+        return paths
+
+    def _load_json(self, path: str) -> dict:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if data.get("version") == INDEX_FORMAT_VERSION else {}
+
+    def _write_json(self, path: str, data: dict) -> None:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def update(self) -> UpdateStats:
+        """Brings the index up to date with the corpus.
+
+        Only new or changed files are read and tokenized; the postings are then
+        re-merged from the cached per-chunk term frequencies.
+        """
+        started = time.perf_counter()
+        stats = UpdateStats()
+        os.makedirs(self.index_dir, exist_ok=True)
+        cached_files = self._load_json(self.files_path).get("files", {})
+        files: dict[str, dict] = {}
+        changed = False
+
+        for path in self._corpus_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entry = cached_files.get(path)
+            if (
+                entry
+                and entry["mtime_ns"] == stat.st_mtime_ns
+                and entry["size"] == stat.st_size
+            ):
+                files[path] = entry
+                stats.reused_files += 1
+                continue
+            with open(path, "rb") as f:
+                raw = f.read()
+            digest = hashlib.sha256(raw).hexdigest()
+            if entry and entry["sha256"] == digest:
+                entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                files[path] = entry
+                stats.reused_files += 1
+                changed = True  # Only the stat data changed; persist it
+                continue
+            chunks = []
+            for heading, line, text in chunk_document(
+                raw.decode("utf-8", errors="replace")
+            ):
+                # The section heading is indexed with every chunk of its section.
+                terms = tokenize(f"{heading}\n{text}")
+                if terms:
+                    chunks.append(
+                        {
+                            "heading": heading,
+                            "line": line,
+                            "text": text,
+                            "length": len(terms),
+                            "tf": dict(Counter(terms)),
+                        }
+                    )
+            files[path] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": digest,
+                "chunks": chunks,
+            }
+            stats.indexed_files += 1
+            changed = True
+
+        stats.removed_files = len(set(cached_files) - set(files))
+        needs_rebuild = (
+            stats.indexed_files
+            or stats.removed_files
+            or not os.path.exists(self.manifest_path)
+        )
+        if changed or stats.removed_files:
+            self._write_json(
+                self.files_path, {"version": INDEX_FORMAT_VERSION, "files": files}
+            )
+        if needs_rebuild:
+            self._rebuild(files)
+            stats.rebuilt = True
+
+        self._load()
+        stats.chunks = len(self._chunks)
+        stats.terms = len(self._lexicon)
+        stats.seconds = time.perf_counter() - started
+        self.last_checked = time.monotonic()
+        return stats
+
+    def _rebuild(self, files: dict[str, dict]) -> None:
+        chunks: list[dict] = []
+        postings_by_term: dict[str, array] = defaultdict(lambda: array("I"))
+        for path in sorted(files):
+            for chunk in files[path]["chunks"]:
+                chunk_id = len(chunks)
+                chunks.append(
+                    {
+                        "path": path,
+                        "heading": chunk["heading"],
+                        "line": chunk["line"],
+                        "length": chunk["length"],
+                        "text": chunk["text"],
+                    }
+                )
+                for term, frequency in chunk["tf"].items():
+                    postings_by_term[term].extend((chunk_id, frequency))
+
+        previous = self._load_json(self.manifest_path).get("postings")
+        generation = int(time.time() * 1000)
+        postings_name = f"postings-{generation}-{os.getpid()}.bin"
+        postings_path = os.path.join(self.index_dir, postings_name)
+        lexicon: dict[str, list[int]] = {}
+        offset = 0  # In (chunk id, tf) pairs
+        with open(postings_path, "wb") as f:
+            for term in sorted(postings_by_term):
+                pairs = postings_by_term[term]
+                lexicon[term] = [offset, len(pairs) // 2]
+                pairs.tofile(f)
+                offset += len(pairs) // 2
+
+        total_length = sum(chunk["length"] for chunk in chunks)
+        self._write_json(
+            self.manifest_path,
+            {
+                "version": INDEX_FORMAT_VERSION,
+                "byteorder": sys.byteorder,
+                "postings": postings_name,
+                "k1": self.k1,
+                "b": self.b,
+                "avg_length": total_length / len(chunks) if chunks else 0.0,
+                "chunks": chunks,
+                "lexicon": lexicon,
+            },
+        )
+        if previous and previous != postings_name:
+            try:
+                # Open mappings of the old file stay valid after it is unlinked.
+                os.remove(os.path.join(self.index_dir, previous))
+            except OSError:
+                pass
+
+    # --- Querying -------------------------------------------------------------
+
+    def _load(self) -> None:
+        try:
+            manifest_mtime_ns = os.stat(self.manifest_path).st_mtime_ns
+        except OSError:
+            return
+        if manifest_mtime_ns == self._manifest_mtime_ns:
+            return
+        manifest = self._load_json(self.manifest_path)
+        if not manifest or manifest.get("byteorder") != sys.byteorder:
+            return
+        self.close()
+        self._chunks = manifest["chunks"]
+        self._lexicon = manifest["lexicon"]
+        avg_length = manifest["avg_length"] or 1.0
+        k1, b = manifest["k1"], manifest["b"]
+        # Per-chunk BM25 length normalisation, precomputed once per load.
+        self._norms = [
+            k1 * (1 - b + b * chunk["length"] / avg_length) for chunk in self._chunks
+        ]
+        self.k1 = k1
+        postings_path = os.path.join(self.index_dir, manifest["postings"])
+        if os.path.getsize(postings_path) > 0:
+            with open(postings_path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._postings = memoryview(self._mmap).cast("I")
+        self._manifest_mtime_ns = manifest_mtime_ns
+
+    def open(self) -> "DocIndex":
+        """Loads the existing index, building it first if there is none."""
+        self._load()
+        if self._manifest_mtime_ns is None:
+            self.update()
+        return self
+
+    def refresh_if_stale(self, max_age_seconds: float) -> UpdateStats | None:
+        """Re-checks the corpus for changes at most every `max_age_seconds`."""
+        if self.last_checked is not None and (
+            max_age_seconds <= 0
+            or time.monotonic() - self.last_checked < max_age_seconds
+        ):
+            return None
+        return self.update()
+
+    def search(self, query: str, top_k: int = 5) -> list[SearchHit]:
+        if self._postings is None or not self._chunks:
+            return []
+        chunk_count = len(self._chunks)
+        scores: dict[int, float] = defaultdict(float)
+        k1_plus_one = self.k1 + 1
+        norms = self._norms
+        postings = self._postings
+        for term in set(tokenize(query)):
+            entry = self._lexicon.get(term)
+            if entry is None:
+                continue
+            offset, document_frequency = entry
+            idf = math.log(
+                1
+                + (chunk_count - document_frequency + 0.5) / (document_frequency + 0.5)
+            )
+            term_postings = postings[offset * 2 : (offset + document_frequency) * 2]
+            for i in range(0, len(term_postings), 2):
+                chunk_id, frequency = term_postings[i], term_postings[i + 1]
+                scores[chunk_id] += (
+                    idf * frequency * k1_plus_one / (frequency + norms[chunk_id])
+                )
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [
+            SearchHit(
+                path=self._chunks[chunk_id]["path"],
+                heading=self._chunks[chunk_id]["heading"],
+                line=self._chunks[chunk_id]["line"],
+                score=score,
+                text=self._chunks[chunk_id]["text"],
+            )
+            for chunk_id, score in best
+        ]
+
+    def close(self) -> None:
+        if self._postings is not None:
+            self._postings.release()
+            self._postings = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._manifest_mtime_ns = None
@@ -0,0 +1,135 @@
+# utils/http_metrics.py
+"""Request metrics and event-loop lag for the main.py app.
+
+`RequestMetricsMiddleware` records, per route template (`/apps/{app_name}/...`
+rather than the raw path, so label cardinality stays bounded), how long
+requests take, how large their responses are, and how many are in flight.
+
+`EventLoopLagMonitor` measures how late the worker's event loop wakes a task
+that sleeps for a fixed interval. Lag means something is blocking the loop
+(synchronous I/O, CPU-heavy work), which delays every request on the worker.
+"""
+
+import asyncio
+import logging
+import time
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "unmatched"
+# Sizes of JSON replies and SSE streams, from empty bodies up to long transcripts.
+RESPONSE_SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "gen_bootstrap_http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response.",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "gen_bootstrap_http_requests_in_flight", "Requests being handled."
+)
+HTTP_RESPONSE_SIZE = REGISTRY.histogram(
+    "gen_bootstrap_http_response_size_bytes",
+    "Response body sizes.",
+    ["method", "route"],
+    buckets=RESPONSE_SIZE_BUCKETS,
+)
+EVENT_LOOP_LAG = REGISTRY.gauge(
+    "gen_bootstrap_event_loop_lag_seconds",
+    "Most recent event loop lag (the worst worker's, across workers).",
+    multiprocess_mode="max",
+)
+EVENT_LOOP_LAG_HISTOGRAM = REGISTRY.histogram(
+    "gen_bootstrap_event_loop_lag_distribution_seconds",
+    "Event loop lag samples.",
+    buckets=LAG_BUCKETS,
+)
+
+
+def _route_template(scope) -> str:
+    # Starlette sets the matched route on the scope while routing.
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording latency, response size and in-flight requests.
+
+    Add it last, so it is the outermost middleware and its timings include
+    admission queueing and cache hits. A response's status is reported by
+    class ("2xx", "5xx"); a request that raised, or whose client went away
+    before the response started, counts as "5xx".
+    """
+
+    def __init__(self, app, exempt_paths=("/metrics",)):
+        self.app = app
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        size = 0
+
+        async def measured_send(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        started = time.perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, measured_send)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            method, route = scope["method"], _route_template(scope)
+            HTTP_REQUEST_DURATION.labels(method, route, f"{status // 100}xx").observe(
+                time.perf_counter() - started
+            )
+            HTTP_RESPONSE_SIZE.labels(method, route).observe(size)
+
+
+class EventLoopLagMonitor:
+    """Samples the running event loop's lag every `interval_seconds`."""
+
+    def __init__(self, interval_seconds: float = 0.5):
+        self.interval_seconds = interval_seconds
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            lag = max(0.0, time.perf_counter() - expected)
+            EVENT_LOOP_LAG.set(lag)
+            EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
+
+    def start(self) -> None:
+        """Starts sampling; call from the loop to monitor (e.g. a startup handler)."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def install_request_metrics(app, settings) -> EventLoopLagMonitor:
+    """Adds the request middleware; call after all other middleware.
+
+    Returns the lag monitor, which the app's lifespan starts and stops.
+    """
+    app.add_middleware(RequestMetricsMiddleware)
+    return EventLoopLagMonitor(settings.metrics_event_loop_interval_seconds)
@@ -0,0 +1,449 @@
+# utils/metrics.py
+"""Minimal in-process metrics with Prometheus text exposition.
+
+Deliberately small (counters, gauges and histograms with fixed label sets) so that
+instrumenting hot paths such as tool calls costs a lock and a few additions,
+without adding a metrics client dependency. Labelled children are meant to be
+resolved once with `.labels(...)` and kept, so the hot path avoids the lookup.
+
+Each uvicorn worker is a separate process with its own registry. In
+multiprocess mode (`MultiprocessMetrics`, enabled by METRICS_MULTIPROC_DIR),
+every worker writes a snapshot of its registry to a shared directory every few
+seconds, and `/metrics` in any worker merges all snapshots: counters and
+histograms are summed, gauges summed or maxed as declared, and gauges of
+workers that have exited are dropped.
+"""
+
+import bisect
+import glob
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from sub-millisecond local calls to slow remote lookups.
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(
+    names: tuple[str, ...], values: tuple[str, ...], extra: str = ""
+) -> str:
+    pairs = [f'{n}="{_escape_label_value(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, "_Metric"] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_type: type, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_type(name, *args, **kwargs)
+            elif not isinstance(metric, metric_type):
+                raise ValueError(
+                    f"Metric '{name}' is already registered as a {metric.type_name}."
+                )
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> "Counter":
+        """Returns the registered counter, creating it on first use."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        multiprocess_mode: str = "sum",
+    ) -> "Gauge":
+        """Returns the registered gauge, creating it on first use.
+
+        `multiprocess_mode` ("sum" or "max") says how values from several
+        workers combine, e.g. "sum" for in-flight counts, "max" for lag.
+        """
+        return self._get_or_create(
+            Gauge, name, documentation, labelnames, multiprocess_mode
+        )
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        buckets=DEFAULT_LATENCY_BUCKETS,
+    ) -> "Histogram":
+        """Returns the registered histogram, creating it on first use."""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def collect(self) -> list[dict]:
+        """A JSON-serializable snapshot of every metric and its samples."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return [metric.collect() for metric in metrics]
+
+    def render(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        return render_families(self.collect())
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"Metric '{self.name}' expects labels {self.labelnames}.")
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _items(self):
+        with self._lock:
+            return list(self._children.items())
+
+    def _sample(self, child):
+        return child.value
+
+    def collect(self) -> dict:
+        return {
+            "name": self.name,
+            "type": self.type_name,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "samples": [
+                [list(values), self._sample(child)] for values, child in self._items()
+            ],
+        }
+
+    def render(self) -> list[str]:
+        return _render_family(self.collect())
+
+
+class _CounterChild:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase.")
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class _GaugeChild:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = float(value)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), multiprocess_mode="sum"):
+        if multiprocess_mode not in ("sum", "max"):
+            raise ValueError("Gauge multiprocess_mode must be 'sum' or 'max'.")
+        super().__init__(name, documentation, labelnames)
+        self.multiprocess_mode = multiprocess_mode
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def collect(self) -> dict:
+        return {**super().collect(), "multiprocess_mode": self.multiprocess_mode}
+
+
+class _HistogramChild:
+    __slots__ = ("_upper_bounds", "_bucket_counts", "_sum", "_count", "_lock")
+
+    def __init__(self, upper_bounds: tuple[float, ...]):
+        self._upper_bounds = upper_bounds
+        self._bucket_counts = [0] * (len(upper_bounds) + 1)  # Last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._upper_bounds, value)
+        with self._lock:
+            self._bucket_counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> tuple[list[int], float, int]:
+        with self._lock:
+            return list(self._bucket_counts), self._sum, self._count
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets if b != math.inf))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _sample(self, child):
+        return list(child.snapshot())
+
+    def collect(self) -> dict:
+        return {**super().collect(), "buckets": list(self.buckets)}
+
+
+def _render_family(family: dict) -> list[str]:
+    name, labelnames = family["name"], tuple(family["labelnames"])
+    lines = [f"# HELP {name} {family['help']}", f"# TYPE {name} {family['type']}"]
+    for values, sample in family["samples"]:
+        values = tuple(values)
+        if family["type"] != "histogram":
+            lines.append(
+                f"{name}{_format_labels(labelnames, values)} {_format_value(sample)}"
+            )
+            continue
+        bucket_counts, total, count = sample
+        cumulative = 0
+        for upper_bound, bucket_count in zip(
+            family["buckets"] + [math.inf], bucket_counts
+        ):
+            cumulative += bucket_count
+            le = f'le="{_format_value(upper_bound)}"'
+            lines.append(
+                f"{name}_bucket{_format_labels(labelnames, values, le)} {cumulative}"
+            )
+        labels = _format_labels(labelnames, values)
+        lines.append(f"{name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{name}_count{labels} {count}")
+    return lines
+
+
+def render_families(families: list[dict]) -> str:
+    lines: list[str] = []
+    for family in families:
+        lines.extend(_render_family(family))
+    return "\n".join(lines) + "\n"
+
+
+def _merge_sample(family: dict, current, sample):
+    if current is None:
+        return sample
+    if family["type"] == "histogram":
+        return [
+            [a + b for a, b in zip(current[0], sample[0])],
+            current[1] + sample[1],
+            current[2] + sample[2],
+        ]
+    if family["type"] == "gauge" and family.get("multiprocess_mode") == "max":
+        return max(current, sample)
+    return current + sample
+
+
+def merge_families(snapshots: list[list[dict]]) -> list[dict]:
+    """Combines the registry snapshots of several processes into one."""
+    merged: dict[str, dict] = {}
+    samples: dict[str, dict[tuple, object]] = {}
+    for families in snapshots:
+        for family in families:
+            name = family["name"]
+            if name not in merged:
+                merged[name] = {**family, "samples": []}
+                samples[name] = {}
+            elif merged[name]["type"] != family["type"] or merged[name].get(
+                "buckets"
+            ) != family.get("buckets"):
+                continue  # A worker running different code; skip rather than mix
+            for values, sample in family["samples"]:
+                key = tuple(values)
+                samples[name][key] = _merge_sample(
+                    family, samples[name].get(key), sample
+                )
+    for name, family in merged.items():
+        family["samples"] = [
+            [list(key), sample] for key, sample in samples[name].items()
+        ]
+    return list(merged.values())
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MultiprocessMetrics:
+    """Shares a registry between worker processes through snapshot files.
+
+    Each process writes `metrics-<pid>.json` into `directory` (atomically, via
+    rename) every `interval_seconds` from a daemon thread and once more on
+    `stop()`. Snapshots of exited workers are kept so counters never go
+    backwards, but their gauges are dropped. The directory must be emptied
+    when the server starts (`utils.serving.prepare_metrics_directory`).
+    """
+
+    def __init__(
+        self, registry: MetricsRegistry, directory: str, interval_seconds: float = 5.0
+    ):
+        self.registry = registry
+        self.directory = directory
+        self.interval_seconds = interval_seconds
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+
+    def write(self) -> None:
+        snapshot = {"pid": os.getpid(), "families": self.registry.collect()}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".metrics-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.path)
+
+    def _read_others(self) -> list[list[dict]]:
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+            if path == self.path:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue  # Removed or replaced while reading
+            families = snapshot["families"]
+            if not _process_alive(snapshot["pid"]):
+                families = [family for family in families if family["type"] != "gauge"]
+            snapshots.append(families)
+        return snapshots
+
+    def render(self) -> str:
+        """This process's live values merged with every other worker's last snapshot."""
+        return render_families(
+            merge_families([self.registry.collect()] + self._read_others())
+        )
+
+    def _loop(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            try:
+                self.write()
+            except OSError:
+                logger.warning("Could not write metrics snapshot.", exc_info=True)
+
+    def start(self) -> None:
+        self.write()
+        self._thread = threading.Thread(
+            target=self._loop, name="metrics-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.write()
@@ -0,0 +1,141 @@
+# utils/prompt_renderer.py
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from utils.token_utils import DEFAULT_ENCODING, count_text_tokens_batch
+
+# Vertex AI prompt templates use `{variable}` placeholders. Braces that do not wrap a
+# plain identifier (e.g. JSON examples inside a prompt) are left untouched.
+PLACEHOLDER_PATTERN = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+class PromptRenderError(ValueError):
+    """Raised when a template cannot be rendered with the given variables."""
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A template split once into literal text and variable slots."""
+
+    literals: tuple[str, ...]  # len(literals) == len(slots) + 1
+    slots: tuple[str, ...]
+
+    @classmethod
+    def compile(cls, template: str) -> "CompiledTemplate":
+        literals, slots, position = [], [], 0
+        for match in PLACEHOLDER_PATTERN.finditer(template):
+            literals.append(template[position : match.start()])
+            slots.append(match.group(1))
+            position = match.end()
+        literals.append(template[position:])
+        return cls(tuple(literals), tuple(slots))
+
+    @property
+    def variables(self) -> frozenset[str]:
+        return frozenset(self.slots)
+
+    def render(self, values: dict[str, Any]) -> str:
+        parts = [self.literals[0]]
+        for slot, literal in zip(self.slots, self.literals[1:]):
+            parts.append(str(values[slot]))
+            parts.append(literal)
+        return "".join(parts)
+
+
+@dataclass
+class RenderedPrompt:
+    text: str
+    system_instruction: str | None = None
+    token_count: int | None = None
+
+
+@dataclass
+class CompiledPrompt:
+    """A prompt definition (as read by `prompts create`) compiled for fast rendering."""
+
+    prompt_name: str | None
+    model_name: str | None
+    template: CompiledTemplate
+    system_template: CompiledTemplate | None = None
+    declared_variables: frozenset[str] = field(default_factory=frozenset)
+
+    @classmethod
+    def from_definition(cls, definition: dict) -> "CompiledPrompt":
+        prompt_data = definition.get("prompt_data")
+        if not isinstance(prompt_data, str):
+            raise PromptRenderError(
+                "Only text 'prompt_data' templates can be rendered locally."
+            )
+        system_instruction = definition.get("system_instruction")
+        declared = set()
+        # `variables` is a list of example dicts ({"name": "example"}) or plain names.
+        for entry in definition.get("variables") or []:
+            declared.update(entry.keys() if isinstance(entry, dict) else [str(entry)])
+        return cls(
+            prompt_name=definition.get("prompt_name"),
+            model_name=definition.get("model_name"),
+            template=CompiledTemplate.compile(prompt_data),
+            system_template=(
+                CompiledTemplate.compile(system_instruction)
+                if isinstance(system_instruction, str)
+                else None
+            ),
+            declared_variables=frozenset(declared),
+        )
+
+    @property
+    def required_variables(self) -> frozenset[str]:
+        required = self.template.variables
+        if self.system_template:
+            required = required | self.system_template.variables
+        return required
+
+    def render(self, values: dict[str, Any]) -> RenderedPrompt:
+        missing = self.required_variables.difference(values)
+        if missing:
+            raise PromptRenderError(
+                f"Missing value(s) for variable(s): {', '.join(sorted(missing))}"
+            )
+        return RenderedPrompt(
+            text=self.template.render(values),
+            system_instruction=(
+                self.system_template.render(values) if self.system_template else None
+            ),
+        )
+
+    def render_batch(
+        self,
+        variable_sets: Iterable[dict[str, Any]],
+        count_tokens: bool = True,
+        encoding: str = DEFAULT_ENCODING,
+    ) -> list[RenderedPrompt | PromptRenderError]:
+        """Renders many variable sets; failures are returned in place, not raised.
+
+        Token counts cover the system instruction plus the prompt text and are
+        computed for the whole batch in one pass.
+        """
+        results: list[RenderedPrompt | PromptRenderError] = []
+        for values in variable_sets:
+            try:
+                results.append(self.render(values))
+            except PromptRenderError as e:
+                results.append(e)
+
+        if count_tokens:
+            rendered = [r for r in results if isinstance(r, RenderedPrompt)]
+            counts = count_text_tokens_batch(
+                [
+                    (
+                        f"{r.system_instruction}\n{r.text}"
+                        if r.system_instruction
+                        else r.text
+                    )
+                    for r in rendered
+                ],
+                encoding,
+            )
+            for result, count in zip(rendered, counts):
+                result.token_count = count
+        return results
@@ -0,0 +1,290 @@
+# utils/prompt_store.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+# Fields that make up a prompt's content; the content hash is computed over these.
+PROMPT_CONTENT_FIELDS = (
+    "prompt_name",
+    "prompt_data",
+    "model_name",
+    "system_instruction",
+    "variables",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prompts (
+    project_id TEXT NOT NULL,
+    location TEXT NOT NULL,
+    prompt_id TEXT NOT NULL,
+    prompt_name TEXT,
+    latest_version_id TEXT,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (project_id, location, prompt_id)
+);
+CREATE INDEX IF NOT EXISTS idx_prompts_name
+    ON prompts (project_id, location, prompt_name);
+CREATE TABLE IF NOT EXISTS prompt_versions (
+    project_id TEXT NOT NULL,
+    location TEXT NOT NULL,
+    prompt_id TEXT NOT NULL,
+    version_id TEXT NOT NULL,
+    prompt_name TEXT,
+    model_name TEXT,
+    prompt_data TEXT,
+    system_instruction TEXT,
+    variables TEXT,
+    content_hash TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (project_id, location, prompt_id, version_id)
+);
+CREATE INDEX IF NOT EXISTS idx_prompt_versions_hash
+    ON prompt_versions (project_id, location, prompt_name, content_hash);
+CREATE TABLE IF NOT EXISTS mirror_syncs (
+    project_id TEXT NOT NULL,
+    location TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (project_id, location)
+);
+"""
+
+
+def _to_text(value: Any) -> str | None:
+    """Normalises SDK values (str, list of parts, proto objects) to text."""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def content_hash(fields: dict) -> str:
+    """Returns a stable hash of a prompt's content fields.
+
+    Works for both local YAML definitions and prompts fetched from Vertex AI,
+    so the two can be compared to decide whether a version has changed.
+    """
+    normalised = {name: _to_text(fields.get(name)) for name in PROMPT_CONTENT_FIELDS}
+    encoded = json.dumps(normalised, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def version_sort_key(version_id: str) -> tuple:
+    """Sorts numeric version IDs numerically, anything else lexically after them."""
+    return (0, int(version_id), "") if version_id.isdigit() else (1, 0, version_id)
+
+
+@dataclass
+class MirroredPrompt:
+    """A prompt version read from the local mirror.
+
+    Attribute names match the SDK's Prompt object so display code can take either.
+    """
+
+    id: str
+    version_id: str
+    content_hash: str
+    prompt_name: str | None = None
+    model_name: str | None = None
+    prompt_data: str | None = None
+    system_instruction: str | None = None
+    variables: list = field(default_factory=list)
+    synced_at: float = 0.0
+
+
+class PromptMirror:
+    """Local, indexed SQLite mirror of the Vertex AI Prompt Registry."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def has_data(self, project_id: str, location: str) -> bool:
+        """True once a full sync of this project and location has completed.
+
+        Versions recorded by other writers (e.g. `prompts create --dir`) do not
+        count: without a sync the mirror may hold only some of the prompts.
+        """
+        return self.last_synced_at(project_id, location) is not None
+
+    def last_synced_at(self, project_id: str, location: str) -> float | None:
+        row = self._conn.execute(
+            "SELECT synced_at FROM mirror_syncs WHERE project_id = ? AND location = ?",
+            (project_id, location),
+        ).fetchone()
+        return row[0] if row else None
+
+    def mark_synced(self, project_id: str, location: str) -> None:
+        """Records a completed full sync; only `prompts sync` should call this."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO mirror_syncs (project_id, location, synced_at) "
+                "VALUES (?, ?, ?)",
+                (project_id, location, time.time()),
+            )
+
+    def known_versions(
+        self, project_id: str, location: str, prompt_id: str
+    ) -> set[str]:
+        rows = self._conn.execute(
+            "SELECT version_id FROM prompt_versions "
+            "WHERE project_id = ? AND location = ? AND prompt_id = ?",
+            (project_id, location, prompt_id),
+        )
+        return {row["version_id"] for row in rows}
+
+    def upsert_version(
+        self,
+        project_id: str,
+        location: str,
+        prompt_id: str,
+        version_id: str,
+        fields: dict,
+    ) -> str:
+        """Stores one prompt version and returns its content hash."""
+        digest = content_hash(fields)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prompt_versions (project_id, location, prompt_id, "
+                "version_id, prompt_name, model_name, prompt_data, system_instruction, "
+                "variables, content_hash, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    project_id,
+                    location,
+                    prompt_id,
+                    version_id,
+                    fields.get("prompt_name"),
+                    fields.get("model_name"),
+                    _to_text(fields.get("prompt_data")),
+                    _to_text(fields.get("system_instruction")),
+                    json.dumps(fields.get("variables") or [], default=str),
+                    digest,
+                    time.time(),
+                ),
+            )
+        return digest
+
+    def set_prompt_head(
+        self,
+        project_id: str,
+        location: str,
+        prompt_id: str,
+        prompt_name: str | None,
+        latest_version_id: str | None,
+    ) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prompts (project_id, location, prompt_id, "
+                "prompt_name, latest_version_id, synced_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    project_id,
+                    location,
+                    prompt_id,
+                    prompt_name,
+                    latest_version_id,
+                    time.time(),
+                ),
+            )
+
+    def remove_missing(
+        self, project_id: str, location: str, live_prompt_ids: set[str]
+    ) -> int:
+        """Drops prompts that no longer exist upstream. Returns the number removed."""
+        rows = self._conn.execute(
+            "SELECT prompt_id FROM prompts WHERE project_id = ? AND location = ?",
+            (project_id, location),
+        ).fetchall()
+        stale = [
+            row["prompt_id"] for row in rows if row["prompt_id"] not in live_prompt_ids
+        ]
+        with self._conn:
+            for prompt_id in stale:
+                params = (project_id, location, prompt_id)
+                self._conn.execute(
+                    "DELETE FROM prompts WHERE project_id = ? AND location = ? "
+                    "AND prompt_id = ?",
+                    params,
+                )
+                self._conn.execute(
+                    "DELETE FROM prompt_versions WHERE project_id = ? AND location = ? "
+                    "AND prompt_id = ?",
+                    params,
+                )
+        return len(stale)
+
+    def list_prompts(self, project_id: str, location: str) -> list[MirroredPrompt]:
+        """Returns the latest mirrored version of every prompt."""
+        rows = self._conn.execute(
+            "SELECT v.* FROM prompts p JOIN prompt_versions v "
+            "ON v.project_id = p.project_id AND v.location = p.location "
+            "AND v.prompt_id = p.prompt_id AND v.version_id = p.latest_version_id "
+            "WHERE p.project_id = ? AND p.location = ?",
+            (project_id, location),
+        )
+        return [self._to_prompt(row) for row in rows]
+
+    def get(
+        self,
+        project_id: str,
+        location: str,
+        prompt_id_or_name: str,
+        version_id: str | None = None,
+    ) -> MirroredPrompt | None:
+        """Looks up a prompt by ID or name; the latest version when none is given."""
+        head = self._conn.execute(
+            "SELECT prompt_id, latest_version_id FROM prompts "
+            "WHERE project_id = ? AND location = ? AND (prompt_id = ? OR prompt_name = ?) "
+            "ORDER BY prompt_id = ? DESC LIMIT 1",
+            (
+                project_id,
+                location,
+                prompt_id_or_name,
+                prompt_id_or_name,
+                prompt_id_or_name,
+            ),
+        ).fetchone()
+        if head is None:
+            return None
+        row = self._conn.execute(
+            "SELECT * FROM prompt_versions WHERE project_id = ? AND location = ? "
+            "AND prompt_id = ? AND version_id = ?",
+            (
+                project_id,
+                location,
+                head["prompt_id"],
+                version_id or head["latest_version_id"],
+            ),
+        ).fetchone()
+        return self._to_prompt(row) if row else None
+
+    @staticmethod
+    def _to_prompt(row: sqlite3.Row) -> MirroredPrompt:
+        return MirroredPrompt(
+            id=row["prompt_id"],
+            version_id=row["version_id"],
+            content_hash=row["content_hash"],
+            prompt_name=row["prompt_name"],
+            model_name=row["model_name"],
+            prompt_data=row["prompt_data"],
+            system_instruction=row["system_instruction"],
+            variables=json.loads(row["variables"] or "[]"),
+            synced_at=row["synced_at"],
+        )
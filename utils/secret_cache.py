@@ -0,0 +1,164 @@
+# utils/secret_cache.py
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # pragma: no cover - cryptography ships with the GCP client libs
+    Fernet = None
+    InvalidToken = Exception
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 3600
+
+
+def default_cache_dir() -> str:
+    """Returns the per-user secret cache directory (honours XDG_CACHE_HOME)."""
+    base_dir = os.getenv("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base_dir, "gen-bootstrap", "secrets")
+
+
+def default_key_path() -> str:
+    """Returns the per-user key path (honours XDG_CONFIG_HOME), outside the cache."""
+    base_dir = os.getenv("XDG_CONFIG_HOME") or os.path.join(
+        os.path.expanduser("~"), ".config"
+    )
+    return os.path.join(base_dir, "gen-bootstrap", "secret-cache.key")
+
+
+def is_pinned_version(version: str) -> bool:
+    """Pinned versions are numeric; aliases such as 'latest' can move."""
+    return bool(version) and version.isdigit()
+
+
+class SecretCacheUnavailable(RuntimeError):
+    """Raised when the encrypted cache cannot be used on this machine."""
+
+
+class SecretCache:
+    """Encrypted, per-user, on-disk cache of secret payloads.
+
+    Entries are keyed by project, secret and *resolved* version number, so an
+    alias lookup ('latest') populates the entry for the concrete version it
+    resolved to. Payloads are encrypted with a Fernet key that is only
+    readable by the current user.
+
+    The key is kept under the config directory, not the cache directory, so a
+    copied, synced or backed-up cache is unreadable on its own. Anyone who can
+    read both files as this user can still decrypt the entries: the cache
+    protects secrets at rest in the cache, not from the user's own account.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        ttl_seconds: int | None = None,
+        key_path: str | None = None,
+    ):
+        if Fernet is None:
+            raise SecretCacheUnavailable(
+                "The 'cryptography' package is required for the secret cache."
+            )
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.key_path = key_path or default_key_path()
+        self.ttl_seconds = ttl_seconds if ttl_seconds else DEFAULT_TTL_SECONDS
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        try:
+            self._fernet = Fernet(self._load_or_create_key())
+        except ValueError as e:
+            raise SecretCacheUnavailable(
+                f"Secret cache key '{self.key_path}' is invalid; delete it to start "
+                "a new cache."
+            ) from e
+
+    def _load_or_create_key(self) -> bytes:
+        """Reads the key, creating it first if needed.
+
+        A new key is written to a temporary file and then hard-linked into
+        place, which fails if the key already exists; concurrent processes
+        therefore never see a partly written key and all end up with the same one.
+        """
+        try:
+            with open(self.key_path, "rb") as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            pass
+        key_dir = os.path.dirname(self.key_path)
+        os.makedirs(key_dir, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=key_dir, prefix=".secret-cache-key-")
+        try:
+            with os.fdopen(fd, "wb") as f:  # mkstemp creates the file with mode 0600
+                f.write(Fernet.generate_key())
+            os.link(tmp_path, self.key_path)
+        except FileExistsError:
+            pass  # Another process created it first; use theirs
+        finally:
+            os.remove(tmp_path)
+        with open(self.key_path, "rb") as f:
+            return f.read().strip()
+
+    def _entry_path(self, project_id: str, secret_id: str, version: str) -> str:
+        digest = hashlib.sha256(
+            f"{project_id}/{secret_id}/{version}".encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.bin")
+
+    def get(self, project_id: str, secret_id: str, version: str) -> bytes | None:
+        """Returns the cached payload, or None on a miss or an expired entry."""
+        entry_path = self._entry_path(project_id, secret_id, version)
+        try:
+            with open(entry_path, "rb") as f:
+                token = f.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            entry = json.loads(self._fernet.decrypt(token, ttl=self.ttl_seconds))
+        except (InvalidToken, ValueError):
+            # Expired, written with another key, or corrupt: drop it.
+            self._remove(entry_path)
+            return None
+        return base64.b64decode(entry["payload"])
+
+    def put(
+        self, project_id: str, secret_id: str, version: str, payload: bytes
+    ) -> None:
+        """Stores a payload for a resolved (numeric) version."""
+        if not is_pinned_version(version):
+            return
+        entry = {
+            "payload": base64.b64encode(payload).decode("ascii"),
+            "stored_at": time.time(),
+        }
+        token = self._fernet.encrypt(json.dumps(entry).encode("utf-8"))
+        entry_path = self._entry_path(project_id, secret_id, version)
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(token)
+        os.replace(tmp_path, entry_path)
+
+    def clear(self) -> int:
+        """Removes every cached entry (the key is kept). Returns the count removed."""
+        removed = 0
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(".bin"):
+                self._remove(os.path.join(self.cache_dir, filename))
+                removed += 1
+        return removed
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            logger.debug("Could not remove secret cache entry.", extra={"path": path})
@@ -0,0 +1,200 @@
+# utils/serving.py
+"""Server profiles for running `main:app` under uvicorn.
+
+The production profile sizes the worker count from the container's CPU quota
+(cgroup v2 `cpu.max`, or v1 `cpu.cfs_quota_us`/`cpu.cfs_period_us`) rather than
+the host's core count, which on Cloud Run and most container platforms is far
+larger than what the container may actually use.
+
+Run `python -m utils.serving` to serve with the production profile; the host
+and port come from `HOST`/`PORT`, tuning from settings.
+"""
+
+import glob
+import importlib.util
+import math
+import os
+import tempfile
+from dataclasses import dataclass
+
+DEFAULT_APP = "main:app"
+DEFAULT_KEEP_ALIVE_SECONDS = 75  # Longer than typical load balancer idle timeouts
+DEFAULT_BACKLOG = 2048
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+METRICS_DIR_ENV = "METRICS_MULTIPROC_DIR"
+
+
+def _read_first_line(path: str) -> str | None:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.readline().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_quota(root: str = CGROUP_ROOT) -> float | None:
+    """Returns the CPU quota in cores, or None if the container is not limited."""
+    cpu_max = _read_first_line(
+        os.path.join(root, "cpu.max")
+    )  # cgroup v2: "<quota> <period>"
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max":
+            try:
+                return int(quota) / int(period or 100000)
+            except (ValueError, ZeroDivisionError):
+                return None
+        return None
+    for cpu_dir in ("cpu", "cpu,cpuacct"):  # cgroup v1
+        quota = _read_first_line(os.path.join(root, cpu_dir, "cpu.cfs_quota_us"))
+        period = _read_first_line(os.path.join(root, cpu_dir, "cpu.cfs_period_us"))
+        if quota and period:
+            try:
+                quota_us, period_us = int(quota), int(period)
+            except ValueError:
+                continue
+            if quota_us > 0 and period_us > 0:
+                return quota_us / period_us
+    return None
+
+
+def available_cpus(root: str = CGROUP_ROOT) -> float:
+    """CPUs this process may use: the cgroup quota, capped by the CPU affinity mask."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = float(len(os.sched_getaffinity(0)))
+    else:  # pragma: no cover - macOS/Windows
+        cpus = float(os.cpu_count() or 1)
+    quota = cgroup_cpu_quota(root)
+    return min(cpus, quota) if quota else cpus
+
+
+def default_worker_count(cpus: float | None = None) -> int:
+    """One worker per whole CPU the container may use, and at least one."""
+    if cpus is None:
+        cpus = available_cpus()
+    return max(1, math.floor(cpus))
+
+
+def _module_available(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+@dataclass
+class ServerProfile:
+    host: str = "0.0.0.0"
+    port: int = 8080
+    workers: int = 1
+    reload: bool = False
+    loop: str = "auto"
+    http: str = "auto"
+    timeout_keep_alive: int = 5
+    backlog: int = DEFAULT_BACKLOG
+
+    def uvicorn_args(self) -> list[str]:
+        """Command-line arguments for `uvicorn <app>`."""
+        args = ["--host", self.host, "--port", str(self.port)]
+        if self.reload:
+            return args + ["--reload", "--reload-dir", "."]
+        return args + [
+            "--workers",
+            str(self.workers),
+            "--loop",
+            self.loop,
+            "--http",
+            self.http,
+            "--timeout-keep-alive",
+            str(self.timeout_keep_alive),
+            "--backlog",
+            str(self.backlog),
+        ]
+
+    def uvicorn_kwargs(self) -> dict:
+        """Keyword arguments for `uvicorn.run(<app>, ...)`."""
+        kwargs = {"host": self.host, "port": self.port}
+        if self.reload:
+            return {**kwargs, "reload": True, "reload_dirs": ["."]}
+        return {
+            **kwargs,
+            "workers": self.workers,
+            "loop": self.loop,
+            "http": self.http,
+            "timeout_keep_alive": self.timeout_keep_alive,
+            "backlog": self.backlog,
+        }
+
+
+def development_profile(host: str = "0.0.0.0", port: int = 8080) -> ServerProfile:
+    """Single process with auto-reload on source changes."""
+    return ServerProfile(host=host, port=port, reload=True)
+
+
+def production_profile(
+    host: str = "0.0.0.0",
+    port: int = 8080,
+    workers: int | None = None,
+    timeout_keep_alive: int = DEFAULT_KEEP_ALIVE_SECONDS,
+    backlog: int = DEFAULT_BACKLOG,
+) -> ServerProfile:
+    """No reload, one worker per available CPU, uvloop/httptools when installed.
+
+    `workers` of None or 0 sizes the pool from the cgroup CPU quota.
+    """
+    return ServerProfile(
+        host=host,
+        port=port,
+        workers=workers or default_worker_count(),
+        reload=False,
+        loop="uvloop" if _module_available("uvloop") else "asyncio",
+        http="httptools" if _module_available("httptools") else "h11",
+        timeout_keep_alive=timeout_keep_alive,
+        backlog=backlog,
+    )
+
+
+def production_profile_from_settings(settings, host: str, port: int) -> ServerProfile:
+    return production_profile(
+        host=host,
+        port=port,
+        workers=settings.server_workers,
+        timeout_keep_alive=settings.server_keep_alive_seconds,
+        backlog=settings.server_backlog,
+    )
+
+
+def prepare_metrics_directory(workers: int, environ=os.environ) -> str | None:
+    """Sets up the directory workers share /metrics snapshots through.
+
+    With one worker there is nothing to share and None is returned. Otherwise
+    METRICS_MULTIPROC_DIR is used, or a new temporary directory is created and
+    exported for the workers to inherit. Snapshots left by a previous server
+    are removed so their counters are not added to the new ones.
+    """
+    if workers <= 1:
+        return None
+    directory = environ.get(METRICS_DIR_ENV)
+    if not directory:
+        directory = tempfile.mkdtemp(prefix="gen-bootstrap-metrics-")
+    os.makedirs(directory, exist_ok=True)
+    for stale in glob.glob(os.path.join(directory, "metrics-*.json")):
+        os.remove(stale)
+    environ[METRICS_DIR_ENV] = directory
+    return directory
+
+
+def main() -> None:
+    import uvicorn
+
+    from config.settings import settings
+
+    profile = production_profile_from_settings(
+        settings,
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", "8080")),
+    )
+    prepare_metrics_directory(profile.workers)
+    uvicorn.run(DEFAULT_APP, **profile.uvicorn_kwargs())
+
+
+if __name__ == "__main__":
+    main()
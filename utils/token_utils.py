@@ -1,7 +1,16 @@
 # utils/token_utils.py
 
+import functools
+import logging
 import subprocess
 
+try:
+    import tiktoken  # A declared dependency; guarded for environments without it
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
 DEFAULT_ENCODING = "cl100k_base"  # Example encoding
 
 
@@ -17,6 +26,50 @@ def count_text_tokens(text: str, encoding: str = DEFAULT_ENCODING) -> int:
         return 0
 
 
+@functools.lru_cache(maxsize=8)
+def _get_encoding(encoding: str):
+    return tiktoken.get_encoding(encoding)
+
+
+_warned_ttok_fallback = False
+
+
+def _warn_ttok_fallback(reason: str) -> None:
+    # Once per process: a batch would otherwise repeat it for every text.
+    global _warned_ttok_fallback
+    if _warned_ttok_fallback:
+        return
+    _warned_ttok_fallback = True
+    logger.warning(
+        "Counting tokens with one ttok subprocess per text; install tiktoken "
+        "(a project dependency) to count batches in-process.",
+        extra={"reason": reason},
+    )
+
+
+def count_text_tokens_batch(
+    texts: list[str], encoding: str = DEFAULT_ENCODING
+) -> list[int]:
+    """Counts tokens for many texts at once.
+
+    Uses tiktoken in-process (one encoder, batched encode). `ttok` prints one
+    total for all its arguments, so without tiktoken the only fallback is
+    count_text_tokens per text, which is slow and logged as a warning.
+    """
+    if not texts:
+        return []
+    if tiktoken is None:
+        _warn_ttok_fallback("tiktoken is not installed")
+    else:
+        try:
+            return [
+                len(tokens) for tokens in _get_encoding(encoding).encode_batch(texts)
+            ]
+        except Exception as e:
+            _warn_ttok_fallback(f"tiktoken failed: {e}")
+    return [count_text_tokens(text, encoding) for text in texts]
+
+
 def trim_text_to_tokens(
     text: str, max_tokens: int, encoding: str = DEFAULT_ENCODING
 ) -> str: